@@ -0,0 +1,79 @@
+"""
+Throughput of batched transcription against batch size.
+
+Transcribes the same set of short clips with Transcriber.transcribe_batch at
+each batch size and reports clips per second. Batch size 1 is the clip-by-clip
+baseline.
+
+Usage:
+    python -m benchmarks.bench_batch --model tiny --batch-sizes 1,2,4,8,16 --clips 32
+    python -m benchmarks.bench_batch --seconds 8 --precision int8 --output batch.json
+"""
+import argparse
+import json
+import os
+import time
+
+from benchmarks.audio import synthetic_corpus
+from src.core import ModelRegistry, Transcriber
+from src.core.quantization import PRECISIONS
+
+
+def run(transcriber, clips, batch_sizes):
+    """Transcribe the clips once per batch size; return one row per size."""
+    rows = []
+    baseline = None
+    print(f"{'batch':>6} {'wall s':>9} {'clips/s':>9} {'speedup':>8}")
+    for batch_size in batch_sizes:
+        start = time.perf_counter()
+        transcriber.transcribe_batch(
+            clips, batch_size=batch_size, language="en", temperature=0.0
+        )
+        wall = time.perf_counter() - start
+
+        clips_per_second = len(clips) / wall
+        baseline = baseline or clips_per_second
+        rows.append({
+            "batch_size": batch_size,
+            "seconds": wall,
+            "clips_per_second": clips_per_second,
+            "speedup": clips_per_second / baseline,
+        })
+        print(f"{batch_size:>6} {wall:>9.1f} {clips_per_second:>9.2f} "
+              f"{clips_per_second / baseline:>7.2f}x")
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--model", default="tiny")
+    parser.add_argument("--precision", choices=PRECISIONS, default="fp32")
+    parser.add_argument("--batch-sizes", default="1,2,4,8", help="Comma-separated batch sizes")
+    parser.add_argument("--clips", type=int, default=16, help="Number of synthetic clips")
+    parser.add_argument("--seconds", type=float, default=10.0, help="Length of each clip")
+    parser.add_argument("--output", help="Write the results to a JSON file")
+    args = parser.parse_args()
+
+    clips = synthetic_corpus(args.clips, args.seconds)
+    batch_sizes = [int(size) for size in args.batch_sizes.split(",")]
+    transcriber = Transcriber(args.model, registry=ModelRegistry(), precision=args.precision)
+    # Load and warm up first so neither is counted as throughput
+    transcriber.transcribe_batch(clips[:1], language="en", temperature=0.0)
+    print(f"model={args.model} precision={args.precision} clips={len(clips)} "
+          f"x {args.seconds:.0f}s cores={os.cpu_count()}")
+
+    rows = run(transcriber, clips, batch_sizes)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({
+                "model": args.model,
+                "precision": args.precision,
+                "clips": len(clips),
+                "seconds_per_clip": args.seconds,
+                "results": rows,
+            }, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
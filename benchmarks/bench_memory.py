@@ -0,0 +1,102 @@
+"""
+Peak memory of feature extraction against recording length.
+
+For each duration, a deterministic synthetic recording is written to an .npy
+file block by block, then a fresh process walks it the way WindowDecoder
+does (one 30-second mel window after another) using either:
+  - in-memory: the whole array plus the full log_mel_spectrogram (default path)
+  - streaming: PcmFile plus StreamingMel (--low-memory)
+and reports its peak RSS. Streaming should stay flat as the duration grows.
+
+Usage:
+    python -m benchmarks.bench_memory --minutes 10 30 60
+    python -m benchmarks.bench_memory --output memory.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Walks every window of the mel spectrogram of sys.argv[2] and prints the peak RSS
+PROBE = """
+import json, resource, sys, time
+import numpy as np
+mode, path = sys.argv[1], sys.argv[2]
+import torch, whisper
+from src.core.streaming import N_FRAMES, N_SAMPLES, PcmFile, StreamingMel
+baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+if mode == "in-memory":
+    mel = whisper.log_mel_spectrogram(np.load(path), 80, padding=N_SAMPLES)
+    n_frames = mel.shape[-1]
+else:
+    mel = StreamingMel(PcmFile(path), 80)
+    n_frames = mel.n_frames
+for seek in range(0, n_frames - N_FRAMES, N_FRAMES):
+    mel[:, seek:seek + N_FRAMES]
+print(json.dumps({
+    "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "baseline_rss_mb": baseline / 1024,
+    "seconds": time.perf_counter() - start,
+}))
+"""
+
+
+def write_recording(path, minutes, block_seconds=60):
+    """Write `minutes` of deterministic noise to a float32 .npy file without holding it."""
+    n = int(minutes * 60 * 16000)
+    out = np.lib.format.open_memmap(path, mode="w+", dtype=np.float32, shape=(n,))
+    rng = np.random.RandomState(0)
+    block = block_seconds * 16000
+    for start in range(0, n, block):
+        stop = min(start + block, n)
+        out[start:stop] = rng.randn(stop - start) * 0.1
+    out.flush()
+    del out
+
+
+def measure(mode, path):
+    """Return the probe's measurements for one mode in a fresh process."""
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE, mode, path],
+        cwd=ROOT, check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--minutes", type=float, nargs="+", default=[5, 15, 30], help="Recording lengths"
+    )
+    parser.add_argument("--output", help="Write the results to a JSON file")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for minutes in args.minutes:
+            path = os.path.join(tmp, f"{minutes:g}min.npy")
+            write_recording(path, minutes)
+            row = {"minutes": minutes}
+            for mode in ("in-memory", "streaming"):
+                row[mode] = measure(mode, path)
+            os.unlink(path)
+            results.append(row)
+            print(
+                f"{minutes:6g} min: in-memory peak {row['in-memory']['peak_rss_mb']:7.0f} MB  "
+                f"streaming peak {row['streaming']['peak_rss_mb']:7.0f} MB"
+            )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
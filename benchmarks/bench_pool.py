@@ -0,0 +1,61 @@
+"""
+Throughput of the multi-process TranscriptionPool against worker count.
+
+Usage:
+    python -m benchmarks.bench_pool --model tiny --workers 1,2,4,8 --files 16
+
+Real audio files can be given with --input instead of synthetic clips.
+"""
+import argparse
+import os
+import time
+
+from benchmarks.audio import synthetic_corpus
+from src.core.pool import TranscriptionPool
+
+
+def run(model, worker_counts, inputs, total_threads):
+    """Transcribe the inputs once per worker count and print files/hour."""
+    print(f"{'workers':>8} {'threads':>8} {'wall s':>9} {'files/h':>10} {'speedup':>8}")
+    baseline = None
+    for workers in worker_counts:
+        with TranscriptionPool(
+            model_name=model, workers=workers, total_threads=total_threads, fp16=False
+        ) as pool:
+            # Warm every worker so model load is not counted as throughput
+            pool.map(inputs[: pool.workers])
+
+            start = time.perf_counter()
+            entries = pool.map(inputs)
+            wall = time.perf_counter() - start
+
+        failed = [entry for entry in entries if entry["status"] != "ok"]
+        if failed:
+            raise RuntimeError(f"{len(failed)} job(s) failed: {failed[0]['error']}")
+
+        files_per_hour = len(inputs) / wall * 3600
+        baseline = baseline or files_per_hour
+        print(
+            f"{pool.workers:>8} {pool.threads_per_worker:>8} {wall:>9.1f} "
+            f"{files_per_hour:>10.0f} {files_per_hour / baseline:>7.2f}x"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--model", default="tiny")
+    parser.add_argument("--workers", default="1,2,4", help="Comma-separated worker counts")
+    parser.add_argument("--files", type=int, default=8, help="Number of synthetic clips")
+    parser.add_argument("--seconds", type=float, default=30.0, help="Length of each clip")
+    parser.add_argument("--threads", type=int, default=None, help="Total core budget")
+    parser.add_argument("--input", nargs="*", help="Audio files to use instead of synthetic clips")
+    args = parser.parse_args()
+
+    inputs = args.input or synthetic_corpus(args.files, args.seconds)
+    worker_counts = [int(w) for w in args.workers.split(",")]
+    print(f"model={args.model} inputs={len(inputs)} cores={args.threads or os.cpu_count()}")
+    run(args.model, worker_counts, inputs, args.threads)
+
+
+if __name__ == "__main__":
+    main()
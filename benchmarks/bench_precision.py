@@ -0,0 +1,111 @@
+"""
+Speed and accuracy of each inference precision.
+
+Transcribes a sample recording at every requested precision and reports, per
+precision: model load time (for int8, both the first load that quantizes the
+model and a load from the quantized-model cache), transcription time,
+realtime factor and word error rate against a reference transcript.
+
+The defaults use the repository's example recording and its transcript:
+    python -m benchmarks.bench_precision --model base
+    python -m benchmarks.bench_precision --audio talk.mp3 --reference talk.txt \\
+        --precision fp32 int8 --output precision.json
+"""
+import argparse
+import json
+import os
+import re
+import tempfile
+import time
+
+from src.core import ModelRegistry, Transcriber
+from src.core.audio import load_audio
+from src.core.quantization import PRECISIONS, QuantizedModelCache
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def normalize_words(text):
+    """Lowercase and strip punctuation, so WER only counts word differences."""
+    return re.sub(r"[^\w\s']", " ", text.lower()).split()
+
+
+def word_error_rate(reference, hypothesis):
+    """Return (substitutions + deletions + insertions) / reference words."""
+    ref, hyp = normalize_words(reference), normalize_words(hypothesis)
+    if not ref:
+        return float(bool(hyp))
+    # Single-row Levenshtein distance over words
+    row = list(range(len(hyp) + 1))
+    for i, word in enumerate(ref, 1):
+        previous, row[0] = row[0], i
+        for j, other in enumerate(hyp, 1):
+            previous, row[j] = row[j], min(
+                row[j] + 1, row[j - 1] + 1, previous + (word != other)
+            )
+    return row[-1] / len(ref)
+
+
+def run(model_name, precision, samples, reference, quantized_cache):
+    """Load and transcribe at one precision; return its measurements."""
+    registry = ModelRegistry(quantized_cache=quantized_cache)
+    transcriber = Transcriber(model_name, registry=registry, precision=precision)
+
+    start = time.perf_counter()
+    transcriber.load_model()
+    row = {"precision": precision, "load_seconds": time.perf_counter() - start}
+
+    if precision == "int8":
+        # A fresh registry reloads from the quantized-model cache
+        start = time.perf_counter()
+        ModelRegistry(quantized_cache=quantized_cache).get(model_name, quantized=True)
+        row["cached_load_seconds"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = transcriber.transcribe(samples, language="en", temperature=0.0)
+    row["transcribe_seconds"] = time.perf_counter() - start
+    row["realtime_factor"] = (len(samples) / 16000) / row["transcribe_seconds"]
+    row["wer"] = word_error_rate(reference, result["text"]) if reference else None
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--audio", default=os.path.join(ROOT, "ikigai.m4a"))
+    parser.add_argument("--reference", default=os.path.join(ROOT, "ikigai.txt"),
+                        help="Reference transcript for WER (skipped if missing)")
+    parser.add_argument("--model", default="base")
+    parser.add_argument("--precision", nargs="+", choices=PRECISIONS,
+                        default=["fp32", "int8"])
+    parser.add_argument("--output", help="Write the results to a JSON file")
+    args = parser.parse_args()
+
+    reference = None
+    if args.reference and os.path.exists(args.reference):
+        with open(args.reference, encoding="utf-8") as f:
+            reference = f.read()
+    samples = load_audio(args.audio)
+    print(f"{os.path.basename(args.audio)}: {len(samples) / 16000:.0f}s of audio, "
+          f"model {args.model}")
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        # A private cache directory, so int8's first load really quantizes
+        quantized_cache = QuantizedModelCache(tmp)
+        for precision in args.precision:
+            row = run(args.model, precision, samples, reference, quantized_cache)
+            results.append(row)
+            wer = f"{row['wer'] * 100:5.1f}%" if row["wer"] is not None else "  n/a"
+            cached = (f" (cached {row['cached_load_seconds']:.1f}s)"
+                      if "cached_load_seconds" in row else "")
+            print(f"  {precision:5s} load {row['load_seconds']:5.1f}s{cached}  "
+                  f"transcribe {row['transcribe_seconds']:6.1f}s  "
+                  f"{row['realtime_factor']:5.1f}x realtime  WER {wer}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"model": args.model, "audio": args.audio, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
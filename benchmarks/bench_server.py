@@ -0,0 +1,118 @@
+"""
+Load test of the local HTTP transcription server.
+
+Starts server.py's TranscriptionServer in-process on a free port (or targets
+a running one with --url) and submits synthetic clips from several client
+threads at once, then reports throughput, latency percentiles and how many
+submissions the bounded queue refused.
+
+Usage:
+    python -m benchmarks.bench_server --model tiny --clients 4 --requests 32
+    python -m benchmarks.bench_server --url http://127.0.0.1:8000 --clients 8
+"""
+import argparse
+import http.client
+import io
+import json
+import threading
+import time
+import wave
+from urllib.parse import urlparse
+
+import numpy as np
+
+from benchmarks.audio import synthetic_corpus
+
+
+def wav_bytes(samples):
+    """Encode float samples as a 16 kHz 16-bit mono WAV file."""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(16000)
+        f.writeframes((np.clip(samples, -1, 1 - 1 / 32768) * 32768).astype("<i2").tobytes())
+    return buffer.getvalue()
+
+
+def call(host, port, method, path, body=None):
+    """Send one request and return (status, decoded JSON body)."""
+    connection = http.client.HTTPConnection(host, port, timeout=3600)
+    connection.request(method, path, body=body, headers={"Content-Type": "audio/wav"})
+    response = connection.getresponse()
+    data = json.loads(response.read() or b"null")
+    connection.close()
+    return response.status, data
+
+
+def client(host, port, bodies, latencies, refused):
+    """Submit each body, then follow the job to completion."""
+    for body in bodies:
+        start = time.perf_counter()
+        status, job = call(host, port, "POST", "/jobs?language=en", body)
+        if status == 503:
+            refused.append(1)
+            continue
+        while job["status"] in ("queued", "running"):
+            time.sleep(0.05)
+            _, job = call(host, port, "GET", f"/jobs/{job['id']}")
+        latencies.append(time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", help="Server to load-test instead of an in-process one")
+    parser.add_argument("--model", default="tiny")
+    parser.add_argument("--workers", type=int, default=1, help="In-process server workers")
+    parser.add_argument("--max-queue", type=int, default=16)
+    parser.add_argument("--clients", type=int, default=4, help="Concurrent client threads")
+    parser.add_argument("--requests", type=int, default=16, help="Total submissions")
+    parser.add_argument("--seconds", type=float, default=10.0, help="Length of each clip")
+    args = parser.parse_args()
+
+    server = jobs = None
+    if args.url:
+        url = urlparse(args.url)
+        host, port = url.hostname, url.port
+    else:
+        from server import TranscriptionServer
+        from src.core.jobs import JobQueue
+
+        jobs = JobQueue(args.model, workers=args.workers, max_pending=args.max_queue)
+        print(f"Loading {args.model}: {jobs.preload():.1f}s")
+        server = TranscriptionServer(("127.0.0.1", 0), jobs)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        host, port = server.server_address
+
+    clips = [wav_bytes(clip) for clip in synthetic_corpus(args.requests, args.seconds)]
+    latencies, refused = [], []
+    threads = [
+        threading.Thread(target=client, args=(host, port, clips[i::args.clients], latencies, refused))
+        for i in range(args.clients)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"{len(latencies)} done, {len(refused)} refused in {wall:.1f}s "
+          f"({len(latencies) / wall * 60:.1f} jobs/min, "
+          f"{len(latencies) * args.seconds / wall:.1f}x realtime)")
+    if latencies:
+        print(f"latency p50 {latencies[len(latencies) // 2]:.1f}s  "
+              f"p95 {latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]:.1f}s  "
+              f"max {latencies[-1]:.1f}s")
+    _, metrics = call(host, port, "GET", "/metrics")
+    print(f"server: {json.dumps(metrics['latency_seconds'])}")
+
+    if server is not None:
+        server.shutdown()
+        server.server_close()
+        jobs.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Cold-start time of the CLI and the desktop app.
+
+Measures, in fresh interpreter processes:
+  - `cli_app.py --help` wall time
+  - time from process start to the first paint of the gui_app.main window
+and whether torch had been imported by then (it should not have been).
+
+Usage:
+    python -m benchmarks.bench_startup --runs 5
+    python -m benchmarks.bench_startup --output startup.json
+
+The GUI run uses Qt's offscreen platform unless QT_QPA_PLATFORM is set.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs gui_app.main() and exits at the window's first paint event
+GUI_PROBE = """
+import json, sys, time
+import psutil
+from PySide6.QtCore import QEvent, QObject, QTimer
+from PySide6.QtWidgets import QApplication
+import gui_app
+
+class FirstPaint(QObject):
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint and not hasattr(self, "seconds"):
+            self.seconds = time.time() - psutil.Process().create_time()
+            print(json.dumps({"first_paint": self.seconds, "torch_loaded": "torch" in sys.modules}))
+            sys.stdout.flush()
+            QTimer.singleShot(0, QApplication.quit)
+        return False
+
+probe = FirstPaint()
+init = gui_app.MainWindow.__init__
+def patched_init(self, *args, **kwargs):
+    init(self, *args, **kwargs)
+    self.installEventFilter(probe)
+gui_app.MainWindow.__init__ = patched_init
+try:
+    gui_app.main(warm_up=False)
+except SystemExit:
+    pass
+"""
+
+
+def time_cli_help():
+    """Return the wall time of one `cli_app.py --help` run."""
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, os.path.join(ROOT, "cli_app.py"), "--help"],
+        cwd=ROOT, check=True, stdout=subprocess.DEVNULL,
+    )
+    return time.perf_counter() - start
+
+
+def time_gui_first_paint():
+    """Return (seconds to first paint, torch imported by then) for one GUI start."""
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    output = subprocess.run(
+        [sys.executable, "-c", GUI_PROBE],
+        cwd=ROOT, env=env, check=True, capture_output=True, text=True,
+    ).stdout
+    line = [l for l in output.splitlines() if l.startswith("{")][-1]
+    data = json.loads(line)
+    return data["first_paint"], data["torch_loaded"]
+
+
+def summarize(samples):
+    return {"median": statistics.median(samples), "min": min(samples), "max": max(samples)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Fresh processes per measurement")
+    parser.add_argument("--skip-gui", action="store_true", help="Only time the CLI")
+    parser.add_argument("--output", help="Write the results to a JSON file")
+    args = parser.parse_args()
+
+    results = {"runs": args.runs}
+    cli = [time_cli_help() for _ in range(args.runs)]
+    results["cli_help"] = summarize(cli)
+    print(f"cli --help:      median {results['cli_help']['median']:.2f}s  min {min(cli):.2f}s")
+
+    if not args.skip_gui:
+        runs = [time_gui_first_paint() for _ in range(args.runs)]
+        paint = [seconds for seconds, _ in runs]
+        results["gui_first_paint"] = summarize(paint)
+        results["gui_torch_loaded"] = any(loaded for _, loaded in runs)
+        print(
+            f"gui first paint: median {results['gui_first_paint']['median']:.2f}s  "
+            f"min {min(paint):.2f}s  torch imported: {results['gui_torch_loaded']}"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+UI-thread stall time of the transcript view against transcript length.
+
+For each segment count, synthetic segments (a few seconds of made-up words
+each) are shown in the GUI's TranscriptView and, for comparison, in the
+QTextEdit it replaced. Per widget it reports:
+
+  - load: showing a finished result at once (set_segments / setPlainText)
+  - stream max / median: appending the segments one at a time, as they
+    arrive during a transcription, with the event loop run after each
+  - jump: TranscriptView.jump_to() to random positions (the QTextEdit has
+    no equivalent)
+  - RSS growth of the process after the load
+
+Stall is the time the UI thread is busy: the call itself plus the event
+loop iterations it causes (layout, paint), followed until --settle seconds
+pass with every iteration shorter than a frame. Idle iterations (under a
+millisecond) are not counted.
+
+Usage:
+    python -m benchmarks.bench_transcript_view --segments 10000 100000
+    python -m benchmarks.bench_transcript_view --skip-baseline --output view.json
+
+Runs on Qt's offscreen platform unless QT_QPA_PLATFORM is set.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+FRAME = 1 / 60
+IDLE = 0.001
+WORDS = (
+    "the of and to in is that it was for on are with as his they be at one have this "
+    "from or had by word but what some we can out other were all there when up use your "
+    "how said an each she which do their time if will way about many then them write"
+).split()
+
+
+def make_segments(count, seed=0):
+    """Return count deterministic segments of 2-6 seconds and 5-20 words."""
+    rng = random.Random(seed)
+    segments, position = [], 0.0
+    for i in range(count):
+        duration = rng.uniform(2.0, 6.0)
+        text = " " + " ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 20))).capitalize() + "."
+        segments.append({"id": i, "start": position, "end": position + duration, "text": text})
+        position += duration
+    return segments
+
+
+def stall(app, widget, action, settle):
+    """Return the seconds the UI thread is busy running action and its events."""
+    start = time.perf_counter()
+    action()
+    busy = time.perf_counter() - start
+    quiet_since = time.perf_counter()
+    while True:
+        began = time.perf_counter()
+        app.processEvents()
+        spent = time.perf_counter() - began
+        if spent > IDLE:
+            busy += spent
+        if spent > FRAME:
+            quiet_since = time.perf_counter()
+        if time.perf_counter() - quiet_since >= settle:
+            return busy
+
+
+def rss_mb():
+    import psutil
+
+    return psutil.Process().memory_info().rss / 1024 ** 2
+
+
+def bench_view(app, segments, settle, jumps):
+    from src.gui.widgets.transcript_view import TranscriptView
+
+    view = TranscriptView()
+    view.resize(900, 500)
+    view.show()
+    app.processEvents()
+
+    before = rss_mb()
+    load = stall(app, view, lambda: view.set_segments(segments), settle)
+    grown = rss_mb() - before
+
+    view.clear()
+    app.processEvents()
+    stream = [stall(app, view, lambda s=s: view.append_segment(s), 0) for s in segments]
+
+    end = segments[-1]["end"]
+    rng = random.Random(1)
+    jump = [stall(app, view, lambda: view.jump_to(rng.uniform(0, end)), 0) for _ in range(jumps)]
+    view.close()
+    return {
+        "load": load,
+        "stream_max": max(stream),
+        "stream_median": statistics.median(stream),
+        "stream_total": sum(stream),
+        "jump_max": max(jump),
+        "rss_growth_mb": grown,
+    }
+
+
+def bench_text_edit(app, segments, settle):
+    from PySide6.QtGui import QTextCursor
+    from PySide6.QtWidgets import QTextEdit
+
+    edit = QTextEdit()
+    edit.setReadOnly(True)
+    edit.resize(900, 500)
+    edit.show()
+    app.processEvents()
+
+    text = "".join(segment["text"] for segment in segments)
+    before = rss_mb()
+    load = stall(app, edit, lambda: edit.setPlainText(text), settle)
+    grown = rss_mb() - before
+
+    edit.clear()
+    app.processEvents()
+
+    def append(segment):
+        cursor = edit.textCursor()
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.insertText(segment["text"])
+        edit.setTextCursor(cursor)
+        edit.ensureCursorVisible()
+
+    stream = [stall(app, edit, lambda s=s: append(s), 0) for s in segments]
+    edit.close()
+    return {
+        "load": load,
+        "stream_max": max(stream),
+        "stream_median": statistics.median(stream),
+        "stream_total": sum(stream),
+        "jump_max": None,
+        "rss_growth_mb": grown,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--segments", nargs="+", type=int, default=[10000, 100000],
+                        help="Transcript lengths in segments")
+    parser.add_argument("--settle", type=float, default=0.5,
+                        help="Seconds without a long event-loop iteration that end a load")
+    parser.add_argument("--jumps", type=int, default=50, help="Jump-to-time calls per length")
+    parser.add_argument("--skip-baseline", action="store_true", help="Only time TranscriptView")
+    parser.add_argument("--output", help="Write the results to a JSON file")
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication
+
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    results = []
+    print(f"{'widget':<15} {'segments':>9} {'load ms':>9} {'stream max':>11} "
+          f"{'median':>8} {'jump max':>9} {'RSS +MB':>8}")
+    for count in args.segments:
+        segments = make_segments(count)
+        runs = [("TranscriptView", bench_view(app, segments, args.settle, args.jumps))]
+        if not args.skip_baseline:
+            runs.append(("QTextEdit", bench_text_edit(app, segments, args.settle)))
+        for widget, row in runs:
+            row = {"widget": widget, "segments": count, **row}
+            results.append(row)
+            jump = f"{row['jump_max'] * 1000:>9.2f}" if row["jump_max"] is not None else f"{'-':>9}"
+            print(f"{widget:<15} {count:>9} {row['load'] * 1000:>9.1f} "
+                  f"{row['stream_max'] * 1000:>11.2f} {row['stream_median'] * 1000:>8.3f} "
+                  f"{jump} {row['rss_growth_mb']:>8.1f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"settle": args.settle, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
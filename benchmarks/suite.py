@@ -0,0 +1,304 @@
+"""
+Benchmark suite for the transcription core.
+
+Runs Transcriber over deterministic audio for every combination of model,
+precision and thread count. Each combination runs in a fresh process, so its
+model load time and peak memory are its own, and records per audio input:
+
+  - load_seconds: model load from the local checkpoint (for int8 including
+    quantization, which runs against an empty quantized-model cache)
+  - first_segment_seconds: latency from starting a transcription to its
+    first segment (median of --repeat runs)
+  - transcribe_seconds: time for the whole input (median of --repeat runs)
+  - realtime_factor: transcribe_seconds per second of audio (lower is faster)
+  - peak_rss_mb: peak resident memory of the process so far
+
+The audio is synthetic speech-like signal of each --lengths duration (the
+same samples on every run), plus any --audio files; the repository's example
+recording is added when ffmpeg is available to decode it. Decoding uses
+language="en" and temperature 0 so every run does the same amount of work.
+
+Everything runs offline on the CPU. Only models already in the local Whisper
+cache are used, never downloaded. "random-tiny" has the tiny architecture
+with seeded random weights: it times the pipeline when no checkpoint is
+cached, but its numbers say nothing about real models.
+
+Results are written as JSON with --output. Given --baseline (an earlier
+results file), every metric is compared with the matching baseline run, and
+the exit status is 1 if any got worse by more than --tolerance.
+
+Usage:
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --models tiny base --precisions fp32 int8 --threads 1 4
+    python -m benchmarks.suite --baseline results.json --tolerance 0.15
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_AUDIO = os.path.join(ROOT, "ikigai.m4a")
+
+RANDOM_MODEL = "random-tiny"
+DECODE_OPTIONS = {"language": "en", "temperature": 0.0}
+
+# Lower is better for every metric; differences below the floor are noise
+METRICS = {
+    "load_seconds": 0.05,
+    "first_segment_seconds": 0.05,
+    "transcribe_seconds": 0.1,
+    "realtime_factor": 0.005,
+    "peak_rss_mb": 20.0,
+}
+
+
+def whisper_cache_dir():
+    """Return the directory whisper.load_model downloads checkpoints to."""
+    default = os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(os.getenv("XDG_CACHE_HOME", default), "whisper")
+
+
+def cached_models():
+    """Return the names of the models whose checkpoints are already downloaded."""
+    import whisper
+
+    directory = whisper_cache_dir()
+    return [
+        name for name, url in whisper._MODELS.items()
+        if os.path.isfile(os.path.join(directory, os.path.basename(url)))
+    ]
+
+
+def random_tiny_model():
+    """Build a Whisper model with tiny's dimensions and seeded random weights."""
+    import torch
+    from whisper.model import ModelDimensions, Whisper
+
+    torch.manual_seed(0)
+    dims = ModelDimensions(
+        n_mels=80, n_audio_ctx=1500, n_audio_state=384, n_audio_head=6, n_audio_layer=4,
+        n_vocab=51865, n_text_ctx=448, n_text_state=384, n_text_head=6, n_text_layer=4,
+    )
+    model = Whisper(dims).eval()
+    # Left uninitialised (torch.empty) by Whisper, which expects a checkpoint
+    torch.nn.init.normal_(model.decoder.positional_embedding, std=0.01)
+    return model
+
+
+def load_inputs(specs):
+    """Return (name, samples) for each audio spec."""
+    from benchmarks.audio import synthetic_speech
+    from src.core.audio import load_audio
+
+    inputs = []
+    for spec in specs:
+        if spec["kind"] == "synthetic":
+            inputs.append((f"synthetic-{spec['seconds']:g}s", synthetic_speech(spec["seconds"])))
+        else:
+            inputs.append((os.path.basename(spec["path"]), load_audio(spec["path"])))
+    return inputs
+
+
+def run_config(config):
+    """Benchmark one model/precision/threads combination; runs in its own process."""
+    import torch
+    import whisper
+
+    from src.core import ModelRegistry, Transcriber
+    from src.core.profiling import peak_rss
+    from src.core.quantization import QuantizedModelCache
+
+    torch.set_num_threads(config["threads"])
+    inputs = load_inputs(config["audio"])
+    model_name = config["model"]
+    if model_name == RANDOM_MODEL:
+        loader = lambda name: random_tiny_model()  # noqa: E731
+    else:
+        loader = lambda name: whisper.load_model(name, device="cpu")  # noqa: E731
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        registry = ModelRegistry(loader=loader, quantized_cache=QuantizedModelCache(tmp))
+        transcriber = Transcriber(model_name, registry=registry, precision=config["precision"])
+        start = time.perf_counter()
+        transcriber.load_model()
+        load_seconds = time.perf_counter() - start
+
+        for name, samples in inputs:
+            first_segments, totals = [], []
+            for _ in range(config["repeat"]):
+                first_segment = None
+                start = time.perf_counter()
+                for _ in transcriber.transcribe_stream(samples, **DECODE_OPTIONS):
+                    if first_segment is None:
+                        first_segment = time.perf_counter() - start
+                totals.append(time.perf_counter() - start)
+                first_segments.append(first_segment if first_segment is not None else totals[-1])
+            first_segment = statistics.median(first_segments)
+            seconds = statistics.median(totals)
+            audio_seconds = len(samples) / 16000
+            rows.append({
+                "model": model_name,
+                "precision": config["precision"],
+                "threads": config["threads"],
+                "audio": name,
+                "audio_seconds": round(audio_seconds, 3),
+                "load_seconds": round(load_seconds, 4),
+                "first_segment_seconds": round(first_segment, 4),
+                "transcribe_seconds": round(seconds, 4),
+                "realtime_factor": round(seconds / audio_seconds, 5),
+                "peak_rss_mb": round(peak_rss() / 1024 ** 2, 1),
+            })
+    return rows
+
+
+def run_in_subprocess(config):
+    """Run run_config() in a fresh interpreter and return its rows."""
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.suite", "--run-config", json.dumps(config)],
+        cwd=ROOT, check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def key(row):
+    return (row["model"], row["precision"], row["threads"], row["audio"])
+
+
+def compare(results, baseline, tolerance):
+    """Compare results with a baseline run by run.
+
+    Args:
+        results (list): Rows of this run
+        baseline (list): Rows of the baseline run
+        tolerance (float): Allowed relative slowdown, e.g. 0.1 for 10%
+
+    Returns:
+        list: (row key, metric, baseline value, new value, regressed) for
+              every metric of every run present in both
+    """
+    previous = {key(row): row for row in baseline}
+    changes = []
+    for row in results:
+        old = previous.get(key(row))
+        if old is None:
+            continue
+        for metric, floor in METRICS.items():
+            if old.get(metric) is None or row.get(metric) is None:
+                continue
+            regressed = (
+                row[metric] > old[metric] * (1 + tolerance)
+                and row[metric] - old[metric] > floor
+            )
+            changes.append((key(row), metric, old[metric], row[metric], regressed))
+    return changes
+
+
+def machine_info():
+    import torch
+
+    return {
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "torch": torch.__version__,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--models", nargs="+",
+                        help=f"Models to run (default: every cached model, or {RANDOM_MODEL} if none)")
+    parser.add_argument("--precisions", nargs="+", default=["fp32", "int8"],
+                        choices=["fp32", "int8"])
+    parser.add_argument("--threads", nargs="+", type=int, default=[os.cpu_count() or 1],
+                        help="torch thread counts (default: all cores)")
+    parser.add_argument("--lengths", nargs="+", type=float, default=[10.0, 60.0],
+                        help="Seconds of synthetic audio per input")
+    parser.add_argument("--audio", nargs="*", help="Audio files to add to the synthetic inputs")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Transcriptions per input; the median is reported")
+    parser.add_argument("--output", help="Write the results to a JSON file")
+    parser.add_argument("--baseline", help="Results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.1,
+                        help="Allowed relative slowdown before a metric counts as a regression")
+    parser.add_argument("--run-config", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_config:
+        print(json.dumps(run_config(json.loads(args.run_config))))
+        return
+
+    models = args.models or cached_models()
+    if not models:
+        print(f"No Whisper checkpoints in {whisper_cache_dir()}; timing {RANDOM_MODEL} only.")
+        models = [RANDOM_MODEL]
+    missing = [m for m in models if m != RANDOM_MODEL and m not in cached_models()]
+    if missing:
+        parser.error(f"Not in the local Whisper cache (nothing is downloaded): {', '.join(missing)}")
+
+    audio = [{"kind": "synthetic", "seconds": seconds} for seconds in args.lengths]
+    files = args.audio
+    if files is None and os.path.exists(SAMPLE_AUDIO) and shutil.which("ffmpeg"):
+        files = [SAMPLE_AUDIO]
+    audio += [{"kind": "file", "path": os.path.abspath(path)} for path in files or []]
+
+    results = []
+    print(f"{'model':<12} {'prec':<5} {'thr':>3} {'audio':<20} {'load s':>7} "
+          f"{'first s':>8} {'total s':>8} {'RTF':>7} {'peak MB':>8}")
+    for model in models:
+        for precision in args.precisions:
+            for threads in args.threads:
+                config = {
+                    "model": model,
+                    "precision": precision,
+                    "threads": threads,
+                    "audio": audio,
+                    "repeat": max(1, args.repeat),
+                }
+                for row in run_in_subprocess(config):
+                    results.append(row)
+                    print(f"{model:<12} {precision:<5} {threads:>3} {row['audio']:<20} "
+                          f"{row['load_seconds']:>7.2f} {row['first_segment_seconds']:>8.2f} "
+                          f"{row['transcribe_seconds']:>8.2f} {row['realtime_factor']:>7.3f} "
+                          f"{row['peak_rss_mb']:>8.0f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({
+                "created": datetime.datetime.now().isoformat(timespec="seconds"),
+                "machine": machine_info(),
+                "decode_options": DECODE_OPTIONS,
+                "repeat": max(1, args.repeat),
+                "results": results,
+            }, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        changes = compare(results, baseline["results"], args.tolerance)
+        regressions = [change for change in changes if change[4]]
+        if not changes:
+            print(f"\nNo runs in common with {args.baseline}.")
+        for (model, precision, threads, audio), metric, old, new, regressed in changes:
+            if regressed:
+                print(f"REGRESSION {model}/{precision}/{threads}t/{audio} {metric}: "
+                      f"{old:g} -> {new:g} ({(new - old) / old:+.0%})")
+        if changes:
+            print(f"\n{len(regressions)} regression(s) in {len(changes)} metric(s) "
+                  f"compared with {args.baseline} (tolerance {args.tolerance:.0%}).")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,13 +3,252 @@ Whisper Transcription Tool - Transcribe audio files using OpenAI's Whisper model
 
 This script provides a command-line interface for transcribing audio files
 using Whisper, with options for model selection, output path and precision.
+Batch mode transcribes many files with a single model load.
 """
+import os
+import sys
+import time
+
 import click
-from src.core import Transcriber
+from click.core import ParameterSource
+from src.core import Transcriber, TranscriptionCache
+from src.core.audio import DecodedAudioCache
+from src.core.batch import expand_inputs, run_batch, run_batch_parallel, write_summary
+from src.core.chunking import transcribe_chunked
+from src.core.export import FORMATS, SegmentExporter, output_paths, parse_formats, save_result
+from src.core.planner import ResourcePlanner
+from src.core.pool import TranscriptionPool
+from src.core.profiling import format_timings
+from src.core.progress import format_duration
+from src.core.quantization import PRECISIONS, resolve_precision
+from src.core.vad import format_summary
+from src.core.warmup import format_warmup, warm_up_model
+
+
+class ProgressLine:
+    """A self-overwriting progress line on stderr, drawn only on a terminal."""
+
+    def __init__(self):
+        self.enabled = sys.stderr.isatty()
+        self.text = ""
+
+    def update(self, progress):
+        """Redraw the line for a TranscriptionProgress."""
+        self.clear()
+        self.text = progress.format()
+        self.draw()
+
+    def draw(self):
+        if self.enabled and self.text:
+            click.echo(f"\r{self.text}", nl=False, err=True)
+
+    def clear(self):
+        if self.enabled and self.text:
+            click.echo("\r" + " " * len(self.text) + "\r", nl=False, err=True)
+
+    def finish(self):
+        if self.enabled and self.text:
+            click.echo(err=True)
+            self.text = ""
+
+
+def stream_to_file(transcriber, audio_file, paths, fp16):
+    """Print segments as they are decoded and append them to the output file of each format."""
+    from whisper.utils import format_timestamp
+
+    progress_line = ProgressLine()
+    announced = False
+    with SegmentExporter(paths) as exporter:
+        for segment in transcriber.transcribe_stream(
+            audio_file, fp16=fp16, progress_callback=progress_line.update
+        ):
+            if transcriber.checkpoint and transcriber.resumed_from is not None and not announced:
+                announced = True
+                progress_line.clear()
+                click.echo(
+                    f"Resuming from checkpoint at {format_duration(transcriber.resumed_from)}"
+                )
+                progress_line.draw()
+            exporter.write_segment(segment)
+            if not segment["text"]:
+                continue
+            start = format_timestamp(segment["start"])
+            end = format_timestamp(segment["end"])
+            progress_line.clear()
+            click.echo(f"[{start} --> {end}]{segment['text']}")
+            progress_line.draw()
+        exporter.finish(transcriber.last_result)
+    progress_line.finish()
+    return transcriber.last_result
+
+
+def parse_format_option(ctx, param, value):
+    """Click callback: accept --format repeated and/or comma-separated."""
+    try:
+        return parse_formats(value) or ["txt"]
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+
+
+def run_batch_mode(
+    batch_inputs,
+    model,
+    output_dir,
+    summary_path,
+    fp16,
+    workers,
+    cache,
+    audio_cache,
+    prefetch,
+    low_memory,
+    vad,
+    precision,
+    batch_size,
+    profile,
+    warm,
+    checkpoint,
+    formats,
+    overcommit=False,
+):
+    """Transcribe every file matched by the batch inputs with one model per process."""
+    try:
+        audio_files = expand_inputs(batch_inputs)
+    except FileNotFoundError as e:
+        raise click.UsageError(str(e))
+
+    click.echo(f"Found {len(audio_files)} file(s) to transcribe.")
+
+    # Check the model (once per worker process) fits in the available memory
+    # before loading it, and run fewer workers if not all of them do
+    planner = ResourcePlanner()
+    planner.on_decision = lambda decision: click.echo(f"Resource planner: {decision.format()}")
+    quantized = precision == "int8"
+    if workers > 1:
+        plan = planner.admit_workers(model, workers, quantized=quantized)
+        if plan.admitted and not overcommit:
+            workers = plan.workers
+    else:
+        plan = planner.admit(model, quantized=quantized)
+    if not plan.admitted:
+        if not overcommit:
+            raise click.ClickException(
+                f"Not enough memory for the {model} model: {plan.reason}. "
+                "Free some memory, pick a smaller model or pass --overcommit."
+            )
+        click.echo("Running anyway (--overcommit).")
+
+    def report(entry):
+        name = os.path.basename(entry["audio_file"])
+        if entry.get("skipped"):
+            click.echo(f"  [done]   {name} (completed by an earlier run) -> {entry['output_path']}")
+        elif entry["status"] == "ok":
+            status = "[cached]" if entry.get("cached") else "[ok]    "
+            click.echo(f"  {status} {name} ({entry['seconds']:.1f}s) -> {entry['output_path']}")
+            others = [path for path in entry.get("outputs", {}).values() if path != entry["output_path"]]
+            if others:
+                click.echo(f"           also {', '.join(others)}")
+            if entry.get("vad"):
+                click.echo(f"           {format_summary(entry['vad'], entry.get('timings'))}")
+        else:
+            click.echo(f"  [failed] {name} ({entry['seconds']:.1f}s): {entry['error']}")
+
+    wall_start = time.perf_counter()
+    if workers > 1:
+        pool = TranscriptionPool(
+            model_name=model,
+            workers=workers,
+            fp16=fp16,
+            cache=cache,
+            low_memory=low_memory,
+            vad=vad,
+            precision=precision,
+            warm=warm,
+            checkpoint=checkpoint,
+            audio_cache=audio_cache,
+            profile=profile,
+        )
+        click.echo(
+            f"Loading {'and warming up ' if warm else ''}{model} model in {pool.workers} worker process(es), "
+            f"{pool.threads_per_worker} thread(s) each..."
+        )
+        load_seconds = warmup = None
+        with pool:
+            summary = run_batch_parallel(
+                pool, audio_files, output_dir=output_dir, on_file_done=report, formats=formats
+            )
+    else:
+        click.echo(f"Loading {model} model...")
+        transcriber = Transcriber(
+            model_name=model,
+            cache=cache,
+            audio_cache=audio_cache,
+            low_memory=low_memory,
+            vad=vad,
+            precision=precision,
+            profile=profile,
+            checkpoint=checkpoint,
+        )
+        warmup = None
+        if warm:
+            warmup = warm_up_model(transcriber, fp16=fp16)
+            load_seconds = warmup["import"] + warmup["load"]
+            click.echo(f"Warm-up: {format_warmup(warmup)}")
+        elif cache is None and not checkpoint:
+            transcriber.load_model()
+            load_seconds = time.perf_counter() - wall_start
+            click.echo(f"Model loaded in {load_seconds:.1f}s")
+        else:
+            # Loaded lazily, so a batch answered from the cache or from
+            # completed checkpoints never loads it
+            load_seconds = None
+        summary = run_batch(
+            transcriber,
+            audio_files,
+            output_dir=output_dir,
+            fp16=fp16,
+            on_file_done=report,
+            prefetch=prefetch,
+            batch_size=batch_size,
+            formats=formats,
+        )
+    wall_seconds = time.perf_counter() - wall_start
+
+    failed = sum(1 for entry in summary if entry["status"] != "ok")
+    total = sum(entry["seconds"] for entry in summary)
+    click.echo("\nBatch summary:")
+    click.echo(f"  Files:      {len(summary)} ({failed} failed)")
+    if load_seconds is not None:
+        click.echo(f"  Model load: {load_seconds:.1f}s")
+    click.echo(f"  Transcribe: {total:.1f}s total, {total / max(len(summary), 1):.1f}s per file")
+    if summary:
+        click.echo(f"  First file: {summary[0]['seconds']:.1f}s ({'warm' if warm else 'cold'} model)")
+    click.echo(f"  Wall time:  {wall_seconds:.1f}s ({workers} worker(s))")
+    if cache is not None:
+        hits = sum(1 for entry in summary if entry.get("cached"))
+        click.echo(f"  Cache:      {hits} hit(s), {len(summary) - hits} miss(es)")
+    skipped = sum(1 for entry in summary if entry.get("skipped"))
+    if skipped:
+        click.echo(f"  Skipped:    {skipped} file(s) completed by an earlier run")
+
+    if summary_path:
+        write_summary(
+            summary,
+            summary_path,
+            model=model,
+            workers=workers,
+            planner=plan.to_dict(),
+            model_load_seconds=load_seconds,
+            warmup=warmup,
+            wall_seconds=wall_seconds,
+        )
+        click.echo(f"  Timings saved to: {summary_path}")
+
+    if failed:
+        raise SystemExit(1)
 
 
 @click.command()
-@click.argument("audio_file", type=click.Path(exists=True))
+@click.argument("audio_file", type=click.Path(exists=True), required=False)
 @click.option(
     "--model",
     "-m",
@@ -21,28 +260,303 @@ from src.core import Transcriber
     "--output",
     "-o",
     type=click.Path(),
-    help="Output file path (default: same as input with .txt extension)",
+    help="Output file path (default: same as input with .txt extension). Other "
+    "formats are written next to it with their own extensions.",
+)
+@click.option(
+    "--format",
+    "-f",
+    "formats",
+    multiple=True,
+    callback=parse_format_option,
+    help=f"Output format: {', '.join(FORMATS)}. Repeat or comma-separate for several "
+    "(e.g. -f txt -f srt, or -f srt,vtt); all are written from the same run as "
+    "segments are decoded. Default is txt.",
+)
+@click.option(
+    "--batch",
+    "-b",
+    "batch_inputs",
+    multiple=True,
+    help="Directory, glob pattern or manifest file (one path per line) to "
+    "transcribe with a single model load. Can be given multiple times.",
+)
+@click.option(
+    "--output-dir",
+    type=click.Path(file_okay=False),
+    help="Batch mode: directory for the outputs (default: next to each input)",
+)
+@click.option(
+    "--summary",
+    "summary_path",
+    type=click.Path(dir_okay=False),
+    help="Batch mode: write per-file timings to this JSON file",
+)
+@click.option(
+    "--workers",
+    "-w",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Number of worker processes for batch mode or --chunk-length, each with "
+    "its own model and an equal share of the CPU cores. Default is 1.",
 )
 @click.option(
-    "--fp16/--no-fp16",
-    default=True,
-    help="Use FP16 for faster inference on GPU. Default is True.",
+    "--prefetch",
+    type=click.IntRange(min=0),
+    default=2,
+    help="Batch mode: number of files decoded in the background ahead of the one "
+    "being transcribed (0 to disable). Not available with --workers. Default is 2.",
 )
-def transcribe(audio_file, model, output, fp16):
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Batch mode: run this many files through the model together. Speeds up "
+    "large numbers of short clips (up to about 30 seconds each). Not available "
+    "with --workers. Default is 1.",
+)
+@click.option(
+    "--warm",
+    is_flag=True,
+    help="Batch mode: run a short dummy inference after loading the model, so the "
+    "first file does not pay for torch's first-use setup.",
+)
+@click.option(
+    "--overcommit",
+    is_flag=True,
+    help="Batch mode: run even if the resource planner finds too little memory "
+    "for the model or the requested --workers.",
+)
+@click.option(
+    "--chunk-length",
+    type=click.FloatRange(min=30),
+    help="Split long audio into chunks of about this many seconds, cut at silence, "
+    "and transcribe them concurrently (see --workers).",
+)
+@click.option(
+    "--low-memory",
+    is_flag=True,
+    help="Stream audio from disk and compute features window by window, so memory "
+    "use does not grow with the length of the recording.",
+)
+@click.option(
+    "--vad",
+    is_flag=True,
+    help="Detect speech first and only transcribe the speech regions, skipping "
+    "silence. Timestamps stay on the original timeline.",
+)
+@click.option(
+    "--cache/--no-cache",
+    "use_cache",
+    default=False,
+    help="Reuse results of earlier runs on the same audio, model and options "
+    "from the on-disk cache, and keep decoded audio so other models skip "
+    "decoding. Default is off.",
+)
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False),
+    help="Directory of the result and decoded-audio caches "
+    "(default: ~/.cache/whisper-transcribe/results and .../audio)",
+)
+@click.option(
+    "--purge-cache",
+    is_flag=True,
+    help="Delete every cached result and decoded audio file before running "
+    "(or on its own, then exit).",
+)
+@click.option(
+    "--precision",
+    type=click.Choice(PRECISIONS),
+    help="Inference precision: fp16 (GPU only, falls back to fp32 on CPU), fp32, "
+    "or int8 (dynamically quantized linear layers, CPU only; the quantized model "
+    "is cached on disk). Default is fp16 on a GPU and fp32 on CPU.",
+)
+@click.option(
+    "--checkpoint",
+    is_flag=True,
+    help="Save progress next to each audio file (<audio>.checkpoint.json) while "
+    "transcribing. Rerunning the same command after a crash or Ctrl+C resumes "
+    "where it stopped, and batch mode skips files already completed.",
+)
+@click.option(
+    "--profile",
+    is_flag=True,
+    help="Time every stage (audio decoding, features, encoder, decoder, temperature "
+    "fallbacks) and print the breakdown. In batch mode the timings of each file "
+    "are written to the --summary file instead.",
+)
+@click.option(
+    "--profile-trace",
+    type=click.Path(dir_okay=False),
+    help="Write the stage timings of a single-file run as a Chrome trace JSON file "
+    "(open it in chrome://tracing or ui.perfetto.dev). Implies --profile.",
+)
+def transcribe(
+    audio_file,
+    model,
+    output,
+    formats,
+    batch_inputs,
+    output_dir,
+    summary_path,
+    workers,
+    prefetch,
+    batch_size,
+    warm,
+    overcommit,
+    chunk_length,
+    low_memory,
+    vad,
+    use_cache,
+    cache_dir,
+    purge_cache,
+    precision,
+    checkpoint,
+    profile,
+    profile_trace,
+):
     """Transcribe audio file using OpenAI's Whisper model."""
-    click.echo(f"Loading {model} model...")
-    transcriber = Transcriber(model_name=model)
-    transcriber.load_model()
+    # Passed along as the per-call flag; the transcriber resolves it against
+    # the precision and the available hardware
+    fp16 = precision in (None, "fp16")
+    cache = audio_cache = None
+    if use_cache or purge_cache:
+        cache = TranscriptionCache(cache_dir)
+        audio_cache = DecodedAudioCache(cache_dir)
+        if purge_cache:
+            click.echo(f"Purged {cache.purge()} cached result(s) from {cache.cache_dir}")
+            click.echo(
+                f"Purged {audio_cache.purge()} decoded audio file(s) from {audio_cache.cache_dir}"
+            )
+            if not audio_file and not batch_inputs:
+                return
+        if not use_cache:
+            cache = audio_cache = None
+
+    if precision == "fp16" and resolve_precision(precision) != "fp16":
+        click.echo("No GPU available: using fp32 instead of fp16.")
+
+    if batch_inputs:
+        if output:
+            raise click.UsageError("--output cannot be used with --batch; use --output-dir")
+        if audio_file:
+            batch_inputs = (audio_file,) + tuple(batch_inputs)
+        if workers > 1:
+            # Each worker process transcribes whole files one at a time
+            ctx = click.get_current_context()
+            if ctx.get_parameter_source("prefetch") is not ParameterSource.DEFAULT:
+                raise click.UsageError(
+                    "--prefetch cannot be used with --workers; each worker decodes its own file"
+                )
+            if batch_size > 1:
+                raise click.UsageError(
+                    "--batch-size cannot be used with --workers; use one or the other"
+                )
+        run_batch_mode(
+            batch_inputs,
+            model,
+            output_dir,
+            summary_path,
+            fp16,
+            workers,
+            cache,
+            audio_cache,
+            prefetch,
+            low_memory,
+            vad,
+            precision,
+            batch_size,
+            profile,
+            warm,
+            checkpoint,
+            formats,
+            overcommit,
+        )
+        return
+
+    if not audio_file:
+        raise click.UsageError("Missing argument 'AUDIO_FILE' (or use --batch).")
+
+    # Resolved up front: the streamed segments are appended to the outputs as
+    # they arrive, and chunks are passed as arrays so the path can't come from
+    # the transcriber
+    output = output or os.path.splitext(audio_file)[0] + ".txt"
+    paths = output_paths(output, formats)
+    if "txt" in paths:
+        paths["txt"] = output
+
+    if checkpoint and chunk_length:
+        click.echo("Checkpointing is not available with --chunk-length.")
+
+    if chunk_length and workers > 1:
+        click.echo(f"Loading {model} model in {workers} worker process(es)...")
+        transcriber = None
+        with TranscriptionPool(
+            model_name=model,
+            workers=workers,
+            fp16=fp16,
+            cache=cache,
+            low_memory=low_memory,
+            vad=vad,
+            precision=precision,
+        ) as pool:
+            click.echo(f"Transcribing audio in ~{chunk_length:.0f}s chunks...")
+            result = transcribe_chunked(audio_file, pool, chunk_seconds=chunk_length)
+    else:
+        click.echo(f"Loading {model} model...")
+        transcriber = Transcriber(
+            model_name=model,
+            cache=cache,
+            audio_cache=audio_cache,
+            low_memory=low_memory,
+            vad=vad,
+            precision=precision,
+            profile=bool(profile or profile_trace),
+            checkpoint=checkpoint,
+        )
+        if cache is None and not checkpoint:
+            transcriber.load_model()
+
+        click.echo("Transcribing audio...")
+        if chunk_length:
+            result = transcribe_chunked(
+                audio_file, transcriber, chunk_seconds=chunk_length, fp16=fp16
+            )
+        else:
+            result = stream_to_file(transcriber, audio_file, paths, fp16)
 
-    click.echo("Transcribing audio...")
-    result = transcriber.transcribe(audio_file, fp16=fp16)
+    if chunk_length:
+        saved = save_result(transcriber, result, paths)
+    else:
+        saved = dict(paths)
+        if "txt" in paths:
+            # Rewrites the streamed file with the final text
+            saved["txt"] = transcriber.save_transcription(result["text"], paths["txt"])
 
-    # Save transcription
-    output_path = transcriber.save_transcription(result["text"], output)
+    if result.get("vad"):
+        click.echo(format_summary(result["vad"], result.get("timings")))
+    if cache is not None and not (chunk_length and workers > 1):
+        click.echo(f"Cache: {cache.hits} hit(s), {cache.misses} miss(es)")
+    if profile or profile_trace:
+        if result.get("timings"):
+            click.echo("\nProfile:")
+            click.echo(format_timings(result["timings"]))
+            if profile_trace:
+                transcriber.last_profile.export_chrome_trace(profile_trace)
+                click.echo(f"Trace saved to: {profile_trace}")
+        else:
+            click.echo("\nProfiling is not available with --chunk-length.")
 
-    click.echo(f"\nTranscription saved to: {output_path}")
-    click.echo("\nTranscription text:")
-    click.echo(result["text"])
+    click.echo()
+    for fmt, path in saved.items():
+        if fmt == "txt":
+            click.echo(f"Transcription saved to: {path}")
+        else:
+            click.echo(f"{fmt.upper()} saved to: {path}")
+    if chunk_length:
+        click.echo("\nTranscription text:")
+        click.echo(result["text"])
 
 
 if __name__ == "__main__":
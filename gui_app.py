@@ -6,13 +6,21 @@ It provides a user-friendly interface for transcribing audio files using OpenAI'
 """
 import os
 import sys
+from PySide6.QtCore import QTimer
 from PySide6.QtWidgets import QApplication
 from PySide6.QtGui import QIcon
 from src.gui.main_window import MainWindow
 
 
-def main():
-    """Main entry point for the GUI application."""
+def main(warm_up=True):
+    """Main entry point for the GUI application.
+
+    Args:
+        warm_up (bool): Once the window has been shown, load the default
+                        (or last used) model in the background and run a
+                        short dummy inference, so the first transcription
+                        neither waits for the model nor runs cold
+    """
     app = QApplication(sys.argv)
     
     # Set application metadata
@@ -29,6 +37,9 @@ def main():
     # Create and show the main window
     window = MainWindow()
     window.show()
+    if warm_up:
+        # Runs on the first event loop iteration, after the window is painted
+        QTimer.singleShot(0, window.start_warmup)
     
     # Start the event loop
     sys.exit(app.exec())
@@ -0,0 +1,312 @@
+"""
+Whisper Transcribe - Local HTTP Server
+
+Serves transcriptions over HTTP so other programs can send audio without
+paying a model load per request. Models stay resident in a JobQueue, which
+runs a bounded number of jobs at a time and refuses new ones (503) once its
+queue is full. Listens on 127.0.0.1 by default and needs no network access.
+
+Endpoints:
+    POST   /jobs                 Submit audio (the request body). Query
+                                 parameters: model, language, task, filename
+    GET    /jobs                 List known jobs
+    GET    /jobs/<id>            Poll a job; includes the result once done
+    GET    /jobs/<id>/segments   Stream segments as newline-delimited JSON
+                                 while they are decoded (?from=N to resume)
+    DELETE /jobs/<id>            Cancel a job
+    GET    /health               Liveness, model readiness and warm-up
+    GET    /metrics              Queue depth, throughput, latency and the
+                                 latest CPU/memory sample
+"""
+import json
+import os
+import tempfile
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import click
+from src.core import TranscriptionCache
+from src.core.jobs import JobQueue, QueueFull
+from src.core.quantization import PRECISIONS
+from src.core.resources import ResourceSampler
+from src.core.warmup import format_warmup
+
+MODELS = ["tiny", "base", "small", "medium", "large"]
+
+# Decode options a client may set per job
+JOB_OPTIONS = ("language", "task", "initial_prompt")
+
+CONTENT_SUFFIXES = {
+    "audio/wav": ".wav",
+    "audio/x-wav": ".wav",
+    "audio/mpeg": ".mp3",
+    "audio/mp4": ".m4a",
+    "audio/ogg": ".ogg",
+    "audio/flac": ".flac",
+    "audio/webm": ".webm",
+}
+
+
+class TranscriptionServer(ThreadingHTTPServer):
+    """HTTP server handing requests to a JobQueue."""
+
+    daemon_threads = True
+
+    def __init__(self, address, jobs: JobQueue, max_upload_bytes: int = 1024 ** 3):
+        """Initialize the server.
+
+        Args:
+            address (tuple): (host, port) to listen on; port 0 picks a free one
+            jobs (JobQueue): Queue running the submitted transcriptions
+            max_upload_bytes (int): Larger uploads are refused with 413
+        """
+        super().__init__(address, TranscriptionRequestHandler)
+        self.jobs = jobs
+        self.max_upload_bytes = max_upload_bytes
+
+
+class TranscriptionRequestHandler(BaseHTTPRequestHandler):
+    """Routes the endpoints listed in the module docstring."""
+
+    protocol_version = "HTTP/1.1"
+    server: TranscriptionServer
+
+    def log_message(self, format, *args):
+        # Keep stderr for errors; the access log of a local service is noise
+        pass
+
+    def send_json(self, status, data, headers=None):
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if self.close_connection:
+            # Tell the client not to reuse a connection left with an unread body
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_error_json(self, status, message, headers=None):
+        self.send_json(status, {"error": message}, headers)
+
+    def route(self):
+        """Return (path parts, query parameters) of the request."""
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split("/") if part]
+        params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        return parts, params
+
+    def find_job(self, job_id):
+        job = self.server.jobs.get(job_id)
+        if job is None:
+            self.send_error_json(HTTPStatus.NOT_FOUND, f"No job {job_id}")
+        return job
+
+    def do_GET(self):
+        parts, params = self.route()
+        jobs = self.server.jobs
+        if parts == ["health"]:
+            self.send_json(HTTPStatus.OK, {
+                "status": "ok",
+                "model": jobs.model_name,
+                "model_loaded": jobs.registry.is_loaded(
+                    jobs.model_name, quantized=jobs.precision == "int8"
+                ),
+                "warm": jobs.warmup is not None,
+            })
+        elif parts == ["metrics"]:
+            self.send_json(HTTPStatus.OK, jobs.metrics())
+        elif parts == ["jobs"]:
+            self.send_json(HTTPStatus.OK, [job.to_dict(include_result=False) for job in jobs.jobs()])
+        elif len(parts) == 2 and parts[0] == "jobs":
+            job = self.find_job(parts[1])
+            if job is not None:
+                self.send_json(HTTPStatus.OK, job.to_dict())
+        elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "segments":
+            start = params.get("from", "0")
+            if not start.isdigit():
+                self.send_error_json(HTTPStatus.BAD_REQUEST, f"from must be a segment index, not {start!r}")
+                return
+            job = self.find_job(parts[1])
+            if job is not None:
+                self.stream_segments(job, int(start))
+        else:
+            self.send_error_json(HTTPStatus.NOT_FOUND, f"Unknown path {self.path}")
+
+    def stream_segments(self, job, start):
+        """Send segments as NDJSON lines in a chunked response, then the job state."""
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def send_line(data):
+            line = json.dumps(data).encode("utf-8") + b"\n"
+            self.wfile.write(f"{len(line):x}\r\n".encode("ascii") + line + b"\r\n")
+            self.wfile.flush()
+
+        try:
+            for segment in job.iter_segments(start):
+                send_line({"segment": segment})
+            send_line({"job": job.to_dict(include_result=False)})
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            # The client went away; the job itself carries on
+            self.close_connection = True
+
+    def do_POST(self):
+        parts, params = self.route()
+        if parts != ["jobs"]:
+            self.send_error_json(HTTPStatus.NOT_FOUND, f"Unknown path {self.path}")
+            return
+        model = params.get("model")
+        if model is not None and model not in MODELS:
+            # Rejected before the upload is read; the unread body ends the connection
+            self.close_connection = True
+            self.send_error_json(HTTPStatus.BAD_REQUEST, f"Unknown model {model}")
+            return
+        length = self.headers.get("Content-Length") or "0"
+        if not length.isdigit():
+            self.close_connection = True
+            self.send_error_json(HTTPStatus.BAD_REQUEST, f"Invalid Content-Length {length!r}")
+            return
+        length = int(length)
+        if length <= 0:
+            self.send_error_json(HTTPStatus.BAD_REQUEST, "Send the audio as the request body")
+            return
+        if length > self.server.max_upload_bytes:
+            self.close_connection = True
+            self.send_error_json(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Audio file too large")
+            return
+
+        suffix = os.path.splitext(params.get("filename", ""))[1] or CONTENT_SUFFIXES.get(
+            self.headers.get("Content-Type", "").split(";")[0].strip(), ""
+        )
+        fd, path = tempfile.mkstemp(prefix="whisper-upload-", suffix=suffix)
+        with os.fdopen(fd, "wb") as f:
+            remaining = length
+            while remaining:
+                chunk = self.rfile.read(min(remaining, 1024 * 1024))
+                if not chunk:
+                    break
+                f.write(chunk)
+                remaining -= len(chunk)
+        if remaining:
+            # The client stopped sending: a partial file would only fail to decode
+            os.remove(path)
+            self.close_connection = True
+            self.send_error_json(
+                HTTPStatus.BAD_REQUEST, f"Upload truncated: got {length - remaining} of {length} bytes"
+            )
+            return
+
+        options = {name: params[name] for name in JOB_OPTIONS if name in params}
+        try:
+            job = self.server.jobs.submit(path, model_name=model, delete_after=True, **options)
+        except QueueFull as e:
+            os.remove(path)
+            self.send_error_json(HTTPStatus.SERVICE_UNAVAILABLE, str(e), {"Retry-After": "5"})
+            return
+        except RuntimeError as e:
+            os.remove(path)
+            self.send_error_json(HTTPStatus.SERVICE_UNAVAILABLE, str(e))
+            return
+        self.send_json(
+            HTTPStatus.ACCEPTED, job.to_dict(), {"Location": f"/jobs/{job.id}"}
+        )
+
+    def do_DELETE(self):
+        parts, _ = self.route()
+        if len(parts) != 2 or parts[0] != "jobs":
+            self.send_error_json(HTTPStatus.NOT_FOUND, f"Unknown path {self.path}")
+            return
+        job = self.find_job(parts[1])
+        if job is None:
+            return
+        if not self.server.jobs.cancel(job.id):
+            self.send_error_json(HTTPStatus.CONFLICT, f"Job {job.id} has already {job.status}")
+            return
+        self.send_json(HTTPStatus.OK, job.to_dict(include_result=False))
+
+
+@click.command()
+@click.option("--host", default="127.0.0.1", help="Address to listen on. Default is 127.0.0.1.")
+@click.option("--port", type=click.IntRange(0, 65535), default=8000, help="Port. Default is 8000.")
+@click.option(
+    "--model",
+    "-m",
+    type=click.Choice(MODELS),
+    default="base",
+    help="Model for jobs that do not ask for one; loaded at startup. Default is base.",
+)
+@click.option(
+    "--workers",
+    "-w",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Jobs processed at the same time. Jobs on the same model share it and "
+    "take turns on it while decoding. Default is 1.",
+)
+@click.option(
+    "--max-queue",
+    type=click.IntRange(min=1),
+    default=16,
+    help="Jobs allowed to wait for a worker; further submissions get 503. Default is 16.",
+)
+@click.option(
+    "--max-upload-mb",
+    type=click.IntRange(min=1),
+    default=1024,
+    help="Largest accepted upload in MB. Default is 1024.",
+)
+@click.option("--precision", type=click.Choice(PRECISIONS), help="Inference precision, as in cli_app.py.")
+@click.option("--vad", is_flag=True, help="Only transcribe the speech regions of each file.")
+@click.option(
+    "--warm",
+    is_flag=True,
+    help="Run a short dummy inference after loading the model, so the first job "
+    "does not pay for torch's first-use setup.",
+)
+@click.option(
+    "--cache/--no-cache",
+    "use_cache",
+    default=False,
+    help="Answer repeated audio from the on-disk result cache. Default is off.",
+)
+def serve(host, port, model, workers, max_queue, max_upload_mb, precision, vad, warm, use_cache):
+    """Run a local HTTP transcription server."""
+    # Samples CPU and memory in the background for /metrics and each result
+    sampler = ResourceSampler().start()
+    jobs = JobQueue(
+        model_name=model,
+        workers=workers,
+        max_pending=max_queue,
+        cache=TranscriptionCache() if use_cache else None,
+        precision=precision,
+        vad=vad,
+        sampler=sampler,
+    )
+    click.echo(f"Loading {model} model...")
+    if warm:
+        click.echo(f"Warm-up: {format_warmup(jobs.warm_up())}")
+    else:
+        seconds = jobs.preload()
+        click.echo(f"Model loaded in {seconds:.1f}s")
+
+    server = TranscriptionServer((host, port), jobs, max_upload_bytes=max_upload_mb * 1024 ** 2)
+    click.echo(f"Listening on http://{host}:{server.server_address[1]} ({workers} worker(s))")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        click.echo("Shutting down...")
+    finally:
+        server.server_close()
+        jobs.close(cancel_running=True)
+        sampler.stop()
+
+
+if __name__ == "__main__":
+    serve()
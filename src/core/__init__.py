@@ -1,6 +1,19 @@
 """
 Core functionality for the Whisper Transcribe application.
 """
+from .async_transcriber import AsyncTranscriber
+from .cache import TranscriptionCache
+from .cancellation import CancellationToken, TranscriptionCancelled
+from .progress import TranscriptionProgress
+from .registry import ModelRegistry
 from .transcriber import Transcriber
 
-__all__ = ['Transcriber'] 
\ No newline at end of file
+__all__ = [
+    'Transcriber',
+    'AsyncTranscriber',
+    'TranscriptionCache',
+    'TranscriptionProgress',
+    'ModelRegistry',
+    'CancellationToken',
+    'TranscriptionCancelled',
+] 
\ No newline at end of file
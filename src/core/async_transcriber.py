@@ -0,0 +1,223 @@
+"""
+asyncio interface to the Transcriber.
+
+Transcriber.transcribe() blocks for as long as inference takes, so calling
+it from a coroutine stalls the whole event loop. AsyncTranscriber runs the
+work on its own thread pool and hands segments back to the loop as each
+window is decoded:
+
+    async with AsyncTranscriber("base", max_concurrency=2) as transcriber:
+        async for segment in transcriber.stream("talk.mp3", language="en"):
+            print(segment["text"])
+
+All callers share one concurrency limiter (an asyncio.Semaphore, which can
+also be shared between several AsyncTranscribers): once the limit is
+reached, further calls wait their turn instead of piling work onto the
+thread pool. Cancelling the awaiting task cancels the transcription, which
+stops before its next decode window and frees the slot.
+"""
+import asyncio
+import contextlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from .cache import TranscriptionCache
+from .cancellation import CancellationToken
+from .progress import TranscriptionProgress
+from .registry import ModelRegistry
+from .transcriber import Transcriber
+
+
+class AsyncTranscriber:
+    """Runs transcriptions off the event loop with bounded concurrency."""
+
+    def __init__(
+        self,
+        model_name: str = "base",
+        max_concurrency: int = 1,
+        registry: Optional[ModelRegistry] = None,
+        cache: Optional[TranscriptionCache] = None,
+        precision: Optional[str] = None,
+        vad: bool = False,
+        limiter: Optional[asyncio.Semaphore] = None,
+    ):
+        """Initialize the transcriber; no thread or model is started yet.
+
+        Args:
+            model_name (str): Model used by calls that do not name one
+            max_concurrency (int): Transcriptions running at the same time;
+                                   also the size of the thread pool
+            registry (ModelRegistry, optional): Registry keeping models
+                                                resident between calls
+            cache (TranscriptionCache, optional): Result cache for every call
+            precision (str, optional): "fp32", "fp16" or "int8"
+            vad (bool): Only transcribe the speech regions of each file
+            limiter (asyncio.Semaphore, optional): Limiter to share with other
+                                                   AsyncTranscribers. Defaults
+                                                   to one of max_concurrency
+        """
+        self.model_name = model_name
+        self.max_concurrency = max(1, max_concurrency)
+        self.registry = registry if registry is not None else ModelRegistry()
+        self.cache = cache
+        self.precision = precision
+        self.vad = vad
+        self.limiter = limiter if limiter is not None else asyncio.Semaphore(self.max_concurrency)
+        # Transcriptions currently holding a slot
+        self.active = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency, thread_name_prefix="async-transcriber"
+        )
+        self._local = threading.local()
+
+    async def load_model(self, model_name: Optional[str] = None) -> None:
+        """Load a model into the registry without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            self._executor,
+            lambda: self.registry.get(model_name or self.model_name, quantized=self.precision == "int8"),
+        )
+
+    async def transcribe(
+        self,
+        audio_file,
+        model_name: Optional[str] = None,
+        progress_callback: Optional[Callable[[TranscriptionProgress], None]] = None,
+        **decode_options
+    ) -> Dict[str, Any]:
+        """Transcribe an audio file.
+
+        Args:
+            audio_file: Path to the audio file, or an array of samples
+            model_name (str, optional): Whisper model; defaults to model_name
+            progress_callback (callable, optional): Called on the event loop
+                                                    with a TranscriptionProgress
+                                                    after every window
+            **decode_options: Extra options passed to Whisper's decoding
+
+        Returns:
+            Dict[str, Any]: The result, as returned by Transcriber.transcribe()
+
+        Raises:
+            asyncio.CancelledError: If the awaiting task was cancelled
+        """
+        result = None
+        events = self._events(audio_file, model_name, progress_callback, decode_options)
+        async with contextlib.aclosing(events):
+            async for kind, value in events:
+                if kind == "result":
+                    result = value
+        return result
+
+    async def stream(
+        self,
+        audio_file,
+        model_name: Optional[str] = None,
+        progress_callback: Optional[Callable[[TranscriptionProgress], None]] = None,
+        **decode_options
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield segments as each window is decoded.
+
+        Leaving the loop early cancels the transcription once the generator
+        is closed; wrap it in contextlib.aclosing() to close it at once.
+
+        Args:
+            audio_file: Path to the audio file, or an array of samples
+            model_name (str, optional): Whisper model; defaults to model_name
+            progress_callback (callable, optional): Called on the event loop
+                                                    with a TranscriptionProgress
+                                                    after every window
+            **decode_options: Extra options passed to Whisper's decoding
+
+        Yields:
+            Dict[str, Any]: Transcribed segments in order
+        """
+        events = self._events(audio_file, model_name, progress_callback, decode_options)
+        async with contextlib.aclosing(events):
+            async for kind, value in events:
+                if kind == "segment":
+                    yield value
+
+    async def close(self) -> None:
+        """Wait for running transcriptions and shut the thread pool down."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._executor.shutdown)
+
+    async def __aenter__(self) -> "AsyncTranscriber":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+
+    async def _events(self, audio_file, model_name, progress_callback, decode_options):
+        """Run one transcription and yield ("segment", segment) then ("result", result)."""
+        loop = asyncio.get_running_loop()
+        events: asyncio.Queue = asyncio.Queue()
+
+        def send(kind, value):
+            loop.call_soon_threadsafe(events.put_nowait, (kind, value))
+
+        def on_progress(progress):
+            loop.call_soon_threadsafe(progress_callback, progress)
+
+        async with self.limiter:
+            token = CancellationToken()
+            future = loop.run_in_executor(
+                self._executor,
+                self._run,
+                audio_file,
+                model_name or self.model_name,
+                on_progress if progress_callback else None,
+                token,
+                send,
+                decode_options,
+            )
+            self.active += 1
+            try:
+                while True:
+                    kind, value = await events.get()
+                    if kind == "error":
+                        raise value
+                    yield kind, value
+                    if kind == "result":
+                        return
+            finally:
+                if not future.done():
+                    token.cancel()
+                    # Hold the slot until the worker has actually stopped
+                    await asyncio.wait([future])
+                self.active -= 1
+
+    def _run(self, audio_file, model_name, progress_callback, token, send, decode_options) -> None:
+        # One Transcriber per pool thread; the models live in the shared registry
+        transcriber = getattr(self._local, "transcriber", None)
+        if transcriber is None:
+            transcriber = self._local.transcriber = Transcriber(
+                model_name,
+                cache=self.cache,
+                registry=self.registry,
+                vad=self.vad,
+                precision=self.precision,
+            )
+        transcriber.model_name = model_name
+        samples = None
+        try:
+            if isinstance(audio_file, str):
+                # Decode the audio before waiting for the model
+                samples = transcriber.open_audio(audio_file)
+            with self.registry.inference_lock(model_name, quantized=transcriber.quantized):
+                for segment in transcriber.transcribe_stream(
+                    audio_file,
+                    progress_callback=progress_callback,
+                    cancel_token=token,
+                    samples=samples,
+                    **decode_options
+                ):
+                    send("segment", segment)
+            send("result", transcriber.last_result)
+        except Exception as e:
+            send("error", e)
+        finally:
+            if hasattr(samples, "close"):
+                samples.close()
@@ -0,0 +1,231 @@
+"""
+Audio decode stage.
+
+Turns audio files into the 16 kHz mono float32 samples Whisper expects, in
+front of the model instead of inside it:
+
+- 16-bit mono 16 kHz WAV and .npy files are read directly; everything else
+  goes through one ffmpeg subprocess (whisper.load_audio).
+- DecodedAudioCache keeps decoded samples as .npy files keyed by the audio
+  content. Cached audio is memory-mapped, so re-transcribing a file (e.g. with
+  a different model) skips decoding entirely.
+- AudioPrefetcher decodes upcoming files on a background thread while the
+  current one is being transcribed.
+"""
+import queue
+import threading
+import wave
+from typing import Callable, Iterable, Iterator, Optional, Tuple
+
+import numpy as np
+
+from .cache import DiskCache, hash_audio
+from .streaming import PcmFile, decode_to_npy
+
+SAMPLE_RATE = 16000
+
+# Decoded audio is large (about 230 MB per hour), so it gets a bigger cap
+DEFAULT_AUDIO_CACHE_BYTES = 2 * 1024 ** 3
+
+
+def _read_wav(path: str) -> Optional[np.ndarray]:
+    """Read a 16-bit mono 16 kHz WAV file, or return None for any other format.
+
+    Samples are scaled exactly like whisper.load_audio, so results match the
+    ffmpeg path bit for bit.
+    """
+    try:
+        with wave.open(path, "rb") as f:
+            if (f.getframerate(), f.getnchannels(), f.getsampwidth()) != (SAMPLE_RATE, 1, 2):
+                return None
+            frames = f.readframes(f.getnframes())
+    except (wave.Error, EOFError):
+        return None
+    return np.frombuffer(frames, dtype="<i2").astype(np.float32) / 32768.0
+
+
+def decode_audio(path: str) -> np.ndarray:
+    """Decode an audio file to 16 kHz mono float32 samples.
+
+    Args:
+        path (str): Path to the audio file
+
+    Returns:
+        np.ndarray: The samples
+    """
+    if path.lower().endswith(".npy"):
+        return np.load(path).astype(np.float32, copy=False)
+    if path.lower().endswith(".wav"):
+        samples = _read_wav(path)
+        if samples is not None:
+            return samples
+
+    import whisper
+
+    return whisper.load_audio(path, sr=SAMPLE_RATE)
+
+
+class DecodedAudioCache(DiskCache):
+    """On-disk LRU cache of decoded samples, stored as memory-mappable .npy files."""
+
+    suffix = ".npy"
+    kind = "audio"
+
+    def __init__(
+        self, cache_dir: Optional[str] = None, max_bytes: int = DEFAULT_AUDIO_CACHE_BYTES
+    ):
+        """Initialize the cache.
+
+        Args:
+            cache_dir (str, optional): Directory holding the cache entries.
+                                       Defaults to default_cache_dir("audio")
+            max_bytes (int): Size cap; least recently used entries are evicted
+                             once the directory grows beyond it
+        """
+        super().__init__(cache_dir, max_bytes)
+
+    def make_key(self, path: str) -> str:
+        """Return the key for an audio file: a hash of its bytes."""
+        return hash_audio(path)
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Return memory-mapped samples for key, or None on a miss.
+
+        The mapping is copy-on-write, so callers may modify the array without
+        touching the cached file.
+        """
+        path = self._path(key)
+        try:
+            samples = np.load(path, mmap_mode="c")
+        except (FileNotFoundError, ValueError, OSError):
+            self.misses += 1
+            return None
+        self._touch(path)
+        self.hits += 1
+        return samples
+
+    def put(self, key: str, samples: np.ndarray) -> None:
+        """Store decoded samples and evict old entries if over the cap."""
+        self._write_atomic(
+            key, lambda f: np.save(f, np.asarray(samples, dtype=np.float32)), mode="wb"
+        )
+
+    def open(self, path: str) -> PcmFile:
+        """Return a streaming reader over an audio file's decoded samples.
+
+        On a miss the file is decoded block by block straight into the cache,
+        so it is never held in memory as a whole.
+
+        Args:
+            path (str): Path to the audio file
+
+        Returns:
+            PcmFile: Reader over the cached .npy file
+        """
+        key = self.make_key(path)
+        entry = self._path(key)
+        if self.contains(key):
+            self._touch(entry)
+            self.hits += 1
+        else:
+            self.misses += 1
+            self._write_atomic(key, lambda f: decode_to_npy(path, f), mode="wb")
+        return PcmFile(entry)
+
+
+def load_audio(path: str, cache: Optional[DecodedAudioCache] = None) -> np.ndarray:
+    """Decode an audio file, going through the decoded-audio cache if given.
+
+    Args:
+        path (str): Path to the audio file
+        cache (DecodedAudioCache, optional): Cache of previously decoded files
+
+    Returns:
+        np.ndarray: 16 kHz mono float32 samples (memory-mapped on a cache hit)
+    """
+    if cache is None:
+        return decode_audio(path)
+
+    key = cache.make_key(path)
+    samples = cache.get(key)
+    if samples is None:
+        samples = decode_audio(path)
+        cache.put(key, samples)
+    return samples
+
+
+class AudioPrefetcher:
+    """Decodes files on a background thread, a bounded number ahead of the consumer.
+
+    Iterating yields (path, samples, error) in input order. samples is what
+    the loader returned (an array, or a PcmFile for streaming), or None for
+    files rejected by skip or that failed to decode (error is then the
+    exception).
+    """
+
+    def __init__(
+        self,
+        paths: Iterable[str],
+        depth: int = 2,
+        cache: Optional[DecodedAudioCache] = None,
+        skip: Optional[Callable[[str], bool]] = None,
+        loader: Optional[Callable[[str], object]] = None,
+    ):
+        """Start decoding in the background.
+
+        Args:
+            paths (Iterable[str]): Audio files, in the order they will be consumed
+            depth (int): Maximum number of decoded files waiting to be consumed
+            cache (DecodedAudioCache, optional): Cache of previously decoded files
+            skip (callable, optional): Predicate for files that need no audio,
+                                       e.g. ones whose result is already cached
+            loader (callable, optional): Function opening a file, e.g.
+                                         Transcriber.open_audio. Defaults to
+                                         load_audio through cache
+        """
+        self.paths = list(paths)
+        self.depth = max(1, depth)
+        self.cache = cache
+        self.skip = skip
+        self.loader = loader or (lambda path: load_audio(path, self.cache))
+        self._queue: "queue.Queue[Tuple[str, Optional[np.ndarray], Optional[Exception]]]" = (
+            queue.Queue(maxsize=self.depth)
+        )
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="audio-prefetch", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        for path in self.paths:
+            samples, error = None, None
+            try:
+                if not (self.skip and self.skip(path)):
+                    samples = self.loader(path)
+            except Exception as e:
+                error = e
+            # Blocks while the queue is full: that bound is the prefetch depth
+            while not self._stopped.is_set():
+                try:
+                    self._queue.put((path, samples, error), timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+            if self._stopped.is_set():
+                return
+
+    def __iter__(self) -> Iterator[Tuple[str, Optional[np.ndarray], Optional[Exception]]]:
+        for _ in self.paths:
+            yield self._queue.get()
+
+    def close(self) -> None:
+        """Stop decoding ahead and drop anything not yet consumed."""
+        self._stopped.set()
+        self._thread.join()
+        while not self._queue.empty():
+            self._queue.get_nowait()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,442 @@
+"""
+Batch transcription support.
+
+This module expands directories, glob patterns and manifest files into a list
+of audio files and runs all of them through a single, already loaded
+Transcriber so the model is only loaded once per run.
+"""
+import glob
+import json
+import os
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from .audio import AudioPrefetcher
+from .export import output_paths, primary_output, save_result
+
+# File extensions picked up when a directory is given as batch input
+AUDIO_EXTENSIONS = (
+    ".mp3", ".wav", ".m4a", ".ogg", ".flac", ".aac", ".wma", ".opus", ".webm", ".mp4",
+)
+
+# A file with one of these extensions is read as a list of audio paths
+MANIFEST_EXTENSIONS = (".txt", ".lst", ".list", ".m3u")
+
+
+def _read_manifest(manifest_path: str) -> List[str]:
+    """Read audio paths from a manifest file.
+
+    One path per line; blank lines and lines starting with '#' are ignored.
+    Relative paths are resolved against the manifest's directory.
+    """
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    paths = []
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if not os.path.isabs(line):
+                line = os.path.join(base_dir, line)
+            paths.append(os.path.normpath(line))
+    return paths
+
+
+def _scan_directory(directory: str) -> List[str]:
+    """Recursively collect audio files below a directory, sorted by path."""
+    found = []
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if name.lower().endswith(AUDIO_EXTENSIONS):
+                found.append(os.path.join(root, name))
+    return sorted(found)
+
+
+def expand_inputs(specs: Iterable[str]) -> List[str]:
+    """Expand batch input specifications into a list of audio files.
+
+    Args:
+        specs (Iterable[str]): Directories, glob patterns, manifest files or
+                               plain audio file paths
+
+    Returns:
+        List[str]: Audio file paths in input order, without duplicates
+
+    Raises:
+        FileNotFoundError: If a spec matches nothing or a manifest entry is missing
+    """
+    files: List[str] = []
+    for spec in specs:
+        if os.path.isdir(spec):
+            matches = _scan_directory(spec)
+        elif os.path.isfile(spec) and spec.lower().endswith(MANIFEST_EXTENSIONS):
+            matches = _read_manifest(spec)
+            missing = [path for path in matches if not os.path.isfile(path)]
+            if missing:
+                raise FileNotFoundError(
+                    f"Manifest {spec} lists missing file(s): {', '.join(missing)}"
+                )
+        elif os.path.isfile(spec):
+            matches = [spec]
+        else:
+            # Like a directory, a pattern such as dir/* only picks up audio,
+            # not earlier outputs or checkpoint sidecars next to it
+            matches = sorted(
+                path for path in glob.glob(spec, recursive=True)
+                if os.path.isfile(path) and path.lower().endswith(AUDIO_EXTENSIONS)
+            )
+
+        if not matches:
+            raise FileNotFoundError(f"No audio files found for: {spec}")
+        files.extend(matches)
+
+    # Keep the first occurrence of each file so a file listed twice runs once
+    seen = set()
+    unique = []
+    for path in files:
+        key = os.path.abspath(path)
+        if key not in seen:
+            seen.add(key)
+            unique.append(path)
+    return unique
+
+
+def plan_outputs(
+    audio_files: List[str], output_dir: Optional[str] = None, formats: Sequence[str] = ("txt",)
+) -> Dict[str, Dict[str, str]]:
+    """Return the output path of each format for every file of a batch.
+
+    Under output_dir, each file's directory relative to the deepest
+    directory holding all the inputs is recreated, so a/talk.mp3 and
+    b/talk.wav are written to a/talk.txt and b/talk.txt instead of both to
+    talk.txt. Files that would still share an output (talk.mp3 next to
+    talk.wav) keep their extension in its name: talk.mp3.txt.
+
+    Args:
+        audio_files (List[str]): Audio files of the batch
+        output_dir (str, optional): Directory for the outputs. If None, each
+                                    file's outputs are written next to it
+        formats (Sequence[str]): Output formats written per file
+
+    Returns:
+        Dict[str, Dict[str, str]]: Output path per format, per audio file
+    """
+    root = None
+    if output_dir and audio_files:
+        try:
+            root = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in audio_files])
+        except ValueError:
+            # Inputs on different drives share no directory
+            root = None
+
+    bases = {}
+    for audio_file in audio_files:
+        directory = os.path.dirname(audio_file)
+        if output_dir:
+            directory = output_dir
+            if root is not None:
+                relative = os.path.relpath(os.path.dirname(os.path.abspath(audio_file)), root)
+                if relative != os.curdir:
+                    directory = os.path.join(output_dir, relative)
+        bases[audio_file] = os.path.join(directory, os.path.splitext(os.path.basename(audio_file))[0])
+
+    counts: Dict[str, int] = {}
+    for base in bases.values():
+        key = os.path.normcase(os.path.abspath(base))
+        counts[key] = counts.get(key, 0) + 1
+    plan = {}
+    for audio_file, base in bases.items():
+        if counts[os.path.normcase(os.path.abspath(base))] > 1:
+            base = os.path.join(os.path.dirname(base), os.path.basename(audio_file))
+        plan[audio_file] = output_paths(base + ".txt", formats)
+    return plan
+
+
+def _make_output_dirs(plan: Dict[str, Dict[str, str]]) -> None:
+    for paths in plan.values():
+        for path in paths.values():
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+
+def run_batch(
+    transcriber,
+    audio_files: List[str],
+    output_dir: Optional[str] = None,
+    fp16: bool = True,
+    on_file_done: Optional[Callable[[Dict[str, Any]], None]] = None,
+    prefetch: int = 2,
+    batch_size: int = 1,
+    formats: Sequence[str] = ("txt",),
+) -> List[Dict[str, Any]]:
+    """Transcribe a list of files with one Transcriber.
+
+    The model is loaded once, on the first file that is not answered from the
+    transcriber's cache; a failure on one file is recorded and the batch
+    continues with the next file. While one file is transcribed, the next
+    ones are decoded in the background. With the transcriber's checkpoint
+    option, files an earlier run completed (and wrote the output of) are
+    skipped, and a file it was interrupted on resumes where it stopped.
+
+    Args:
+        transcriber: The Transcriber instance to use
+        audio_files (List[str]): Audio files to transcribe
+        output_dir (str, optional): Directory for the outputs; the inputs'
+                                    subdirectories are recreated below it
+                                    (see plan_outputs)
+        fp16 (bool): Whether to use FP16 for faster inference on GPU
+        on_file_done (callable, optional): Called with each file's summary entry
+        prefetch (int): Number of files decoded ahead of the one being
+                        transcribed; 0 decodes each file when its turn comes
+        batch_size (int): Transcribe this many files per call to
+                          Transcriber.transcribe_batch, running them through
+                          the model together. Best for many short clips
+        formats (Sequence[str]): Output formats written per file (see
+                                 src.core.export)
+
+    Returns:
+        List[Dict[str, Any]]: One summary entry per input file with keys
+                              "audio_file", "output_path" (the .txt file,
+                              else the first format's), "outputs" (path per
+                              format), "status", "seconds", "error" and
+                              "cached" (plus "vad"
+                              for files transcribed with VAD, "timings"
+                              with the transcriber's profile option, and
+                              "skipped" for files completed by an earlier run)
+    """
+    plan = plan_outputs(audio_files, output_dir, formats)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+        _make_output_dirs(plan)
+
+    def completed(audio_file):
+        """Return True if an earlier run finished the file and wrote its output."""
+        return (
+            transcriber.checkpoint
+            and all(os.path.exists(path) for path in plan[audio_file].values())
+            and transcriber.is_complete(audio_file, fp16=fp16)
+        )
+
+    skipped = {audio_file for audio_file in audio_files if completed(audio_file)}
+
+    prefetcher = None
+    if prefetch > 0:
+        # Files answered from the result cache or skipped need no audio
+        prefetcher = AudioPrefetcher(
+            audio_files,
+            depth=prefetch,
+            skip=lambda path: path in skipped or transcriber.is_cached(path, fp16=fp16),
+            loader=transcriber.open_audio,
+        )
+    decoded = iter(prefetcher) if prefetcher is not None else None
+
+    summary = []
+
+    def finish(entry):
+        summary.append(entry)
+        if on_file_done:
+            on_file_done(entry)
+
+    def new_entry(audio_file):
+        return {
+            "audio_file": audio_file,
+            "output_path": None,
+            "outputs": {},
+            "status": "ok",
+            "seconds": 0.0,
+            "error": None,
+            "cached": False,
+        }
+
+    def skip(entry):
+        entry["skipped"] = True
+        entry["outputs"] = dict(plan[entry["audio_file"]])
+        entry["output_path"] = primary_output(entry["outputs"])
+        if decoded is not None:
+            next(decoded)
+
+    def save(entry, result):
+        if result.get("vad"):
+            entry["vad"] = result["vad"]
+        if result.get("timings"):
+            entry["timings"] = result["timings"]
+        entry["outputs"] = save_result(transcriber, result, plan[entry["audio_file"]])
+        entry["output_path"] = primary_output(entry["outputs"])
+
+    def next_samples():
+        """Return the next file's prefetched audio (None without prefetching)."""
+        if decoded is None:
+            return None
+        _, samples, decode_error = next(decoded)
+        if decode_error is not None:
+            raise decode_error
+        return samples
+
+    if batch_size > 1:
+        for start in range(0, len(audio_files), batch_size):
+            group = []
+            for audio_file in audio_files[start:start + batch_size]:
+                entry = new_entry(audio_file)
+                if audio_file in skipped:
+                    skip(entry)
+                    group.append((entry, None))
+                    continue
+                try:
+                    group.append((entry, next_samples()))
+                except Exception as e:
+                    entry["status"] = "error"
+                    entry["error"] = str(e)
+                    group.append((entry, None))
+            ready = [
+                (entry, samples) for entry, samples in group
+                if entry["status"] == "ok" and not entry.get("skipped")
+            ]
+
+            began = time.perf_counter()
+            results = {}
+            if ready:
+                for entry, _ in ready:
+                    entry["cached"] = transcriber.is_cached(entry["audio_file"], fp16=fp16)
+                try:
+                    batch_results = transcriber.transcribe_batch(
+                        [entry["audio_file"] for entry, _ in ready],
+                        batch_size=batch_size,
+                        fp16=fp16,
+                        samples=[samples for _, samples in ready],
+                    )
+                    results = {id(entry): result for (entry, _), result in zip(ready, batch_results)}
+                except Exception:
+                    # Find the failing file by transcribing the group one by one below
+                    pass
+            seconds = (time.perf_counter() - began) / max(len(ready), 1)
+
+            for entry, samples in group:
+                if entry["status"] == "ok" and not entry.get("skipped"):
+                    began = time.perf_counter()
+                    try:
+                        result = results.get(id(entry))
+                        if result is None:
+                            result = transcriber.transcribe(
+                                entry["audio_file"], fp16=fp16, samples=samples
+                            )
+                        save(entry, result)
+                    except Exception as e:
+                        entry["status"] = "error"
+                        entry["error"] = str(e)
+                    entry["seconds"] = seconds + time.perf_counter() - began
+                finish(entry)
+    else:
+        for audio_file in audio_files:
+            entry = new_entry(audio_file)
+            if audio_file in skipped:
+                skip(entry)
+                finish(entry)
+                continue
+            cache = getattr(transcriber, "cache", None)
+            hits_before = cache.hits if cache is not None else 0
+            start = time.perf_counter()
+            try:
+                samples = next_samples()
+                result = transcriber.transcribe(audio_file, fp16=fp16, samples=samples)
+                entry["cached"] = cache is not None and cache.hits > hits_before
+                save(entry, result)
+            except Exception as e:
+                entry["status"] = "error"
+                entry["error"] = str(e)
+            entry["seconds"] = time.perf_counter() - start
+            finish(entry)
+
+    if prefetcher is not None:
+        prefetcher.close()
+    return summary
+
+
+def run_batch_parallel(
+    pool,
+    audio_files: List[str],
+    output_dir: Optional[str] = None,
+    on_file_done: Optional[Callable[[Dict[str, Any]], None]] = None,
+    formats: Sequence[str] = ("txt",),
+) -> List[Dict[str, Any]]:
+    """Transcribe a list of files across a TranscriptionPool.
+
+    Same contract as run_batch, but each worker process uses its own model.
+    With the pool's checkpoint option, files an earlier run completed (and
+    wrote the output of) are skipped without being sent to a worker.
+
+    Args:
+        pool: The TranscriptionPool to dispatch the files to
+        audio_files (List[str]): Audio files to transcribe
+        output_dir (str, optional): Directory for the outputs
+        on_file_done (callable, optional): Called with each file's summary entry,
+                                           in input order
+        formats (Sequence[str]): Output formats written per file
+
+    Returns:
+        List[Dict[str, Any]]: One summary entry per input file
+    """
+    plan = plan_outputs(audio_files, output_dir, formats)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+        _make_output_dirs(plan)
+
+    def completed(audio_file):
+        """Return True if an earlier run finished the file and wrote its output."""
+        return (
+            pool.checkpoint
+            and all(os.path.exists(path) for path in plan[audio_file].values())
+            and pool.is_complete(audio_file)
+        )
+
+    skipped = {audio_file for audio_file in audio_files if completed(audio_file)}
+    todo = [audio_file for audio_file in audio_files if audio_file not in skipped]
+    if list(formats) == ["txt"]:
+        outputs = [plan[audio_file]["txt"] for audio_file in todo]
+    else:
+        # The workers write every format of their file
+        outputs = [plan[audio_file] for audio_file in todo]
+    results = pool.imap(todo, outputs) if todo else iter(())
+
+    summary = []
+    for audio_file in audio_files:
+        if audio_file in skipped:
+            entry = {
+                "audio_file": audio_file,
+                "output_path": primary_output(plan[audio_file]),
+                "outputs": dict(plan[audio_file]),
+                "status": "ok",
+                "seconds": 0.0,
+                "error": None,
+                "cached": False,
+                "skipped": True,
+            }
+        else:
+            entry = next(results)
+            entry.pop("index", None)
+            entry.pop("result", None)
+        summary.append(entry)
+        if on_file_done:
+            on_file_done(entry)
+
+    return summary
+
+
+def write_summary(summary: List[Dict[str, Any]], path: str, **extra: Any) -> str:
+    """Write a batch summary to a JSON file.
+
+    Args:
+        summary (List[Dict[str, Any]]): Entries returned by run_batch
+        path (str): Destination JSON path
+        **extra: Additional top-level fields (e.g. model name, load time)
+
+    Returns:
+        str: Path where the summary was saved
+    """
+    data = dict(extra)
+    data["total_seconds"] = sum(entry["seconds"] for entry in summary)
+    data["failed"] = sum(1 for entry in summary if entry["status"] != "ok")
+    data["files"] = summary
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    return path
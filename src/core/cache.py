@@ -0,0 +1,277 @@
+"""
+Persistent, content-addressed transcription cache.
+
+Results are stored as JSON files named after a hash of the audio content,
+the model name, the FP16 flag and the decode options, so re-transcribing the
+same audio with the same settings is answered from disk. The cache has a size
+cap and evicts the least recently used entries first.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Default size cap for the cache directory
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# Digests of audio files by (path, size, mtime), so building several cache
+# keys for one file (is_cached, the lookup, the decoded-audio cache) reads it
+# once; a file changed in place gets a new size or mtime and is hashed again
+_FILE_DIGESTS_MAX = 1024
+_file_digests: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+_file_digests_lock = threading.Lock()
+
+
+def default_cache_dir(kind: str = "results") -> str:
+    """Return the default cache directory (honours XDG_CACHE_HOME).
+
+    Args:
+        kind (str): Sub-directory, e.g. "results" or "audio"
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "whisper-transcribe", kind)
+
+
+def hash_audio(audio) -> str:
+    """Return a SHA-256 hex digest of an audio file's bytes or of a sample array.
+
+    Args:
+        audio: Path to an audio file, or a numpy array / torch tensor of samples
+
+    Returns:
+        str: Hex digest identifying the audio content
+    """
+    if isinstance(audio, str):
+        return _hash_file(audio)
+    if hasattr(audio, "numpy"):
+        audio = audio.detach().cpu().numpy()
+    digest = hashlib.sha256()
+    digest.update(f"{audio.dtype}:{audio.shape}:".encode("utf-8"))
+    digest.update(audio.tobytes())
+    return digest.hexdigest()
+
+
+def _hash_file(path: str) -> str:
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    with _file_digests_lock:
+        if key in _file_digests:
+            _file_digests.move_to_end(key)
+            return _file_digests[key]
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    with _file_digests_lock:
+        _file_digests[key] = digest.hexdigest()
+        while len(_file_digests) > _FILE_DIGESTS_MAX:
+            _file_digests.popitem(last=False)
+    return digest.hexdigest()
+
+
+class DiskCache:
+    """Directory of cache entries with a size cap and LRU eviction.
+
+    Entries are files named <key><suffix>; their mtime is the LRU clock.
+    Subclasses define what an entry holds.
+    """
+
+    suffix = ""
+    kind = "results"
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        """Initialize the cache.
+
+        The directory is only created on the first write.
+
+        Args:
+            cache_dir (str, optional): Directory holding the cache entries.
+                                       Defaults to default_cache_dir()
+            max_bytes (int): Size cap; least recently used entries are evicted
+                             once the directory grows beyond it
+        """
+        self.cache_dir = cache_dir or default_cache_dir(self.kind)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + self.suffix)
+
+    def contains(self, key: str) -> bool:
+        """Return True if an entry exists for key, without counting a hit."""
+        return os.path.exists(self._path(key))
+
+    def _touch(self, path: str) -> None:
+        """Mark an entry as recently used."""
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def _write_atomic(self, key: str, write: Callable[[Any], None], mode: str = "w") -> None:
+        """Write an entry through a temp file and rename, then evict.
+
+        Args:
+            key (str): Entry key
+            write (callable): Called with the open temp file
+            mode (str): File mode, "w" for text or "wb" for binary
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Write to a temp file and rename so readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            encoding = None if "b" in mode else "utf-8"
+            with os.fdopen(fd, mode, encoding=encoding) as f:
+                write(f)
+            os.replace(tmp_path, self._path(key))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        self.evict()
+
+    def _entries(self):
+        """Return (mtime, size, path) for every entry, oldest first."""
+        entries = []
+        if not os.path.isdir(self.cache_dir):
+            return entries
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(self.suffix):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return sorted(entries)
+
+    def evict(self) -> int:
+        """Remove least recently used entries until the cache fits its cap.
+
+        Returns:
+            int: Number of entries removed
+        """
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        return removed
+
+    def purge(self) -> int:
+        """Remove every entry from the cache.
+
+        Returns:
+            int: Number of entries removed
+        """
+        removed = 0
+        for _, _, path in self._entries():
+            try:
+                os.unlink(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the current size of the cache."""
+        entries = self._entries()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+            "max_bytes": self.max_bytes,
+            "cache_dir": self.cache_dir,
+        }
+
+
+class TranscriptionCache(DiskCache):
+    """On-disk LRU cache of transcription results."""
+
+    suffix = ".json"
+    kind = "results"
+
+    def make_key(
+        self,
+        audio,
+        model_name: str,
+        fp16: bool,
+        decode_options: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """Build the cache key for a transcription request.
+
+        Args:
+            audio: Path to an audio file or an array of samples
+            model_name (str): Name of the Whisper model
+            fp16 (bool): Whether FP16 inference is requested
+            decode_options (dict, optional): Extra options passed to Whisper
+
+        Returns:
+            str: Hex digest used as the entry name
+        """
+        try:
+            import whisper
+
+            whisper_version = getattr(whisper, "__version__", "")
+        except ImportError:
+            whisper_version = ""
+
+        settings = json.dumps(
+            {
+                "model": model_name,
+                "fp16": bool(fp16),
+                "options": decode_options or {},
+                "whisper": whisper_version,
+            },
+            sort_keys=True,
+            default=str,
+        )
+        digest = hashlib.sha256()
+        digest.update(hash_audio(audio).encode("utf-8"))
+        digest.update(settings.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a cached result and mark it as recently used.
+
+        Args:
+            key (str): Key returned by make_key
+
+        Returns:
+            Dict[str, Any]: The cached result, or None on a miss
+        """
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                result = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self.misses += 1
+            return None
+
+        self._touch(path)
+        self.hits += 1
+        return result
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        """Store a result and evict old entries if the cache is over its cap.
+
+        Args:
+            key (str): Key returned by make_key
+            result (Dict[str, Any]): Transcription result (text, segments, language, ...)
+        """
+        self._write_atomic(
+            key, lambda f: json.dump(result, f, ensure_ascii=False, default=float)
+        )
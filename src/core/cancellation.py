@@ -0,0 +1,58 @@
+"""
+Cooperative cancellation for running transcriptions.
+
+A CancellationToken is shared between the code running a transcription and
+whoever may want to stop it (e.g. the GUI's Cancel button). The transcriber
+checks it between 30-second decode windows, so cancelling never interrupts
+the model mid-inference: the job unwinds cleanly, its buffers are freed and
+the model is immediately ready for the next job. The wait is bounded by the
+time it takes to decode one window.
+"""
+import threading
+import time
+from typing import Optional
+
+
+class TranscriptionCancelled(Exception):
+    """Raised by the transcriber when its cancellation token is set."""
+
+    def __init__(self, latency: Optional[float] = None):
+        """Initialize the exception.
+
+        Args:
+            latency (float, optional): Seconds between the cancel request and
+                                       the transcriber noticing it
+        """
+        message = "Transcription cancelled"
+        if latency is not None:
+            message += f" after {latency:.2f}s"
+        super().__init__(message)
+        self.latency = latency
+
+
+class CancellationToken:
+    """Thread-safe flag requesting that a transcription stop."""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self.requested_at: Optional[float] = None
+
+    def cancel(self) -> None:
+        """Request cancellation. Safe to call from any thread, more than once."""
+        if not self._event.is_set():
+            self.requested_at = time.perf_counter()
+            self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """True once cancel() has been called."""
+        return self._event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        """Raise TranscriptionCancelled if cancellation was requested.
+
+        Raises:
+            TranscriptionCancelled: With the latency since cancel() was called
+        """
+        if self._event.is_set():
+            raise TranscriptionCancelled(time.perf_counter() - self.requested_at)
@@ -0,0 +1,169 @@
+"""
+Resumable transcription checkpoints.
+
+A long transcription only produces its result at the end, so a crash or a
+closed window at 90% would lose everything. With checkpointing on, the
+Transcriber saves the decoder's state (seek position, tokens, segments and
+language) to a sidecar file next to the audio, <audio>.checkpoint.json, as
+windows are decoded. A later run on the same file with the same model and
+options restores that state and continues from the saved seek position.
+
+Once the transcription finishes, the checkpoint is marked complete and holds
+the result, so reruns (e.g. a batch restarted after a crash) skip the file.
+A checkpoint is only used if the file's size and modification time and the
+transcription settings still match; anything else starts over.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import time
+import warnings
+from typing import Any, Dict, Optional
+
+SUFFIX = ".checkpoint.json"
+
+# Seconds between checkpoint writes while decoding; interrupted runs (cancel,
+# error) are always saved, a killed process loses at most this much work
+DEFAULT_INTERVAL = 10.0
+
+
+def checkpoint_path(audio_file: str) -> str:
+    """Return the sidecar checkpoint path of an audio file."""
+    return audio_file + SUFFIX
+
+
+def remove_checkpoint(audio_file: str) -> None:
+    """Delete the checkpoint of an audio file, if it has one."""
+    try:
+        os.remove(checkpoint_path(audio_file))
+    except FileNotFoundError:
+        pass
+
+
+def checkpoint_key(
+    audio_file: str, model_name: str, fp16: bool, decode_options: Optional[Dict[str, Any]] = None
+) -> str:
+    """Identify an audio file and the settings it is transcribed with.
+
+    The file is identified by its size and modification time rather than a
+    hash of its content, which would mean reading hours of audio twice.
+
+    Args:
+        audio_file (str): Path to the audio file
+        model_name (str): Name of the Whisper model
+        fp16 (bool): Whether FP16 inference is used
+        decode_options (dict, optional): Options that change the result
+
+    Returns:
+        str: Hex digest stored in the checkpoint
+    """
+    try:
+        import whisper
+
+        whisper_version = getattr(whisper, "__version__", "")
+    except ImportError:
+        whisper_version = ""
+
+    stat = os.stat(audio_file)
+    settings = json.dumps(
+        {
+            "size": stat.st_size,
+            "mtime": stat.st_mtime_ns,
+            "model": model_name,
+            "fp16": bool(fp16),
+            "options": decode_options or {},
+            "whisper": whisper_version,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(settings.encode("utf-8")).hexdigest()
+
+
+class TranscriptionCheckpoint:
+    """Sidecar file holding the decoding state of one transcription."""
+
+    def __init__(self, path: str, key: str, interval: float = DEFAULT_INTERVAL):
+        """Initialize the checkpoint; nothing is read or written yet.
+
+        Args:
+            path (str): Path of the checkpoint file
+            key (str): checkpoint_key() of the transcription
+            interval (float): Minimum seconds between two save() calls that
+                              actually write
+        """
+        self.path = path
+        self.key = key
+        self.interval = interval
+        self.saved_at = 0.0
+        # Turned off after a failed write, e.g. in a read-only directory
+        self.enabled = True
+
+    def read(self) -> Optional[Dict[str, Any]]:
+        """Return the checkpoint's contents if it belongs to this transcription."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get("key") != self.key:
+            return None
+        return data
+
+    def state(self) -> Optional[Dict[str, Any]]:
+        """Return the saved decoder state of an unfinished transcription, or None."""
+        data = self.read()
+        if data is None or data.get("complete"):
+            return None
+        return data.get("state")
+
+    def result(self) -> Optional[Dict[str, Any]]:
+        """Return the result of a completed transcription, or None."""
+        data = self.read()
+        if data is None or not data.get("complete"):
+            return None
+        return data.get("result")
+
+    def save(self, state: Dict[str, Any], force: bool = False) -> bool:
+        """Write the decoder state, at most once per interval unless forced.
+
+        Returns:
+            bool: True if the state was written
+        """
+        if not force and time.monotonic() - self.saved_at < self.interval:
+            return False
+        written = self._write({"key": self.key, "complete": False, "state": state})
+        if written:
+            self.saved_at = time.monotonic()
+        return written
+
+    def complete(self, result: Dict[str, Any]) -> bool:
+        """Mark the transcription complete, keeping its result for reruns."""
+        return self._write({"key": self.key, "complete": True, "result": result})
+
+    def remove(self) -> None:
+        """Delete the checkpoint file."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def _write(self, data: Dict[str, Any]) -> bool:
+        if not self.enabled:
+            return False
+        directory = os.path.dirname(os.path.abspath(self.path))
+        tmp_path = None
+        try:
+            # Write to a temp file and rename so a crash never leaves half a checkpoint
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, default=float)
+            os.replace(tmp_path, self.path)
+            return True
+        except OSError as e:
+            warnings.warn(f"Checkpointing disabled, cannot write {self.path}: {e}")
+            self.enabled = False
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            return False
@@ -0,0 +1,215 @@
+"""
+Long-audio chunking.
+
+Splits long recordings into chunks at silence boundaries so the chunks can be
+transcribed concurrently, then stitches the per-chunk results back into a
+single result dict with timestamps on the original timeline.
+"""
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from .audio import load_audio
+
+SAMPLE_RATE = 16000
+HOP_LENGTH = 160  # samples per mel frame, matches whisper.audio.HOP_LENGTH
+
+# Energy analysis resolution used when looking for a quiet place to cut
+FRAME_SECONDS = 0.02
+SMOOTH_SECONDS = 0.3
+
+
+def load_pcm(audio, cache=None) -> np.ndarray:
+    """Return 16 kHz mono float32 samples for a path or an existing array.
+
+    Args:
+        audio: Path to an audio file, or samples
+        cache (DecodedAudioCache, optional): Cache of previously decoded files
+    """
+    if isinstance(audio, str):
+        return load_audio(audio, cache)
+    return np.asarray(audio, dtype=np.float32)
+
+
+def _frame_energy(audio: np.ndarray) -> np.ndarray:
+    """Smoothed per-frame RMS energy in dB."""
+    frame = int(FRAME_SECONDS * SAMPLE_RATE)
+    count = len(audio) // frame
+    if count == 0:
+        return np.zeros(0, dtype=np.float32)
+    frames = audio[: count * frame].reshape(count, frame)
+    rms = np.sqrt(np.mean(frames.astype(np.float64) ** 2, axis=1) + 1e-12)
+    energy = 20 * np.log10(rms)
+    width = max(1, int(SMOOTH_SECONDS / FRAME_SECONDS))
+    return np.convolve(energy, np.ones(width) / width, mode="same")
+
+
+def find_split_points(
+    audio: np.ndarray, chunk_seconds: float = 600.0, search_seconds: float = 30.0
+) -> List[int]:
+    """Pick chunk boundaries in the quietest spot near each nominal cut.
+
+    Each nominal boundary (every chunk_seconds) is moved to the frame with the
+    lowest smoothed energy within +/- search_seconds, i.e. into a pause
+    between words, so no word is split across two chunks.
+
+    Args:
+        audio (np.ndarray): 16 kHz mono samples
+        chunk_seconds (float): Target chunk length
+        search_seconds (float): How far a boundary may move to find silence
+
+    Returns:
+        List[int]: Sample offsets of the interior boundaries, ascending
+    """
+    total = len(audio)
+    chunk = int(chunk_seconds * SAMPLE_RATE)
+    search = int(min(search_seconds, chunk_seconds / 4) * SAMPLE_RATE)
+    if total <= chunk + chunk // 2:
+        return []
+
+    energy = _frame_energy(audio)
+    frame = int(FRAME_SECONDS * SAMPLE_RATE)
+
+    points = []
+    previous = 0
+    nominal = chunk
+    while nominal < total - chunk // 2:
+        lo = max(previous + chunk // 2, nominal - search) // frame
+        hi = min(total - chunk // 4, nominal + search) // frame
+        if hi > lo:
+            split = (lo + int(np.argmin(energy[lo:hi]))) * frame + frame // 2
+        else:
+            split = nominal
+        points.append(split)
+        previous = split
+        nominal = split + chunk
+    return points
+
+
+def split_audio(
+    audio: np.ndarray, chunk_seconds: float = 600.0, search_seconds: float = 30.0
+) -> List[Tuple[int, int]]:
+    """Split samples into (start, end) sample ranges cut at silence.
+
+    Args:
+        audio (np.ndarray): 16 kHz mono samples
+        chunk_seconds (float): Target chunk length
+        search_seconds (float): How far a boundary may move to find silence
+
+    Returns:
+        List[Tuple[int, int]]: Contiguous, non-overlapping ranges covering the audio
+    """
+    bounds = [0] + find_split_points(audio, chunk_seconds, search_seconds) + [len(audio)]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _join_text(parts: Sequence[str]) -> str:
+    """Concatenate chunk texts, adding a space only where a seam has none."""
+    text = ""
+    for part in parts:
+        if text and part and not text[-1].isspace() and not part[0].isspace():
+            text += " "
+        text += part
+    return text
+
+
+def stitch_results(
+    results: Sequence[Dict[str, Any]], ranges: Sequence[Tuple[int, int]]
+) -> Dict[str, Any]:
+    """Merge per-chunk results into one result on the original timeline.
+
+    Segment times (and word times, if present) are shifted by each chunk's
+    offset and clamped to the chunk so nothing can overlap the next chunk;
+    ids and seek positions are renumbered so the result has the same shape as
+    a single Whisper transcribe call.
+
+    Args:
+        results (Sequence[Dict[str, Any]]): One Whisper result per chunk
+        ranges (Sequence[Tuple[int, int]]): Sample range of each chunk
+
+    Returns:
+        Dict[str, Any]: Combined result with "text", "segments" and "language"
+                        (and "vad" if the chunks were transcribed with VAD)
+    """
+    segments = []
+    texts = []
+    languages = []
+    for result, (start, end) in zip(results, ranges):
+        offset = start / SAMPLE_RATE
+        limit = end / SAMPLE_RATE
+        seek_offset = start // HOP_LENGTH
+        languages.append(result.get("language"))
+
+        chunk_texts = []
+        for segment in result.get("segments", []):
+            if not segment.get("text", "").strip():
+                continue
+            shifted = dict(segment)
+            shifted["start"] = min(segment["start"] + offset, limit)
+            shifted["end"] = min(segment["end"] + offset, limit)
+            shifted["seek"] = segment.get("seek", 0) + seek_offset
+            if segment.get("words"):
+                shifted["words"] = [
+                    {**word, "start": min(word["start"] + offset, limit),
+                     "end": min(word["end"] + offset, limit)}
+                    for word in segment["words"]
+                ]
+            shifted["id"] = len(segments)
+            segments.append(shifted)
+            chunk_texts.append(segment["text"])
+
+        # Prefer the chunk's own text; fall back to its segments if it has none
+        texts.append(result.get("text") or "".join(chunk_texts))
+
+    detected = [language for language in languages if language]
+    language = max(set(detected), key=detected.count) if detected else None
+    stitched = {"text": _join_text(texts), "segments": segments, "language": language}
+
+    # Chunks transcribed with VAD each report their skipped audio; add them up
+    reports = [result["vad"] for result in results if result.get("vad")]
+    if reports:
+        stitched["vad"] = {
+            key: round(sum(report[key] for report in reports), 3)
+            for key in ("duration", "speech", "skipped", "regions")
+        }
+    return stitched
+
+
+def transcribe_chunked(
+    audio,
+    engine,
+    chunk_seconds: float = 600.0,
+    search_seconds: float = 30.0,
+    fp16: bool = True,
+) -> Dict[str, Any]:
+    """Transcribe long audio chunk by chunk and stitch the results.
+
+    Args:
+        audio: Path to an audio file or 16 kHz mono float32 samples
+        engine: A TranscriptionPool (chunks are decoded concurrently, one per
+                worker) or a Transcriber (chunks are decoded in sequence)
+        chunk_seconds (float): Target chunk length
+        search_seconds (float): How far a boundary may move to find silence
+        fp16 (bool): Whether to use FP16 (Transcriber engine only; a pool
+                     uses the setting it was created with)
+
+    Returns:
+        Dict[str, Any]: Combined result with "text", "segments" and "language"
+
+    Raises:
+        RuntimeError: If any chunk fails to transcribe
+    """
+    samples = load_pcm(audio, getattr(engine, "audio_cache", None))
+    ranges = split_audio(samples, chunk_seconds, search_seconds)
+    chunks = [samples[start:end] for start, end in ranges]
+
+    if hasattr(engine, "imap"):
+        results = []
+        for entry in engine.imap(chunks):
+            if entry["status"] != "ok":
+                raise RuntimeError(f"Chunk {entry['index']} failed: {entry['error']}")
+            results.append(entry["result"])
+    else:
+        results = [engine.transcribe(chunk, fp16=fp16) for chunk in chunks]
+
+    return stitch_results(results, ranges)
@@ -0,0 +1,680 @@
+"""
+Window-by-window Whisper decoding.
+
+WindowDecoder runs the same seek loop as whisper.transcribe, but as a
+generator: each 30-second window's segments are yielded as soon as the window
+is decoded instead of after the whole file. Given the same options it produces
+the same segments, text and language as whisper.transcribe.
+"""
+import warnings
+from collections import defaultdict
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import torch
+from whisper.audio import (
+    FRAMES_PER_SECOND,
+    HOP_LENGTH,
+    N_FRAMES,
+    N_SAMPLES,
+    SAMPLE_RATE,
+    log_mel_spectrogram,
+    pad_or_trim,
+)
+from whisper.decoding import DecodingOptions, DecodingResult
+from whisper.timing import add_word_timestamps
+from whisper.tokenizer import get_tokenizer
+from whisper.utils import exact_div, get_end
+
+from .profiling import WINDOW, Profiler, span
+from .streaming import PcmFile, StreamingMel, open_streaming
+from .vad import SpeechSource
+
+PUNCTUATION = "\"'“¿([{-\"'.。,，!！?？:：”)]}、"
+
+
+def _word_anomaly_score(word: dict) -> float:
+    """Score very long/short/improbable words (used for hallucination skipping)."""
+    probability = word.get("probability", 0.0)
+    duration = word["end"] - word["start"]
+    score = 0.0
+    if probability < 0.15:
+        score += 1.0
+    if duration < 0.133:
+        score += (0.133 - duration) * 15
+    if duration > 2.0:
+        score += duration - 2.0
+    return score
+
+
+def _is_segment_anomaly(segment: Optional[dict]) -> bool:
+    if segment is None or not segment["words"]:
+        return False
+    words = [w for w in segment["words"] if w["word"] not in PUNCTUATION]
+    words = words[:8]
+    score = sum(_word_anomaly_score(w) for w in words)
+    return score >= 3 or score + 0.01 >= len(words)
+
+
+def _next_words_segment(segments: List[dict]) -> Optional[dict]:
+    return next((s for s in segments if s["words"]), None)
+
+
+class Window(NamedTuple):
+    """A 30-second window prepared for decoding by WindowDecoder.next_window()."""
+
+    seek: int          # first mel frame of the window
+    size: int          # frames of real audio in it (the rest is padding)
+    mel: torch.Tensor  # (n_mels, N_FRAMES) features on the model's device
+
+
+class WindowDecoder:
+    """Incremental version of whisper.transcribe's decoding loop."""
+
+    def __init__(
+        self,
+        model,
+        audio: Union[str, np.ndarray, torch.Tensor],
+        *,
+        temperature: Union[float, Tuple[float, ...]] = (0.0, 0.2, 0.4, 0.6, 0.8, 1.0),
+        compression_ratio_threshold: Optional[float] = 2.4,
+        logprob_threshold: Optional[float] = -1.0,
+        no_speech_threshold: Optional[float] = 0.6,
+        condition_on_previous_text: bool = True,
+        initial_prompt: Optional[str] = None,
+        carry_initial_prompt: bool = False,
+        word_timestamps: bool = False,
+        prepend_punctuations: str = "\"'“¿([{-",
+        append_punctuations: str = "\"'.。,，!！?？:：”)]}、",
+        clip_timestamps: Union[str, List[float]] = "0",
+        hallucination_silence_threshold: Optional[float] = None,
+        stream_mel: bool = False,
+        profiler: Optional[Profiler] = None,
+        **decode_options,
+    ):
+        """Prepare the mel spectrogram, language and tokenizer for decoding.
+
+        Args:
+            model: The loaded Whisper model
+            audio: Path to an audio file, 16 kHz mono samples, or a PcmFile
+                   or SpeechSource reading them from disk
+            stream_mel (bool): Compute mel features window by window instead
+                               of for the whole file up front, so memory does
+                               not grow with the audio's duration. Always on
+                               when reading from disk
+            profiler (Profiler, optional): Records the time spent computing
+                                           features, in the encoder and in
+                                           the decoder, per window
+            **decode_options: Same keyword arguments as whisper.transcribe
+                              (fp16, language, task, beam_size, ...)
+        """
+        self.model = model
+        self.profiler = profiler
+        # Windows decoded again at a higher temperature so far
+        self.fallbacks = 0
+        self.temperature = temperature
+        self.compression_ratio_threshold = compression_ratio_threshold
+        self.logprob_threshold = logprob_threshold
+        self.no_speech_threshold = no_speech_threshold
+        self.condition_on_previous_text = condition_on_previous_text
+        self.carry_initial_prompt = carry_initial_prompt
+        self.word_timestamps = word_timestamps
+        self.prepend_punctuations = prepend_punctuations
+        self.append_punctuations = append_punctuations
+        self.hallucination_silence_threshold = hallucination_silence_threshold
+
+        self.dtype = torch.float16 if decode_options.get("fp16", True) else torch.float32
+        if model.device == torch.device("cpu"):
+            if torch.cuda.is_available():
+                warnings.warn("Performing inference on CPU when CUDA is available")
+            if self.dtype == torch.float16:
+                warnings.warn("FP16 is not supported on CPU; using FP32 instead")
+                self.dtype = torch.float32
+        if self.dtype == torch.float32:
+            decode_options["fp16"] = False
+
+        # Pad 30-seconds of silence to the input audio, for slicing
+        if stream_mel or isinstance(audio, (PcmFile, SpeechSource)):
+            if isinstance(audio, str):
+                audio = open_streaming(audio)
+            self.mel = StreamingMel(audio, model.dims.n_mels)
+        else:
+            with span(profiler, "mel"):
+                self.mel = log_mel_spectrogram(audio, model.dims.n_mels, padding=N_SAMPLES)
+        self.content_frames = self.mel.shape[-1] - N_FRAMES
+        self.duration = float(self.content_frames * HOP_LENGTH / SAMPLE_RATE)
+
+        if decode_options.get("language", None) is None:
+            if not model.is_multilingual:
+                decode_options["language"] = "en"
+            else:
+                with span(profiler, "language_detection"):
+                    mel_segment = pad_or_trim(self.mel[:, :N_FRAMES], N_FRAMES)
+                    mel_segment = mel_segment.to(model.device).to(self.dtype)
+                    _, probs = model.detect_language(mel_segment)
+                decode_options["language"] = max(probs, key=probs.get)
+
+        self.language: str = decode_options["language"]
+        self.task: str = decode_options.get("task", "transcribe")
+        self.decode_options = decode_options
+        self.tokenizer = get_tokenizer(
+            model.is_multilingual,
+            num_languages=model.num_languages,
+            language=self.language,
+            task=self.task,
+        )
+
+        if word_timestamps and self.task == "translate":
+            warnings.warn("Word-level timestamps on translations may not be reliable.")
+
+        if isinstance(clip_timestamps, str):
+            clip_timestamps = [
+                float(ts) for ts in (clip_timestamps.split(",") if clip_timestamps else [])
+            ]
+        seek_points: List[int] = [round(ts * FRAMES_PER_SECOND) for ts in clip_timestamps]
+        if len(seek_points) == 0:
+            seek_points.append(0)
+        if len(seek_points) % 2 == 1:
+            seek_points.append(self.content_frames)
+        self.seek_clips: List[Tuple[int, int]] = list(zip(seek_points[::2], seek_points[1::2]))
+
+        # mel frames per output token: 2
+        self.input_stride = exact_div(N_FRAMES, model.dims.n_audio_ctx)
+        # time per output token: 0.02 (seconds)
+        self.time_precision = self.input_stride * HOP_LENGTH / SAMPLE_RATE
+
+        # Decoding state; everything needed to continue from the current seek
+        self.clip_idx = 0
+        self.seek = self.seek_clips[0][0]
+        self.all_tokens: List[int] = []
+        self.all_segments: List[dict] = []
+        self.prompt_reset_since = 0
+        self.last_speech_timestamp = 0.0
+
+        self.remaining_prompt_length = model.dims.n_text_ctx // 2 - 1
+        if initial_prompt is not None:
+            self.initial_prompt_tokens = self.tokenizer.encode(" " + initial_prompt.strip())
+            self.all_tokens.extend(self.initial_prompt_tokens)
+            self.remaining_prompt_length -= len(self.initial_prompt_tokens)
+        else:
+            self.initial_prompt_tokens = []
+
+    @property
+    def position(self) -> float:
+        """Seconds of audio decoded so far."""
+        return min(self.seek, self.content_frames) * HOP_LENGTH / SAMPLE_RATE
+
+    @property
+    def finished(self) -> bool:
+        """True once every clip has been decoded."""
+        return self.clip_idx >= len(self.seek_clips)
+
+    @property
+    def temperatures(self) -> List[float]:
+        """Temperatures tried in turn until a window decodes acceptably."""
+        if isinstance(self.temperature, (int, float)):
+            return [self.temperature]
+        return list(self.temperature)
+
+    def decoding_options(self, temperature: float) -> DecodingOptions:
+        """Return the DecodingOptions for the current window at a temperature."""
+        kwargs = {**self.decode_options}
+        if temperature > 0:
+            # disable beam_size and patience when t > 0
+            kwargs.pop("beam_size", None)
+            kwargs.pop("patience", None)
+        else:
+            # disable best_of when t == 0
+            kwargs.pop("best_of", None)
+        return DecodingOptions(**kwargs, temperature=temperature)
+
+    def needs_fallback(self, decode_result: DecodingResult) -> bool:
+        """Return True if a window's result should be retried at a higher temperature."""
+        needs_fallback = False
+        if (
+            self.compression_ratio_threshold is not None
+            and decode_result.compression_ratio > self.compression_ratio_threshold
+        ):
+            needs_fallback = True  # too repetitive
+        if (
+            self.logprob_threshold is not None
+            and decode_result.avg_logprob < self.logprob_threshold
+        ):
+            needs_fallback = True  # average log probability is too low
+        if (
+            self.no_speech_threshold is not None
+            and decode_result.no_speech_prob > self.no_speech_threshold
+            and self.logprob_threshold is not None
+            and decode_result.avg_logprob < self.logprob_threshold
+        ):
+            needs_fallback = False  # silence
+        return needs_fallback
+
+    def decode_with_fallback(
+        self, segment: torch.Tensor, temperatures: Optional[List[float]] = None
+    ) -> DecodingResult:
+        """Decode one window, retrying at higher temperatures on failure.
+
+        The window goes through the encoder once; retries only rerun the
+        decoder on the same audio features.
+
+        Args:
+            segment (torch.Tensor): The window's mel features
+            temperatures (List[float], optional): Temperatures to try.
+                                                  Defaults to self.temperatures
+        """
+        with span(self.profiler, "encoder"), torch.no_grad():
+            # model.decode() skips the encoder when given its output
+            audio_features = self.model.embed_audio(segment.unsqueeze(0))[0]
+
+        decode_result = None
+        for i, t in enumerate(temperatures if temperatures is not None else self.temperatures):
+            if i:
+                self.fallbacks += 1
+                if self.profiler is not None:
+                    self.profiler.count_fallback()
+            with span(self.profiler, "decoder", temperature=t):
+                decode_result = self.model.decode(audio_features, self.decoding_options(t))
+            if not self.needs_fallback(decode_result):
+                break
+
+        return decode_result
+
+    def _new_segment(
+        self, *, start: float, end: float, tokens: torch.Tensor, result: DecodingResult
+    ) -> dict:
+        tokens = tokens.tolist()
+        text_tokens = [token for token in tokens if token < self.tokenizer.eot]
+        return {
+            "seek": self.seek,
+            "start": start,
+            "end": end,
+            "text": self.tokenizer.decode(text_tokens),
+            "tokens": tokens,
+            "temperature": result.temperature,
+            "avg_logprob": result.avg_logprob,
+            "compression_ratio": result.compression_ratio,
+            "no_speech_prob": result.no_speech_prob,
+        }
+
+    def windows(self) -> Iterator[List[dict]]:
+        """Decode window by window.
+
+        Yields:
+            List[dict]: The segments completed by each decoded window (empty
+                        for windows skipped as silence). After every yield,
+                        self.seek is the frame position decoding resumes from.
+        """
+        while True:
+            window = self.next_window()
+            if window is None:
+                return
+            with span(self.profiler, WINDOW) as details:
+                fallbacks = self.fallbacks
+                result = self.decode_with_fallback(window.mel)
+                segments = self.finish_window(window, result)
+                details.update(
+                    start=round(window.seek * HOP_LENGTH / SAMPLE_RATE, 3),
+                    temperature=result.temperature,
+                    fallbacks=self.fallbacks - fallbacks,
+                )
+            yield segments
+
+    def next_window(self) -> Optional[Window]:
+        """Prepare the next window to decode, or return None once finished.
+
+        Sets the window's prompt in decode_options. The window must be passed
+        to finish_window() with its DecodingResult before asking for the next.
+        """
+        while self.clip_idx < len(self.seek_clips):
+            seek_clip_start, seek_clip_end = self.seek_clips[self.clip_idx]
+            if self.seek < seek_clip_start:
+                self.seek = seek_clip_start
+            if self.seek >= seek_clip_end:
+                self.clip_idx += 1
+                if self.clip_idx < len(self.seek_clips):
+                    self.seek = self.seek_clips[self.clip_idx][0]
+                continue
+
+            seek = self.seek
+            segment_size = min(N_FRAMES, self.content_frames - seek, seek_clip_end - seek)
+            # Streamed features are computed here, window by window
+            with span(self.profiler, "mel"):
+                mel_segment = self.mel[:, seek : seek + segment_size]
+                mel_segment = pad_or_trim(mel_segment, N_FRAMES).to(self.model.device).to(self.dtype)
+
+            if self.carry_initial_prompt:
+                nignored = max(len(self.initial_prompt_tokens), self.prompt_reset_since)
+                remaining_prompt = self.all_tokens[nignored:][-self.remaining_prompt_length:]
+                self.decode_options["prompt"] = self.initial_prompt_tokens + remaining_prompt
+            else:
+                self.decode_options["prompt"] = self.all_tokens[self.prompt_reset_since:]
+            return Window(seek, segment_size, mel_segment)
+        return None
+
+    def finish_window(self, window: Window, result: DecodingResult) -> List[dict]:
+        """Turn a decoded window into segments and advance the seek.
+
+        Args:
+            window (Window): The window returned by next_window()
+            result (DecodingResult): Its decoding result
+
+        Returns:
+            List[dict]: The segments completed by the window, as yielded by
+                        windows()
+        """
+        tokenizer = self.tokenizer
+        seek, segment_size, mel_segment = window
+        time_offset = float(seek * HOP_LENGTH / SAMPLE_RATE)
+        window_end_time = float((seek + N_FRAMES) * HOP_LENGTH / SAMPLE_RATE)
+        segment_duration = segment_size * HOP_LENGTH / SAMPLE_RATE
+        tokens = torch.tensor(result.tokens)
+
+        if self.no_speech_threshold is not None:
+            # no voice activity check
+            should_skip = result.no_speech_prob > self.no_speech_threshold
+            if (
+                self.logprob_threshold is not None
+                and result.avg_logprob > self.logprob_threshold
+            ):
+                # don't skip if the logprob is high enough, despite the no_speech_prob
+                should_skip = False
+
+            if should_skip:
+                # fast-forward to the next segment boundary
+                self.seek = seek + segment_size
+                return []
+
+        previous_seek = seek
+        current_segments = []
+
+        timestamp_tokens: torch.Tensor = tokens.ge(tokenizer.timestamp_begin)
+        single_timestamp_ending = timestamp_tokens[-2:].tolist() == [False, True]
+
+        consecutive = torch.where(timestamp_tokens[:-1] & timestamp_tokens[1:])[0]
+        consecutive.add_(1)
+        if len(consecutive) > 0:
+            # if the output contains two consecutive timestamp tokens
+            slices = consecutive.tolist()
+            if single_timestamp_ending:
+                slices.append(len(tokens))
+
+            last_slice = 0
+            for current_slice in slices:
+                sliced_tokens = tokens[last_slice:current_slice]
+                start_timestamp_pos = sliced_tokens[0].item() - tokenizer.timestamp_begin
+                end_timestamp_pos = sliced_tokens[-1].item() - tokenizer.timestamp_begin
+                current_segments.append(
+                    self._new_segment(
+                        start=time_offset + start_timestamp_pos * self.time_precision,
+                        end=time_offset + end_timestamp_pos * self.time_precision,
+                        tokens=sliced_tokens,
+                        result=result,
+                    )
+                )
+                last_slice = current_slice
+
+            if single_timestamp_ending:
+                # single timestamp at the end means no speech after the last timestamp.
+                seek += segment_size
+            else:
+                # otherwise, ignore the unfinished segment and seek to the last timestamp
+                last_timestamp_pos = (
+                    tokens[last_slice - 1].item() - tokenizer.timestamp_begin
+                )
+                seek += last_timestamp_pos * self.input_stride
+        else:
+            duration = segment_duration
+            timestamps = tokens[timestamp_tokens.nonzero().flatten()]
+            if len(timestamps) > 0 and timestamps[-1].item() != tokenizer.timestamp_begin:
+                # no consecutive timestamps but it has a timestamp; use the last one.
+                last_timestamp_pos = timestamps[-1].item() - tokenizer.timestamp_begin
+                duration = last_timestamp_pos * self.time_precision
+
+            current_segments.append(
+                self._new_segment(
+                    start=time_offset,
+                    end=time_offset + duration,
+                    tokens=tokens,
+                    result=result,
+                )
+            )
+            seek += segment_size
+
+        if self.word_timestamps:
+            with span(self.profiler, "word_timestamps"):
+                seek, restart = self._apply_word_timestamps(
+                    current_segments,
+                    mel_segment,
+                    seek=seek,
+                    previous_seek=previous_seek,
+                    segment_size=segment_size,
+                    time_offset=time_offset,
+                    window_end_time=window_end_time,
+                    segment_duration=segment_duration,
+                    single_timestamp_ending=single_timestamp_ending,
+                )
+            if restart:
+                self.seek = seek
+                return []
+
+        # if a segment is instantaneous or does not contain text, clear it
+        for segment in current_segments:
+            if segment["start"] == segment["end"] or segment["text"].strip() == "":
+                segment["text"] = ""
+                segment["tokens"] = []
+                segment["words"] = []
+
+        new_segments = [
+            {"id": i, **segment}
+            for i, segment in enumerate(current_segments, start=len(self.all_segments))
+        ]
+        self.all_segments.extend(new_segments)
+        self.all_tokens.extend(
+            [token for segment in current_segments for token in segment["tokens"]]
+        )
+
+        if not self.condition_on_previous_text or result.temperature > 0.5:
+            # do not feed the prompt tokens if a high temperature was used
+            self.prompt_reset_since = len(self.all_tokens)
+
+        self.seek = seek
+        return new_segments
+
+    def _apply_word_timestamps(
+        self,
+        current_segments: List[dict],
+        mel_segment: torch.Tensor,
+        *,
+        seek: int,
+        previous_seek: int,
+        segment_size: int,
+        time_offset: float,
+        window_end_time: float,
+        segment_duration: float,
+        single_timestamp_ending: bool,
+    ) -> Tuple[int, bool]:
+        """Add word timestamps and apply hallucination skipping.
+
+        Returns:
+            Tuple[int, bool]: The new seek, and whether the window should be
+                              discarded and decoding restarted from that seek
+        """
+        add_word_timestamps(
+            segments=current_segments,
+            model=self.model,
+            tokenizer=self.tokenizer,
+            mel=mel_segment,
+            num_frames=segment_size,
+            prepend_punctuations=self.prepend_punctuations,
+            append_punctuations=self.append_punctuations,
+            last_speech_timestamp=self.last_speech_timestamp,
+        )
+
+        if not single_timestamp_ending:
+            last_word_end = get_end(current_segments)
+            if last_word_end is not None and last_word_end > time_offset:
+                seek = round(last_word_end * FRAMES_PER_SECOND)
+
+        # skip silence before possible hallucinations
+        threshold = self.hallucination_silence_threshold
+        if threshold is not None:
+            if not single_timestamp_ending:
+                last_word_end = get_end(current_segments)
+                if last_word_end is not None and last_word_end > time_offset:
+                    remaining_duration = window_end_time - last_word_end
+                    if remaining_duration > threshold:
+                        seek = round(last_word_end * FRAMES_PER_SECOND)
+                    else:
+                        seek = previous_seek + segment_size
+
+            # if first segment might be a hallucination, skip leading silence
+            first_segment = _next_words_segment(current_segments)
+            if first_segment is not None and _is_segment_anomaly(first_segment):
+                gap = first_segment["start"] - time_offset
+                if gap > threshold:
+                    return previous_seek + round(gap * FRAMES_PER_SECOND), True
+
+            # skip silence before any possible hallucination that is surrounded
+            # by silence or more hallucinations
+            hal_last_end = self.last_speech_timestamp
+            for si in range(len(current_segments)):
+                segment = current_segments[si]
+                if not segment["words"]:
+                    continue
+                if _is_segment_anomaly(segment):
+                    next_segment = _next_words_segment(current_segments[si + 1 :])
+                    if next_segment is not None:
+                        hal_next_start = next_segment["words"][0]["start"]
+                    else:
+                        hal_next_start = time_offset + segment_duration
+                    silence_before = (
+                        segment["start"] - hal_last_end > threshold
+                        or segment["start"] < threshold
+                        or segment["start"] - time_offset < 2.0
+                    )
+                    silence_after = (
+                        hal_next_start - segment["end"] > threshold
+                        or _is_segment_anomaly(next_segment)
+                        or window_end_time - segment["end"] < 2.0
+                    )
+                    if silence_before and silence_after:
+                        seek = round(max(time_offset + 1, segment["start"]) * FRAMES_PER_SECOND)
+                        if self.duration - segment["end"] < threshold:
+                            seek = self.content_frames
+                        current_segments[si:] = []
+                        break
+                hal_last_end = segment["end"]
+
+        last_word_end = get_end(current_segments)
+        if last_word_end is not None:
+            self.last_speech_timestamp = last_word_end
+        return seek, False
+
+    def state(self) -> Dict[str, Any]:
+        """Return the decoding state needed to continue from the current seek.
+
+        The state is JSON-serializable; restore() it on a decoder for the same
+        audio and options (with language set to the saved one) to pick up
+        where this one stopped.
+        """
+        return {
+            "clip_idx": self.clip_idx,
+            "seek": self.seek,
+            "language": self.language,
+            "all_tokens": list(self.all_tokens),
+            "all_segments": list(self.all_segments),
+            "prompt_reset_since": self.prompt_reset_since,
+            "last_speech_timestamp": self.last_speech_timestamp,
+        }
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        """Continue decoding from a state returned by state()."""
+        self.clip_idx = state["clip_idx"]
+        self.seek = state["seek"]
+        self.all_tokens = list(state["all_tokens"])
+        self.all_segments = list(state["all_segments"])
+        self.prompt_reset_since = state["prompt_reset_since"]
+        self.last_speech_timestamp = state["last_speech_timestamp"]
+
+    def release(self) -> None:
+        """Drop the mel spectrogram (closing a streamed source) to free its memory.
+
+        The decoder cannot produce further windows afterwards; result() still
+        returns what was decoded so far.
+        """
+        if isinstance(self.mel, StreamingMel):
+            self.mel.close()
+        self.mel = None
+
+    def result(self) -> Dict[str, Any]:
+        """Return the transcription so far in whisper.transcribe's result format."""
+        return dict(
+            text=self.tokenizer.decode(self.all_tokens[len(self.initial_prompt_tokens):]),
+            segments=self.all_segments,
+            language=self.language,
+        )
+
+
+def detect_languages(model, audios: Sequence[np.ndarray], fp16: bool = True) -> List[str]:
+    """Detect the language of several clips with one batched encoder pass.
+
+    Each clip's language is detected from its first 30 seconds, like
+    WindowDecoder does for a single file.
+
+    Args:
+        model: The loaded Whisper model
+        audios (Sequence[np.ndarray]): 16 kHz mono samples of each clip
+        fp16 (bool): Whether to run the encoder in FP16
+
+    Returns:
+        List[str]: One language code per clip
+    """
+    if not model.is_multilingual:
+        return ["en"] * len(audios)
+    dtype = torch.float16 if fp16 and model.device != torch.device("cpu") else torch.float32
+    mel = torch.stack([
+        log_mel_spectrogram(pad_or_trim(np.asarray(audio[:N_SAMPLES])), model.dims.n_mels)
+        for audio in audios
+    ])
+    _, probs = model.detect_language(mel.to(model.device).to(dtype))
+    return [max(p, key=p.get) for p in probs]
+
+
+def decode_batched(decoders: Sequence[WindowDecoder], batch_size: int = 8) -> None:
+    """Run several WindowDecoders to completion, decoding their windows in batches.
+
+    The decoders advance in lockstep: every round takes the next window of
+    each unfinished decoder, and windows that share decoding options (task,
+    language and prompt, e.g. the first window of every clip) go through the
+    encoder and decoder together, batch_size at a time. A window whose result
+    fails Whisper's quality checks is retried on its own at the remaining
+    temperatures, as in the single-file loop.
+
+    Args:
+        decoders (Sequence[WindowDecoder]): Decoders over the same model
+        batch_size (int): Maximum number of windows per forward pass
+    """
+    active = list(decoders)
+    while active:
+        windows = [(decoder, decoder.next_window()) for decoder in active]
+        windows = [(decoder, window) for decoder, window in windows if window is not None]
+        active = [decoder for decoder, _ in windows]
+
+        groups = defaultdict(list)
+        for decoder, window in windows:
+            options = decoder.decoding_options(decoder.temperatures[0])
+            groups[repr(options)].append((decoder, window, options))
+
+        for group in groups.values():
+            for i in range(0, len(group), max(1, batch_size)):
+                chunk = group[i:i + max(1, batch_size)]
+                first = chunk[0][0]
+                mel = torch.stack([window.mel for _, window, _ in chunk])
+                results = first.model.decode(mel, chunk[0][2])
+                for (decoder, window, _), result in zip(chunk, results):
+                    if decoder.needs_fallback(result) and len(decoder.temperatures) > 1:
+                        result = decoder.decode_with_fallback(
+                            window.mel, decoder.temperatures[1:]
+                        )
+                    decoder.finish_window(window, result)
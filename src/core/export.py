@@ -0,0 +1,295 @@
+"""
+Transcript export in several formats from a single transcription run.
+
+Each format has a SegmentWriter that appends segments to its file as they
+are decoded, so subtitles and segment lists grow while a long file is being
+transcribed instead of needing a second pass (or a second tool) afterwards.
+SegmentExporter drives one writer per requested format from the same stream
+of segments; export_result() writes a finished result in one go.
+
+Formats:
+    txt   The text of every segment, as decoded
+    srt   SubRip subtitles
+    vtt   WebVTT subtitles
+    tsv   Tab-separated start, end (in milliseconds) and text, with a header
+    json  {"text", "segments", "language"}, like Transcriber.transcribe()
+
+Only the standard library is used, so importing this module stays cheap.
+"""
+import json
+import os
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+FORMATS = ("txt", "srt", "vtt", "tsv", "json")
+
+
+def format_timestamp(seconds: float, always_include_hours: bool = False, decimal_marker: str = ".") -> str:
+    """Format seconds as [HH:]MM:SS.mmm, like whisper.utils.format_timestamp."""
+    milliseconds = round(max(seconds, 0.0) * 1000.0)
+    hours, milliseconds = divmod(milliseconds, 3_600_000)
+    minutes, milliseconds = divmod(milliseconds, 60_000)
+    secs, milliseconds = divmod(milliseconds, 1_000)
+    hours_marker = f"{hours:02d}:" if always_include_hours or hours > 0 else ""
+    return f"{hours_marker}{minutes:02d}:{secs:02d}{decimal_marker}{milliseconds:03d}"
+
+
+def parse_formats(values: Iterable[str]) -> List[str]:
+    """Normalize format names given separately or comma-separated, e.g. ["srt,vtt", "json"].
+
+    Returns:
+        List[str]: Known formats in the order given, without duplicates
+
+    Raises:
+        ValueError: If a format is unknown
+    """
+    formats: List[str] = []
+    for value in values:
+        for name in value.split(","):
+            name = name.strip().lower().lstrip(".")
+            if not name:
+                continue
+            if name not in FORMATS:
+                raise ValueError(f"Unknown format '{name}' (choose from {', '.join(FORMATS)})")
+            if name not in formats:
+                formats.append(name)
+    return formats
+
+
+def output_paths(base_path: str, formats: Sequence[str]) -> Dict[str, str]:
+    """Return the output file of each format.
+
+    Args:
+        base_path (str): Output path; its extension is replaced by each
+                         format's, except for the format it already names
+        formats (Sequence[str]): Formats to write
+
+    Returns:
+        Dict[str, str]: Path per format
+    """
+    stem, extension = os.path.splitext(base_path)
+    return {
+        fmt: base_path if extension.lower() == f".{fmt}" else f"{stem}.{fmt}"
+        for fmt in formats
+    }
+
+
+class SegmentWriter:
+    """Writes one format to a file, segment by segment."""
+
+    def __init__(self, path: str):
+        """Open the file and write the format's header.
+
+        Args:
+            path (str): Destination file
+        """
+        self.path = path
+        self.file = open(path, "w", encoding="utf-8")
+        # Entries written so far (subtitle cues, rows, segments)
+        self.count = 0
+        self.begin()
+
+    def begin(self) -> None:
+        """Write whatever precedes the first segment."""
+
+    def write_segment(self, segment: Dict[str, Any]) -> None:
+        """Append one segment and flush it to disk."""
+        if self.accepts(segment):
+            self.write(segment)
+            self.count += 1
+            self.file.flush()
+
+    def accepts(self, segment: Dict[str, Any]) -> bool:
+        """Return True if the segment belongs in this format (subtitles skip empty ones)."""
+        return bool(segment["text"].strip())
+
+    def write(self, segment: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def finish(self, result: Optional[Dict[str, Any]] = None) -> None:
+        """Write whatever follows the last segment and close the file.
+
+        Args:
+            result (dict, optional): The finished result, for formats that
+                                     also store its text and language
+        """
+        self.file.close()
+
+    def close(self) -> None:
+        """Close the file without finishing it, e.g. after an error."""
+        if not self.file.closed:
+            self.file.close()
+
+
+class TxtWriter(SegmentWriter):
+    """Plain text: the segments' text, concatenated as decoded."""
+
+    def write(self, segment):
+        self.file.write(segment["text"])
+
+
+class SrtWriter(SegmentWriter):
+    """SubRip subtitles."""
+
+    def write(self, segment):
+        start = format_timestamp(segment["start"], always_include_hours=True, decimal_marker=",")
+        end = format_timestamp(segment["end"], always_include_hours=True, decimal_marker=",")
+        self.file.write(f"{self.count + 1}\n{start} --> {end}\n{segment['text'].strip()}\n\n")
+
+
+class VttWriter(SegmentWriter):
+    """WebVTT subtitles."""
+
+    def begin(self):
+        self.file.write("WEBVTT\n\n")
+
+    def write(self, segment):
+        start = format_timestamp(segment["start"])
+        end = format_timestamp(segment["end"])
+        self.file.write(f"{start} --> {end}\n{segment['text'].strip()}\n\n")
+
+
+class TsvWriter(SegmentWriter):
+    """Tab-separated start and end in integer milliseconds, and text."""
+
+    def begin(self):
+        self.file.write("start\tend\ttext\n")
+
+    def write(self, segment):
+        text = segment["text"].strip().replace("\t", " ")
+        self.file.write(f"{round(1000 * segment['start'])}\t{round(1000 * segment['end'])}\t{text}\n")
+
+
+class JsonWriter(SegmentWriter):
+    """The result as JSON; segments are streamed into its "segments" array.
+
+    The file is only valid JSON once finish() has closed the array and added
+    the text and language.
+    """
+
+    def begin(self):
+        self.file.write('{"segments": [')
+
+    def accepts(self, segment):
+        return True
+
+    def write(self, segment):
+        if self.count:
+            self.file.write(", ")
+        json.dump(segment, self.file, ensure_ascii=False, default=float)
+
+    def finish(self, result=None):
+        result = result or {}
+        text = result.get("text", "")
+        self.file.write(
+            f'], "text": {json.dumps(text, ensure_ascii=False)}, '
+            f'"language": {json.dumps(result.get("language"))}'
+        )
+        if result.get("vad") is not None:
+            self.file.write(f', "vad": {json.dumps(result["vad"], default=float)}')
+        self.file.write("}\n")
+        super().finish(result)
+
+
+WRITERS = {
+    "txt": TxtWriter,
+    "srt": SrtWriter,
+    "vtt": VttWriter,
+    "tsv": TsvWriter,
+    "json": JsonWriter,
+}
+
+
+class SegmentExporter:
+    """Writes several formats at once from one stream of segments."""
+
+    def __init__(self, paths: Dict[str, str]):
+        """Open a writer per format.
+
+        Args:
+            paths (Dict[str, str]): Destination file per format, e.g. from
+                                    output_paths()
+        """
+        self.paths = dict(paths)
+        self.writers: List[SegmentWriter] = []
+        try:
+            for fmt, path in self.paths.items():
+                self.writers.append(WRITERS[fmt](path))
+        except BaseException:
+            self.close()
+            raise
+
+    def write_segment(self, segment: Dict[str, Any]) -> None:
+        """Append a segment to every format."""
+        for writer in self.writers:
+            writer.write_segment(segment)
+
+    def finish(self, result: Optional[Dict[str, Any]] = None) -> Dict[str, str]:
+        """Complete and close every file.
+
+        Returns:
+            Dict[str, str]: Path per format
+        """
+        for writer in self.writers:
+            writer.finish(result)
+        return self.paths
+
+    def close(self) -> None:
+        """Close every file without finishing it."""
+        for writer in self.writers:
+            writer.close()
+
+    def __enter__(self) -> "SegmentExporter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+def export_result(result: Dict[str, Any], paths: Dict[str, str]) -> Dict[str, str]:
+    """Write a finished result in every format of paths.
+
+    Args:
+        result (Dict[str, Any]): Result with "segments" (and "text")
+        paths (Dict[str, str]): Destination file per format
+
+    Returns:
+        Dict[str, str]: Path per format
+    """
+    with SegmentExporter(paths) as exporter:
+        for segment in result.get("segments", []):
+            exporter.write_segment(segment)
+        return exporter.finish(result)
+
+
+def save_result(transcriber, result: Dict[str, Any], paths: Dict[str, str]) -> Dict[str, str]:
+    """Save a finished result in every format of paths.
+
+    The text goes through transcriber.save_transcription(), as in a txt-only
+    run; the other formats are written by export_result().
+
+    Args:
+        transcriber: The Transcriber that produced the result, or None when
+                     it ran elsewhere (e.g. in a TranscriptionPool); the text
+                     is then written directly
+        result (Dict[str, Any]): The transcription result
+        paths (Dict[str, str]): Destination file per format
+
+    Returns:
+        Dict[str, str]: Path written per format, in the order of paths
+    """
+    others = {fmt: path for fmt, path in paths.items() if fmt != "txt"}
+    saved = export_result(result, others) if others else {}
+    if "txt" in paths and transcriber is not None:
+        saved["txt"] = transcriber.save_transcription(result["text"], paths["txt"])
+    elif "txt" in paths:
+        with open(paths["txt"], "w", encoding="utf-8") as f:
+            f.write(result["text"])
+        saved["txt"] = paths["txt"]
+    return {fmt: saved[fmt] for fmt in paths}
+
+
+def primary_output(paths: Dict[str, str]) -> Optional[str]:
+    """Return the path reported for a run: the text file, else the first format's."""
+    if "txt" in paths:
+        return paths["txt"]
+    return next(iter(paths.values()), None)
@@ -0,0 +1,531 @@
+"""
+Background transcription job queue for long-running services.
+
+A JobQueue owns a few worker threads and a ModelRegistry, so models stay
+resident between jobs and a request never waits for a model load (after the
+first one). submit() never blocks: jobs wait in a bounded queue, and once it
+is full submit() raises QueueFull so callers can push back instead of piling
+up work. Segments are stored on the Job as windows are decoded, so clients
+can follow a transcription while it runs.
+
+Whisper's decoder caches keys and values in hooks on the model itself, so
+two threads must not decode with the same model at once (see
+ModelRegistry.inference_lock). Workers hold the model's lock only for the
+decode: with several workers, one job's audio is decoded by ffmpeg while
+another job is on the model, and jobs for different models run side by side.
+"""
+import os
+import queue
+import statistics
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .cache import TranscriptionCache
+from .cancellation import CancellationToken, TranscriptionCancelled
+from .registry import ModelRegistry
+from .resources import ResourceSampler
+from .transcriber import Transcriber
+from .warmup import warm_up_model
+
+FINISHED_STATES = ("done", "failed", "cancelled")
+
+
+class QueueFull(Exception):
+    """Raised by JobQueue.submit() when the pending-job limit is reached."""
+
+
+class Job:
+    """One submitted transcription and everything known about it so far."""
+
+    def __init__(
+        self,
+        audio_file: str,
+        model_name: str,
+        options: Dict[str, Any],
+        delete_after: bool = False,
+        vad: Optional[bool] = None,
+        checkpoint: Optional[bool] = None,
+    ):
+        """Initialize a queued job.
+
+        Args:
+            audio_file (str): Path of the audio to transcribe
+            model_name (str): Whisper model to use
+            options (Dict[str, Any]): Decode options, e.g. language
+            delete_after (bool): Delete audio_file once the job has finished
+                                 (for uploads saved to a temporary file)
+            vad (bool, optional): Only transcribe speech; None uses the
+                                  queue's setting
+            checkpoint (bool, optional): Checkpoint next to the audio file;
+                                         None uses the queue's setting
+        """
+        self.id = uuid.uuid4().hex
+        self.audio_file = audio_file
+        self.model_name = model_name
+        self.options = options
+        self.delete_after = delete_after
+        self.vad = vad
+        self.checkpoint = checkpoint
+        self.status = "queued"
+        self.segments: List[Dict[str, Any]] = []
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.progress = 0.0
+        self.duration: Optional[float] = None
+        self.cancel_token = CancellationToken()
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._changed = threading.Condition()
+
+    @property
+    def finished(self) -> bool:
+        """True once the job is done, has failed or was cancelled."""
+        return self.status in FINISHED_STATES
+
+    @property
+    def queue_seconds(self) -> Optional[float]:
+        """Seconds the job waited before a worker picked it up."""
+        if self.started_at is None:
+            return None
+        return self.started_at - self.submitted_at
+
+    @property
+    def run_seconds(self) -> Optional[float]:
+        """Seconds from a worker picking the job up to it finishing."""
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return self.finished_at - self.started_at
+
+    def to_dict(self, include_result: bool = True) -> Dict[str, Any]:
+        """Return the job's state as JSON-serializable data.
+
+        Args:
+            include_result (bool): Include the full result once the job is done
+        """
+        with self._changed:
+            info = {
+                "id": self.id,
+                "status": self.status,
+                "model": self.model_name,
+                "options": self.options,
+                "progress": round(self.progress, 4),
+                "duration": self.duration,
+                "segments": len(self.segments),
+                "error": self.error,
+                "submitted_at": self.submitted_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+                "queue_seconds": self.queue_seconds,
+                "run_seconds": self.run_seconds,
+            }
+            if include_result and self.result is not None:
+                info["result"] = self.result
+        return info
+
+    def wait_for_segments(
+        self, start: int = 0, timeout: Optional[float] = None
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        """Wait until there are segments after start or the job has finished.
+
+        Args:
+            start (int): Number of segments the caller already has
+            timeout (float, optional): Give up waiting after this many seconds
+
+        Returns:
+            Tuple[List[Dict[str, Any]], bool]: The new segments (empty on a
+                                               timeout), and whether the job
+                                               has finished
+        """
+        with self._changed:
+            self._changed.wait_for(
+                lambda: len(self.segments) > start or self.finished, timeout
+            )
+            return self.segments[start:], self.finished
+
+    def iter_segments(self, start: int = 0) -> Iterator[Dict[str, Any]]:
+        """Yield the job's segments, waiting for new ones until it finishes."""
+        while True:
+            segments, finished = self.wait_for_segments(start)
+            yield from segments
+            start += len(segments)
+            if finished and not segments:
+                return
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the job to finish.
+
+        Returns:
+            bool: True if it finished within timeout
+        """
+        with self._changed:
+            return self._changed.wait_for(lambda: self.finished, timeout)
+
+    def _start(self) -> bool:
+        """Mark a queued job as running; False if it was cancelled meanwhile."""
+        with self._changed:
+            if self.status != "queued":
+                return False
+            self.status = "running"
+            self.started_at = time.time()
+            self._changed.notify_all()
+            return True
+
+    def _cancel_if_queued(self) -> bool:
+        """Mark a job that no worker has started as cancelled."""
+        with self._changed:
+            if self.status != "queued":
+                return False
+            self.status = "cancelled"
+            self.finished_at = time.time()
+            self._changed.notify_all()
+            return True
+
+    def _update(self, **changes) -> None:
+        with self._changed:
+            for name, value in changes.items():
+                setattr(self, name, value)
+            self._changed.notify_all()
+
+    def _add_segment(self, segment: Dict[str, Any]) -> None:
+        with self._changed:
+            self.segments.append(segment)
+            self._changed.notify_all()
+
+
+def _delete_upload(job: Job) -> None:
+    """Delete a finished job's audio file if it was only kept for the job."""
+    if job.delete_after:
+        try:
+            os.remove(job.audio_file)
+        except OSError:
+            pass
+
+
+def _percentiles(values) -> Dict[str, Optional[float]]:
+    """Return mean, median and 95th percentile of values (None when empty)."""
+    values = sorted(values)
+    if not values:
+        return {"mean": None, "p50": None, "p95": None}
+    return {
+        "mean": statistics.fmean(values),
+        "p50": values[len(values) // 2],
+        "p95": values[min(len(values) - 1, int(len(values) * 0.95))],
+    }
+
+
+class JobQueue:
+    """Runs transcription jobs on background threads with resident models."""
+
+    def __init__(
+        self,
+        model_name: str = "base",
+        workers: int = 1,
+        max_pending: int = 16,
+        registry: Optional[ModelRegistry] = None,
+        cache: Optional[TranscriptionCache] = None,
+        precision: Optional[str] = None,
+        vad: bool = False,
+        keep_finished: int = 1000,
+        audio_cache=None,
+        checkpoint: bool = False,
+        sampler: Optional[ResourceSampler] = None,
+    ):
+        """Start the worker threads.
+
+        Args:
+            model_name (str): Model used by jobs that do not name one
+            workers (int): Number of jobs processed at the same time
+            max_pending (int): Jobs allowed to wait for a worker before
+                               submit() raises QueueFull
+            registry (ModelRegistry, optional): Registry keeping the models
+                                                resident, shared by all workers
+            cache (TranscriptionCache, optional): Result cache for every job
+            precision (str, optional): "fp32", "fp16" or "int8" for every job
+            vad (bool): Only transcribe the speech regions of each file
+            keep_finished (int): Finished jobs remembered for polling; older
+                                 ones are forgotten
+            audio_cache (DecodedAudioCache, optional): Decoded-audio cache for
+                                                       every job
+            checkpoint (bool): Checkpoint every job next to its audio file
+                               so an interrupted one resumes (see
+                               Transcriber's checkpoint option)
+            sampler (ResourceSampler, optional): Running sampler; each
+                                                 finished result gets its
+                                                 job's resource summary as
+                                                 result["resources"]
+        """
+        self.model_name = model_name
+        self.workers = max(1, workers)
+        self.max_pending = max_pending
+        self.registry = registry if registry is not None else ModelRegistry()
+        self.cache = cache
+        self.precision = precision
+        self.vad = vad
+        self.keep_finished = keep_finished
+        self.audio_cache = audio_cache
+        self.checkpoint = checkpoint
+        self.sampler = sampler
+        self.started_at = time.time()
+        # warm_up_model() report, once warm_up() has run
+        self.warmup: Optional[Dict[str, float]] = None
+
+        self._pending: "queue.Queue[Optional[Job]]" = queue.Queue(maxsize=max_pending)
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._running = 0
+        self._counts = {state: 0 for state in FINISHED_STATES}
+        self._rejected = 0
+        self._audio_seconds = 0.0
+        self._run_seconds = 0.0
+        # Jobs answered from the cache (or a completed checkpoint), kept out
+        # of the realtime factor since nothing was decoded
+        self._replayed = 0
+        # Recent timings for the latency percentiles in metrics()
+        self._latencies: deque = deque(maxlen=1000)
+        self._waits: deque = deque(maxlen=1000)
+        self._first_job: Optional[Dict[str, Any]] = None
+
+        self._threads = [
+            threading.Thread(target=self._work, name=f"transcription-job-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def preload(self, model_name: Optional[str] = None) -> float:
+        """Load a model into the registry ahead of the first job.
+
+        Returns:
+            float: Seconds the load took (close to zero if already resident)
+        """
+        start = time.perf_counter()
+        self.registry.get(model_name or self.model_name, quantized=self.precision == "int8")
+        return time.perf_counter() - start
+
+    def warm_up(self, model_name: Optional[str] = None) -> Dict[str, float]:
+        """Load a model and run a dummy inference on it ahead of the first job.
+
+        Returns:
+            Dict[str, float]: The warm_up_model() report, also kept as warmup
+        """
+        transcriber = Transcriber(
+            model_name or self.model_name, registry=self.registry, precision=self.precision
+        )
+        self.warmup = warm_up_model(transcriber)
+        return self.warmup
+
+    def submit(
+        self,
+        audio_file: str,
+        model_name: Optional[str] = None,
+        delete_after: bool = False,
+        vad: Optional[bool] = None,
+        checkpoint: Optional[bool] = None,
+        **decode_options
+    ) -> Job:
+        """Queue a transcription and return at once.
+
+        Args:
+            audio_file (str): Path of the audio to transcribe
+            model_name (str, optional): Whisper model; defaults to model_name
+            delete_after (bool): Delete audio_file once the job has finished
+            vad (bool, optional): Only transcribe speech; defaults to vad
+            checkpoint (bool, optional): Checkpoint the job next to its audio
+                                         file; defaults to checkpoint
+            **decode_options: Extra options passed to Whisper's decoding
+
+        Returns:
+            Job: The queued job, to be polled or followed with iter_segments()
+
+        Raises:
+            QueueFull: If max_pending jobs are already waiting
+            RuntimeError: If the queue has been closed
+        """
+        job = Job(audio_file, model_name or self.model_name, decode_options, delete_after, vad, checkpoint)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("The job queue is closed")
+            self._jobs[job.id] = job
+        try:
+            self._pending.put_nowait(job)
+        except queue.Full:
+            with self._lock:
+                del self._jobs[job.id]
+                self._rejected += 1
+            raise QueueFull(f"{self.max_pending} jobs are already waiting") from None
+        self._forget_finished()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Return a job by id, or None if it is unknown or was forgotten."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self) -> List[Job]:
+        """Return the remembered jobs, oldest first."""
+        with self._lock:
+            return list(self._jobs.values())
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued or running job.
+
+        A queued job is cancelled at once; a running one stops before its
+        next decode window.
+
+        Returns:
+            bool: False if the job is unknown or had already finished
+        """
+        job = self.get(job_id)
+        if job is None or job.finished:
+            return False
+        job.cancel_token.cancel()
+        if job._cancel_if_queued():
+            with self._lock:
+                self._counts["cancelled"] += 1
+            _delete_upload(job)
+        return True
+
+    def metrics(self) -> Dict[str, Any]:
+        """Return queue, throughput and latency figures for monitoring."""
+        with self._lock:
+            counts = dict(self._counts)
+            running = self._running
+            rejected = self._rejected
+            audio_seconds = self._audio_seconds
+            run_seconds = self._run_seconds
+            replayed = self._replayed
+            latencies = list(self._latencies)
+            waits = list(self._waits)
+            first_job = self._first_job
+        latest = self.sampler.latest() if self.sampler is not None else None
+        return {
+            "uptime_seconds": time.time() - self.started_at,
+            "workers": self.workers,
+            "queued": self._pending.qsize(),
+            "running": running,
+            "max_pending": self.max_pending,
+            "completed": counts,
+            "rejected": rejected,
+            "audio_seconds": audio_seconds,
+            "processing_seconds": run_seconds,
+            "replayed": replayed,
+            "realtime_factor": run_seconds / audio_seconds if audio_seconds else None,
+            "latency_seconds": _percentiles(latencies),
+            "first_job": first_job,
+            "warmup": self.warmup,
+            "queue_wait_seconds": _percentiles(waits),
+            "models": self.registry.loaded_models(),
+            "model_memory_bytes": self.registry.memory_used(),
+            "resources": latest.to_dict() if latest is not None else None,
+        }
+
+    def close(self, cancel_running: bool = False, timeout: Optional[float] = None) -> None:
+        """Stop accepting jobs, cancel the queued ones and stop the workers.
+
+        Args:
+            cancel_running (bool): Also cancel the jobs being transcribed,
+                                   instead of letting them finish
+            timeout (float, optional): Seconds to wait for each worker
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            if job.status == "queued" or (cancel_running and not job.finished):
+                self.cancel(job.id)
+        for _ in self._threads:
+            self._pending.put(None)
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def __enter__(self) -> "JobQueue":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close(cancel_running=True)
+
+    def _work(self) -> None:
+        # One transcriber per worker; the models themselves live in the registry
+        transcriber = Transcriber(
+            self.model_name,
+            cache=self.cache,
+            registry=self.registry,
+            vad=self.vad,
+            precision=self.precision,
+            audio_cache=self.audio_cache,
+            checkpoint=self.checkpoint,
+        )
+        while True:
+            job = self._pending.get()
+            if job is None:
+                return
+            if job._start():
+                self._run(job, transcriber)
+
+    def _run(self, job: Job, transcriber: Transcriber) -> None:
+        with self._lock:
+            self._running += 1
+        transcriber.model_name = job.model_name
+        transcriber.vad = self.vad if job.vad is None else job.vad
+        transcriber.checkpoint = self.checkpoint if job.checkpoint is None else job.checkpoint
+        samples = None
+        outcome: Dict[str, Any] = {"status": "failed"}
+        if self.sampler is not None:
+            started = self.sampler.sample().time
+        try:
+            job.cancel_token.raise_if_cancelled()
+            # Decode the audio before waiting for the model
+            samples = transcriber.open_audio(job.audio_file)
+            lock = self.registry.inference_lock(job.model_name, quantized=transcriber.quantized)
+            with lock:
+                for segment in transcriber.transcribe_stream(
+                    job.audio_file,
+                    progress_callback=lambda p: job._update(progress=p.fraction, duration=p.duration),
+                    cancel_token=job.cancel_token,
+                    samples=samples,
+                    **job.options
+                ):
+                    job._add_segment(segment)
+            result = transcriber.last_result
+            if self.sampler is not None:
+                self.sampler.sample()
+                result = dict(result, resources=self.sampler.summarize(started))
+            outcome = {"status": "done", "result": result, "progress": 1.0}
+        except TranscriptionCancelled:
+            outcome = {"status": "cancelled"}
+        except Exception as e:
+            outcome = {"status": "failed", "error": str(e)}
+        finally:
+            if hasattr(samples, "close"):
+                samples.close()
+            _delete_upload(job)
+            finished_at = time.time()
+            with self._lock:
+                self._running -= 1
+                self._counts[outcome["status"]] += 1
+                self._latencies.append(finished_at - job.submitted_at)
+                self._waits.append(job.started_at - job.submitted_at)
+                if outcome["status"] == "done" and transcriber.replayed:
+                    self._replayed += 1
+                elif outcome["status"] == "done":
+                    self._run_seconds += finished_at - job.started_at
+                    self._audio_seconds += job.duration or 0.0
+                    if self._first_job is None:
+                        self._first_job = {
+                            "run_seconds": finished_at - job.started_at,
+                            "warm": self.warmup is not None,
+                        }
+            job._update(finished_at=finished_at, **outcome)
+
+    def _forget_finished(self) -> None:
+        with self._lock:
+            finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+            for job_id in finished[:max(0, len(finished) - self.keep_finished)]:
+                del self._jobs[job_id]
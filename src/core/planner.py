@@ -0,0 +1,311 @@
+"""
+Memory-aware admission of transcription work.
+
+Loading medium or large, or starting one more job, on a machine without the
+memory for it does not fail cleanly: the process swaps until it crawls or
+the OOM killer ends it. A ResourcePlanner checks before that happens. It
+estimates what a job needs (the model's weights unless they are already
+resident, plus the job's working memory) and compares it with the memory
+the OS reports as available, less a reserve for everything else and less
+the memory promised to jobs admitted earlier whose models have not been
+loaded yet (the OS cannot report memory nobody has allocated). Each
+request gets a Decision:
+
+  - admit: it fits (possibly after evicting models no running job uses)
+  - queue: it does not fit while the running jobs hold their memory, or as
+    many jobs are running as the CPU cores serve well; try again once one
+    has finished
+  - refuse: it cannot fit on this machine, or nothing is running and the
+    memory is taken by other programs
+
+Model sizes come from the registry's measurement (model_footprint()) once a
+model is resident, and from the checkpoints' parameter counts until then.
+An admitted job's promise is kept until its model shows up in the registry
+or the caller release()s the decision when the job has finished.
+Every decision is kept in the planner's history and passed to its
+on_decision callback, which the CLI and the desktop app use to show why work
+was held back.
+"""
+import os
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .registry import ModelRegistry
+
+MB = 1024 ** 2
+GB = 1024 ** 3
+
+# fp32 weights of each model: parameter count x 4 bytes
+MODEL_FOOTPRINTS = {
+    "tiny": 37_760_640 * 4,
+    "base": 71_825_920 * 4,
+    "small": 241_734_912 * 4,
+    "medium": 763_856_896 * 4,
+    "large": 1_541_570_560 * 4,
+}
+
+# int8 quantization packs the linear layers; the embeddings stay fp32
+QUANTIZED_FRACTION = 0.4
+
+# Working memory of a job besides the weights: decoder caches, the encoder's
+# activations and the mel spectrogram of one window, which grow with the model
+JOB_BASE_MEMORY = 256 * MB
+JOB_WEIGHTS_FRACTION = 0.25
+
+# Decoded audio held by a job: 16 kHz float32 samples
+AUDIO_BYTES_PER_SECOND = 16000 * 4
+
+# Left available for the OS, the UI and other programs
+DEFAULT_RESERVE = 512 * MB
+
+# Fewest CPU threads a job should get; more jobs than cores / this only
+# make each one slower
+MIN_THREADS_PER_JOB = 2
+
+
+def format_bytes(size: float) -> str:
+    """Format a byte count as e.g. "812 MB" or "3.1 GB"."""
+    if abs(size) >= GB:
+        return f"{size / GB:.1f} GB"
+    return f"{size / MB:.0f} MB"
+
+
+def _system_memory() -> Tuple[int, int]:
+    import psutil
+
+    memory = psutil.virtual_memory()
+    return memory.total, memory.available
+
+
+@dataclass
+class Decision:
+    """The planner's answer to one request, and why."""
+
+    action: str          # "admit", "queue" or "refuse"
+    model_name: str
+    reason: str
+    needed: int          # bytes the work needs beyond what is resident
+    available: int       # bytes it may use (available memory less the reserve)
+    workers: Optional[int] = None  # for admit_workers(): worker processes allowed
+    evicted: List[str] = field(default_factory=list)
+    time: float = field(default_factory=time.time)
+
+    @property
+    def admitted(self) -> bool:
+        return self.action == "admit"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    def format(self) -> str:
+        """Render the decision on one line, e.g. for a log or status bar."""
+        return f"{self.action} {self.model_name}: {self.reason}"
+
+
+class ResourcePlanner:
+    """Decides which transcription work fits in memory and on the CPU cores."""
+
+    def __init__(
+        self,
+        registry: Optional[ModelRegistry] = None,
+        reserve: int = DEFAULT_RESERVE,
+        cpus: Optional[int] = None,
+        memory: Optional[Callable[[], Tuple[int, int]]] = None,
+        history: int = 100,
+    ):
+        """Initialize the planner.
+
+        Args:
+            registry (ModelRegistry, optional): Registry whose resident models
+                                                need no memory to start a job,
+                                                and whose idle models may be
+                                                evicted to make room
+            reserve (int): Bytes always left available
+            cpus (int, optional): CPU cores to plan for; defaults to the
+                                  cores this process may run on
+            memory (callable, optional): Returns (total, available) bytes;
+                                         defaults to psutil's figures
+            history (int): Decisions kept in decisions
+        """
+        self.registry = registry
+        self.reserve = reserve
+        if cpus is None:
+            cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count()
+        self.cpus = max(1, cpus or 1)
+        self._memory = memory or _system_memory
+        self.decisions: deque = deque(maxlen=history)
+        # Admitted decisions whose models were not resident, and their registry keys
+        self._pending: List[Tuple[Decision, str]] = []
+        # Called with every Decision, e.g. to print or show it
+        self.on_decision: Optional[Callable[[Decision], None]] = None
+
+    def model_memory(self, model_name: str, quantized: bool = False) -> int:
+        """Return the bytes a model's weights take once loaded."""
+        if self.registry is not None:
+            measured = self.registry.footprint(self.registry.key(model_name, quantized))
+            if measured:
+                return measured
+        size = MODEL_FOOTPRINTS.get(model_name.split(".")[0], MODEL_FOOTPRINTS["large"])
+        return int(size * QUANTIZED_FRACTION) if quantized else size
+
+    def job_memory(self, model_name: str, quantized: bool = False, audio_seconds: Optional[float] = None) -> int:
+        """Return the working memory a job needs besides the model's weights."""
+        size = JOB_BASE_MEMORY + int(self.model_memory(model_name, quantized) * JOB_WEIGHTS_FRACTION)
+        if audio_seconds:
+            size += int(audio_seconds * AUDIO_BYTES_PER_SECOND)
+        return size
+
+    def max_jobs(self) -> int:
+        """Return how many jobs the CPU cores run at once without slowing each other down."""
+        return max(1, self.cpus // MIN_THREADS_PER_JOB)
+
+    def reserved(self) -> int:
+        """Return the bytes promised to admitted jobs whose models are not loaded yet."""
+        if self.registry is not None:
+            # Once loaded, a model's memory shows up in the OS figures
+            self._pending = [
+                (decision, key) for decision, key in self._pending if not self.registry.is_loaded(key)
+            ]
+        return sum(decision.needed for decision, key in self._pending)
+
+    def release(self, decision: Decision) -> None:
+        """Drop what an admitted decision promised, e.g. once its job has finished."""
+        self._pending = [(pending, key) for pending, key in self._pending if pending is not decision]
+
+    def admit(
+        self,
+        model_name: str,
+        running: Sequence[str] = (),
+        quantized: bool = False,
+        audio_seconds: Optional[float] = None,
+    ) -> Decision:
+        """Decide whether a job can start now in this process.
+
+        Args:
+            model_name (str): Model the job uses
+            running (Sequence[str]): Models of the jobs running in this
+                                     process (their memory is already in use)
+            quantized (bool): The job uses the int8 model
+            audio_seconds (float, optional): Length of the job's audio
+
+        Returns:
+            Decision: admit, queue or refuse; when admitted after evicting
+                      idle models, their names are in evicted. An admitted
+                      decision holds its memory until the model is loaded
+                      or it is passed to release()
+        """
+        total, available = self._memory()
+        reserved = self.reserved()
+        free = available - self.reserve - reserved
+        loaded = self.registry is not None and self.registry.is_loaded(model_name, quantized)
+        needed = self.job_memory(model_name, quantized, audio_seconds)
+        if not loaded:
+            needed += self.model_memory(model_name, quantized)
+
+        def decide(action, reason, evicted=()):
+            return self._record(Decision(action, model_name, reason, needed, free, evicted=list(evicted)))
+
+        if len(running) >= self.max_jobs():
+            return decide(
+                "queue",
+                f"{len(running)} job(s) running, as many as {self.cpus} CPU core(s) run well",
+            )
+        if needed <= free:
+            return self._promise(
+                decide("admit", f"needs {format_bytes(needed)} of {format_bytes(free)} available"),
+                loaded,
+                quantized,
+            )
+
+        # Models no running job uses can make room, least recently used first
+        evicted = []
+        if self.registry is not None:
+            busy = {self.registry.key(model_name, quantized)} | set(running)
+            reclaimable = 0
+            for key in self.registry.loaded_models():
+                if key in busy or needed <= free + reclaimable:
+                    continue
+                evicted.append(key)
+                reclaimable += self.registry.footprint(key) or 0
+            if needed <= free + reclaimable:
+                for key in evicted:
+                    self.registry.evict(key)
+                return self._promise(
+                    decide(
+                        "admit",
+                        f"needs {format_bytes(needed)}; unloaded {', '.join(evicted)} to make room",
+                        evicted,
+                    ),
+                    loaded,
+                    quantized,
+                )
+
+        if needed > total - self.reserve:
+            return decide(
+                "refuse",
+                f"needs {format_bytes(needed)}, more than this machine's "
+                f"{format_bytes(total)} less {format_bytes(self.reserve)} reserved",
+            )
+        if running or reserved:
+            return decide(
+                "queue",
+                f"needs {format_bytes(needed)}, {format_bytes(max(free, 0))} available "
+                f"until a running job finishes",
+            )
+        return decide(
+            "refuse",
+            f"needs {format_bytes(needed)}, only {format_bytes(max(free, 0))} available "
+            f"(the rest is used by other programs)",
+        )
+
+    def admit_workers(self, model_name: str, workers: int, quantized: bool = False) -> Decision:
+        """Decide how many worker processes, each loading its own model, fit in memory.
+
+        The cores are shared out by the pool itself (see pool.plan_workers).
+
+        Returns:
+            Decision: admit with workers set to the number that fits (at most
+                      the requested number), or refuse if not even one does
+        """
+        total, available = self._memory()
+        free = available - self.reserve - self.reserved()
+        per_worker = self.model_memory(model_name, quantized) + self.job_memory(model_name, quantized)
+        fits = max(0, free // per_worker)
+        allowed = min(workers, fits)
+        if allowed < 1:
+            if per_worker > total - self.reserve:
+                reason = (
+                    f"a worker needs {format_bytes(per_worker)}, more than this machine's "
+                    f"{format_bytes(total)} less {format_bytes(self.reserve)} reserved"
+                )
+            else:
+                reason = (
+                    f"a worker needs {format_bytes(per_worker)}, only "
+                    f"{format_bytes(max(free, 0))} available"
+                )
+            return self._record(Decision("refuse", model_name, reason, per_worker, free, workers=0))
+        if allowed < workers:
+            reason = (
+                f"{allowed} of {workers} worker(s): each needs {format_bytes(per_worker)}, "
+                f"{format_bytes(free)} available"
+            )
+        else:
+            reason = (
+                f"{allowed} worker(s) x {format_bytes(per_worker)} fit in "
+                f"{format_bytes(free)} available"
+            )
+        return self._record(Decision("admit", model_name, reason, per_worker * allowed, free, workers=allowed))
+
+    def _promise(self, decision: Decision, loaded: bool, quantized: bool) -> Decision:
+        if not loaded:
+            key = self.registry.key(decision.model_name, quantized) if self.registry is not None else decision.model_name
+            self._pending.append((decision, key))
+        return decision
+
+    def _record(self, decision: Decision) -> Decision:
+        self.decisions.append(decision)
+        if self.on_decision is not None:
+            self.on_decision(decision)
+        return decision
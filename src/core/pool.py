@@ -0,0 +1,264 @@
+"""
+Multi-process transcription pool.
+
+PyTorch's intra-op threading stops scaling well before a 32+ core machine is
+busy, so this module splits the core budget across several worker processes.
+Each worker pins its torch thread count and loads its own Whisper model once;
+jobs are dispatched from a shared queue and results come back in input order.
+"""
+import multiprocessing
+import os
+import time
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .export import primary_output, save_result
+
+# Per-process state, set up by _init_worker inside each pool process
+_worker_transcriber = None
+_worker_fp16 = True
+_worker_error = None
+_worker_warmup = None
+
+
+def plan_workers(
+    workers: Optional[int] = None, total_threads: Optional[int] = None
+) -> Tuple[int, int]:
+    """Split a core budget into a worker count and torch threads per worker.
+
+    Args:
+        workers (int, optional): Number of worker processes. If None, one
+                                 worker per 4 cores is used
+        total_threads (int, optional): Total core budget. Defaults to the
+                                       number of CPUs on the machine
+
+    Returns:
+        Tuple[int, int]: (workers, threads_per_worker)
+    """
+    total = total_threads or os.cpu_count() or 1
+    if not workers:
+        workers = max(1, total // 4)
+    workers = max(1, min(workers, total))
+    return workers, max(1, total // workers)
+
+
+def _init_worker(
+    model_name: str,
+    threads: int,
+    fp16: bool,
+    cache=None,
+    low_memory: bool = False,
+    vad: bool = False,
+    precision: Optional[str] = None,
+    warm: bool = False,
+    checkpoint: bool = False,
+    audio_cache=None,
+    profile: bool = False,
+) -> None:
+    """Pool initializer: pin torch threads and load (and optionally warm up) the model once."""
+    global _worker_transcriber, _worker_fp16, _worker_error, _worker_warmup
+
+    try:
+        import torch
+
+        # torch is already imported by the time a spawned worker runs this
+        # (unpickling _init_worker imports the package), so OMP_NUM_THREADS
+        # would come too late; set_num_threads sizes OpenMP/MKL's pools itself
+        torch.set_num_threads(threads)
+        try:
+            torch.set_num_interop_threads(1)
+        except RuntimeError:
+            # Only allowed before any parallel work has run in this process
+            pass
+
+        from .transcriber import Transcriber
+
+        _worker_transcriber = Transcriber(
+            model_name=model_name,
+            cache=cache,
+            low_memory=low_memory,
+            vad=vad,
+            precision=precision,
+            checkpoint=checkpoint,
+            audio_cache=audio_cache,
+            profile=profile,
+        )
+        _worker_transcriber.load_model()
+        _worker_fp16 = fp16
+        if warm:
+            from .warmup import warm_up_model
+
+            _worker_warmup = warm_up_model(_worker_transcriber, fp16=fp16)
+    except Exception as e:
+        # Raising here would make multiprocessing respawn the worker forever;
+        # report the failure from every job instead.
+        _worker_error = f"Worker failed to load model: {e}"
+
+
+def _run_job(job: Tuple[int, Any, Union[None, str, Dict[str, str]]]) -> Dict[str, Any]:
+    """Transcribe one job inside a worker process."""
+    index, audio, output_path = job
+    entry = {
+        "index": index,
+        "audio_file": audio if isinstance(audio, str) else None,
+        "output_path": None,
+        "status": "ok",
+        "seconds": 0.0,
+        "error": None,
+        "result": None,
+        "cached": False,
+        "worker_pid": os.getpid(),
+    }
+    start = time.perf_counter()
+    try:
+        if _worker_error:
+            raise RuntimeError(_worker_error)
+        cache = _worker_transcriber.cache
+        hits_before = cache.hits if cache is not None else 0
+        result = _worker_transcriber.transcribe(audio, fp16=_worker_fp16)
+        entry["cached"] = cache is not None and cache.hits > hits_before
+        if result.get("vad"):
+            entry["vad"] = result["vad"]
+        if result.get("timings"):
+            entry["timings"] = result["timings"]
+        if isinstance(output_path, dict):
+            entry["outputs"] = save_result(_worker_transcriber, result, output_path)
+            entry["output_path"] = primary_output(entry["outputs"])
+        elif output_path:
+            entry["output_path"] = _worker_transcriber.save_transcription(
+                result["text"], output_path
+            )
+        else:
+            entry["result"] = result
+    except Exception as e:
+        entry["status"] = "error"
+        entry["error"] = str(e)
+    entry["seconds"] = time.perf_counter() - start
+    return entry
+
+
+class TranscriptionPool:
+    """Process pool of Transcribers for parallel CPU transcription."""
+
+    def __init__(
+        self,
+        model_name: str = "base",
+        workers: Optional[int] = None,
+        total_threads: Optional[int] = None,
+        fp16: bool = True,
+        cache=None,
+        low_memory: bool = False,
+        vad: bool = False,
+        precision: Optional[str] = None,
+        warm: bool = False,
+        checkpoint: bool = False,
+        audio_cache=None,
+        profile: bool = False,
+    ):
+        """Start the worker processes.
+
+        Args:
+            model_name (str): Name of the Whisper model each worker loads
+            workers (int, optional): Number of worker processes (see plan_workers)
+            total_threads (int, optional): Total core budget shared by the workers
+            fp16 (bool): Whether to use FP16 for faster inference on GPU
+            cache (TranscriptionCache, optional): Result cache shared by the
+                                                  workers through its directory
+            low_memory (bool): Stream audio in every worker so per-worker
+                               memory does not grow with file duration
+            vad (bool): Skip silence in every job (see Transcriber)
+            precision (str, optional): "fp32", "fp16" or "int8" (see Transcriber).
+                                       A quantized model is loaded from the
+                                       shared on-disk cache after the first
+                                       worker has quantized it
+            warm (bool): Run a dummy inference in every worker after loading
+                         its model (see warmup.warm_up_model)
+            checkpoint (bool): Checkpoint every job next to its audio file and
+                               resume interrupted ones (see Transcriber)
+            audio_cache (DecodedAudioCache, optional): Decoded-audio cache
+                                                       shared by the workers
+                                                       through its directory
+            profile (bool): Time every stage of each job; the timings are
+                            reported in the job's entry as "timings"
+        """
+        self.model_name = model_name
+        self.fp16 = fp16
+        self.checkpoint = checkpoint
+        # Settings-only Transcriber (no model) that finds the workers' checkpoints
+        self._settings = None
+        if checkpoint:
+            from .transcriber import Transcriber
+
+            self._settings = Transcriber(model_name, vad=vad, precision=precision, checkpoint=True)
+        self.workers, self.threads_per_worker = plan_workers(workers, total_threads)
+        # "spawn" avoids forking a parent that may already hold torch threads
+        context = multiprocessing.get_context("spawn")
+        self._pool = context.Pool(
+            processes=self.workers,
+            initializer=_init_worker,
+            initargs=(
+                model_name, self.threads_per_worker, fp16, cache, low_memory, vad, precision, warm,
+                checkpoint, audio_cache, profile,
+            ),
+        )
+
+    def imap(
+        self,
+        audio_inputs: Sequence[Any],
+        output_paths: Optional[Sequence[Union[None, str, Dict[str, str]]]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Transcribe inputs in parallel, yielding results in input order.
+
+        Args:
+            audio_inputs (Sequence): Audio file paths or 16 kHz float32 arrays
+            output_paths (Sequence, optional): If given, each worker saves its
+                                               transcription there (or, given a
+                                               path per format, in every format
+                                               and reports them as "outputs")
+                                               and the result dict is not sent back
+
+        Yields:
+            Dict[str, Any]: One entry per input with "status", "seconds",
+                            "error", "output_path", "result" and "cached"
+                            (plus "vad" and, with profile, "timings")
+        """
+        if output_paths is None:
+            output_paths = [None] * len(audio_inputs)
+        jobs = [
+            (index, audio, output_path)
+            for index, (audio, output_path) in enumerate(zip(audio_inputs, output_paths))
+        ]
+        # chunksize=1 keeps dispatch queue-driven so long files don't stall a batch
+        return self._pool.imap(_run_job, jobs, chunksize=1)
+
+    def is_complete(self, audio_file: str) -> bool:
+        """Return True if a worker's checkpoint holds the finished transcription of audio_file."""
+        return self._settings is not None and self._settings.is_complete(audio_file, fp16=self.fp16)
+
+    def map(
+        self,
+        audio_inputs: Sequence[Any],
+        output_paths: Optional[Sequence[Union[None, str, Dict[str, str]]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Transcribe inputs in parallel and return all entries in input order."""
+        return list(self.imap(audio_inputs, output_paths))
+
+    def close(self) -> None:
+        """Wait for outstanding jobs and shut the workers down."""
+        self._pool.close()
+        self._pool.join()
+
+    def terminate(self) -> None:
+        """Stop the workers immediately, dropping outstanding jobs."""
+        self._pool.terminate()
+        self._pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.terminate()
+        return False
+
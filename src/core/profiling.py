@@ -0,0 +1,233 @@
+"""
+Per-stage timing of a transcription.
+
+A Profiler records named spans (audio decode, mel spectrogram, encoder,
+decoder, ...) with their wall-clock time, process CPU time and memory. The
+Transcriber fills one in when profiling is on, and attaches its summary to
+the result as result["timings"]:
+
+    {
+        "wall": 41.2, "cpu": 40.8, "peak_rss_mb": 812.4, "fallbacks": 3,
+        "stages": {"encoder": {"count": 12, "wall": 9.1, "cpu": 9.0, ...}, ...},
+        "windows": [{"start": 0.0, "wall": 3.4, "cpu": 3.3, "fallbacks": 0, ...}, ...],
+    }
+
+Spans nest (a window holds its encoder and decoder spans), and
+export_chrome_trace() writes them in the Trace Event Format read by
+chrome://tracing and https://ui.perfetto.dev.
+
+CPU time is the whole process's, so it includes torch's worker threads; a
+CPU/wall ratio above 1 means inference used several cores. Memory is the
+resident set size at the end of each span and the process's high-water mark
+(peak) at that point; on a GPU the peak CUDA allocation within the span is
+recorded as well.
+"""
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+MB = 1024 ** 2
+
+# Span names reported per window rather than as a stage
+WINDOW = "window"
+
+
+def peak_rss() -> Optional[int]:
+    """Return the process's peak resident set size in bytes, if the OS reports it."""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports kilobytes, macOS bytes
+        return peak if sys.platform == "darwin" else peak * 1024
+    try:
+        import psutil
+
+        return getattr(psutil.Process().memory_info(), "peak_wset", None)
+    except ImportError:
+        return None
+
+
+def current_rss() -> Optional[int]:
+    """Return the process's resident set size in bytes, if psutil is available."""
+    try:
+        import psutil
+
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        return None
+
+
+def _cuda():
+    """Return torch.cuda if torch is imported and a GPU is in use, else None."""
+    torch = sys.modules.get("torch")
+    if torch is not None and torch.cuda.is_available():
+        return torch.cuda
+    return None
+
+
+class Profiler:
+    """Records nested, timed spans of one transcription."""
+
+    def __init__(self):
+        self.spans: List[Dict[str, Any]] = []
+        self.fallbacks = 0
+        self.started = time.perf_counter()
+        # Peak GPU memory so far of each open span, innermost last: resetting
+        # the counter for a nested span would otherwise lose its parent's peak
+        self._cuda_peaks: List[int] = []
+        self._cpu_started = time.process_time()
+        self._pid = os.getpid()
+
+    @contextlib.contextmanager
+    def span(self, name: str, **args) -> Iterator[Dict[str, Any]]:
+        """Time the body of a with-block as a span.
+
+        Args:
+            name (str): Stage name, e.g. "encoder"
+            **args: Details stored with the span, e.g. the window's start time
+
+        Yields:
+            Dict[str, Any]: The span's args, to which the body may add details
+        """
+        cuda = _cuda()
+        if cuda is not None:
+            if self._cuda_peaks:
+                self._cuda_peaks[-1] = max(self._cuda_peaks[-1], cuda.max_memory_allocated())
+            cuda.reset_peak_memory_stats()
+            self._cuda_peaks.append(0)
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield args
+        finally:
+            record = {
+                "name": name,
+                "start": wall - self.started,
+                "wall": time.perf_counter() - wall,
+                "cpu": time.process_time() - cpu,
+                "rss": current_rss(),
+                "peak_rss": peak_rss(),
+                "thread": threading.get_ident(),
+                "args": args,
+            }
+            if cuda is not None:
+                record["cuda_peak"] = max(self._cuda_peaks.pop(), cuda.max_memory_allocated())
+                if self._cuda_peaks:
+                    self._cuda_peaks[-1] = max(self._cuda_peaks[-1], record["cuda_peak"])
+            self.spans.append(record)
+
+    def count_fallback(self) -> None:
+        """Record that a window was decoded again at a higher temperature."""
+        self.fallbacks += 1
+
+    def summary(self) -> Dict[str, Any]:
+        """Return the result["timings"] block described in the module docstring."""
+        stages: Dict[str, Dict[str, Any]] = {}
+        windows = []
+        for span in self.spans:
+            if span["name"] == WINDOW:
+                windows.append({
+                    **span["args"],
+                    "wall": round(span["wall"], 4),
+                    "cpu": round(span["cpu"], 4),
+                    "peak_rss_mb": _mb(span["peak_rss"]),
+                })
+                continue
+            stage = stages.setdefault(
+                span["name"], {"count": 0, "wall": 0.0, "cpu": 0.0, "peak_rss_mb": None}
+            )
+            stage["count"] += 1
+            stage["wall"] += span["wall"]
+            stage["cpu"] += span["cpu"]
+            stage["peak_rss_mb"] = max(
+                filter(None, [stage["peak_rss_mb"], _mb(span["peak_rss"])]), default=None
+            )
+            if "cuda_peak" in span:
+                stage["cuda_peak_mb"] = max(stage.get("cuda_peak_mb", 0.0), _mb(span["cuda_peak"]))
+        for stage in stages.values():
+            stage["wall"] = round(stage["wall"], 4)
+            stage["cpu"] = round(stage["cpu"], 4)
+
+        return {
+            "wall": round(time.perf_counter() - self.started, 4),
+            "cpu": round(time.process_time() - self._cpu_started, 4),
+            "peak_rss_mb": _mb(peak_rss()),
+            "fallbacks": self.fallbacks,
+            "stages": stages,
+            "windows": windows,
+        }
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Return the spans as a Chrome Trace Event Format document."""
+        events = []
+        for span in self.spans:
+            args = dict(span["args"], cpu_ms=round(span["cpu"] * 1000, 3))
+            if span["rss"] is not None:
+                args["rss_mb"] = _mb(span["rss"])
+            if span["peak_rss"] is not None:
+                args["peak_rss_mb"] = _mb(span["peak_rss"])
+            if "cuda_peak" in span:
+                args["cuda_peak_mb"] = _mb(span["cuda_peak"])
+            events.append({
+                "name": span["name"],
+                "cat": "window" if span["name"] == WINDOW else "stage",
+                "ph": "X",
+                "ts": round(span["start"] * 1e6, 1),
+                "dur": round(span["wall"] * 1e6, 1),
+                "pid": self._pid,
+                "tid": span["thread"],
+                "args": args,
+            })
+        # Parents before children when they start at the same instant
+        events.sort(key=lambda event: (event["ts"], -event["dur"]))
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, path: str) -> str:
+        """Write chrome_trace() to a JSON file.
+
+        Returns:
+            str: The path written
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f)
+        return path
+
+
+def _mb(value: Optional[int]) -> Optional[float]:
+    return round(value / MB, 1) if value is not None else None
+
+
+def span(profiler: Optional[Profiler], name: str, **args):
+    """Return profiler.span(name, **args), or a no-op context without a profiler."""
+    if profiler is None:
+        return contextlib.nullcontext(args)
+    return profiler.span(name, **args)
+
+
+def format_timings(timings: Dict[str, Any]) -> str:
+    """Render a result["timings"] block as a table, e.g. for cli_app.py --profile."""
+    wall = timings["wall"] or 1e-9
+    lines = [f"{'stage':<20} {'calls':>6} {'wall s':>9} {'cpu s':>9} {'share':>6} {'peak MB':>8}"]
+    for name, stage in sorted(timings["stages"].items(), key=lambda item: -item[1]["wall"]):
+        peak = f"{stage['peak_rss_mb']:.0f}" if stage["peak_rss_mb"] is not None else "-"
+        lines.append(
+            f"{name:<20} {stage['count']:>6} {stage['wall']:>9.2f} {stage['cpu']:>9.2f} "
+            f"{stage['wall'] / wall:>6.0%} {peak:>8}"
+        )
+    lines.append(f"{'total':<20} {'':>6} {timings['wall']:>9.2f} {timings['cpu']:>9.2f}")
+    windows = timings["windows"]
+    if windows:
+        slowest = max(windows, key=lambda window: window["wall"])
+        lines.append(
+            f"{len(windows)} window(s), mean {sum(w['wall'] for w in windows) / len(windows):.2f}s, "
+            f"slowest {slowest['wall']:.2f}s at {slowest.get('start', 0.0):.0f}s; "
+            f"{timings['fallbacks']} temperature fallback(s)"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,74 @@
+"""
+Transcription progress reporting.
+
+Progress is derived from the decoder's seek position over the total audio
+duration, which is the only honest measure Whisper offers: every window
+advances the seek by however much audio it managed to transcribe.
+"""
+from dataclasses import dataclass
+from typing import Optional
+
+
+def format_duration(seconds: float) -> str:
+    """Format seconds as M:SS or H:MM:SS."""
+    seconds = int(round(max(seconds, 0)))
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{secs:02d}"
+    return f"{minutes}:{secs:02d}"
+
+
+@dataclass
+class TranscriptionProgress:
+    """Snapshot of a running transcription, passed to progress callbacks."""
+
+    position: float  # seconds of audio decoded so far
+    duration: float  # total seconds of audio
+    elapsed: float   # wall-clock seconds spent decoding
+    start: float = 0.0  # position decoding started from (resumed runs)
+
+    @property
+    def fraction(self) -> float:
+        """Decoded share of the audio, 0.0 to 1.0."""
+        if self.duration <= 0:
+            return 1.0
+        return min(max(self.position / self.duration, 0.0), 1.0)
+
+    @property
+    def percent(self) -> int:
+        """Decoded share of the audio as an integer percentage."""
+        return int(self.fraction * 100)
+
+    @property
+    def speed(self) -> Optional[float]:
+        """Audio seconds decoded per wall-clock second (>1 is faster than realtime)."""
+        decoded = self.position - self.start
+        if self.elapsed <= 0 or decoded <= 0:
+            return None
+        return decoded / self.elapsed
+
+    @property
+    def realtime_factor(self) -> Optional[float]:
+        """Wall-clock seconds per audio second (<1 is faster than realtime)."""
+        speed = self.speed
+        return 1.0 / speed if speed else None
+
+    @property
+    def eta(self) -> Optional[float]:
+        """Estimated seconds until decoding finishes, at the speed so far."""
+        speed = self.speed
+        if speed is None:
+            return None
+        return (self.duration - self.position) / speed
+
+    def format(self) -> str:
+        """Human-readable one-line summary, e.g. for a status bar."""
+        parts = [
+            f"{self.percent}%",
+            f"{format_duration(self.position)} / {format_duration(self.duration)}",
+        ]
+        if self.eta is not None:
+            parts.append(f"ETA {format_duration(self.eta)}")
+            parts.append(f"{self.speed:.1f}x realtime")
+        return " | ".join(parts)
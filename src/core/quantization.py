@@ -0,0 +1,186 @@
+"""
+Inference precision and int8 dynamic quantization.
+
+Three precisions are supported:
+
+- fp16: half precision, only meaningful on a CUDA GPU. Requested on a CPU it
+  quietly becomes fp32 instead of warning on every window.
+- fp32: full precision.
+- int8: the Whisper linear layers (attention projections and MLPs, most of
+  the compute) are converted with torch's dynamic quantization, which stores
+  their weights as int8 and quantizes activations on the fly. Runs on the
+  CPU only, where it is usually the fastest choice.
+
+Quantizing takes a while for larger models, so the quantized model's state
+dict is stored in a QuantizedModelCache and later loads rebuild the model
+from it without quantizing or loading the full-precision weights. The
+state dict is read with torch.load(weights_only=True), so a cache entry
+cannot run code when it is loaded.
+"""
+import copy
+import hashlib
+import pickle
+import warnings
+from typing import Callable, Optional
+
+from .cache import DiskCache
+
+PRECISIONS = ("fp32", "fp16", "int8")
+
+# Quantized models are a few hundred MB each for the larger sizes
+DEFAULT_MODEL_CACHE_BYTES = 8 * 1024 ** 3
+
+
+def resolve_precision(precision: Optional[str] = None, fp16: bool = True) -> str:
+    """Return the precision a transcription will actually run at.
+
+    Args:
+        precision (str, optional): "fp32", "fp16" or "int8". If None, fp16
+                                   decides between "fp16" and "fp32"
+        fp16 (bool): Legacy FP16 flag, used when precision is None
+
+    Returns:
+        str: The precision, with fp16 replaced by fp32 when no GPU is available
+
+    Raises:
+        ValueError: If precision is not one of PRECISIONS
+    """
+    if precision is None:
+        precision = "fp16" if fp16 else "fp32"
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unknown precision {precision!r}; expected one of {PRECISIONS}")
+    if precision == "fp16":
+        import torch
+
+        if not torch.cuda.is_available():
+            return "fp32"
+    return precision
+
+
+def quantize_model(model):
+    """Return an int8 dynamically quantized copy of a Whisper model on the CPU.
+
+    The original model is left untouched.
+    """
+    import torch
+    from whisper.model import Linear
+
+    quantized = copy.deepcopy(model).cpu().float().eval()
+    # Whisper subclasses nn.Linear only to cast weights to the input dtype;
+    # torch's quantizer matches exact types, so hand it plain nn.Linear layers
+    for module in quantized.modules():
+        if type(module) is Linear:
+            module.__class__ = torch.nn.Linear
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")  # deprecation notices from torch.ao
+        return torch.ao.quantization.quantize_dynamic(
+            quantized, {torch.nn.Linear}, dtype=torch.qint8, inplace=True
+        )
+
+
+def _build_quantized(data):
+    """Rebuild a quantized model saved by QuantizedModelCache.put()."""
+    import torch
+    from whisper.model import Linear, ModelDimensions, Whisper
+
+    model = Whisper(ModelDimensions(**data["dims"]))
+    # The same layers quantize_model() converts, as empty int8 layers to load into
+    for name, module in list(model.named_modules()):
+        if type(module) is Linear:
+            parent, _, attribute = name.rpartition(".")
+            setattr(model.get_submodule(parent), attribute, torch.ao.nn.quantized.dynamic.Linear(
+                module.in_features, module.out_features, bias_=module.bias is not None, dtype=torch.qint8
+            ))
+    model.load_state_dict(data["model_state_dict"], assign=True)
+    # Not part of the state dict; whisper.load_model() sets it per model
+    model.register_buffer("alignment_heads", data["alignment_heads"].to_sparse(), persistent=False)
+    return model.eval()
+
+
+class QuantizedModelCache(DiskCache):
+    """On-disk LRU cache of quantized Whisper models."""
+
+    suffix = ".pt"
+    kind = "models"
+
+    def __init__(
+        self, cache_dir: Optional[str] = None, max_bytes: int = DEFAULT_MODEL_CACHE_BYTES
+    ):
+        """Initialize the cache.
+
+        Args:
+            cache_dir (str, optional): Directory holding the cache entries.
+                                       Defaults to default_cache_dir("models")
+            max_bytes (int): Size cap; least recently used entries are evicted
+                             once the directory grows beyond it
+        """
+        super().__init__(cache_dir, max_bytes)
+
+    def make_key(self, model_name: str) -> str:
+        """Return the key for a model's quantized form.
+
+        The layout of quantized layers' state is tied to the torch and whisper
+        versions that wrote it, so both are part of the key.
+        """
+        import torch
+        import whisper
+
+        settings = f"{model_name}:int8:{torch.__version__}:{getattr(whisper, '__version__', '')}"
+        return hashlib.sha256(settings.encode("utf-8")).hexdigest()
+
+    def get(self, key: str):
+        """Return the cached quantized model for key, or None on a miss."""
+        import torch
+
+        path = self._path(key)
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                data = torch.load(path, map_location="cpu", weights_only=True)
+            model = _build_quantized(data)
+        except (FileNotFoundError, EOFError, RuntimeError, OSError, KeyError, TypeError, pickle.UnpicklingError):
+            # Missing, truncated or written in another format (e.g. a pickled
+            # module from an older version): quantize again
+            self.misses += 1
+            return None
+        self._touch(path)
+        self.hits += 1
+        return model
+
+    def put(self, key: str, model) -> None:
+        """Store a quantized model's state and evict old entries if over the cap."""
+        import torch
+
+        data = {
+            "dims": dict(model.dims.__dict__),
+            "alignment_heads": model.alignment_heads.to_dense(),
+            "model_state_dict": model.state_dict(),
+        }
+        self._write_atomic(key, lambda f: torch.save(data, f), mode="wb")
+
+
+def load_quantized(
+    model_name: str,
+    loader: Callable[[str], object],
+    cache: Optional[QuantizedModelCache] = None,
+):
+    """Return the int8 quantized form of a model, quantizing it only once.
+
+    Args:
+        model_name (str): Name of the Whisper model
+        loader (callable): Loads the full-precision model by name
+        cache (QuantizedModelCache, optional): Where quantized models are kept
+
+    Returns:
+        The quantized model, on the CPU
+    """
+    key = cache.make_key(model_name) if cache is not None else None
+    if key is not None:
+        model = cache.get(key)
+        if model is not None:
+            return model
+
+    model = quantize_model(loader(model_name))
+    if key is not None:
+        cache.put(key, model)
+    return model
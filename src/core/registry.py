@@ -0,0 +1,214 @@
+"""
+In-process Whisper model registry.
+
+Keeps several loaded models resident so switching between them does not
+reload weights from disk. Models are evicted least-recently-used first once
+their combined size exceeds a configurable memory budget. int8 quantized
+models are resident next to (and evicted independently of) full-precision
+ones, under "<name>:int8".
+"""
+import gc
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+
+from .quantization import QuantizedModelCache, load_quantized
+
+# Enough for e.g. tiny + base + small in fp32 with room to spare
+DEFAULT_MEMORY_BUDGET = 4 * 1024 ** 3
+
+
+def model_footprint(model) -> int:
+    """Return the bytes held by a model's parameters and buffers.
+
+    Weights packed by dynamic quantization are neither, so they are counted
+    from the state dict.
+    """
+    try:
+        tensors = list(model.parameters()) + list(model.buffers())
+        for name, value in model.state_dict().items():
+            if name.endswith("_packed_params._packed_params"):
+                tensors.extend(t for t in value if t is not None)
+        return sum(t.numel() * t.element_size() for t in tensors)
+    except (AttributeError, TypeError):
+        return 0
+
+
+def release_memory() -> None:
+    """Return freed tensor memory to the OS / CUDA allocator."""
+    gc.collect()
+    try:
+        import torch
+
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+    except ImportError:
+        pass
+
+
+class ModelRegistry:
+    """Thread-safe LRU cache of loaded Whisper models."""
+
+    def __init__(
+        self,
+        memory_budget: int = DEFAULT_MEMORY_BUDGET,
+        loader: Optional[Callable[[str], Any]] = None,
+        quantized_cache: Optional[QuantizedModelCache] = None,
+    ):
+        """Initialize an empty registry.
+
+        Args:
+            memory_budget (int): Maximum bytes of resident model weights. The
+                                 most recently used model is always kept, even
+                                 if it alone exceeds the budget
+            loader (callable, optional): Function loading a model by name.
+                                         Defaults to whisper.load_model
+            quantized_cache (QuantizedModelCache, optional): Where quantized
+                models are stored. Defaults to the standard cache directory
+                when loading with whisper.load_model; with a custom loader,
+                models are only cached if one is given
+        """
+        self.memory_budget = memory_budget
+        self._loader = loader
+        if quantized_cache is None and loader is None:
+            quantized_cache = QuantizedModelCache()
+        self.quantized_cache = quantized_cache
+        self._models: "OrderedDict[str, Any]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._lock = threading.RLock()
+        self._inference_locks: Dict[str, threading.Lock] = {}
+        # Models being loaded, so concurrent get() calls wait for one load
+        self._loading: Dict[str, Future] = {}
+
+    def get(self, model_name: str, quantized: bool = False):
+        """Return a loaded model, loading it on first use.
+
+        Args:
+            model_name (str): Name of the Whisper model
+            quantized (bool): Return the int8 dynamically quantized (CPU)
+                              form of the model instead
+
+        Returns:
+            The loaded Whisper model
+        """
+        key = self.key(model_name, quantized)
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                return self._models[key]
+            # Another thread is loading this model: wait for it, not for the lock
+            loading = self._loading.get(key)
+            if loading is None:
+                loading = self._loading[key] = Future()
+                owner = True
+            else:
+                owner = False
+        if not owner:
+            return loading.result()
+
+        # Loads take seconds to minutes; the lock is only held to publish the result
+        try:
+            model = self._load(model_name, quantized)
+        except BaseException as e:
+            with self._lock:
+                del self._loading[key]
+            loading.set_exception(e)
+            raise
+        with self._lock:
+            self._models[key] = model
+            self._sizes[key] = model_footprint(model)
+            del self._loading[key]
+            self._evict_over_budget()
+        loading.set_result(model)
+        return model
+
+    def _load(self, model_name: str, quantized: bool):
+        if self._loader is None:
+            import whisper
+
+            loader = whisper.load_model
+        else:
+            loader = self._loader
+        if not quantized:
+            return loader(model_name)
+
+        # Quantize the resident full-precision model if there is one
+        def load_float(name):
+            with self._lock:
+                model = self._models.get(name)
+            if model is not None:
+                return model
+            return loader(name) if self._loader else loader(name, device="cpu")
+
+        return load_quantized(model_name, load_float, self.quantized_cache)
+
+    @staticmethod
+    def key(model_name: str, quantized: bool = False) -> str:
+        """Return the name a model is held under, e.g. in loaded_models() and footprint().
+
+        The quantized form of a model is a separate entry, "<name>:int8".
+        """
+        return f"{model_name}:int8" if quantized else model_name
+
+    def inference_lock(self, model_name: str, quantized: bool = False) -> threading.Lock:
+        """Return the lock serializing inference on one model.
+
+        Whisper's decoder keeps its key/value cache in forward hooks on the
+        model's own modules, so two threads decoding with the same model at
+        once corrupt each other's output. Threads sharing a registry hold
+        this lock while they decode.
+        """
+        key = self.key(model_name, quantized)
+        with self._lock:
+            return self._inference_locks.setdefault(key, threading.Lock())
+
+    def is_loaded(self, model_name: str, quantized: bool = False) -> bool:
+        """Return True if the model (or its quantized form) is resident."""
+        with self._lock:
+            return self.key(model_name, quantized) in self._models
+
+    def loaded_models(self) -> List[str]:
+        """Return resident model names, least recently used first."""
+        with self._lock:
+            return list(self._models)
+
+    def memory_used(self) -> int:
+        """Return the bytes held by resident models."""
+        with self._lock:
+            return sum(self._sizes.values())
+
+    def footprint(self, model_name: str) -> Optional[int]:
+        """Return the measured size of a resident model, or None."""
+        with self._lock:
+            return self._sizes.get(model_name)
+
+    def evict(self, model_name: str) -> bool:
+        """Drop a model from the registry.
+
+        Returns:
+            bool: True if the model was resident
+        """
+        with self._lock:
+            if model_name not in self._models:
+                return False
+            del self._models[model_name]
+            del self._sizes[model_name]
+        release_memory()
+        return True
+
+    def clear(self) -> None:
+        """Drop every resident model."""
+        with self._lock:
+            self._models.clear()
+            self._sizes.clear()
+        release_memory()
+
+    def _evict_over_budget(self) -> None:
+        evicted = False
+        while len(self._models) > 1 and sum(self._sizes.values()) > self.memory_budget:
+            name, _ = self._models.popitem(last=False)
+            del self._sizes[name]
+            evicted = True
+        if evicted:
+            release_memory()
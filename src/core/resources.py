@@ -0,0 +1,256 @@
+"""
+Background sampling of system and process resources.
+
+A ResourceSampler takes a ResourceSample every interval on its own thread
+and keeps the most recent ones in a ring buffer, so a UI or a server can
+read a short history (for sparklines, or the peak memory of a job) without
+measuring anything on its own thread. A sample records:
+
+  - system-wide CPU use, and the CPU used by this process (all threads,
+    so it exceeds 100% when inference runs on several cores)
+  - the resident set size of this process and, separately, of its child
+    processes (e.g. batch workers)
+  - this process's thread count
+  - GPU utilization and memory when torch has already been imported and a
+    CUDA device is in use
+
+summarize() turns the samples of a time span into the per-job figures
+JobQueue attaches to each result as result["resources"]:
+
+    {"seconds": 41.2, "samples": 43, "peak_rss_mb": 812.4,
+     "mean_cpu_percent": 96.1, "peak_threads": 14, "peak_gpu_memory_mb": None}
+
+Jobs running side by side in one process share these figures: the peak
+RSS of a job is the whole process's peak while it ran.
+"""
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+MB = 1024 ** 2
+
+
+@dataclass
+class ResourceSample:
+    """Resource use at one moment."""
+
+    time: float              # time.monotonic() of the sample
+    cpu_percent: float       # system-wide, 0-100
+    process_cpu: float       # CPU seconds used by this process so far
+    process_cpu_percent: float  # this process since the previous sample, 100 = one core
+    rss: int                 # bytes resident for this process
+    children_rss: int        # bytes resident for its child processes
+    threads: int             # threads of this process
+    gpu_percent: Optional[float] = None
+    gpu_memory: Optional[int] = None  # bytes allocated by torch on the GPU
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "time": self.time,
+            "cpu_percent": self.cpu_percent,
+            "process_cpu_percent": self.process_cpu_percent,
+            "rss_mb": self.rss / MB,
+            "children_rss_mb": self.children_rss / MB,
+            "threads": self.threads,
+            "gpu_percent": self.gpu_percent,
+            "gpu_memory_mb": self.gpu_memory / MB if self.gpu_memory is not None else None,
+        }
+
+
+def _cuda():
+    """Return torch.cuda if torch is imported and a GPU is in use, else None.
+
+    torch is never imported here: that takes seconds, and a process that
+    has not imported it has nothing on the GPU.
+    """
+    torch = sys.modules.get("torch")
+    if torch is not None and torch.cuda.is_available():
+        return torch.cuda
+    return None
+
+
+class ResourceSampler:
+    """Samples resource use on a background thread into a ring buffer."""
+
+    def __init__(self, interval: float = 1.0, capacity: int = 600, gpu: bool = True):
+        """Initialize the sampler; call start() to begin sampling.
+
+        Args:
+            interval (float): Seconds between two samples
+            capacity (int): Samples kept; older ones are dropped
+            gpu (bool): Also sample the GPU when one is in use
+        """
+        import psutil
+
+        self.interval = interval
+        self.gpu = gpu
+        self._psutil = psutil
+        self._process = psutil.Process()
+        self._samples: deque = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # GPU utilization source: torch (needs pynvml), then nvidia-smi, then none
+        self._gpu_utilization = "torch"
+        # The first cpu_percent() calls only set the baseline
+        psutil.cpu_percent()
+        self._last_cpu = (time.monotonic(), self._process_cpu())
+
+    def start(self) -> "ResourceSampler":
+        """Start the sampling thread (once); returns the sampler."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="resource-sampler", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the sampling thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def __enter__(self) -> "ResourceSampler":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
+
+    def sample(self) -> ResourceSample:
+        """Take a sample now, add it to the history and return it.
+
+        The sampling thread calls this every interval; a job calls it when
+        it starts and ends so even short jobs have samples of their own.
+        """
+        now = time.monotonic()
+        cpu = self._process_cpu()
+        with self._lock:
+            last_time, last_cpu = self._last_cpu
+            self._last_cpu = (now, cpu)
+        elapsed = now - last_time
+        rss, threads = self._process_memory()
+        gpu_percent, gpu_memory = self._gpu() if self.gpu else (None, None)
+        sample = ResourceSample(
+            time=now,
+            cpu_percent=self._psutil.cpu_percent(),
+            process_cpu=cpu,
+            process_cpu_percent=(cpu - last_cpu) / elapsed * 100 if elapsed > 0 else 0.0,
+            rss=rss,
+            children_rss=self._children_rss(),
+            threads=threads,
+            gpu_percent=gpu_percent,
+            gpu_memory=gpu_memory,
+        )
+        with self._lock:
+            self._samples.append(sample)
+        return sample
+
+    def samples(self, since: Optional[float] = None) -> List[ResourceSample]:
+        """Return the kept samples, oldest first, optionally only those from since on."""
+        with self._lock:
+            samples = list(self._samples)
+        if since is not None:
+            samples = [sample for sample in samples if sample.time >= since]
+        return samples
+
+    def latest(self) -> Optional[ResourceSample]:
+        """Return the most recent sample, or None before the first one."""
+        with self._lock:
+            return self._samples[-1] if self._samples else None
+
+    def summarize(self, start: float, end: Optional[float] = None) -> Dict[str, Any]:
+        """Summarize the samples taken between two time.monotonic() times.
+
+        Args:
+            start (float): Start of the span, e.g. when a job started
+            end (float, optional): End of the span; defaults to now
+
+        Returns:
+            Dict[str, Any]: Peak and mean figures (None without samples)
+        """
+        end = time.monotonic() if end is None else end
+        samples = [sample for sample in self.samples(start) if sample.time <= end]
+        summary: Dict[str, Any] = {
+            "seconds": end - start,
+            "samples": len(samples),
+            "peak_rss_mb": None,
+            "mean_cpu_percent": None,
+            "peak_threads": None,
+            "peak_gpu_memory_mb": None,
+        }
+        if not samples:
+            return summary
+        summary["peak_rss_mb"] = max(sample.rss for sample in samples) / MB
+        summary["peak_threads"] = max(sample.threads for sample in samples)
+        first, last = samples[0], samples[-1]
+        if last.time > first.time:
+            # CPU seconds over wall seconds is exact however few samples there are
+            summary["mean_cpu_percent"] = (last.process_cpu - first.process_cpu) / (last.time - first.time) * 100
+        gpu = [sample.gpu_memory for sample in samples if sample.gpu_memory is not None]
+        if gpu:
+            summary["peak_gpu_memory_mb"] = max(gpu) / MB
+        return summary
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.sample()
+            except Exception:
+                # A process or device that vanished between two calls; try again next time
+                pass
+            self._stop.wait(self.interval)
+
+    def _process_cpu(self) -> float:
+        times = self._process.cpu_times()
+        return times.user + times.system
+
+    def _process_memory(self):
+        with self._process.oneshot():
+            return self._process.memory_info().rss, self._process.num_threads()
+
+    def _children_rss(self) -> int:
+        total = 0
+        for child in self._process.children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except self._psutil.Error:
+                pass
+        return total
+
+    def _gpu(self):
+        cuda = _cuda()
+        if cuda is None:
+            return None, None
+        memory = cuda.memory_allocated()
+        utilization = None
+        if self._gpu_utilization == "torch":
+            try:
+                utilization = float(cuda.utilization())
+            except Exception:
+                self._gpu_utilization = "nvidia-smi"
+        if self._gpu_utilization == "nvidia-smi":
+            try:
+                output = subprocess.check_output(
+                    ["nvidia-smi", "--query-gpu=utilization.gpu", "--format=csv,noheader,nounits"],
+                    encoding="utf-8",
+                    timeout=5,
+                )
+                utilization = float(output.splitlines()[0])
+            except Exception:
+                self._gpu_utilization = None
+        return utilization, memory
+
+
+def format_resources(summary: Dict[str, Any]) -> str:
+    """Render a result["resources"] block on one line, e.g. "peak 812 MB, CPU 96%"."""
+    parts = []
+    if summary.get("peak_rss_mb") is not None:
+        parts.append(f"peak {summary['peak_rss_mb']:.0f} MB")
+    if summary.get("mean_cpu_percent") is not None:
+        parts.append(f"CPU {summary['mean_cpu_percent']:.0f}%")
+    if summary.get("peak_gpu_memory_mb") is not None:
+        parts.append(f"GPU {summary['peak_gpu_memory_mb']:.0f} MB")
+    return ", ".join(parts)
@@ -0,0 +1,304 @@
+"""
+Streaming audio source for long recordings.
+
+The default pipeline holds the whole recording in memory twice over: the
+decoded samples (about 230 MB per hour) and the full log-mel spectrogram. For
+multi-hour files this module keeps memory flat instead:
+
+- decode_to_npy() streams decoded samples straight into an .npy file (from a
+  WAV reader or ffmpeg's stdout pipe), never holding the whole file.
+- PcmFile reads sample ranges from such a file on demand.
+- StreamingMel computes log-mel features one window at a time. It behaves
+  like the mel tensor WindowDecoder slices, including Whisper's
+  normalisation against the spectrogram's global maximum, which is found in
+  a first streaming pass.
+
+Peak memory is then a few windows' worth of samples and features, whatever
+the duration of the audio.
+"""
+import os
+import struct
+import subprocess
+import tempfile
+import wave
+from typing import Union
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+N_FFT = 400
+HOP_LENGTH = 160
+N_SAMPLES = 30 * SAMPLE_RATE  # samples in a 30-second window
+N_FRAMES = N_SAMPLES // HOP_LENGTH
+
+# Fixed .npy header size, so the header can be rewritten once the length is known
+NPY_HEADER_BYTES = 128
+
+# Samples read per block while decoding or scanning (about 30 seconds)
+BLOCK_SAMPLES = N_SAMPLES
+
+
+def _npy_header(length: int) -> bytes:
+    """Return a version 1.0 .npy header for a 1-D float32 array, padded to NPY_HEADER_BYTES."""
+    header = "{'descr': '<f4', 'fortran_order': False, 'shape': (%d,), }" % length
+    header = header.ljust(NPY_HEADER_BYTES - 10 - 1) + "\n"
+    return b"\x93NUMPY\x01\x00" + struct.pack("<H", len(header)) + header.encode("latin1")
+
+
+def _wav_blocks(path: str):
+    """Yield float32 blocks of a 16-bit mono 16 kHz WAV file, or None if it is another format."""
+    try:
+        f = wave.open(path, "rb")
+    except (wave.Error, EOFError):
+        return None
+    if (f.getframerate(), f.getnchannels(), f.getsampwidth()) != (SAMPLE_RATE, 1, 2):
+        f.close()
+        return None
+
+    def blocks():
+        with f:
+            while True:
+                frames = f.readframes(BLOCK_SAMPLES)
+                if not frames:
+                    return
+                yield np.frombuffer(frames, dtype="<i2").astype(np.float32) / 32768.0
+
+    return blocks()
+
+
+def _ffmpeg_blocks(path: str):
+    """Yield float32 blocks decoded by an ffmpeg subprocess, read from its stdout pipe."""
+    cmd = [
+        "ffmpeg", "-nostdin", "-threads", "0", "-i", path,
+        "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(SAMPLE_RATE), "-",
+    ]
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    try:
+        while True:
+            data = process.stdout.read(BLOCK_SAMPLES * 2)
+            if not data:
+                break
+            yield np.frombuffer(data, dtype="<i2").astype(np.float32) / 32768.0
+        stderr = process.stderr.read()
+        if process.wait() != 0:
+            raise RuntimeError(f"Failed to load audio: {stderr.decode(errors='replace')}")
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+
+
+def decode_to_npy(path: str, out) -> int:
+    """Decode an audio file into a 16 kHz mono float32 .npy file, block by block.
+
+    Samples are scaled exactly like whisper.load_audio.
+
+    Args:
+        path (str): Path to the audio file
+        out: Path of the .npy file to write, or a seekable binary file object
+
+    Returns:
+        int: Number of samples written
+    """
+    if path.lower().endswith(".npy"):
+        source = PcmFile(path)
+        blocks = (source.read(i, i + BLOCK_SAMPLES) for i in range(0, len(source), BLOCK_SAMPLES))
+    else:
+        blocks = _wav_blocks(path) if path.lower().endswith(".wav") else None
+        if blocks is None:
+            blocks = _ffmpeg_blocks(path)
+
+    if isinstance(out, str):
+        with open(out, "wb") as f:
+            return decode_to_npy(path, f)
+
+    start = out.tell()
+    out.write(_npy_header(0))
+    length = 0
+    for block in blocks:
+        out.write(np.ascontiguousarray(block, dtype="<f4").tobytes())
+        length += len(block)
+    end = out.tell()
+    out.seek(start)
+    out.write(_npy_header(length))
+    out.seek(end)
+    return length
+
+
+class PcmFile:
+    """Random access to the samples of a 1-D float32 .npy file without loading it."""
+
+    def __init__(self, path: str, delete: bool = False):
+        """Open the file.
+
+        Args:
+            path (str): Path to the .npy file
+            delete (bool): Remove the file once it is no longer needed. On
+                           POSIX it is unlinked right away; the open handle
+                           keeps the data readable until close()
+        """
+        self.path = path
+        self._file = open(path, "rb")
+        version = np.lib.format.read_magic(self._file)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(self._file)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(self._file)
+        if len(shape) != 1 or dtype != np.dtype("<f4"):
+            self._file.close()
+            raise ValueError(f"{path} is not a 1-D float32 array")
+        self._offset = self._file.tell()
+        self._length = shape[0]
+
+        self._delete = delete
+        if delete:
+            try:
+                os.unlink(path)
+                self._delete = False
+            except OSError:
+                pass  # e.g. Windows: removed in close()
+
+    def __len__(self) -> int:
+        return self._length
+
+    def read(self, start: int, stop: int) -> np.ndarray:
+        """Return samples [start, stop), clipped to the file."""
+        start = max(0, start)
+        stop = min(stop, self._length)
+        if stop <= start:
+            return np.zeros(0, dtype=np.float32)
+        self._file.seek(self._offset + start * 4)
+        return np.frombuffer(self._file.read((stop - start) * 4), dtype="<f4").astype(np.float32)
+
+    def close(self) -> None:
+        """Close the file (and delete it if requested)."""
+        if not self._file.closed:
+            self._file.close()
+        if self._delete:
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+            self._delete = False
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+def open_streaming(path: str, cache=None) -> PcmFile:
+    """Decode an audio file for streaming, without holding it in memory.
+
+    Args:
+        path (str): Path to the audio file
+        cache (DecodedAudioCache, optional): Cache the decoded samples are
+                                             streamed into and read back from.
+                                             Without it a temporary file is used
+
+    Returns:
+        PcmFile: Reader over the decoded samples
+    """
+    if cache is not None:
+        return cache.open(path)
+
+    fd, tmp_path = tempfile.mkstemp(suffix=".npy")
+    os.close(fd)
+    try:
+        decode_to_npy(path, tmp_path)
+        return PcmFile(tmp_path, delete=True)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+
+
+class StreamingMel:
+    """Log-mel spectrogram computed window by window from a sample source.
+
+    Slicing mel[:, start:stop] returns the same frames as slicing
+    whisper.log_mel_spectrogram(audio, n_mels, padding=N_SAMPLES), which is
+    the only way WindowDecoder accesses it.
+    """
+
+    def __init__(self, source: Union[PcmFile, np.ndarray], n_mels: int = 80):
+        """Scan the source once for the spectrogram's global maximum.
+
+        Args:
+            source: A PcmFile (or another reader with len() and
+                    read(start, stop)) or an array of 16 kHz float32 samples
+            n_mels (int): Number of mel bands of the model
+        """
+        import torch
+        from whisper.audio import mel_filters
+
+        self.source = source
+        self.n_mels = n_mels
+        self.n_samples = len(source)
+        # Same width as the full spectrogram of the audio plus 30 s of padding
+        self.n_frames = (self.n_samples + N_SAMPLES) // HOP_LENGTH
+        self.shape = (n_mels, self.n_frames)
+        self._window = torch.hann_window(N_FFT)
+        self._filters = mel_filters("cpu", n_mels)
+
+        self.max = -np.inf
+        for start in range(0, self.n_frames, N_FRAMES):
+            log_spec = self._log_spec(start, min(start + N_FRAMES, self.n_frames))
+            self.max = max(self.max, float(log_spec.max()))
+
+    def _samples(self, start: int, stop: int) -> np.ndarray:
+        """Return samples [start, stop) of the audio followed by N_SAMPLES of silence.
+
+        Negative indices mirror the start of the audio, like the reflect
+        padding torch.stft(center=True) applies.
+        """
+        out = np.zeros(stop - start, dtype=np.float32)
+        lo, hi = max(start, 0), min(stop, self.n_samples)
+        if hi > lo:
+            out[lo - start:hi - start] = self._read(lo, hi)
+        if start < 0:
+            # Reflect around sample 0 (x[-i] = x[i]); past the audio it is silence
+            head = np.zeros(-start + 1, dtype=np.float32)
+            available = self._read(0, min(-start + 1, self.n_samples))
+            head[: len(available)] = available
+            out[: -start] = head[-start:0:-1]
+        return out
+
+    def _read(self, start: int, stop: int) -> np.ndarray:
+        if isinstance(self.source, np.ndarray):
+            return np.asarray(self.source[start:stop], dtype=np.float32)
+        return self.source.read(start, stop)
+
+    def _log_spec(self, start: int, stop: int):
+        """Unnormalised log10 mel energies of frames [start, stop)."""
+        import torch
+
+        half = N_FFT // 2
+        samples = self._samples(start * HOP_LENGTH - half, (stop - 1) * HOP_LENGTH + half)
+        stft = torch.stft(
+            torch.from_numpy(samples), N_FFT, HOP_LENGTH,
+            window=self._window, center=False, return_complex=True,
+        )
+        magnitudes = stft.abs() ** 2
+        mel_spec = self._filters @ magnitudes
+        return torch.clamp(mel_spec, min=1e-10).log10()
+
+    def __getitem__(self, key):
+        """Return mel[:, start:stop] as a tensor, normalised like log_mel_spectrogram."""
+        import torch
+
+        if not (isinstance(key, tuple) and len(key) == 2 and key[0] == slice(None)):
+            raise TypeError("StreamingMel only supports mel[:, start:stop]")
+        start, stop, step = key[1].indices(self.n_frames)
+        if step != 1:
+            raise TypeError("StreamingMel does not support strided slices")
+        if stop <= start:
+            return torch.zeros(self.n_mels, 0)
+        log_spec = self._log_spec(start, stop)
+        log_spec = torch.maximum(log_spec, torch.tensor(self.max - 8.0))
+        return (log_spec + 4.0) / 4.0
+
+    def close(self) -> None:
+        """Close the underlying reader, if any."""
+        if not isinstance(self.source, np.ndarray):
+            self.source.close()
@@ -2,58 +2,553 @@
 Whisper Transcription Tool - Core transcription functionality.
 
 This module provides the Transcriber class that handles audio transcription
-using OpenAI's Whisper model.
+using OpenAI's Whisper model. torch and whisper take seconds to import, so they
+are only imported once a model is loaded or a transcription starts; creating a
+Transcriber (e.g. while a window is being built) stays cheap.
 """
 import os
-from typing import Optional, Dict, Any
+import time
+from typing import Optional, Dict, Any, Callable, Iterator, List, Sequence, Tuple
 
-import whisper
-import torch
+import numpy as np
+
+from .audio import DecodedAudioCache, load_audio
+from .cache import TranscriptionCache
+from .cancellation import CancellationToken, TranscriptionCancelled
+from .checkpoint import TranscriptionCheckpoint, checkpoint_key, checkpoint_path
+from .profiling import Profiler, span
+from .progress import TranscriptionProgress
+from .quantization import resolve_precision
+from .streaming import N_SAMPLES, open_streaming
+from .registry import ModelRegistry, release_memory
+from .vad import detect_speech
 
 
 class Transcriber:
     """Handles audio transcription using OpenAI's Whisper model."""
 
-    def __init__(self, model_name: str = "base"):
+    def __init__(
+        self,
+        model_name: str = "base",
+        cache: Optional[TranscriptionCache] = None,
+        registry: Optional[ModelRegistry] = None,
+        audio_cache: Optional[DecodedAudioCache] = None,
+        low_memory: bool = False,
+        vad: bool = False,
+        precision: Optional[str] = None,
+        profile: bool = False,
+        checkpoint: bool = False,
+    ):
         """Initialize the transcriber with specified model.
 
         Args:
             model_name (str): Name of the Whisper model to use.
                              Options: "tiny", "base", "small", "medium", "large"
+            cache (TranscriptionCache, optional): Result cache consulted before
+                                                  running inference
+            registry (ModelRegistry, optional): Registry keeping loaded models
+                                                resident. Share one registry to
+                                                switch models without reloading
+            audio_cache (DecodedAudioCache, optional): Cache of decoded audio;
+                                                       files seen before skip
+                                                       decoding
+            low_memory (bool): Stream audio from disk and compute mel features
+                               window by window, so memory stays flat however
+                               long the recording is
+            vad (bool): Detect speech first and only transcribe the speech
+                        regions; timestamps stay on the original timeline
+            precision (str, optional): "fp32", "fp16" or "int8" (int8 dynamic
+                                       quantization, CPU only). fp16 falls back
+                                       to fp32 without a GPU. If None, the fp16
+                                       argument of each call decides
+            profile (bool): Time every stage of transcribe() and
+                            transcribe_stream() and attach the breakdown to
+                            the result as result["timings"] (see
+                            profiling.Profiler); last_profile keeps the spans
+                            for export_chrome_trace()
+            checkpoint (bool): Save the progress of transcribe_stream() on an
+                               audio file to a sidecar file as windows are
+                               decoded, resume an interrupted run from it, and
+                               answer a completed one from it (see
+                               checkpoint.TranscriptionCheckpoint)
         """
         self.model_name = model_name
         self.model = None
+        self.loaded_model_name = None
+        self.loaded_quantized = False
         self.current_audio_file = None
-        # Print GPU availability
-        print(f"Using GPU: {torch.cuda.is_available()}")
+        self.last_result = None
+        self.cache = cache
+        self.registry = registry if registry is not None else ModelRegistry()
+        self.audio_cache = audio_cache
+        self.low_memory = low_memory
+        self.vad = vad
+        self.precision = precision
+        self.profile = profile
+        self.last_profile: Optional[Profiler] = None
+        self.checkpoint = checkpoint
+        # Seconds into the audio the last transcription resumed from, if it did
+        self.resumed_from: Optional[float] = None
+        # Whether the last transcription was replayed from the cache or a
+        # completed checkpoint, without decoding
+        self.replayed = False
+
+    @property
+    def quantized(self) -> bool:
+        """True if the int8 quantized form of the model is used."""
+        return self.precision == "int8"
+
+    def is_model_loaded(self) -> bool:
+        """Return True if the current model_name can be used without loading from disk."""
+        return (
+            self.model is not None
+            and self.loaded_model_name == self.model_name
+            and self.loaded_quantized == self.quantized
+        ) or self.registry.is_loaded(self.model_name, quantized=self.quantized)
 
     def load_model(self) -> None:
-        """Load the Whisper model."""
-        if self.model is None:
-            self.model = whisper.load_model(self.model_name)
+        """Load the Whisper model named by model_name.
+
+        Switching model_name (or precision to or from int8) and calling this
+        again picks the new model from the registry, which is instant if it
+        is still resident.
+        """
+        if (
+            self.model is None
+            or self.loaded_model_name != self.model_name
+            or self.loaded_quantized != self.quantized
+        ):
+            if self.model is None:
+                # Print GPU availability
+                import torch
+                print(f"Using GPU: {torch.cuda.is_available()}")
+            self.model = self.registry.get(self.model_name, quantized=self.quantized)
+            self.loaded_model_name = self.model_name
+            self.loaded_quantized = self.quantized
+
+    def open_audio(self, audio_file: str):
+        """Decode an audio file for transcription.
+
+        Returns:
+            np.ndarray or PcmFile: Samples in memory, or in low_memory mode a
+                                   reader streaming them from disk
+        """
+        if self.low_memory:
+            return open_streaming(audio_file, self.audio_cache)
+        return load_audio(audio_file, self.audio_cache)
+
+    def _result_settings(self, fp16: bool, decode_options: Dict[str, Any]) -> Tuple[bool, Dict[str, Any]]:
+        """Return the (fp16, options) a result depends on.
+
+        VAD and quantization change the result, so they are part of the
+        options; fp16 is the effective setting, so fp16 requested on a CPU
+        shares fp32 results.
+        """
+        precision = resolve_precision(self.precision, fp16)
+        if self.vad:
+            decode_options = dict(decode_options, vad=True)
+        if precision == "int8":
+            decode_options = dict(decode_options, precision="int8")
+        return precision == "fp16", decode_options
+
+    def _cache_key(self, audio_file, fp16: bool, decode_options: Dict[str, Any]) -> str:
+        """Return the result cache key."""
+        fp16, decode_options = self._result_settings(fp16, decode_options)
+        return self.cache.make_key(audio_file, self.model_name, fp16, decode_options)
+
+    def _checkpoint(self, audio_file, fp16: bool, decode_options: Dict[str, Any]):
+        """Return the TranscriptionCheckpoint of an audio file, or None if not checkpointing."""
+        if not self.checkpoint or not isinstance(audio_file, str):
+            return None
+        fp16, decode_options = self._result_settings(fp16, decode_options)
+        return TranscriptionCheckpoint(
+            checkpoint_path(audio_file),
+            checkpoint_key(audio_file, self.model_name, fp16, decode_options),
+        )
+
+    def is_complete(self, audio_file: str, fp16: bool = True, **decode_options) -> bool:
+        """Return True if a checkpoint holds the finished transcription of audio_file."""
+        checkpoint = self._checkpoint(audio_file, fp16, decode_options)
+        return checkpoint is not None and checkpoint.result() is not None
+
+    def is_cached(self, audio_file: str, fp16: bool = True, **decode_options) -> bool:
+        """Return True if transcribe() would be answered from the result cache."""
+        if self.cache is None:
+            return False
+        return self.cache.contains(self._cache_key(audio_file, fp16, decode_options))
 
     def transcribe(
         self, 
         audio_file: str, 
         fp16: bool = True,
-        progress_callback: Optional[callable] = None
+        progress_callback: Optional[callable] = None,
+        cancel_token: Optional[CancellationToken] = None,
+        samples=None,
+        **decode_options
     ) -> Dict[str, Any]:
         """Transcribe an audio file using the loaded Whisper model.
 
+        If a cache is set, a previous result for the same audio content, model
+        and options is returned without running inference.
+
         Args:
             audio_file (str): Path to the audio file to transcribe
             fp16 (bool): Whether to use FP16 for faster inference on GPU
-            progress_callback (callable, optional): Callback function for progress updates
+            progress_callback (callable, optional): Called with a
+                TranscriptionProgress after every decoded window
+            cancel_token (CancellationToken, optional): Checked between
+                decode windows; see transcribe_stream()
+            samples (np.ndarray or PcmFile, optional): audio_file already
+                opened by open_audio(), e.g. by an AudioPrefetcher
+            **decode_options: Extra options passed to Whisper's decoding
 
         Returns:
             Dict[str, Any]: Transcription result containing the text and other metadata
+
+        Raises:
+            TranscriptionCancelled: If cancel_token was cancelled
         """
-        if self.model is None:
-            self.load_model()
+        for _ in self.transcribe_stream(
+            audio_file,
+            fp16=fp16,
+            progress_callback=progress_callback,
+            cancel_token=cancel_token,
+            samples=samples,
+            **decode_options
+        ):
+            pass
+        return self.last_result
+
+    def transcribe_stream(
+        self,
+        audio_file: str,
+        fp16: bool = True,
+        progress_callback: Optional[Callable[[TranscriptionProgress], None]] = None,
+        cancel_token: Optional[CancellationToken] = None,
+        samples=None,
+        **decode_options
+    ) -> Iterator[Dict[str, Any]]:
+        """Transcribe an audio file, yielding segments as each window is decoded.
+
+        Segments have the same fields as result["segments"] from transcribe().
+        Once the generator is exhausted, last_result holds the full result
+        dict (text, segments, language), which is also stored in the cache.
+        With vad set, the result also has a "vad" entry reporting how much
+        audio was skipped (see vad.SpeechMap.summary); with profile set, a
+        "timings" entry with the time spent in each stage. With checkpoint set,
+        an interrupted transcription of the same file resumes where it stopped:
+        the segments decoded before are yielded first, then decoding continues.
 
+        Args:
+            audio_file (str): Path to the audio file to transcribe
+            fp16 (bool): Whether to use FP16 for faster inference on GPU.
+                         Ignored if precision is set, and without a GPU
+            progress_callback (callable, optional): Called with a
+                TranscriptionProgress once decoding starts and after every
+                decoded window
+            cancel_token (CancellationToken, optional): Checked before each
+                decode window. Once cancelled, the decode buffers are freed
+                and TranscriptionCancelled is raised; the model itself is
+                left untouched and ready for the next job
+            samples (np.ndarray or PcmFile, optional): audio_file already
+                opened by open_audio(). The result cache is still keyed by
+                audio_file. Without it, files are opened here
+            **decode_options: Extra options passed to Whisper's decoding
+
+        Yields:
+            Dict[str, Any]: Transcribed segments in order
+
+        Raises:
+            TranscriptionCancelled: If cancel_token was cancelled
+        """
         self.current_audio_file = audio_file
-        # TODO: Implement progress callback when Whisper API supports it
-        result = self.model.transcribe(audio_file, fp16=fp16)
+        self.last_result = None
+        self.resumed_from = None
+        self.replayed = False
+        profiler = self.last_profile = Profiler() if self.profile else None
+
+        cache_key = None
+        if self.cache is not None:
+            with span(profiler, "cache_lookup"):
+                cache_key = self._cache_key(audio_file, fp16, decode_options)
+                cached = self.cache.get(cache_key)
+            if cached is not None:
+                yield from self._replay(cached, progress_callback, profiler)
+                return
+
+        checkpoint = self._checkpoint(audio_file, fp16, decode_options)
+        state = None
+        if checkpoint is not None:
+            completed = checkpoint.result()
+            if completed is not None:
+                if cache_key is not None:
+                    self.cache.put(cache_key, completed)
+                yield from self._replay(completed, progress_callback, profiler)
+                return
+            state = checkpoint.state()
+            if state is not None:
+                # Decode in the language detected before instead of detecting again
+                decode_options = dict(decode_options, language=state["language"])
+
+        with span(profiler, "load_model"):
+            self.load_model()
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+        fp16 = resolve_precision(self.precision, fp16) == "fp16"
+
+        if samples is None and isinstance(audio_file, str):
+            with span(profiler, "decode_audio"):
+                samples = self.open_audio(audio_file)
+
+        source = audio_file if samples is None else samples
+        speech = None
+        if self.vad:
+            with span(profiler, "vad"):
+                speech = detect_speech(source)
+            if not speech.regions:
+                # Nothing but silence: no window needs decoding
+                result = self._silent_result(speech, decode_options)
+                if progress_callback:
+                    progress_callback(TranscriptionProgress(speech.duration, speech.duration, 0.0))
+                if cache_key is not None:
+                    self.cache.put(cache_key, result)
+                if checkpoint is not None:
+                    checkpoint.complete(result)
+                self.last_result = self._with_timings(result, profiler)
+                return
+            source = speech.compact(source)
+
+        from .decoding import WindowDecoder
+
+        decoder = WindowDecoder(
+            self.model,
+            source,
+            fp16=fp16,
+            stream_mel=self.low_memory,
+            profiler=profiler,
+            **decode_options
+        )
+        if state is not None:
+            decoder.restore(state)
+            self.resumed_from = decoder.position
+            if speech is not None:
+                self.resumed_from = speech.to_original(decoder.position)
+        start = time.perf_counter()
+
+        def report_progress():
+            if progress_callback:
+                position = decoder.duration if decoder.finished else decoder.position
+                duration = decoder.duration
+                if speech is not None:
+                    # Report against the original recording, not the speech-only audio
+                    duration = speech.duration
+                    position = duration if decoder.finished else speech.to_original(position)
+                progress_callback(
+                    TranscriptionProgress(
+                        position=position,
+                        duration=duration,
+                        elapsed=time.perf_counter() - start,
+                        start=self.resumed_from or 0.0,
+                    )
+                )
+
+        # Decoder state as of the last completed window, saved if interrupted
+        state = decoder.state() if checkpoint is not None else None
+        try:
+            report_progress()
+            if self.resumed_from is not None:
+                # Replay what the interrupted run had decoded
+                segments = decoder.all_segments
+                if speech is not None:
+                    segments = [speech.remap_segment(segment) for segment in segments]
+                yield from segments
+            # The generator only decodes the next window when asked for it, so
+            # checking the token at the end of each iteration stops before it
+            for segments in decoder.windows():
+                if checkpoint is not None:
+                    state = decoder.state()
+                    checkpoint.save(state)
+                report_progress()
+                if speech is not None:
+                    segments = [speech.remap_segment(segment) for segment in segments]
+                yield from segments
+                if cancel_token is not None:
+                    cancel_token.raise_if_cancelled()
+        except BaseException as e:
+            if checkpoint is not None:
+                # Cancelled, failed or interrupted: keep the progress for the next run
+                checkpoint.save(state, force=True)
+            if isinstance(e, (TranscriptionCancelled, GeneratorExit)):
+                # Abandoned mid-file: free the mel spectrogram and cached tensors now
+                # rather than whenever the exception's traceback is collected
+                decoder.release()
+                release_memory()
+            raise
+        if decoder.seek < decoder.content_frames:
+            # Clips ending before the audio does: report completion explicitly
+            report_progress()
+
+        result = self._finish_result(decoder, speech)
+        if cache_key is not None:
+            self.cache.put(cache_key, result)
+        if checkpoint is not None:
+            checkpoint.complete(result)
+        self.last_result = self._with_timings(result, profiler)
+
+    def _replay(
+        self,
+        result: Dict[str, Any],
+        progress_callback: Optional[Callable[[TranscriptionProgress], None]],
+        profiler: Optional[Profiler],
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield the segments of a stored result (cache or completed checkpoint) and finish with it."""
+        self.replayed = True
+        yield from result.get("segments", [])
+        self.last_result = self._with_timings(result, profiler)
+        if progress_callback:
+            duration = result["segments"][-1]["end"] if result.get("segments") else 0.0
+            progress_callback(TranscriptionProgress(duration, duration, 0.0))
+
+    def transcribe_batch(
+        self,
+        audio_files: Sequence,
+        batch_size: int = 8,
+        fp16: bool = True,
+        cancel_token: Optional[CancellationToken] = None,
+        samples: Optional[Sequence] = None,
+        **decode_options
+    ) -> List[Dict[str, Any]]:
+        """Transcribe many short clips, running their windows through the model in batches.
+
+        Meant for workloads of many clips of up to about 30 seconds, where one
+        call per clip would leave the encoder busy with padding and pay the
+        per-call overhead every time. Clips are taken batch_size at a time;
+        their languages are detected in one batched pass, and windows that
+        share decoding options are encoded and decoded together (see
+        decoding.decode_batched). Longer clips work too, their later windows
+        are just less likely to share a batch.
+
+        Args:
+            audio_files (Sequence): Paths to audio files, or arrays of samples
+            batch_size (int): Number of clips decoded per forward pass. Larger
+                              batches use more memory for better throughput
+            fp16 (bool): Whether to use FP16 for faster inference on GPU.
+                         Ignored if precision is set, and without a GPU
+            cancel_token (CancellationToken, optional): Checked between batches
+            samples (Sequence, optional): The files already opened by
+                                          open_audio(), in the same order
+            **decode_options: Extra options passed to Whisper's decoding
+
+        Returns:
+            List[Dict[str, Any]]: One result per clip, in input order, each
+                                  as returned by transcribe()
+
+        Raises:
+            TranscriptionCancelled: If cancel_token was cancelled
+        """
+        from .decoding import WindowDecoder, decode_batched, detect_languages
+
+        batch_size = max(1, batch_size)
+        results: List[Optional[Dict[str, Any]]] = [None] * len(audio_files)
+        pending = []
+        for index, audio_file in enumerate(audio_files):
+            cache_key = None
+            if self.cache is not None:
+                cache_key = self._cache_key(audio_file, fp16, decode_options)
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    results[index] = cached
+                    continue
+            pending.append((index, cache_key))
+        if not pending:
+            return results
+
+        self.load_model()
+        fp16 = resolve_precision(self.precision, fp16) == "fp16"
+
+        for start in range(0, len(pending), batch_size):
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
+            batch = []
+            for index, cache_key in pending[start:start + batch_size]:
+                audio_file = audio_files[index]
+                source = samples[index] if samples is not None else None
+                if source is None:
+                    source = (
+                        self.open_audio(audio_file) if isinstance(audio_file, str) else audio_file
+                    )
+                speech = detect_speech(source) if self.vad else None
+                if speech is not None and not speech.regions:
+                    results[index] = self._silent_result(speech, decode_options)
+                    if cache_key is not None:
+                        self.cache.put(cache_key, results[index])
+                    continue
+                if speech is not None:
+                    source = speech.compact(source)
+                batch.append((index, cache_key, source, speech))
+            if not batch:
+                continue
+
+            languages = [decode_options.get("language")] * len(batch)
+            if languages[0] is None:
+                languages = detect_languages(
+                    self.model,
+                    [
+                        source[:N_SAMPLES] if isinstance(source, np.ndarray)
+                        else source.read(0, N_SAMPLES)
+                        for _, _, source, _ in batch
+                    ],
+                    fp16=fp16,
+                )
+            decoders = [
+                WindowDecoder(
+                    self.model,
+                    source,
+                    fp16=fp16,
+                    stream_mel=self.low_memory,
+                    **dict(decode_options, language=language)
+                )
+                for (_, _, source, _), language in zip(batch, languages)
+            ]
+            try:
+                decode_batched(decoders, batch_size)
+            except BaseException:
+                for decoder in decoders:
+                    decoder.release()
+                release_memory()
+                raise
+
+            for (index, cache_key, _, speech), decoder in zip(batch, decoders):
+                results[index] = self._finish_result(decoder, speech)
+                if cache_key is not None:
+                    self.cache.put(cache_key, results[index])
+        return results
+
+    @staticmethod
+    def _with_timings(result: Dict[str, Any], profiler: Optional[Profiler]) -> Dict[str, Any]:
+        """Attach a profiler's breakdown to a result (after it was cached)."""
+        if profiler is not None:
+            result = dict(result, timings=profiler.summary())
+        return result
+
+    @staticmethod
+    def _silent_result(speech, decode_options: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the result for audio in which VAD found no speech."""
+        return {
+            "text": "",
+            "segments": [],
+            "language": decode_options.get("language"),
+            "vad": speech.summary(),
+        }
+
+    @staticmethod
+    def _finish_result(decoder, speech) -> Dict[str, Any]:
+        """Return a finished decoder's result, remapped if VAD was used, and free it."""
+        result = decoder.result()
+        decoder.release()
+        if speech is not None:
+            result["segments"] = [speech.remap_segment(segment) for segment in result["segments"]]
+            result["vad"] = speech.summary()
         return result
 
     def save_transcription(self, text: str, output_path: Optional[str] = None) -> str:
@@ -0,0 +1,282 @@
+"""
+Voice activity detection pre-pass.
+
+Meetings and call recordings are often a third silence or more, and Whisper
+spends as long on a silent window as on a spoken one. detect_speech() finds
+the speech regions from short-time energy on the CPU, at a tiny fraction of
+the cost of one encoder pass. The returned SpeechMap cuts the audio down to
+those regions for the model and maps the timestamps of the result back onto
+the original timeline.
+
+The detector looks at loudness only: steady background noise is learned as
+the noise floor and skipped, but hold music and other loud non-speech is
+kept and transcribed as before.
+"""
+import bisect
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .progress import format_duration
+from .streaming import BLOCK_SAMPLES
+
+SAMPLE_RATE = 16000
+
+# Analysis frame length (20 ms, one Whisper timestamp step)
+FRAME_SAMPLES = 320
+
+# Frames quieter than this are never speech, whatever the noise floor
+SILENCE_DB = -60.0
+
+
+def _read(source, start: int, stop: int) -> np.ndarray:
+    """Return samples [start, stop) of an array or a PcmFile-like reader."""
+    if isinstance(source, np.ndarray):
+        return np.asarray(source[start:stop], dtype=np.float32)
+    return source.read(start, stop)
+
+
+def frame_energy(source) -> np.ndarray:
+    """Per-frame RMS energy in dB, read block by block.
+
+    Args:
+        source: 16 kHz mono samples, or a PcmFile streaming them from disk
+
+    Returns:
+        np.ndarray: One value per FRAME_SAMPLES frame (a trailing partial
+                    frame is included)
+    """
+    n_samples = len(source)
+    energies = []
+    for start in range(0, n_samples, BLOCK_SAMPLES):
+        block = _read(source, start, min(start + BLOCK_SAMPLES, n_samples))
+        pad = -len(block) % FRAME_SAMPLES
+        if pad:
+            block = np.concatenate([block, np.zeros(pad, dtype=np.float32)])
+        frames = block.reshape(-1, FRAME_SAMPLES).astype(np.float64)
+        energies.append(10 * np.log10(np.mean(frames ** 2, axis=1) + 1e-12))
+    if not energies:
+        return np.zeros(0)
+    return np.concatenate(energies)
+
+
+def _runs(active: np.ndarray) -> List[Tuple[int, int]]:
+    """Return the [start, end) frame ranges where active is True."""
+    edges = np.diff(np.concatenate([[0], active.astype(np.int8), [0]]))
+    return list(zip(np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)))
+
+
+def detect_speech(
+    source,
+    threshold_db: Optional[float] = None,
+    margin_db: float = 12.0,
+    min_speech: float = 0.25,
+    min_silence: float = 1.0,
+    pad: float = 0.2,
+) -> "SpeechMap":
+    """Find the regions of a recording that contain speech.
+
+    Args:
+        source: 16 kHz mono samples, or a PcmFile streaming them from disk
+        threshold_db (float, optional): Fixed energy threshold. By default it
+                                        is margin_db above the noise floor
+                                        (the 10th percentile frame energy)
+        margin_db (float): How far above the noise floor speech must be
+        min_speech (float): Shorter bursts (clicks, bumps) are dropped
+        min_silence (float): Shorter pauses are kept, so sentences are not
+                             chopped into pieces
+        pad (float): Seconds of context kept on either side of each region
+
+    Returns:
+        SpeechMap: The speech regions of the recording
+    """
+    n_samples = len(source)
+    energy = frame_energy(source)
+    if threshold_db is None:
+        floor = float(np.percentile(energy, 10)) if len(energy) else SILENCE_DB
+        threshold_db = floor + margin_db
+    threshold_db = max(threshold_db, SILENCE_DB)
+
+    frames_per_second = SAMPLE_RATE / FRAME_SAMPLES
+    regions: List[List[int]] = []
+    for start, end in _runs(energy > threshold_db):
+        if regions and start - regions[-1][1] < min_silence * frames_per_second:
+            regions[-1][1] = end
+        else:
+            regions.append([start, end])
+
+    pad_samples = int(pad * SAMPLE_RATE)
+    speech: List[Tuple[int, int]] = []
+    for start, end in regions:
+        if end - start < min_speech * frames_per_second:
+            continue
+        start = max(0, start * FRAME_SAMPLES - pad_samples)
+        end = min(n_samples, end * FRAME_SAMPLES + pad_samples)
+        if speech and start <= speech[-1][1]:
+            speech[-1] = (speech[-1][0], end)
+        else:
+            speech.append((start, end))
+    return SpeechMap(speech, n_samples)
+
+
+class SpeechSource:
+    """Reader over the speech regions of a PcmFile, as if they were one recording."""
+
+    def __init__(self, source, speech_map: "SpeechMap"):
+        self.source = source
+        self.speech_map = speech_map
+
+    def __len__(self) -> int:
+        return self.speech_map.speech_samples
+
+    def read(self, start: int, stop: int) -> np.ndarray:
+        """Return samples [start, stop) of the concatenated speech regions."""
+        offsets = self.speech_map.offsets
+        parts = []
+        for (region_start, region_end), offset in zip(self.speech_map.regions, offsets):
+            lo = max(start, offset)
+            hi = min(stop, offset + region_end - region_start)
+            if hi > lo:
+                parts.append(self.source.read(region_start + lo - offset, region_start + hi - offset))
+        if not parts:
+            return np.zeros(0, dtype=np.float32)
+        return np.concatenate(parts)
+
+    def close(self) -> None:
+        """Close the underlying reader."""
+        self.source.close()
+
+
+class SpeechMap:
+    """Speech regions of a recording, and the mapping from speech-only time back to it."""
+
+    def __init__(self, regions: Sequence[Tuple[int, int]], n_samples: int):
+        """Initialize the map.
+
+        Args:
+            regions (Sequence[Tuple[int, int]]): Ascending, non-overlapping
+                                                 sample ranges containing speech
+            n_samples (int): Length of the original recording in samples
+        """
+        self.regions = [(int(start), int(end)) for start, end in regions]
+        self.n_samples = n_samples
+        # Where each region starts once the regions are concatenated
+        self.offsets = [0]
+        for start, end in self.regions:
+            self.offsets.append(self.offsets[-1] + end - start)
+        self.speech_samples = self.offsets.pop()
+
+    @property
+    def duration(self) -> float:
+        """Seconds of audio in the original recording."""
+        return self.n_samples / SAMPLE_RATE
+
+    @property
+    def speech_duration(self) -> float:
+        """Seconds of audio kept for transcription."""
+        return self.speech_samples / SAMPLE_RATE
+
+    def compact(self, source):
+        """Return only the speech regions of source, concatenated.
+
+        Args:
+            source: The samples detect_speech() ran on, or a PcmFile
+
+        Returns:
+            An array for array input; a SpeechSource reading the regions on
+            demand for a PcmFile, so low-memory mode stays low-memory
+        """
+        if isinstance(source, np.ndarray):
+            if self.regions == [(0, self.n_samples)]:
+                return source
+            return np.concatenate([source[start:end] for start, end in self.regions])
+        return SpeechSource(source, self)
+
+    def to_original(self, seconds: float, end: bool = False) -> float:
+        """Map a time in the speech-only audio onto the original timeline.
+
+        Args:
+            seconds (float): Time in the concatenated speech regions
+            end (bool): Whether the time ends a span. A time exactly on the
+                        seam between two regions then maps to the end of the
+                        earlier region rather than the start of the later one
+
+        Returns:
+            float: Time in the original recording
+        """
+        if not self.regions:
+            return 0.0
+        sample = seconds * SAMPLE_RATE
+        search = bisect.bisect_left if end else bisect.bisect_right
+        index = min(max(search(self.offsets, sample) - 1, 0), len(self.regions) - 1)
+        start, stop = self.regions[index]
+        return min(start + sample - self.offsets[index], stop) / SAMPLE_RATE
+
+    def remap_segment(self, segment: Dict[str, Any]) -> Dict[str, Any]:
+        """Return a copy of a segment with its (and its words') times on the original timeline."""
+        remapped = dict(segment)
+        remapped["start"] = round(self.to_original(segment["start"]), 3)
+        remapped["end"] = round(self.to_original(segment["end"], end=True), 3)
+        if segment.get("words"):
+            remapped["words"] = [
+                {
+                    **word,
+                    "start": round(self.to_original(word["start"]), 3),
+                    "end": round(self.to_original(word["end"], end=True), 3),
+                }
+                for word in segment["words"]
+            ]
+        return remapped
+
+    def summary(self) -> Dict[str, Any]:
+        """Return the skipped-audio report stored with results as result["vad"]."""
+        return {
+            "duration": round(self.duration, 3),
+            "speech": round(self.speech_duration, 3),
+            "skipped": round(self.duration - self.speech_duration, 3),
+            "regions": len(self.regions),
+        }
+
+
+def estimate_speedup(summary: Dict[str, Any], timings: Dict[str, Any]) -> Optional[float]:
+    """Estimate how much faster VAD made a profiled run.
+
+    The model only saw the speech, so the wall time of its windows (and mel
+    spectrograms) per second of speech is its rate on this machine. Running
+    the whole recording at that rate, without the VAD pass itself, gives the
+    time the run would have taken with VAD off.
+
+    Args:
+        summary (Dict[str, Any]): A result["vad"] report
+        timings (Dict[str, Any]): The same result's result["timings"]
+
+    Returns:
+        Optional[float]: Time without VAD over time with it, or None if the
+                         run decoded no speech to measure the rate from
+    """
+    speech, wall = summary["speech"], timings["wall"]
+    stages = timings["stages"]
+    model = sum(window["wall"] for window in timings["windows"]) + stages.get("mel", {}).get("wall", 0.0)
+    if speech <= 0 or model <= 0 or wall <= 0:
+        return None
+    detection = stages.get("vad", {}).get("wall", 0.0)
+    without_vad = wall - detection - model + model * summary["duration"] / speech
+    return without_vad / wall
+
+
+def format_summary(summary: Dict[str, Any], timings: Optional[Dict[str, Any]] = None) -> str:
+    """Describe a result["vad"] report, e.g. for the CLI or the status bar.
+
+    Args:
+        summary (Dict[str, Any]): A result["vad"] report
+        timings (Dict[str, Any], optional): The result's result["timings"];
+                                            adds the estimated speedup
+
+    Returns:
+        str: E.g. "VAD skipped 3:20 of 10:00 (33% of the audio, 1.4x faster)"
+    """
+    duration, skipped = summary["duration"], summary["skipped"]
+    share = skipped / duration * 100 if duration else 0.0
+    speedup = estimate_speedup(summary, timings) if timings else None
+    faster = f", {speedup:.1f}x faster" if speedup is not None else ""
+    return f"VAD skipped {format_duration(skipped)} of {format_duration(duration)} ({share:.0f}% of the audio{faster})"
@@ -0,0 +1,93 @@
+"""
+Deferred import of the inference stack, and model warm-up.
+
+Importing torch and whisper takes seconds, so entry points avoid doing it at
+startup. The GUI warms up on a worker thread once the window is up, so the
+first transcription does not pay for it either. A transcription started
+while the warm-up is still running simply waits on Python's import lock for
+it to finish.
+
+Even with the model loaded, the first inference is several times slower than
+the ones after it: torch picks its kernels, grows its allocator and (on a GPU)
+sets up its CUDA context on first use. warm_up_model() loads a model and pays
+for that with a short dummy inference, timing it and a second, warm one.
+"""
+import time
+from typing import Dict
+
+# Length of the dummy clip decoded by warm_up_model(); every window is padded
+# to 30 seconds for the encoder anyway
+WARMUP_SECONDS = 1.0
+# Caps the decoder's steps on the dummy clip
+WARMUP_SAMPLE_LEN = 8
+
+
+def import_backend() -> float:
+    """Import torch and whisper.
+
+    Returns:
+        float: Seconds the import took (close to zero if already imported)
+    """
+    start = time.perf_counter()
+    import torch  # noqa: F401
+    import whisper  # noqa: F401
+    return time.perf_counter() - start
+
+
+def warm_up_model(transcriber, fp16: bool = True, seconds: float = WARMUP_SECONDS) -> Dict[str, float]:
+    """Load a transcriber's model and run a dummy inference on it twice.
+
+    The dummy clip is quiet noise decoded without a language, so language
+    detection, the encoder and the decoder all run once. Inference holds the
+    registry's inference lock, like any other transcription sharing the model.
+    Nothing is written to the transcriber's result cache.
+
+    Args:
+        transcriber: The Transcriber whose model_name and precision to warm up
+        fp16 (bool): Whether to use FP16 on a GPU, as in Transcriber.transcribe
+        seconds (float): Length of the dummy clip
+
+    Returns:
+        Dict[str, float]: Seconds spent on "import" (torch and whisper), "load"
+                          (the model), and the "cold" first and "warm" second
+                          inference
+    """
+    import_seconds = import_backend()
+
+    import numpy as np
+
+    from .decoding import WindowDecoder
+    from .quantization import resolve_precision
+
+    start = time.perf_counter()
+    transcriber.load_model()
+    load_seconds = time.perf_counter() - start
+
+    samples = (np.random.default_rng(0).standard_normal(int(seconds * 16000)) * 0.01).astype(np.float32)
+    fp16 = resolve_precision(transcriber.precision, fp16) == "fp16"
+    inference = []
+    lock = transcriber.registry.inference_lock(transcriber.model_name, quantized=transcriber.quantized)
+    with lock:
+        for _ in range(2):
+            start = time.perf_counter()
+            decoder = WindowDecoder(
+                transcriber.model, samples, fp16=fp16, temperature=0.0, sample_len=WARMUP_SAMPLE_LEN
+            )
+            for _ in decoder.windows():
+                pass
+            decoder.release()
+            inference.append(time.perf_counter() - start)
+    return {
+        "import": import_seconds,
+        "load": load_seconds,
+        "cold": inference[0],
+        "warm": inference[1],
+    }
+
+
+def format_warmup(report: Dict[str, float]) -> str:
+    """Describe a warm_up_model() report in one line."""
+    return (
+        f"model loaded in {report['load']:.1f}s; "
+        f"first inference {report['cold']:.2f}s cold, {report['warm']:.2f}s warm"
+    )
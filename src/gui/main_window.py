@@ -2,8 +2,7 @@
 Main window for the Whisper Transcribe application.
 """
 import os
-import platform
-import psutil
+import time
 from PySide6.QtWidgets import (
     QMainWindow,
     QWidget,
@@ -11,7 +10,7 @@ from PySide6.QtWidgets import (
     QHBoxLayout,
     QPushButton,
     QComboBox,
-    QTextEdit,
+    QLineEdit,
     QProgressBar,
     QFileDialog,
     QMessageBox,
@@ -23,11 +22,33 @@ from PySide6.QtWidgets import (
     QStylePainter,
     QStyleOptionComboBox,
     QStyle,
+    QCheckBox,
 )
-from PySide6.QtCore import Qt, QTimer, QRect, QPoint
+from PySide6.QtCore import Qt, QRect, QPoint, QSettings
 from PySide6.QtGui import QFont, QIcon, QPalette, QBrush, QColor, QPainter
-from src.core import Transcriber
-from .worker import TranscriptionWorker
+from src.core import ModelRegistry, Transcriber, TranscriptionCache
+from src.core.audio import DecodedAudioCache
+from src.core.export import FORMATS, save_result
+from src.core.planner import ResourcePlanner
+from src.core.resources import ResourceSampler, format_resources
+from src.core.vad import format_summary
+from src.core.warmup import format_warmup
+from .scheduler import JobScheduler
+from .widgets.job_queue import JobQueuePanel, job_status
+from .widgets.resource_panel import ResourcePanel
+from .widgets.transcript_view import TranscriptView, parse_timestamp
+from .worker import ModelWarmupWorker
+
+MODELS = ["tiny", "base", "small", "medium", "large"]
+
+# Save dialog filter of each export format
+SAVE_FILTERS = {
+    "txt": "Text Files (*.txt)",
+    "srt": "SubRip Subtitles (*.srt)",
+    "vtt": "WebVTT Subtitles (*.vtt)",
+    "tsv": "Tab-separated Segments (*.tsv)",
+    "json": "JSON (*.json)",
+}
 
 
 class CustomComboBox(QComboBox):
@@ -76,13 +97,57 @@ class MainWindow(QMainWindow):
 
     def __init__(self):
         super().__init__()
-        self.transcriber = Transcriber()  # Initialize transcriber
+        # Initialize transcriber; re-opening a file already transcribed with the
+        # same model is answered from the on-disk result cache, re-running it
+        # with another model reuses the decoded audio, and models stay resident
+        # in the registry so switching back and forth is instant. With the
+        # resume option, progress is checkpointed next to the audio, so a
+        # transcription cancelled or cut short by closing the window resumes
+        # where it stopped
+        self.model_registry = ModelRegistry()
+        self.transcriber = Transcriber(
+            cache=TranscriptionCache(),
+            registry=self.model_registry,
+            audio_cache=DecodedAudioCache(),
+        )
         self.current_file = None
-        self.worker = None
-        self.system_monitor_timer = None
+        # Files picked in the dialog, queued together by Transcribe
+        self.current_files = []
+        # The finished result, kept so it can be saved in any export format
+        self.last_result = None
+        # CPU, memory and GPU use, sampled off the UI thread for the
+        # resource panel and each job's result
+        self.resource_sampler = ResourceSampler().start()
+        self.warmup_worker = None
+        # Model readiness: the warm-up report, the models that have run an
+        # inference, and how long the first job took to its first segment
+        self.warmup_report = None
+        self.warming_up = None
+        self.warm_models = set()
+        self.first_job = None
+        self.job_started_at = None
+        self.job_warm = False
+        self.job_first_segment = None
+        self.job_cache_hits = 0
+        self.settings = QSettings("WhisperTranscribe", "Whisper Transcribe")
+        # Jobs and the warm-up only start once the planner finds the memory
+        # for them; what it holds back is shown in the status line
+        self.planner = ResourcePlanner(registry=self.model_registry)
+        self.planner.on_decision = self.on_plan_decision
+        # Queued files run on background workers sharing the models above;
+        # the job shown in the transcript view is current_job
+        self.scheduler = JobScheduler(
+            self.transcriber,
+            workers=int(self.settings.value("workers", 1)),
+            sampler=self.resource_sampler,
+            planner=self.planner,
+        )
+        self.current_job = None
         
         self.setWindowTitle("Whisper Transcribe")
-        self.setMinimumSize(900, 700)
+        self.setMinimumSize(900, 800)
+        # Audio files dropped on the window are queued
+        self.setAcceptDrops(True)
         
         # Set application icon if available
         icon_path = "resources/icons/app_icon.ico"
@@ -99,9 +164,6 @@ class MainWindow(QMainWindow):
         # Create UI elements
         self.setup_ui(layout)
         
-        # Setup system monitoring
-        self.setup_system_monitoring()
-        
     def setup_ui(self, layout):
         """Set up the user interface elements."""
         # Header with app title
@@ -136,10 +198,11 @@ class MainWindow(QMainWindow):
         # Create the custom combobox
         self.model_combo = CustomComboBox()
         self.model_combo.setFont(QFont("Arial", 12))
-        models = ["tiny", "base", "small", "medium", "large"]
-        for model in models:
+        for model in MODELS:
             self.model_combo.addItem(model)
-        self.model_combo.setCurrentText("base")
+        # Start with the model used last, which is also the one warmed up
+        last_model = self.settings.value("model", "base")
+        self.model_combo.setCurrentText(last_model if last_model in MODELS else "base")
         self.model_combo.setMinimumHeight(40)
         self.model_combo.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
         
@@ -175,6 +238,34 @@ class MainWindow(QMainWindow):
         # Add to form layout - this keeps the label and field closely aligned
         model_form_layout.addRow(model_label, self.model_combo)
         
+        # Voice activity detection: skip silence before running the model
+        self.vad_checkbox = QCheckBox("Skip silence (voice activity detection)")
+        self.vad_checkbox.setFont(QFont("Arial", 11))
+        self.vad_checkbox.setToolTip(
+            "Only transcribe the parts of the recording that contain speech. "
+            "Timestamps stay on the original timeline."
+        )
+        model_form_layout.addRow(self.vad_checkbox)
+
+        # Checkpoints: resume an interrupted transcription where it stopped
+        self.checkpoint_checkbox = QCheckBox("Resume interrupted transcriptions")
+        self.checkpoint_checkbox.setFont(QFont("Arial", 11))
+        self.checkpoint_checkbox.setToolTip(
+            "Save progress next to the audio file (<audio>.checkpoint.json) while "
+            "transcribing, so a cancelled job or closed window continues from there "
+            "next time. The file is deleted once the transcription is done."
+        )
+        model_form_layout.addRow(self.checkpoint_checkbox)
+        
+        # Model readiness and first-job latency
+        self.model_status_label = QLabel("")
+        self.model_status_label.setFont(QFont("Arial", 10))
+        self.model_status_label.setStyleSheet("QLabel { color: #555; border: none; }")
+        self.model_status_label.setWordWrap(True)
+        model_form_layout.addRow(self.model_status_label)
+        self.model_combo.currentTextChanged.connect(self.update_model_status)
+        self.update_model_status()
+        
         # Add the frame to the main layout
         layout.addWidget(model_frame)
         
@@ -191,7 +282,7 @@ class MainWindow(QMainWindow):
         """)
         file_layout = QVBoxLayout(file_frame)
         
-        file_header = QLabel("Selected File")
+        file_header = QLabel("Selected Files")
         file_header.setFont(QFont("Arial", 12, QFont.Weight.Bold))
         file_layout.addWidget(file_header)
         
@@ -206,7 +297,7 @@ class MainWindow(QMainWindow):
         button_layout = QHBoxLayout()
         
         # File selection button
-        self.select_file_btn = QPushButton("Select Audio File")
+        self.select_file_btn = QPushButton("Select Audio Files")
         self.select_file_btn.setFont(QFont("Arial", 12))
         self.select_file_btn.setMinimumHeight(50)
         self.select_file_btn.clicked.connect(self.select_file)
@@ -311,25 +402,49 @@ class MainWindow(QMainWindow):
         
         layout.addLayout(progress_layout)
         
-        # Result text area
+        # Job queue: every queued file with its status; pick one to show it
+        queue_label = QLabel("Queue")
+        queue_label.setFont(QFont("Arial", 12, QFont.Weight.Bold))
+        layout.addWidget(queue_label)
+        
+        self.queue_panel = JobQueuePanel(self.scheduler)
+        self.queue_panel.job_selected.connect(self.show_job)
+        self.queue_panel.workers_spin.valueChanged.connect(
+            lambda workers: self.settings.setValue("workers", workers)
+        )
+        layout.addWidget(self.queue_panel)
+        
+        self.scheduler.job_started.connect(self.on_job_started)
+        self.scheduler.job_changed.connect(self.on_job_changed)
+        self.scheduler.segments.connect(self.on_job_segments)
+        self.scheduler.job_finished.connect(self.on_job_finished)
+        
+        # Transcript: one row per segment, only the visible rows are laid out
+        result_header = QHBoxLayout()
         result_label = QLabel("Transcription")
         result_label.setFont(QFont("Arial", 12, QFont.Weight.Bold))
-        layout.addWidget(result_label)
-        
-        self.result_text = QTextEdit()
-        self.result_text.setReadOnly(True)
-        self.result_text.setFont(QFont("Arial", 11))
-        self.result_text.setMinimumHeight(300)
-        self.result_text.setPlaceholderText("Transcription will appear here...")
-        self.result_text.setStyleSheet("""
-            QTextEdit {
+        result_header.addWidget(result_label)
+        result_header.addStretch()
+        
+        self.jump_input = QLineEdit()
+        self.jump_input.setPlaceholderText("Jump to (m:ss)")
+        self.jump_input.setFixedWidth(130)
+        self.jump_input.returnPressed.connect(self.jump_to_time)
+        result_header.addWidget(self.jump_input)
+        layout.addLayout(result_header)
+        
+        self.transcript_view = TranscriptView()
+        self.transcript_view.setFont(QFont("Arial", 11))
+        self.transcript_view.setMinimumHeight(200)
+        self.transcript_view.setStyleSheet("""
+            QListView {
                 border: 1px solid #bbb;
                 border-radius: 5px;
                 background-color: white;
-                padding: 10px;
+                alternate-background-color: #f7f9fc;
             }
         """)
-        layout.addWidget(self.result_text)
+        layout.addWidget(self.transcript_view)
         
         # System info section
         system_frame = QFrame()
@@ -344,17 +459,9 @@ class MainWindow(QMainWindow):
         """)
         system_layout = QHBoxLayout(system_frame)
         
-        # CPU usage
-        self.cpu_label = QLabel("CPU: --")
-        system_layout.addWidget(self.cpu_label)
-        
-        # Memory usage
-        self.memory_label = QLabel("Memory: --")
-        system_layout.addWidget(self.memory_label)
-        
-        # GPU info (if available)
-        self.gpu_label = QLabel("GPU: --")
-        system_layout.addWidget(self.gpu_label)
+        # CPU, memory, thread and GPU history; only reads the sampler's buffer
+        self.resource_panel = ResourcePanel(self.resource_sampler)
+        system_layout.addWidget(self.resource_panel)
         
         layout.addWidget(system_frame)
         
@@ -384,113 +491,245 @@ class MainWindow(QMainWindow):
         """)
         layout.addWidget(self.save_btn)
         
-    def setup_system_monitoring(self):
-        """Set up system resource monitoring."""
-        self.system_monitor_timer = QTimer()
-        self.system_monitor_timer.timeout.connect(self.update_system_info)
-        self.system_monitor_timer.start(2000)  # Update every 2 seconds
-        
-    def update_system_info(self):
-        """Update system resource information."""
-        # CPU usage
-        cpu_percent = psutil.cpu_percent()
-        self.cpu_label.setText(f"CPU: {cpu_percent}%")
-        
-        # Memory usage
-        memory = psutil.virtual_memory()
-        memory_usage = memory.percent
-        memory_used = memory.used / (1024 * 1024 * 1024)  # Convert to GB
-        self.memory_label.setText(f"Memory: {memory_usage}% ({memory_used:.1f} GB)")
-        
-        # GPU info - with usage percentage
-        try:
-            import torch
-            if torch.cuda.is_available():
-                gpu_name = torch.cuda.get_device_name(0)
-                
-                # Get GPU utilization using nvidia-smi through subprocess
-                # This only works on NVIDIA GPUs
-                import subprocess
-                result = subprocess.check_output(
-                    ['nvidia-smi', '--query-gpu=utilization.gpu', '--format=csv,noheader,nounits'],
-                    encoding='utf-8'
-                )
-                gpu_usage = float(result.strip())
-                
-                self.gpu_label.setText(f"GPU: {gpu_usage}% ({gpu_name})")
-            else:
-                self.gpu_label.setText("GPU: Not available")
-        except Exception as e:
-            # Fallback if there's an error getting GPU info
-            if hasattr(self.transcriber, 'model') and self.transcriber.model:
-                self.gpu_label.setText("GPU: Active (usage data unavailable)")
-            else:
-                self.gpu_label.setText("GPU: Unknown")
+    def start_warmup(self):
+        """Load the selected model and warm it up in the background once the window is up.
+
+        Imports torch and whisper, loads the model into the shared registry and
+        runs a short dummy inference, so the first transcription starts warm.
+        """
+        if self.warmup_worker is not None:
+            return
+        model_name = self.model_combo.currentText()
+        decision = self.planner.admit(model_name)
+        if not decision.admitted:
+            self.model_status_label.setText(f"Not warming up {model_name}: {decision.reason}")
+            return
+        self.warmup_worker = ModelWarmupWorker(
+            Transcriber(registry=self.model_registry), model_name=model_name
+        )
+        self.warmup_worker.finished.connect(
+            lambda report: self.on_warmup_complete(model_name, report)
+        )
+        self.warmup_worker.error.connect(self.on_warmup_error)
+        self.warming_up = model_name
+        self.model_status_label.setText(f"Warming up {model_name} model...")
+        self.warmup_worker.start()
+    
+    def on_plan_decision(self, decision):
+        """Show why the resource planner held work back or unloaded models."""
+        if decision.admitted and not decision.evicted:
+            return
+        self.status_label.setText(f"Resource planner: {decision.format()}")
+        self.status_label.setVisible(True)
+    
+    def on_warmup_complete(self, model_name, report):
+        """Record the warm-up timings and show the model as ready."""
+        self.warmup_report = dict(report, model=model_name)
+        self.warming_up = None
+        self.warm_models.add(model_name)
+        self.update_model_status()
+    
+    def on_warmup_error(self, error_msg):
+        """Report a failed warm-up; the first transcription loads the model instead."""
+        self.warming_up = None
+        self.model_status_label.setText(f"Warm-up failed: {error_msg}")
+    
+    def update_model_status(self):
+        """Show whether the selected model is ready and how fast the first job started."""
+        model_name = self.model_combo.currentText()
+        if self.warming_up is not None:
+            self.model_status_label.setText(f"Warming up {self.warming_up} model...")
+            return
+        if model_name in self.warm_models:
+            lines = [f"{model_name} ready"]
+            if self.warmup_report and self.warmup_report["model"] == model_name:
+                lines[0] += f" (warm-up: {format_warmup(self.warmup_report)})"
+        elif self.model_registry.is_loaded(model_name):
+            lines = [f"{model_name} loaded, not warmed up"]
+        else:
+            lines = [f"{model_name} not loaded yet; the first transcription loads it"]
+        if self.first_job:
+            lines.append(
+                f"First job: first segment after {self.first_job['first_segment']:.1f}s, "
+                f"done in {self.first_job['total']:.1f}s "
+                f"({'warm' if self.first_job['warm'] else 'cold'} {self.first_job['model']} model)"
+            )
+        self.model_status_label.setText("\n".join(lines))
     
     def select_file(self):
-        """Open file dialog to select an audio file."""
-        file_name, _ = QFileDialog.getOpenFileName(
+        """Open file dialog to select one or more audio files."""
+        file_names, _ = QFileDialog.getOpenFileNames(
             self,
-            "Select Audio File",
+            "Select Audio Files",
             "",
             "Audio Files (*.mp3 *.wav *.m4a *.ogg);;All Files (*.*)"
         )
-        if file_name:
-            self.current_file = file_name
-            self.file_label.setText(os.path.basename(file_name))
+        if file_names:
+            self.current_files = file_names
+            self.current_file = file_names[0]
+            if len(file_names) == 1:
+                self.file_label.setText(os.path.basename(file_names[0]))
+            else:
+                self.file_label.setText(
+                    f"{len(file_names)} files: " + ", ".join(os.path.basename(name) for name in file_names)
+                )
             self.transcribe_btn.setEnabled(True)
-            self.result_text.clear()
-            self.save_btn.setEnabled(False)
-            self.status_label.setText(f"Ready to transcribe: {os.path.basename(file_name)}")
+            self.status_label.setText(f"Ready to transcribe: {self.file_label.text()}")
             self.status_label.setVisible(True)
     
     def start_transcription(self):
-        """Initialize and start the transcription process."""
-        if not self.current_file:
+        """Queue the selected files with the selected model and settings."""
+        files = self.current_files or ([self.current_file] if self.current_file else [])
+        if not files:
             return
-            
-        # Disable UI elements during transcription
+        self.enqueue_files(files)
+        # Queued; Transcribe is enabled again by the next selection
+        self.current_files = []
         self.transcribe_btn.setEnabled(False)
-        self.select_file_btn.setEnabled(False)
-        self.model_combo.setEnabled(False)
-        self.save_btn.setEnabled(False)
-        self.cancel_btn.setEnabled(True)
-        self.result_text.clear()
-        
-        # Show and reset progress bar
-        self.progress_bar.setVisible(True)
-        self.progress_bar.setValue(0)
-        self.status_label.setText(f"Transcribing: {os.path.basename(self.current_file)}")
-        self.status_label.setVisible(True)
-        
-        # Create and configure worker
-        self.worker = TranscriptionWorker(
-            self.transcriber,
-            self.current_file,
-            model_name=self.model_combo.currentText()
+    
+    def enqueue_files(self, files):
+        """Add files to the job queue with the selected model, VAD and resume settings."""
+        model_name = self.model_combo.currentText()
+        self.settings.setValue("model", model_name)
+        for file_name in files:
+            self.scheduler.add(
+                file_name,
+                model_name,
+                vad=self.vad_checkbox.isChecked(),
+                checkpoint=self.checkpoint_checkbox.isChecked(),
+            )
+        queued = len(self.scheduler.queued())
+        if queued:
+            self.status_label.setText(f"{queued} file{'s' if queued != 1 else ''} waiting in the queue")
+            self.status_label.setVisible(True)
+    
+    def dragEnterEvent(self, event):
+        """Accept files dragged over the window."""
+        if any(url.isLocalFile() for url in event.mimeData().urls()):
+            event.acceptProposedAction()
+    
+    def dropEvent(self, event):
+        """Queue the dropped files."""
+        files = [url.toLocalFile() for url in event.mimeData().urls() if url.isLocalFile()]
+        files = [name for name in files if os.path.isfile(name)]
+        if files:
+            self.enqueue_files(files)
+            event.acceptProposedAction()
+    
+    def show_job(self, entry):
+        """Show a queued job in the transcript view, progress bar and status line."""
+        self.current_job = entry
+        self.current_file = entry.audio_file
+        self.transcript_view.clear()
+        self.transcript_view.set_segments(
+            entry.result["segments"] if entry.result else entry.segments
         )
-        
-        # Connect signals
-        self.worker.finished.connect(self.on_transcription_complete)
-        self.worker.error.connect(self.on_transcription_error)
-        self.worker.progress.connect(self.progress_bar.setValue)
-        
-        # Start transcription
-        self.worker.start()
+        self.last_result = entry.result if entry.status == "done" else None
+        self.save_btn.setEnabled(self.last_result is not None)
+        self.cancel_btn.setEnabled(not entry.finished)
+        self.progress_bar.setVisible(not entry.finished)
+        self.progress_bar.setValue(int(entry.progress * 100))
+        self.status_label.setText(f"{entry.name}: {job_status(entry)}")
+        self.status_label.setVisible(True)
+        # Latency of the session's first job, measured on the job shown
+        self.job_started_at = entry.started_at if not entry.finished else None
+        self.job_warm = entry.model_name in self.warm_models
+        self.job_first_segment = None
+        self.job_cache_hits = self.transcriber.cache.hits if self.transcriber.cache is not None else 0
     
-    def cancel_transcription(self):
-        """Cancel the current transcription process."""
-        if self.worker and self.worker.isRunning():
-            self.worker.terminate()
-            self.status_label.setText("Transcription cancelled")
+    def on_job_started(self, entry):
+        """Show a job that starts while no running job is shown."""
+        if self.current_job is None or self.current_job.finished:
+            self.show_job(entry)
+            self.queue_panel.select_job(entry)
+    
+    def on_job_changed(self, entry):
+        """Follow the shown job's progress."""
+        if entry is self.current_job:
+            self.progress_bar.setValue(int(entry.progress * 100))
+            self.on_transcription_status(job_status(entry))
+    
+    def on_job_segments(self, entry, segments):
+        """Append the shown job's newly decoded segments to the transcript view."""
+        if entry is self.current_job:
+            for segment in segments:
+                self.on_segment_decoded(segment)
+    
+    def on_job_finished(self, entry):
+        """Report a finished job; the shown one goes through the completion handlers."""
+        if entry.status == "done":
+            self.warm_models.add(entry.model_name)
+        if entry is not self.current_job:
+            if entry.status == "done":
+                self.update_model_status()
+            return
+        if entry.first_segment_at is not None and entry.started_at is not None:
+            self.job_first_segment = entry.first_segment_at - entry.started_at
+        if entry.status == "done":
+            self.progress_bar.setValue(100)
+            self.on_transcription_complete(entry.result)
+        elif entry.status == "cancelled":
+            latency = entry.finished_at - entry.cancelled_at if entry.cancelled_at else 0.0
+            self.on_transcription_cancelled(latency)
+        elif entry.status == "refused":
+            self.status_label.setText(f"{entry.name} not transcribed: {entry.error}")
             self.cleanup_after_transcription()
+        else:
+            self.on_transcription_error(entry.error)
+    
+    def cancel_transcription(self):
+        """Cancel the job shown in the transcript view.
+
+        A queued job is dropped at once; a running one finishes the window
+        it is decoding, frees its buffers and reports back through
+        on_transcription_cancelled, leaving the shared model ready for the
+        next job.
+        """
+        if self.current_job is not None and self.scheduler.cancel(self.current_job):
+            self.cancel_btn.setEnabled(False)
+            if not self.current_job.finished:
+                self.status_label.setText("Cancelling...")
+    
+    def on_transcription_cancelled(self, latency):
+        """Handle a transcription that stopped after being cancelled."""
+        self.status_label.setText(f"Transcription cancelled (stopped in {latency:.1f}s)")
+        self.cleanup_after_transcription()
+    
+    def on_transcription_status(self, text):
+        """Show the job's status line (position in the audio) under the progress bar."""
+        if self.current_file:
+            text = f"{os.path.basename(self.current_file)}: {text}"
+        self.status_label.setText(text)
+    
+    def on_segment_decoded(self, segment):
+        """Append a newly decoded segment to the transcript view."""
+        if self.job_first_segment is None and self.job_started_at is not None:
+            self.job_first_segment = time.perf_counter() - self.job_started_at
+        self.transcript_view.append_segment(segment)
+    
+    def jump_to_time(self):
+        """Scroll the transcript to the position typed in the jump field."""
+        seconds = parse_timestamp(self.jump_input.text())
+        if seconds is None or not self.transcript_view.jump_to(seconds):
+            self.status_label.setText(f"Cannot jump to '{self.jump_input.text()}'")
+            self.status_label.setVisible(True)
     
     def on_transcription_complete(self, result):
         """Handle completion of transcription."""
-        # Update UI with result
-        self.result_text.setPlainText(result["text"])
+        # Update UI with result; the streamed rows stay (and keep their
+        # scroll position) unless the result differs, e.g. from the cache
+        segments = result.get("segments", [])
+        if self.transcript_view.model().segments != [segment for segment in segments if segment["text"].strip()]:
+            self.transcript_view.set_segments(segments)
+        self.last_result = result
         self.save_btn.setEnabled(True)
-        self.status_label.setText("Transcription complete")
+        status = "Transcription complete"
+        if result.get("vad"):
+            status += f". {format_summary(result['vad'], result.get('timings'))}"
+        if result.get("resources"):
+            status += f" ({format_resources(result['resources'])})"
+        self.status_label.setText(status)
+        self.record_job_latency()
         
         # Re-enable UI elements
         self.cleanup_after_transcription()
@@ -505,34 +744,66 @@ class MainWindow(QMainWindow):
         self.status_label.setText("Transcription failed")
         self.cleanup_after_transcription()
     
+    def record_job_latency(self):
+        """Keep the latency of the session's first job and mark its model as warm."""
+        if self.job_started_at is None:
+            return
+        total = time.perf_counter() - self.job_started_at
+        model_name = self.current_job.model_name if self.current_job else self.model_combo.currentText()
+        cache = self.transcriber.cache
+        cached = cache is not None and cache.hits > self.job_cache_hits
+        # A result answered from the cache says nothing about the model
+        if self.first_job is None and not cached:
+            self.first_job = {
+                "model": model_name,
+                "warm": self.job_warm,
+                "first_segment": self.job_first_segment if self.job_first_segment is not None else total,
+                "total": total,
+            }
+        self.warm_models.add(model_name)
+        self.job_started_at = None
+        self.update_model_status()
+    
     def cleanup_after_transcription(self):
         """Re-enable UI elements after transcription (success or failure)."""
         self.transcribe_btn.setEnabled(True)
         self.select_file_btn.setEnabled(True)
         self.model_combo.setEnabled(True)
+        self.vad_checkbox.setEnabled(True)
         self.progress_bar.setVisible(False)
         self.cancel_btn.setEnabled(False)
-        
-        # Clean up worker
-        if self.worker:
-            self.worker.deleteLater()
-            self.worker = None
     
     def save_transcription(self):
-        """Save the transcription to a file."""
-        if not self.result_text.toPlainText():
+        """Save the transcription in the format picked in the save dialog."""
+        if self.last_result is None:
             return
-            
-        file_name, _ = QFileDialog.getSaveFileName(
+
+        filters = [SAVE_FILTERS[fmt] for fmt in FORMATS]
+        last_format = self.settings.value("export_format", "txt")
+        if last_format not in FORMATS:
+            last_format = "txt"
+        suggested = ""
+        if self.current_file:
+            suggested = os.path.splitext(self.current_file)[0] + "." + last_format
+        file_name, selected_filter = QFileDialog.getSaveFileName(
             self,
             "Save Transcription",
-            "",
-            "Text Files (*.txt);;All Files (*.*)"
+            suggested,
+            ";;".join(filters),
+            SAVE_FILTERS[last_format]
         )
         if file_name:
+            # A known typed extension wins over the picked filter; otherwise the
+            # filter's format is used, and only a name without an extension gets it
+            extension = os.path.splitext(file_name)[1]
+            fmt = extension.lstrip(".").lower()
+            if fmt not in FORMATS:
+                fmt = FORMATS[filters.index(selected_filter)] if selected_filter in filters else "txt"
+                if not extension:
+                    file_name = f"{file_name}.{fmt}"
             try:
-                with open(file_name, 'w', encoding='utf-8') as f:
-                    f.write(self.result_text.toPlainText())
+                save_result(self.transcriber, self.last_result, {fmt: file_name})
+                self.settings.setValue("export_format", fmt)
                 QMessageBox.information(
                     self,
                     "Success",
@@ -548,6 +819,12 @@ class MainWindow(QMainWindow):
     
     def closeEvent(self, event):
         """Handle application close event."""
-        # Stop the timer when the application is closed
-        if self.system_monitor_timer:
-            self.system_monitor_timer.stop() 
\ No newline at end of file
+        # Stop the resource monitor when the application is closed
+        self.resource_panel.stop()
+        self.resource_sampler.stop()
+        # Stop the running jobs cleanly instead of killing their threads;
+        # checkpointed ones resume next time
+        self.scheduler.close()
+        # The warm-up is a single short inference; let it finish
+        if self.warmup_worker and self.warmup_worker.isRunning():
+            self.warmup_worker.wait() 
\ No newline at end of file
@@ -0,0 +1,255 @@
+"""
+Scheduling of queued transcription jobs for the desktop app.
+
+JobScheduler keeps the window's queue of files in order and hands them to a
+core JobQueue as workers become free, so queued jobs can still be reordered
+or cancelled up to the moment they start. The JobQueue's worker threads
+share the window's ModelRegistry: a model is loaded once for every job that
+uses it, and its inference lock lets one job decode its audio while another
+is on the model. A job queued with checkpointing saves its progress next to
+its audio while it runs, and the checkpoint is deleted once it is done.
+
+Jobs are followed from the UI thread with a short timer that picks up new
+segments and progress, so the workers never touch Qt objects.
+
+With a ResourcePlanner, each job is only started once the planner admits
+it: a job that does not fit in memory next to the running ones waits at
+the head of the queue (status "Waiting") until one of them has finished,
+and one that cannot fit at all is refused.
+"""
+import itertools
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from src.core.checkpoint import remove_checkpoint
+from src.core.jobs import JobQueue
+
+# Most jobs the queue runs at once; the scheduler's workers setting picks
+# how many of these it uses
+MAX_WORKERS = max(2, min(4, (os.cpu_count() or 1) // 2))
+
+# Milliseconds between two looks at the running jobs
+POLL_INTERVAL = 100
+
+_ids = itertools.count(1)
+
+
+class QueuedJob:
+    """A file in the window's queue, before, while and after it runs."""
+
+    def __init__(self, audio_file: str, model_name: str, vad: bool = False, checkpoint: bool = False):
+        self.id = next(_ids)
+        self.audio_file = audio_file
+        self.model_name = model_name
+        self.vad = vad
+        # Checkpoint next to the audio while running, so it can resume
+        self.checkpoint = checkpoint
+        self.status = "queued"
+        # Why the planner holds the job back, while it does
+        self.waiting: Optional[str] = None
+        # The planner's admit decision, released once the job has finished
+        self.decision = None
+        self.progress = 0.0
+        self.position: Optional[float] = None
+        self.duration: Optional[float] = None
+        self.segments: List[Dict[str, Any]] = []
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        # The core Job once the scheduler has submitted it
+        self.job = None
+        # perf_counter() times for the latency shown in the model panel
+        self.started_at: Optional[float] = None
+        self.first_segment_at: Optional[float] = None
+        self.cancelled_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(self.audio_file)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "failed", "cancelled", "refused")
+
+
+class JobScheduler(QObject):
+    """Runs the window's queue of files on a configurable number of workers."""
+
+    job_added = Signal(object)      # QueuedJob
+    job_moved = Signal(object)      # QueuedJob whose position in the queue changed
+    job_started = Signal(object)    # QueuedJob
+    job_changed = Signal(object)    # QueuedJob with new progress
+    segments = Signal(object, list)  # QueuedJob and its newly decoded segments
+    job_finished = Signal(object)   # QueuedJob that is done, failed or cancelled
+
+    def __init__(self, transcriber, workers: int = 1, sampler=None, planner=None, parent=None):
+        """Start the worker threads.
+
+        Args:
+            transcriber: The window's Transcriber; its registry, result cache,
+                         decoded-audio cache and checkpoint setting are
+                         shared with every job
+            workers (int): Jobs run at the same time (up to MAX_WORKERS)
+            sampler (ResourceSampler, optional): Running sampler whose
+                                                 summary of each job is
+                                                 attached to its result
+            planner (ResourcePlanner, optional): Admits each job before it
+                                                 starts; its registry should
+                                                 be the transcriber's
+        """
+        super().__init__(parent)
+        self.queue = JobQueue(
+            model_name=transcriber.model_name,
+            workers=MAX_WORKERS,
+            max_pending=MAX_WORKERS,
+            registry=transcriber.registry,
+            cache=transcriber.cache,
+            audio_cache=transcriber.audio_cache,
+            checkpoint=transcriber.checkpoint,
+            sampler=sampler,
+        )
+        self.workers = max(1, min(workers, MAX_WORKERS))
+        self.planner = planner
+        self.jobs: List[QueuedJob] = []
+        self.timer = QTimer(self)
+        self.timer.setInterval(POLL_INTERVAL)
+        self.timer.timeout.connect(self.poll)
+
+    def add(self, audio_file: str, model_name: str, vad: bool = False, checkpoint: bool = False) -> QueuedJob:
+        """Queue a file; it starts once a worker is free and the jobs before it have started."""
+        entry = QueuedJob(audio_file, model_name, vad, checkpoint)
+        self.jobs.append(entry)
+        self.job_added.emit(entry)
+        self.dispatch()
+        return entry
+
+    def queued(self) -> List[QueuedJob]:
+        return [entry for entry in self.jobs if entry.status == "queued"]
+
+    def running(self) -> List[QueuedJob]:
+        return [entry for entry in self.jobs if entry.status == "running"]
+
+    def move(self, entry: QueuedJob, offset: int) -> bool:
+        """Move a queued job earlier (negative offset) or later among the queued jobs.
+
+        Returns:
+            bool: False if the job is not queued or is already at that end
+        """
+        queued = self.queued()
+        if entry not in queued:
+            return False
+        position = queued.index(entry)
+        target = max(0, min(len(queued) - 1, position + offset))
+        if target == position:
+            return False
+        # Queued jobs keep their slots in the list; only their order changes
+        slots = [index for index, job in enumerate(self.jobs) if job.status == "queued"]
+        queued.insert(target, queued.pop(position))
+        for slot, job in zip(slots, queued):
+            self.jobs[slot] = job
+        self.job_moved.emit(entry)
+        return True
+
+    def cancel(self, entry: QueuedJob) -> bool:
+        """Cancel a queued job at once, or a running one after the window being decoded.
+
+        Returns:
+            bool: False if the job had already finished
+        """
+        if entry.finished:
+            return False
+        entry.cancelled_at = time.perf_counter()
+        if entry.job is None:
+            entry.status = "cancelled"
+            entry.finished_at = time.perf_counter()
+            self.job_finished.emit(entry)
+        else:
+            self.queue.cancel(entry.job.id)
+        return True
+
+    def remove_finished(self) -> List[QueuedJob]:
+        """Forget the finished jobs and return them."""
+        finished = [entry for entry in self.jobs if entry.finished]
+        self.jobs = [entry for entry in self.jobs if not entry.finished]
+        return finished
+
+    def set_workers(self, workers: int) -> None:
+        """Change how many jobs run at once; running jobs are not interrupted."""
+        self.workers = max(1, min(workers, MAX_WORKERS))
+        self.dispatch()
+
+    def dispatch(self) -> None:
+        """Start queued jobs, in queue order, while workers are free and the planner admits them."""
+        running = [entry.model_name for entry in self.running()]
+        for entry in self.queued():
+            if len(running) >= self.workers:
+                break
+            if self.planner is not None:
+                decision = self.planner.admit(entry.model_name, running=running)
+                if decision.action == "queue":
+                    # Later jobs wait too, so the queue order holds
+                    if entry.waiting != decision.reason:
+                        entry.waiting = decision.reason
+                        self.job_changed.emit(entry)
+                    break
+                if decision.action == "refuse":
+                    entry.status = "refused"
+                    entry.error = decision.reason
+                    entry.finished_at = time.perf_counter()
+                    self.job_finished.emit(entry)
+                    continue
+                entry.decision = decision
+            entry.waiting = None
+            entry.job = self.queue.submit(
+                entry.audio_file, model_name=entry.model_name, vad=entry.vad, checkpoint=entry.checkpoint
+            )
+            entry.status = "running"
+            entry.started_at = time.perf_counter()
+            running.append(entry.model_name)
+            self.job_started.emit(entry)
+        if running and not self.timer.isActive():
+            self.timer.start()
+
+    def poll(self) -> None:
+        """Pick up the running jobs' new segments, progress and outcome."""
+        finished_any = False
+        for entry in self.running():
+            job = entry.job
+            new, finished = job.wait_for_segments(len(entry.segments), timeout=0)
+            if new:
+                if entry.first_segment_at is None:
+                    entry.first_segment_at = time.perf_counter()
+                entry.segments.extend(new)
+                self.segments.emit(entry, new)
+            if job.progress != entry.progress or job.duration != entry.duration:
+                entry.progress = job.progress
+                entry.duration = job.duration
+                entry.position = job.progress * job.duration if job.duration else None
+                self.job_changed.emit(entry)
+            if finished:
+                entry.status = job.status
+                entry.result = job.result
+                entry.error = job.error
+                entry.finished_at = time.perf_counter()
+                if entry.decision is not None:
+                    self.planner.release(entry.decision)
+                if entry.checkpoint and entry.status == "done":
+                    # Only an interrupted job needs its checkpoint to resume
+                    remove_checkpoint(entry.audio_file)
+                finished_any = True
+                self.job_finished.emit(entry)
+        # Workers and memory are only freed by finished jobs
+        if finished_any:
+            self.dispatch()
+        if not self.running():
+            self.timer.stop()
+
+    def close(self) -> None:
+        """Cancel every job and stop the workers."""
+        self.timer.stop()
+        for entry in self.queued():
+            entry.status = "cancelled"
+        self.queue.close(cancel_running=True)
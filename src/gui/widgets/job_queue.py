@@ -0,0 +1,183 @@
+"""
+Job queue panel: the files queued for transcription and what became of them.
+"""
+from typing import Optional
+
+from PySide6.QtCore import Qt, Signal
+from PySide6.QtWidgets import (
+    QAbstractItemView,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QProgressBar,
+    QPushButton,
+    QSpinBox,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+    QWidget,
+)
+
+from src.core.progress import format_duration
+
+from ..scheduler import MAX_WORKERS
+
+
+def job_status(entry) -> str:
+    """Return the status column text of a QueuedJob."""
+    if entry.status == "running":
+        if entry.position is not None and entry.duration:
+            return f"Running {format_duration(entry.position)} / {format_duration(entry.duration)}"
+        return "Running"
+    if entry.status == "queued" and entry.waiting:
+        return f"Waiting: {entry.waiting}"
+    if entry.status == "failed":
+        return f"Failed: {entry.error}"
+    if entry.status == "refused":
+        return f"Refused: {entry.error}"
+    return entry.status.capitalize()
+
+
+class JobQueuePanel(QWidget):
+    """Table of a JobScheduler's jobs with reorder, cancel and worker controls."""
+
+    FILE, MODEL, STATUS, PROGRESS = range(4)
+
+    job_selected = Signal(object)  # QueuedJob picked in the table
+
+    def __init__(self, scheduler, parent=None):
+        super().__init__(parent)
+        self.scheduler = scheduler
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self.table = QTableWidget(0, 4)
+        self.table.setHorizontalHeaderLabels(["File", "Model", "Status", "Progress"])
+        self.table.verticalHeader().setVisible(False)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(self.FILE, QHeaderView.ResizeMode.Stretch)
+        header.setSectionResizeMode(self.STATUS, QHeaderView.ResizeMode.Stretch)
+        self.table.setMinimumHeight(110)
+        self.table.itemSelectionChanged.connect(self.on_selection_changed)
+        layout.addWidget(self.table)
+
+        controls = QHBoxLayout()
+        self.up_btn = QPushButton("Move Up")
+        self.up_btn.clicked.connect(lambda: self.move_selected(-1))
+        controls.addWidget(self.up_btn)
+        self.down_btn = QPushButton("Move Down")
+        self.down_btn.clicked.connect(lambda: self.move_selected(1))
+        controls.addWidget(self.down_btn)
+        self.cancel_btn = QPushButton("Cancel Job")
+        self.cancel_btn.clicked.connect(self.cancel_selected)
+        controls.addWidget(self.cancel_btn)
+        self.clear_btn = QPushButton("Clear Finished")
+        self.clear_btn.clicked.connect(self.clear_finished)
+        controls.addWidget(self.clear_btn)
+        controls.addStretch()
+        controls.addWidget(QLabel("Workers:"))
+        self.workers_spin = QSpinBox()
+        self.workers_spin.setRange(1, MAX_WORKERS)
+        self.workers_spin.setValue(scheduler.workers)
+        self.workers_spin.setToolTip(
+            "Jobs transcribed at the same time. Jobs share loaded models; "
+            "one job's audio is decoded while another is on the model."
+        )
+        self.workers_spin.valueChanged.connect(scheduler.set_workers)
+        controls.addWidget(self.workers_spin)
+        layout.addLayout(controls)
+
+        scheduler.job_added.connect(self.add_row)
+        scheduler.job_moved.connect(lambda entry: self.refresh(select=entry))
+        scheduler.job_started.connect(self.update_row)
+        scheduler.job_changed.connect(self.update_row)
+        scheduler.job_finished.connect(self.update_row)
+        self.update_buttons()
+
+    def add_row(self, entry) -> None:
+        row = self.table.rowCount()
+        self.table.insertRow(row)
+        self.fill_row(row, entry)
+        self.update_buttons()
+
+    def fill_row(self, row: int, entry) -> None:
+        name = QTableWidgetItem(entry.name)
+        name.setToolTip(entry.audio_file)
+        name.setData(Qt.ItemDataRole.UserRole, entry.id)
+        self.table.setItem(row, self.FILE, name)
+        self.table.setItem(row, self.MODEL, QTableWidgetItem(entry.model_name))
+        self.table.setItem(row, self.STATUS, QTableWidgetItem(job_status(entry)))
+        bar = QProgressBar()
+        bar.setRange(0, 100)
+        bar.setValue(int(entry.progress * 100))
+        self.table.setCellWidget(row, self.PROGRESS, bar)
+
+    def row_of(self, entry) -> int:
+        for row in range(self.table.rowCount()):
+            if self.table.item(row, self.FILE).data(Qt.ItemDataRole.UserRole) == entry.id:
+                return row
+        return -1
+
+    def update_row(self, entry) -> None:
+        row = self.row_of(entry)
+        if row < 0:
+            return
+        self.table.item(row, self.STATUS).setText(job_status(entry))
+        self.table.item(row, self.STATUS).setToolTip(entry.error or "")
+        bar = self.table.cellWidget(row, self.PROGRESS)
+        bar.setValue(100 if entry.status == "done" else int(entry.progress * 100))
+        if entry is self.selected_job():
+            self.update_buttons()
+
+    def refresh(self, select=None) -> None:
+        """Rebuild the rows in the scheduler's order."""
+        select = select or self.selected_job()
+        self.table.setRowCount(0)
+        for entry in self.scheduler.jobs:
+            self.add_row(entry)
+        if select is not None and self.row_of(select) >= 0:
+            self.table.selectRow(self.row_of(select))
+        self.update_buttons()
+
+    def selected_job(self):
+        rows = self.table.selectionModel().selectedRows()
+        if not rows:
+            return None
+        job_id = self.table.item(rows[0].row(), self.FILE).data(Qt.ItemDataRole.UserRole)
+        return next((entry for entry in self.scheduler.jobs if entry.id == job_id), None)
+
+    def select_job(self, entry) -> None:
+        row = self.row_of(entry)
+        if row >= 0:
+            self.table.selectRow(row)
+
+    def move_selected(self, offset: int) -> None:
+        entry = self.selected_job()
+        if entry is not None:
+            self.scheduler.move(entry, offset)
+
+    def cancel_selected(self) -> None:
+        entry = self.selected_job()
+        if entry is not None:
+            self.scheduler.cancel(entry)
+
+    def clear_finished(self) -> None:
+        self.scheduler.remove_finished()
+        self.refresh()
+
+    def on_selection_changed(self) -> None:
+        self.update_buttons()
+        entry = self.selected_job()
+        if entry is not None:
+            self.job_selected.emit(entry)
+
+    def update_buttons(self) -> None:
+        entry: Optional[object] = self.selected_job()
+        queued = entry is not None and entry.status == "queued"
+        self.up_btn.setEnabled(queued)
+        self.down_btn.setEnabled(queued)
+        self.cancel_btn.setEnabled(entry is not None and not entry.finished)
+        self.clear_btn.setEnabled(any(job.finished for job in self.scheduler.jobs))
@@ -0,0 +1,125 @@
+"""
+Sparklines of the resource sampler's history.
+
+The panel only reads samples the ResourceSampler has already taken on its
+own thread; redrawing it costs a copy of the ring buffer and a few
+polylines, so the UI thread never waits on psutil, torch or nvidia-smi.
+"""
+from typing import Callable, List, Optional
+
+from PySide6.QtCore import QPointF, Qt, QTimer
+from PySide6.QtGui import QColor, QPainter, QPen, QPolygonF
+from PySide6.QtWidgets import QHBoxLayout, QWidget
+
+from src.core.resources import MB
+
+# Milliseconds between two redraws
+REFRESH_INTERVAL = 1000
+
+# Samples drawn per sparkline (the most recent ones)
+HISTORY = 120
+
+
+class Sparkline(QWidget):
+    """A caption and the recent history of one value as a small line chart."""
+
+    def __init__(self, title: str, color: str, maximum: Optional[float] = None, parent=None):
+        """Initialize the sparkline.
+
+        Args:
+            title (str): Caption, e.g. "CPU"
+            color (str): Line color
+            maximum (float, optional): Top of the chart; None scales to the
+                                       largest value shown
+        """
+        super().__init__(parent)
+        self.title = title
+        self.color = QColor(color)
+        self.maximum = maximum
+        self.values: List[float] = []
+        self.caption = f"{title}: --"
+        self.setMinimumSize(140, 44)
+
+    def set_values(self, values: List[float], caption: str) -> None:
+        self.values = values[-HISTORY:]
+        self.caption = caption
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        rect = self.rect().adjusted(2, 2, -2, -2)
+        painter.setPen(self.palette().text().color())
+        painter.drawText(rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop, self.caption)
+        chart = rect.adjusted(0, painter.fontMetrics().height() + 2, 0, 0)
+        if len(self.values) < 2 or chart.height() <= 0:
+            return
+        top = self.maximum or max(self.values) or 1.0
+        step = chart.width() / (HISTORY - 1)
+        left = chart.right() - step * (len(self.values) - 1)
+        points = QPolygonF([
+            QPointF(left + i * step, chart.bottom() - min(value / top, 1.0) * chart.height())
+            for i, value in enumerate(self.values)
+        ])
+        painter.setPen(QPen(self.color, 1.5))
+        painter.drawPolyline(points)
+
+
+class ResourcePanel(QWidget):
+    """CPU, memory, thread and GPU sparklines fed by a ResourceSampler."""
+
+    def __init__(self, sampler, parent=None):
+        super().__init__(parent)
+        self.sampler = sampler
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.cpu = Sparkline("CPU", "#4a86e8", maximum=100.0)
+        self.memory = Sparkline("Memory", "#3cba54")
+        self.threads = Sparkline("Threads", "#f4b400")
+        self.gpu = Sparkline("GPU", "#db4437", maximum=100.0)
+        for sparkline in (self.cpu, self.memory, self.threads, self.gpu):
+            layout.addWidget(sparkline)
+        self.gpu.setVisible(False)
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(REFRESH_INTERVAL)
+
+    def refresh(self) -> None:
+        """Redraw the sparklines from the sampler's history."""
+        samples = self.sampler.samples()[-HISTORY:]
+        if not samples:
+            return
+        latest = samples[-1]
+
+        def series(value: Callable) -> List[float]:
+            return [value(sample) for sample in samples]
+
+        self.cpu.set_values(
+            series(lambda sample: sample.cpu_percent),
+            f"CPU: {latest.cpu_percent:.0f}% (app {latest.process_cpu_percent:.0f}%)",
+        )
+        self.cpu.setToolTip("System-wide CPU use; the app's share counts 100% per busy core")
+        memory = series(lambda sample: (sample.rss + sample.children_rss) / MB)
+        self.memory.set_values(memory, f"Memory: {memory[-1]:.0f} MB")
+        self.memory.setToolTip(
+            f"Resident memory of the app ({latest.rss / MB:.0f} MB) "
+            f"and its worker processes ({latest.children_rss / MB:.0f} MB)"
+        )
+        self.threads.set_values(series(lambda sample: float(sample.threads)), f"Threads: {latest.threads}")
+        if latest.gpu_memory is not None:
+            self.gpu.setVisible(True)
+            if latest.gpu_percent is not None:
+                self.gpu.set_values(
+                    series(lambda sample: sample.gpu_percent or 0.0),
+                    f"GPU: {latest.gpu_percent:.0f}% ({latest.gpu_memory / MB:.0f} MB)",
+                )
+            else:
+                self.gpu.maximum = None
+                self.gpu.set_values(
+                    series(lambda sample: (sample.gpu_memory or 0) / MB),
+                    f"GPU: {latest.gpu_memory / MB:.0f} MB",
+                )
+
+    def stop(self) -> None:
+        self.timer.stop()
@@ -0,0 +1,167 @@
+"""
+Segment-backed transcript view.
+
+A QTextEdit lays out the whole document whenever its text changes, so a
+three-hour transcript (tens of thousands of segments) froze the window for
+seconds and kept every line's layout in memory. TranscriptModel keeps the
+segments themselves, one row each, and TranscriptView shows them in a
+QListView with uniform item sizes: Qt then only lays out and paints the rows
+that are on screen, so appending a segment or loading a whole result costs
+about the same for ten rows as for a hundred thousand.
+
+The rows are held by QStringListModel and drawn by the default delegate, so
+painting a row (several data() lookups per row) never calls into Python.
+"""
+import bisect
+import re
+from typing import Any, Dict, Iterable, List, Optional
+
+from PySide6.QtCore import QStringListModel, Qt
+from PySide6.QtGui import QGuiApplication, QKeySequence, QPainter
+from PySide6.QtWidgets import QAbstractItemView, QListView
+
+from src.core.export import format_timestamp
+
+# Between a row's timestamp and its text
+SEPARATOR = "  "
+
+# [[H:]M:]S[.fff], e.g. "90", "1:30", "1:02:03.5"
+_TIMESTAMP = re.compile(r"^\s*(?:(?:(\d+):)?(\d+):)?(\d+(?:\.\d*)?)\s*$")
+
+
+def parse_timestamp(text: str) -> Optional[float]:
+    """Parse a position typed as seconds, M:SS or H:MM:SS(.fff).
+
+    Returns:
+        Optional[float]: Seconds, or None if the text is not a timestamp
+    """
+    match = _TIMESTAMP.match(text)
+    if not match:
+        return None
+    hours, minutes, seconds = match.groups()
+    return int(hours or 0) * 3600 + int(minutes or 0) * 60 + float(seconds)
+
+
+def row_text(segment: Dict[str, Any]) -> str:
+    """Return the row shown for a segment: its start time and its text."""
+    return f"{format_timestamp(segment.get('start', 0.0))}{SEPARATOR}{segment['text'].strip()}"
+
+
+class TranscriptModel(QStringListModel):
+    """One row per transcript segment that has text."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.segments: List[Dict[str, Any]] = []
+        # Start time of each row, for jump-to-time lookups
+        self.starts: List[float] = []
+
+    def append_segments(self, segments: Iterable[Dict[str, Any]]) -> int:
+        """Append segments as new rows, skipping those without text.
+
+        Returns:
+            int: Number of rows added
+        """
+        new = [segment for segment in segments if segment.get("text", "").strip()]
+        if not new:
+            return 0
+        first = len(self.segments)
+        self.segments.extend(new)
+        self.starts.extend(segment.get("start", 0.0) for segment in new)
+        self.insertRows(first, len(new))
+        for row, segment in enumerate(new, first):
+            self.setData(self.index(row), row_text(segment))
+        return len(new)
+
+    def set_segments(self, segments: Iterable[Dict[str, Any]]) -> None:
+        """Replace every row, e.g. with a finished result."""
+        self.segments = [segment for segment in segments if segment.get("text", "").strip()]
+        self.starts = [segment.get("start", 0.0) for segment in self.segments]
+        self.setStringList([row_text(segment) for segment in self.segments])
+
+    def clear(self) -> None:
+        self.set_segments([])
+
+    def row_at(self, seconds: float) -> int:
+        """Return the row of the segment playing at a position (-1 if there are no rows)."""
+        if not self.starts:
+            return -1
+        return max(bisect.bisect_right(self.starts, seconds) - 1, 0)
+
+    def text(self) -> str:
+        """Return the transcript as plain text, the segments' text concatenated."""
+        return "".join(segment["text"] for segment in self.segments)
+
+
+class TranscriptView(QListView):
+    """Virtualized list of transcript segments with timestamps."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.placeholder = "Transcription will appear here..."
+        self.setModel(TranscriptModel(self))
+        # Every row is one line high, so Qt never measures rows off screen
+        self.setUniformItemSizes(True)
+        self.setWordWrap(False)
+        self.setAlternatingRowColors(True)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+
+    def append_segment(self, segment: Dict[str, Any]) -> None:
+        """Append a decoded segment, following the end if the view was scrolled to it."""
+        scrollbar = self.verticalScrollBar()
+        following = scrollbar.value() >= scrollbar.maximum()
+        if self.model().append_segments([segment]) and following:
+            self.scrollToBottom()
+
+    def set_segments(self, segments: Iterable[Dict[str, Any]]) -> None:
+        """Show a finished result's segments."""
+        self.model().set_segments(segments)
+
+    def clear(self) -> None:
+        self.model().clear()
+
+    def text(self) -> str:
+        """Return the transcript as plain text."""
+        return self.model().text()
+
+    def jump_to(self, seconds: float) -> bool:
+        """Scroll to and select the segment playing at a position.
+
+        Returns:
+            bool: False if there is nothing to jump to
+        """
+        row = self.model().row_at(seconds)
+        if row < 0:
+            return False
+        index = self.model().index(row)
+        self.setCurrentIndex(index)
+        self.scrollTo(index, QAbstractItemView.ScrollHint.PositionAtTop)
+        return True
+
+    def selected_text(self) -> str:
+        """Return the selected rows as "[timestamp] text" lines."""
+        segments = self.model().segments
+        rows = sorted(index.row() for index in self.selectionModel().selectedIndexes())
+        return "\n".join(
+            f"[{format_timestamp(segments[row].get('start', 0.0))}] {segments[row]['text'].strip()}"
+            for row in rows
+        )
+
+    def keyPressEvent(self, event):
+        if event.matches(QKeySequence.StandardKey.Copy):
+            QGuiApplication.clipboard().setText(self.selected_text())
+            return
+        super().keyPressEvent(event)
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self.model().rowCount() == 0 and self.placeholder:
+            painter = QPainter(self.viewport())
+            painter.setPen(self.palette().placeholderText().color())
+            painter.drawText(
+                self.viewport().rect().adjusted(10, 10, -10, -10),
+                Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop,
+                self.placeholder,
+            )
@@ -1,7 +1,10 @@
+import json
 import os
 import tempfile
-from unittest.mock import patch, MagicMock
+from unittest.mock import ANY, patch, MagicMock
+import numpy as np
 import pytest
+import torch
 from click.testing import CliRunner
 import app as app
 
@@ -20,6 +23,63 @@ def mock_whisper_model():
     return mock_model
 
 
+# Transcriber settings the CLI passes when no option changes them
+DEFAULT_SETTINGS = dict(
+    cache=None,
+    audio_cache=None,
+    low_memory=False,
+    vad=False,
+    precision=None,
+    profile=False,
+    checkpoint=False,
+)
+
+
+def mock_settings(MockTranscriber):
+    """Make a mocked Transcriber keep its constructor settings as attributes, like the real one."""
+    instance = MockTranscriber.return_value
+
+    def construct(model_name="base", **settings):
+        instance.model_name = model_name
+        for name, value in settings.items():
+            setattr(instance, name, value)
+        return instance
+
+    MockTranscriber.side_effect = construct
+    return instance
+
+
+def make_segment(text, start=0.0, end=2.0):
+    """Create a transcription segment as yielded by Transcriber.transcribe_stream"""
+    return {"id": 0, "seek": 0, "start": start, "end": end, "text": text, "tokens": []}
+
+
+@pytest.fixture
+def mock_decode_audio():
+    """Patch audio decoding to return two seconds of silence without ffmpeg"""
+    with patch(
+        "src.core.audio.decode_audio", return_value=np.zeros(32000, dtype=np.float32)
+    ) as mock_decode:
+        yield mock_decode
+
+
+@pytest.fixture
+def mock_window_decoder(mock_decode_audio):
+    """Patch the window decoder to stream one segment without real audio"""
+    with patch("src.core.decoding.WindowDecoder") as MockDecoder:
+        decoder = MockDecoder.return_value
+        decoder.seek = decoder.content_frames = 200
+        decoder.duration = 2.0
+        decoder.finished = True
+        decoder.windows.return_value = iter([[make_segment("This is a test transcription.")]])
+        decoder.result.return_value = {
+            "text": "This is a test transcription.",
+            "segments": [make_segment("This is a test transcription.")],
+            "language": "en",
+        }
+        yield MockDecoder
+
+
 def test_transcribe_command_help(runner):
     """Test that the CLI shows help information"""
     result = runner.invoke(app.transcribe, ["--help"])
@@ -27,11 +87,13 @@ def test_transcribe_command_help(runner):
     assert "Transcribe audio file using OpenAI's Whisper model." in result.output
     assert "--model" in result.output
     assert "--output" in result.output
-    assert "--fp16 / --no-fp16" in result.output
+    assert "--precision [fp32|fp16|int8]" in result.output
 
 
 @patch("whisper.load_model")
-def test_transcribe_basic_functionality(mock_load_model, mock_whisper_model, runner):
+def test_transcribe_basic_functionality(
+    mock_load_model, mock_whisper_model, mock_decode_audio, mock_window_decoder, runner
+):
     """Test basic transcription functionality with mocked Whisper model"""
     mock_load_model.return_value = mock_whisper_model
 
@@ -50,9 +112,15 @@ def test_transcribe_basic_functionality(mock_load_model, mock_whisper_model, run
             # Check the model was loaded with the right parameter
             mock_load_model.assert_called_once_with("tiny")
 
-            # Check the transcribe method was called with the right parameters
-            mock_whisper_model.transcribe.assert_called_once_with(
-                audio_file.name, fp16=True
+            # Check the audio was decoded once and run through the model
+            # window by window with the right parameters (fp16 only with a GPU)
+            mock_decode_audio.assert_called_once_with(audio_file.name)
+            mock_window_decoder.assert_called_once_with(
+                mock_whisper_model,
+                ANY,
+                fp16=torch.cuda.is_available(),
+                stream_mel=False,
+                profiler=None,
             )
 
             # Check the output file was created with the right content
@@ -61,17 +129,20 @@ def test_transcribe_basic_functionality(mock_load_model, mock_whisper_model, run
                 content = f.read()
                 assert content == "This is a test transcription."
 
-            # Check the output message
+            # Check the output message, with the segment streamed as it was decoded
             assert f"Transcription saved to: {output_path}" in result.output
-            assert "This is a test transcription." in result.output
+            assert "[00:00.000 --> 00:02.000]This is a test transcription." in result.output
 
 
 @patch("app.Transcriber")
 def test_default_output_filename(MockTranscriber, runner):
     """Test that default output filename is created correctly when not specified"""
     # Configure the mock Transcriber instance and its methods
-    mock_instance = MockTranscriber.return_value
-    mock_instance.transcribe.return_value = {"text": "This is a test transcription."}
+    mock_instance = mock_settings(MockTranscriber)
+    mock_instance.transcribe_stream.return_value = iter(
+        [make_segment("This is a test transcription.")]
+    )
+    mock_instance.last_result = {"text": "This is a test transcription."}
     # Mock save_transcription to return the generated path for verification
     def mock_save(text, output_path=None):
         # In the default case (output_path is None), the app calculates it
@@ -106,11 +177,15 @@ def test_default_output_filename(MockTranscriber, runner):
         assert result.exit_code == 0, f"CLI command failed: {result.output}"
 
         # Verify Transcriber instantiation and methods were called
-        MockTranscriber.assert_called_once_with(model_name="base")
+        MockTranscriber.assert_called_once_with(model_name="base", **DEFAULT_SETTINGS)
         mock_instance.load_model.assert_called_once()
-        mock_instance.transcribe.assert_called_once_with(audio_file_path, fp16=True)
-        # Check save_transcription call - it receives the result text and potentially None for output path
-        mock_instance.save_transcription.assert_called_once_with("This is a test transcription.", None)
+        mock_instance.transcribe_stream.assert_called_once_with(
+            audio_file_path, fp16=True, progress_callback=ANY
+        )
+        # Check save_transcription call - it receives the result text and the default output path
+        mock_instance.save_transcription.assert_called_once_with(
+            "This is a test transcription.", expected_output
+        )
 
 
         # Check the output file was created with the right name
@@ -134,10 +209,11 @@ def test_default_output_filename(MockTranscriber, runner):
 
 
 @patch("app.Transcriber")
-def test_fp16_parameter(MockTranscriber, runner):
-    """Test that fp16 parameter is correctly passed to the model"""
-    mock_instance = MockTranscriber.return_value
-    mock_instance.transcribe.return_value = {"text": "Test"}
+def test_precision_parameter(MockTranscriber, runner):
+    """Test that --precision is passed to the transcriber"""
+    mock_instance = mock_settings(MockTranscriber)
+    mock_instance.transcribe_stream.return_value = iter([make_segment("Test")])
+    mock_instance.last_result = {"text": "Test"}
     def mock_save(text, output_path=None):
         if output_path is None:
             output_path = os.path.splitext(audio_file_path)[0] + ".txt"
@@ -154,14 +230,17 @@ def test_fp16_parameter(MockTranscriber, runner):
 
     output_path = None
     try:
-        # Test with fp16=False
-        result = runner.invoke(app.transcribe, ["--no-fp16", audio_file_path])
+        # Test with int8 quantization
+        result = runner.invoke(app.transcribe, ["--precision", "int8", audio_file_path])
 
         # Check command ran successfully
         assert result.exit_code == 0
 
-        # Check the transcribe method was called with fp16=False
-        mock_instance.transcribe.assert_called_with(audio_file_path, fp16=False)
+        # Check the transcriber was set to int8 and called with fp16=False
+        assert mock_instance.precision == "int8"
+        mock_instance.transcribe_stream.assert_called_with(
+            audio_file_path, fp16=False, progress_callback=ANY
+        )
         
         # Get the expected output path for cleanup
         output_path = os.path.splitext(audio_file_path)[0] + ".txt"
@@ -178,3 +257,420 @@ def test_missing_audio_file(runner):
     result = runner.invoke(app.transcribe, ["nonexistent_file.mp3"])
     assert result.exit_code != 0
     assert "does not exist" in result.output
+
+
+@patch("app.Transcriber")
+def test_batch_directory_loads_model_once(MockTranscriber, runner):
+    """Test that batch mode transcribes every file in a directory with one model load"""
+    mock_instance = mock_settings(MockTranscriber)
+    mock_instance.transcribe.side_effect = lambda path, fp16=True, samples=None: {
+        "text": f"Text of {os.path.basename(path)}"
+    }
+
+    def mock_save(text, output_path=None):
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return output_path
+
+    mock_instance.save_transcription.side_effect = mock_save
+
+    with tempfile.TemporaryDirectory() as input_dir, tempfile.TemporaryDirectory() as out_dir:
+        for name in ("a.mp3", "b.wav", "notes.txt"):
+            open(os.path.join(input_dir, name), "w").close()
+        summary_path = os.path.join(out_dir, "summary.json")
+
+        result = runner.invoke(
+            app.transcribe,
+            ["--batch", input_dir, "--output-dir", out_dir, "--summary", summary_path],
+        )
+
+        assert result.exit_code == 0, result.output
+        MockTranscriber.assert_called_once_with(model_name="base", **DEFAULT_SETTINGS)
+        assert mock_instance.transcribe.call_count == 2
+        assert os.path.exists(os.path.join(out_dir, "a.txt"))
+        assert os.path.exists(os.path.join(out_dir, "b.txt"))
+
+        with open(summary_path, "r", encoding="utf-8") as f:
+            summary = json.load(f)
+        assert summary["failed"] == 0
+        assert [os.path.basename(e["audio_file"]) for e in summary["files"]] == ["a.mp3", "b.wav"]
+
+
+@patch("app.Transcriber")
+def test_batch_output_dir_mirrors_subdirectories(MockTranscriber, runner):
+    """Test that same-named files in different subdirectories get separate outputs"""
+    mock_instance = mock_settings(MockTranscriber)
+    mock_instance.transcribe.side_effect = lambda path, fp16=True, samples=None: {
+        "text": f"Text of {path}"
+    }
+
+    def mock_save(text, output_path=None):
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return output_path
+
+    mock_instance.save_transcription.side_effect = mock_save
+
+    with tempfile.TemporaryDirectory() as input_dir, tempfile.TemporaryDirectory() as out_dir:
+        inputs = [
+            os.path.join(input_dir, "a", "talk.mp3"),
+            os.path.join(input_dir, "b", "talk.wav"),
+            os.path.join(input_dir, "b", "talk.mp3"),
+        ]
+        for path in inputs:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            open(path, "w").close()
+
+        # Outputs and checkpoints of an earlier run are not picked up as audio
+        open(os.path.join(input_dir, "a", "talk.txt"), "w").close()
+        open(os.path.join(input_dir, "a", "talk.mp3.checkpoint.json"), "w").close()
+
+        result = runner.invoke(app.transcribe, ["--batch", os.path.join(input_dir, "*", "*")])
+        assert result.exit_code == 0, result.output
+        assert mock_instance.transcribe.call_count == 3
+
+        result = runner.invoke(app.transcribe, ["--batch", input_dir, "--output-dir", out_dir])
+
+        assert result.exit_code == 0, result.output
+        outputs = {
+            os.path.join("a", "talk.txt"): inputs[0],
+            os.path.join("b", "talk.wav.txt"): inputs[1],
+            os.path.join("b", "talk.mp3.txt"): inputs[2],
+        }
+        for output, audio_file in outputs.items():
+            with open(os.path.join(out_dir, output), "r", encoding="utf-8") as f:
+                assert f.read() == f"Text of {audio_file}"
+
+
+@patch("app.Transcriber")
+def test_batch_manifest_continues_after_failure(MockTranscriber, runner):
+    """Test that a failing file is reported and the rest of a manifest still runs"""
+    mock_instance = mock_settings(MockTranscriber)
+
+    def mock_transcribe(path, fp16=True, samples=None):
+        if path.endswith("bad.mp3"):
+            raise RuntimeError("decode failed")
+        return {"text": "ok"}
+
+    mock_instance.transcribe.side_effect = mock_transcribe
+    mock_instance.save_transcription.side_effect = lambda text, output_path=None: output_path
+
+    with tempfile.TemporaryDirectory() as input_dir:
+        for name in ("good.mp3", "bad.mp3"):
+            open(os.path.join(input_dir, name), "w").close()
+        manifest = os.path.join(input_dir, "files.txt")
+        with open(manifest, "w", encoding="utf-8") as f:
+            f.write("# nightly run\nbad.mp3\n\ngood.mp3\n")
+
+        result = runner.invoke(app.transcribe, ["--batch", manifest])
+
+        assert result.exit_code == 1
+        assert mock_instance.transcribe.call_count == 2
+        assert "decode failed" in result.output
+        assert "(1 failed)" in result.output
+
+
+def test_batch_no_matches(runner):
+    """Test that a batch spec matching nothing is a usage error"""
+    result = runner.invoke(app.transcribe, ["--batch", "no_such_dir/*.mp3"])
+    assert result.exit_code != 0
+    assert "No audio files found" in result.output
+
+
+def test_missing_audio_file_and_batch(runner):
+    """Test that the command requires an audio file or batch input"""
+    result = runner.invoke(app.transcribe, [])
+    assert result.exit_code != 0
+    assert "AUDIO_FILE" in result.output
+
+
+@patch("app.TranscriptionPool")
+def test_batch_workers_uses_process_pool(MockPool, runner):
+    """Test that --workers dispatches the batch to a process pool"""
+    pool = MockPool.return_value
+    pool.workers, pool.threads_per_worker = 2, 4
+    pool.checkpoint = False
+    pool.__enter__.return_value = pool
+    pool.imap.side_effect = lambda files, outputs: iter(
+        {"audio_file": f, "output_path": o, "status": "ok", "seconds": 0.1, "error": None}
+        for f, o in zip(files, outputs)
+    )
+
+    with tempfile.TemporaryDirectory() as input_dir:
+        for name in ("a.mp3", "b.mp3", "c.mp3"):
+            open(os.path.join(input_dir, name), "w").close()
+
+        result = runner.invoke(app.transcribe, ["--batch", input_dir, "--workers", "2", "--precision", "fp32"])
+
+        assert result.exit_code == 0, result.output
+        MockPool.assert_called_once_with(
+            model_name="base",
+            workers=2,
+            fp16=False,
+            cache=None,
+            low_memory=False,
+            vad=False,
+            precision="fp32",
+            warm=False,
+            checkpoint=False,
+            audio_cache=None,
+            profile=False,
+        )
+        files, outputs = pool.imap.call_args[0]
+        assert [os.path.basename(f) for f in files] == ["a.mp3", "b.mp3", "c.mp3"]
+        assert [os.path.basename(o) for o in outputs] == ["a.txt", "b.txt", "c.txt"]
+        assert "(2 worker(s))" in result.output
+
+
+@patch("app.TranscriptionPool")
+def test_batch_workers_reject_per_process_options(MockPool, runner):
+    """Test that --prefetch and --batch-size are refused with --workers, not ignored"""
+    with tempfile.TemporaryDirectory() as input_dir:
+        open(os.path.join(input_dir, "a.mp3"), "w").close()
+        for option in (["--prefetch", "4"], ["--batch-size", "8"]):
+            result = runner.invoke(app.transcribe, ["--batch", input_dir, "--workers", "2"] + option)
+            assert result.exit_code == 2
+            assert f"{option[0]} cannot be used with --workers" in result.output
+    MockPool.assert_not_called()
+
+
+@patch("src.core.planner._system_memory", return_value=(8 * 1024 ** 3, 2 * 1024 ** 3))
+@patch("app.TranscriptionPool")
+@patch("app.Transcriber")
+def test_batch_planner_sizes_workers_to_memory(MockTranscriber, MockPool, mock_memory, runner):
+    """Test that batch mode refuses a model that does not fit and runs fewer workers"""
+    mock_instance = mock_settings(MockTranscriber)
+    mock_instance.transcribe.side_effect = lambda path, fp16=True, samples=None: {"text": "ok"}
+    mock_instance.save_transcription.side_effect = lambda text, output_path=None: output_path
+    pool = MockPool.return_value
+    pool.workers, pool.threads_per_worker = 2, 1
+    pool.checkpoint = False
+    pool.__enter__.return_value = pool
+    pool.imap.side_effect = lambda files, outputs: iter(
+        {"audio_file": f, "output_path": o, "status": "ok", "seconds": 0.1, "error": None}
+        for f, o in zip(files, outputs)
+    )
+
+    with tempfile.TemporaryDirectory() as input_dir:
+        open(os.path.join(input_dir, "a.mp3"), "w").close()
+
+        result = runner.invoke(app.transcribe, ["--batch", input_dir, "--model", "medium"])
+        assert result.exit_code != 0
+        assert "Not enough memory for the medium model" in result.output
+        MockTranscriber.assert_not_called()
+
+        result = runner.invoke(app.transcribe, ["--batch", input_dir, "--model", "medium", "--overcommit"])
+        assert result.exit_code == 0, result.output
+        assert "Running anyway (--overcommit)." in result.output
+
+        result = runner.invoke(app.transcribe, ["--batch", input_dir, "--workers", "4"])
+        assert result.exit_code == 0, result.output
+        assert "Resource planner: admit base: 2 of 4 worker(s)" in result.output
+        assert MockPool.call_args.kwargs["workers"] == 2
+
+
+@patch("app.warm_up_model")
+@patch("app.Transcriber")
+def test_batch_warm_runs_warmup_first(MockTranscriber, mock_warm_up, runner):
+    """Test that --warm warms the model up before the first file"""
+    mock_instance = mock_settings(MockTranscriber)
+    mock_instance.transcribe.side_effect = lambda path, fp16=True, samples=None: {"text": "ok"}
+    mock_instance.save_transcription.side_effect = lambda text, output_path=None: output_path
+    mock_warm_up.return_value = {"import": 0.5, "load": 1.0, "cold": 2.0, "warm": 0.25}
+
+    with tempfile.TemporaryDirectory() as input_dir:
+        open(os.path.join(input_dir, "a.mp3"), "w").close()
+        summary_path = os.path.join(input_dir, "summary.json")
+
+        result = runner.invoke(
+            app.transcribe, ["--batch", input_dir, "--warm", "--summary", summary_path]
+        )
+
+        assert result.exit_code == 0, result.output
+        mock_warm_up.assert_called_once_with(mock_instance, fp16=True)
+        mock_instance.load_model.assert_not_called()
+        assert "first inference 2.00s cold, 0.25s warm" in result.output
+        assert "(warm model)" in result.output
+        with open(summary_path, "r", encoding="utf-8") as f:
+            summary = json.load(f)
+        assert summary["warmup"]["cold"] == 2.0
+        assert summary["model_load_seconds"] == 1.5
+
+
+@patch("app.transcribe_chunked")
+@patch("app.Transcriber")
+def test_chunk_length_uses_chunked_mode(MockTranscriber, mock_chunked, runner):
+    """Test that --chunk-length transcribes through the chunked path"""
+    mock_instance = mock_settings(MockTranscriber)
+    mock_chunked.return_value = {"text": "Stitched text", "segments": [], "language": "en"}
+    mock_instance.save_transcription.side_effect = lambda text, output_path=None: output_path
+
+    with tempfile.NamedTemporaryFile(suffix=".mp3") as audio_file:
+        result = runner.invoke(app.transcribe, ["--chunk-length", "300", audio_file.name])
+
+        assert result.exit_code == 0, result.output
+        mock_chunked.assert_called_once_with(
+            audio_file.name, mock_instance, chunk_seconds=300.0, fp16=True
+        )
+        mock_instance.transcribe.assert_not_called()
+        expected_output = os.path.splitext(audio_file.name)[0] + ".txt"
+        mock_instance.save_transcription.assert_called_once_with("Stitched text", expected_output)
+
+
+@patch("app.transcribe_chunked")
+@patch("app.TranscriptionPool")
+@patch("app.Transcriber")
+def test_chunk_length_with_workers_uses_pool(MockTranscriber, MockPool, mock_chunked, runner):
+    """Test that --chunk-length with --workers runs the chunks in a pool with the same options"""
+    pool = MockPool.return_value.__enter__.return_value
+    mock_chunked.return_value = {"text": "Stitched text", "segments": [], "language": "en"}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        audio_file = os.path.join(tmp, "long.mp3")
+        open(audio_file, "w").close()
+        result = runner.invoke(
+            app.transcribe, ["--chunk-length", "300", "--workers", "2", "--low-memory", audio_file]
+        )
+
+        assert result.exit_code == 0, result.output
+        assert MockPool.call_args.kwargs["low_memory"] is True
+        mock_chunked.assert_called_once_with(audio_file, pool, chunk_seconds=300.0)
+        MockTranscriber.assert_not_called()
+        with open(os.path.join(tmp, "long.txt"), encoding="utf-8") as f:
+            assert f.read() == "Stitched text"
+
+
+@patch("whisper.load_model")
+def test_cache_skips_second_transcription(
+    mock_load_model, mock_whisper_model, mock_decode_audio, mock_window_decoder, runner
+):
+    """Test that --cache answers a repeated run from disk without inference"""
+    mock_load_model.return_value = mock_whisper_model
+
+    with tempfile.NamedTemporaryFile(suffix=".mp3") as audio_file:
+        audio_file.write(b"fake audio bytes")
+        audio_file.flush()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_dir = os.path.join(temp_dir, "cache")
+            output_path = os.path.join(temp_dir, "output.txt")
+            args = ["--cache", "--cache-dir", cache_dir, "--output", output_path, audio_file.name]
+
+            first = runner.invoke(app.transcribe, args)
+            second = runner.invoke(app.transcribe, args)
+
+            assert first.exit_code == 0, first.output
+            assert second.exit_code == 0, second.output
+            assert "Cache: 0 hit(s), 1 miss(es)" in first.output
+            assert "Cache: 1 hit(s), 0 miss(es)" in second.output
+            assert mock_window_decoder.call_count == 1
+            assert mock_load_model.call_count == 1
+            assert mock_decode_audio.call_count == 1
+            assert "This is a test transcription." in second.output
+
+            purge = runner.invoke(app.transcribe, ["--purge-cache", "--cache-dir", cache_dir])
+            assert purge.exit_code == 0
+            assert "Purged 1 cached result(s)" in purge.output
+            assert "Purged 1 decoded audio file(s)" in purge.output
+
+
+@patch("whisper.load_model")
+def test_checkpoint_answers_completed_rerun(
+    mock_load_model, mock_whisper_model, mock_decode_audio, mock_window_decoder, runner
+):
+    """Test that --checkpoint leaves a sidecar file and a rerun is answered from it"""
+    mock_load_model.return_value = mock_whisper_model
+    mock_window_decoder.return_value.state.return_value = {"seek": 200}
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        audio_path = os.path.join(temp_dir, "talk.mp3")
+        with open(audio_path, "wb") as f:
+            f.write(b"fake audio bytes")
+        args = ["--checkpoint", audio_path]
+
+        first = runner.invoke(app.transcribe, args)
+        second = runner.invoke(app.transcribe, args)
+
+        assert first.exit_code == 0, first.output
+        assert second.exit_code == 0, second.output
+        assert os.path.exists(audio_path + ".checkpoint.json")
+        assert mock_window_decoder.call_count == 1
+        assert mock_load_model.call_count == 1
+        assert "This is a test transcription." in second.output
+        with open(os.path.join(temp_dir, "talk.txt"), encoding="utf-8") as f:
+            assert f.read() == "This is a test transcription."
+
+
+@patch("whisper.load_model")
+def test_vad_skips_silent_audio(
+    mock_load_model, mock_whisper_model, mock_decode_audio, mock_window_decoder, runner
+):
+    """Test that --vad reports skipped audio and never decodes a silent file"""
+    mock_load_model.return_value = mock_whisper_model
+
+    with tempfile.NamedTemporaryFile(suffix=".mp3") as audio_file:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_path = os.path.join(temp_dir, "output.txt")
+
+            result = runner.invoke(app.transcribe, ["--vad", "--output", output_path, audio_file.name])
+
+            assert result.exit_code == 0, result.output
+            mock_window_decoder.assert_not_called()
+            assert "VAD skipped 0:02 of 0:02 (100% of the audio)" in result.output
+
+
+@patch("whisper.load_model")
+def test_profile_prints_breakdown_and_trace(
+    mock_load_model, mock_whisper_model, mock_decode_audio, mock_window_decoder, runner
+):
+    """Test that --profile prints the stage table and --profile-trace writes a trace"""
+    mock_load_model.return_value = mock_whisper_model
+
+    with tempfile.NamedTemporaryFile(suffix=".mp3") as audio_file:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_path = os.path.join(temp_dir, "output.txt")
+            trace_path = os.path.join(temp_dir, "trace.json")
+
+            result = runner.invoke(
+                app.transcribe,
+                ["--profile-trace", trace_path, "--output", output_path, audio_file.name],
+            )
+
+            assert result.exit_code == 0, result.output
+            assert "Profile:" in result.output
+            assert "decode_audio" in result.output
+            assert f"Trace saved to: {trace_path}" in result.output
+            with open(trace_path, encoding="utf-8") as f:
+                names = {event["name"] for event in json.load(f)["traceEvents"]}
+            assert {"load_model", "decode_audio"} <= names
+
+
+@patch("app.Transcriber")
+def test_multiple_formats_from_one_run(MockTranscriber, runner):
+    """Test that --format writes every requested format from a single transcription"""
+    mock_instance = mock_settings(MockTranscriber)
+    segments = [make_segment(" Hello.", 0.0, 1.0), make_segment(" World.", 1.0, 2.5)]
+    mock_instance.transcribe_stream.return_value = iter(segments)
+    mock_instance.last_result = {"text": " Hello. World.", "segments": segments, "language": "en"}
+    mock_instance.save_transcription.side_effect = lambda text, output_path=None: output_path
+
+    with tempfile.TemporaryDirectory() as tmp:
+        audio_path = os.path.join(tmp, "talk.mp3")
+        open(audio_path, "w").close()
+
+        result = runner.invoke(app.transcribe, [audio_path, "-f", "srt,vtt", "--format", "json"])
+
+        assert result.exit_code == 0, result.output
+        mock_instance.transcribe_stream.assert_called_once()
+        mock_instance.save_transcription.assert_not_called()
+        with open(os.path.join(tmp, "talk.srt"), encoding="utf-8") as f:
+            assert f.read().startswith("1\n00:00:00,000 --> 00:00:01,000\nHello.\n\n2\n")
+        with open(os.path.join(tmp, "talk.vtt"), encoding="utf-8") as f:
+            assert f.read().startswith("WEBVTT\n\n00:00.000 --> 00:01.000\nHello.")
+        with open(os.path.join(tmp, "talk.json"), encoding="utf-8") as f:
+            assert json.load(f)["segments"] == segments
+        assert not os.path.exists(os.path.join(tmp, "talk.txt"))
+        assert f"SRT saved to: {os.path.join(tmp, 'talk.srt')}" in result.output
+
+        result = runner.invoke(app.transcribe, [audio_path, "--format", "docx"])
+        assert result.exit_code != 0
+        assert "Unknown format 'docx'" in result.output
@@ -0,0 +1,37 @@
+"""
+Shared fixtures: a tiny random Whisper model for real, download-free decoding.
+"""
+import numpy as np
+import pytest
+import torch
+from whisper.model import ModelDimensions, Whisper
+
+from src.core import ModelRegistry, Transcriber
+
+
+@pytest.fixture(scope="session")
+def random_model():
+    """A tiny randomly initialised Whisper model (no download needed)."""
+    torch.manual_seed(0)
+    dims = ModelDimensions(
+        n_mels=80, n_audio_ctx=1500, n_audio_state=64, n_audio_head=2, n_audio_layer=1,
+        n_vocab=51865, n_text_ctx=448, n_text_state=64, n_text_head=2, n_text_layer=1,
+    )
+    model = Whisper(dims).eval()
+    # Whisper leaves the text positional embedding uninitialised (torch.empty)
+    torch.nn.init.normal_(model.decoder.positional_embedding, std=0.01)
+    # Warm up kernels so the first compared run takes the same code paths as the rest
+    model.transcribe(np.zeros(16000, dtype=np.float32), fp16=False, language="en", temperature=0.0)
+    return model
+
+
+@pytest.fixture(scope="session")
+def audio():
+    """Forty seconds of deterministic noise, enough for two windows."""
+    return (np.random.RandomState(0).randn(16000 * 40) * 0.1).astype(np.float32)
+
+
+@pytest.fixture
+def random_transcriber(random_model):
+    """A Transcriber whose registry serves the random model under any name."""
+    return Transcriber("random", registry=ModelRegistry(loader=lambda name: random_model))
@@ -0,0 +1,118 @@
+"""
+Tests for the asyncio interface to the Transcriber.
+"""
+import asyncio
+import contextlib
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.core import AsyncTranscriber, ModelRegistry
+
+OPTIONS = dict(fp16=False, language="en", temperature=0.0)
+
+
+@pytest.fixture
+def registry(random_model):
+    return ModelRegistry(loader=lambda name: random_model)
+
+
+def test_stream_yields_segments_of_result(registry, audio):
+    """Test that streamed segments match the awaited result."""
+    async def run():
+        async with AsyncTranscriber("random", registry=registry) as transcriber:
+            segments = [segment async for segment in transcriber.stream(audio, **OPTIONS)]
+            result = await transcriber.transcribe(audio, **OPTIONS)
+        return segments, result
+
+    segments, result = asyncio.run(run())
+
+    assert segments == result["segments"]
+    assert result["text"]
+
+
+def test_event_loop_stays_responsive(registry, audio):
+    """Test that inference runs off the loop and progress arrives on it."""
+    loop_thread = []
+    progress = []
+
+    async def ticker():
+        ticks = 0
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+            loop_thread.append(threading.current_thread())
+            if ticks > 1000:
+                return ticks
+
+    async def run():
+        async with AsyncTranscriber("random", registry=registry) as transcriber:
+            tick = asyncio.create_task(ticker())
+            await transcriber.transcribe(audio, progress_callback=progress.append, **OPTIONS)
+            tick.cancel()
+            return len(loop_thread)
+
+    assert asyncio.run(run()) > 5
+    assert progress[-1].fraction == 1.0
+    assert set(loop_thread) == {threading.main_thread()}
+
+
+def test_cancelling_task_stops_transcription(registry, audio):
+    """Test that cancelling the awaiting task frees the slot for the next call."""
+    async def run():
+        async with AsyncTranscriber("random", registry=registry) as transcriber:
+            task = asyncio.create_task(transcriber.transcribe(audio, **OPTIONS))
+            while transcriber.active == 0:
+                await asyncio.sleep(0.001)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            assert transcriber.active == 0
+            return await transcriber.transcribe(audio[:16000 * 5], **OPTIONS)
+
+    assert asyncio.run(run())["segments"]
+
+
+def test_breaking_out_of_stream_cancels(registry, audio):
+    """Test that closing the stream early stops decoding the rest of the file."""
+    async def run():
+        async with AsyncTranscriber("random", registry=registry) as transcriber:
+            stream = transcriber.stream(audio, **OPTIONS)
+            async with contextlib.aclosing(stream):
+                async for _ in stream:
+                    break
+            return transcriber.active
+
+    assert asyncio.run(run()) == 0
+
+
+def test_limiter_is_shared_across_callers(registry, audio):
+    """Test that no more than max_concurrency transcriptions run at once."""
+    running, peak = [0], [0]
+    original = AsyncTranscriber._run
+
+    def counting_run(self, *args):
+        running[0] += 1
+        peak[0] = max(peak[0], running[0])
+        time.sleep(0.05)
+        try:
+            original(self, *args)
+        finally:
+            running[0] -= 1
+
+    async def run():
+        limiter = asyncio.Semaphore(2)
+        first = AsyncTranscriber("random", max_concurrency=2, registry=registry, limiter=limiter)
+        second = AsyncTranscriber("random", max_concurrency=2, registry=registry, limiter=limiter)
+        clip = audio[:16000 * 2]
+        await asyncio.gather(*[
+            transcriber.transcribe(clip, **OPTIONS) for transcriber in (first, second) * 3
+        ])
+        await first.close()
+        await second.close()
+
+    with patch.object(AsyncTranscriber, "_run", counting_run):
+        asyncio.run(run())
+    assert peak[0] == 2
@@ -0,0 +1,118 @@
+"""
+Tests for the audio decode stage: native WAV reads, the decoded-audio cache
+and background prefetching.
+"""
+import time
+import wave
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from src.core.audio import AudioPrefetcher, DecodedAudioCache, decode_audio, load_audio
+from src.core.batch import run_batch
+
+
+def write_wav(path, samples, rate=16000):
+    """Write float samples in [-1, 1) as a 16-bit mono WAV file."""
+    pcm = (np.clip(samples, -1, 1 - 1 / 32768) * 32768).astype("<i2")
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes(pcm.tobytes())
+    return pcm
+
+
+def test_wav_is_read_without_ffmpeg(tmp_path):
+    """Test that 16 kHz mono WAV is decoded natively, scaled like whisper.load_audio."""
+    pcm = write_wav(tmp_path / "a.wav", np.random.RandomState(0).randn(16000) * 0.1)
+
+    with patch("whisper.load_audio") as mock_ffmpeg:
+        samples = decode_audio(str(tmp_path / "a.wav"))
+
+    mock_ffmpeg.assert_not_called()
+    assert samples.dtype == np.float32
+    np.testing.assert_array_equal(samples, pcm.astype(np.float32) / 32768.0)
+
+
+def test_other_formats_go_through_ffmpeg(tmp_path):
+    """Test that WAV at another sample rate falls back to whisper.load_audio."""
+    write_wav(tmp_path / "b.wav", np.zeros(8000), rate=8000)
+
+    with patch("whisper.load_audio", return_value=np.zeros(16000, np.float32)) as mock_ffmpeg:
+        decode_audio(str(tmp_path / "b.wav"))
+
+    mock_ffmpeg.assert_called_once_with(str(tmp_path / "b.wav"), sr=16000)
+
+
+def test_cache_memory_maps_decoded_audio(tmp_path):
+    """Test that a second load reads the cached .npy instead of decoding."""
+    path = str(tmp_path / "a.wav")
+    write_wav(path, np.random.RandomState(1).randn(32000) * 0.1)
+    cache = DecodedAudioCache(str(tmp_path / "cache"))
+
+    with patch("src.core.audio.decode_audio", wraps=decode_audio) as mock_decode:
+        first = load_audio(path, cache)
+        second = load_audio(path, cache)
+
+    assert mock_decode.call_count == 1
+    assert isinstance(second, np.memmap)
+    np.testing.assert_array_equal(first, second)
+    second[0] = 1.0  # copy-on-write: the cache entry is unchanged
+    assert load_audio(path, cache)[0] == first[0]
+    assert cache.stats()["entries"] == 1
+
+
+def test_prefetcher_keeps_order_and_reports_errors(tmp_path):
+    """Test ordering, skipped files and per-file decode errors."""
+    def fake_decode(path):
+        if path == "bad":
+            raise RuntimeError("cannot decode")
+        return np.full(10, len(path), np.float32)
+
+    with patch("src.core.audio.decode_audio", side_effect=fake_decode):
+        with AudioPrefetcher(["a", "bad", "ccc", "skip"], skip=lambda p: p == "skip") as prefetcher:
+            items = list(prefetcher)
+
+    assert [path for path, _, _ in items] == ["a", "bad", "ccc", "skip"]
+    assert items[0][1][0] == 1 and items[2][1][0] == 3
+    assert isinstance(items[1][2], RuntimeError) and items[1][1] is None
+    assert items[3][1] is None and items[3][2] is None
+
+
+def test_prefetcher_stays_within_depth():
+    """Test that at most depth files wait decoded (plus one blocked on the queue)."""
+    decoded = []
+
+    def fake_decode(path):
+        decoded.append(path)
+        return np.zeros(1, np.float32)
+
+    with patch("src.core.audio.decode_audio", side_effect=fake_decode):
+        prefetcher = AudioPrefetcher([str(i) for i in range(10)], depth=2)
+        time.sleep(0.3)
+        assert len(decoded) == 3
+        prefetcher.close()
+
+
+def test_batch_passes_prefetched_audio(tmp_path):
+    """Test that run_batch hands each file's prefetched samples to the transcriber."""
+    files = []
+    for i in range(3):
+        path = tmp_path / f"clip{i}.wav"
+        write_wav(path, np.random.RandomState(i).randn(16000) * 0.1)
+        files.append(str(path))
+
+    transcriber = MagicMock(cache=None, audio_cache=None)
+    transcriber.is_cached.side_effect = lambda path, fp16: path.endswith("clip1.wav")
+    transcriber.open_audio.side_effect = decode_audio
+    transcriber.transcribe.return_value = {"text": "ok"}
+
+    summary = run_batch(transcriber, files, output_dir=str(tmp_path / "out"), prefetch=2)
+
+    assert [entry["status"] for entry in summary] == ["ok"] * 3
+    calls = transcriber.transcribe.call_args_list
+    assert [c.args[0] for c in calls] == files
+    np.testing.assert_array_equal(calls[0].kwargs["samples"], decode_audio(files[0]))
+    assert calls[1].kwargs["samples"] is None  # answered from the result cache
+    np.testing.assert_array_equal(calls[2].kwargs["samples"], decode_audio(files[2]))
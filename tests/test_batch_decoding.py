@@ -0,0 +1,95 @@
+"""
+Tests for batched transcription of short clips.
+"""
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from src.core import TranscriptionCache
+from src.core.batch import run_batch
+
+SR = 16000
+
+
+@pytest.fixture(scope="module")
+def clips():
+    """Short clips of different lengths, one longer than a window."""
+    rng = np.random.RandomState(1)
+    return [(rng.randn(int(seconds * SR)) * 0.1).astype(np.float32) for seconds in (5, 12, 35)]
+
+
+def test_batch_matches_single_transcription(random_transcriber, clips):
+    """Test that batched results equal clip-by-clip results, in input order."""
+    options = dict(fp16=False, language="en", temperature=0.0)
+
+    batched = random_transcriber.transcribe_batch(clips, batch_size=3, **options)
+    single = [random_transcriber.transcribe(clip, **options) for clip in clips]
+
+    assert len(batched) == len(clips)
+    for result, expected in zip(batched, single):
+        assert result["text"] == expected["text"]
+        assert [(s["start"], s["end"]) for s in result["segments"]] == [
+            (s["start"], s["end"]) for s in expected["segments"]
+        ]
+
+
+def test_batch_detects_language_per_clip(random_transcriber, clips):
+    """Test that clips without a language get the same one transcribe() detects."""
+    batched = random_transcriber.transcribe_batch(clips[:2], batch_size=2, fp16=False, temperature=0.0)
+
+    for result, clip in zip(batched, clips[:2]):
+        assert result["language"] == random_transcriber.transcribe(
+            clip, fp16=False, temperature=0.0
+        )["language"]
+
+
+def test_batch_uses_cache(random_transcriber, clips, tmp_path):
+    """Test that cached clips are not decoded again and new results are stored."""
+    random_transcriber.cache = TranscriptionCache(str(tmp_path))
+    options = dict(fp16=False, language="en", temperature=0.0)
+    first = random_transcriber.transcribe(clips[0], **options)
+
+    results = random_transcriber.transcribe_batch(clips[:2], batch_size=2, **options)
+
+    assert results[0] == first
+    assert random_transcriber.cache.hits == 1
+    assert random_transcriber.is_cached(clips[1], **options)
+
+
+def test_run_batch_groups_files(tmp_path):
+    """Test that run_batch hands files over in groups and keeps their order."""
+    transcriber = MagicMock(checkpoint=False)
+    transcriber.is_cached.return_value = False
+    transcriber.transcribe_batch.side_effect = lambda files, **kwargs: [
+        {"text": f"text of {f}"} for f in files
+    ]
+    transcriber.save_transcription.side_effect = lambda text, path: path
+    files = [str(tmp_path / f"{i}.wav") for i in range(5)]
+
+    summary = run_batch(transcriber, files, prefetch=0, batch_size=2)
+
+    assert [entry["audio_file"] for entry in summary] == files
+    assert [len(call.args[0]) for call in transcriber.transcribe_batch.call_args_list] == [2, 2, 1]
+    assert all(entry["status"] == "ok" for entry in summary)
+    transcriber.transcribe.assert_not_called()
+
+
+def test_run_batch_falls_back_to_single_files(tmp_path):
+    """Test that a failing group is retried file by file so only the bad file fails."""
+    transcriber = MagicMock(checkpoint=False)
+    transcriber.is_cached.return_value = False
+    transcriber.transcribe_batch.side_effect = RuntimeError("bad clip")
+
+    def transcribe(audio_file, **kwargs):
+        if audio_file.endswith("bad.wav"):
+            raise RuntimeError("bad clip")
+        return {"text": "ok"}
+
+    transcriber.transcribe.side_effect = transcribe
+    files = [str(tmp_path / name) for name in ("a.wav", "bad.wav", "c.wav")]
+
+    summary = run_batch(transcriber, files, prefetch=0, batch_size=3)
+
+    assert [entry["status"] for entry in summary] == ["ok", "error", "ok"]
+    assert summary[1]["error"] == "bad clip"
@@ -0,0 +1,115 @@
+"""
+Tests for the persistent transcription cache.
+"""
+import os
+import time
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from src.core import Transcriber, TranscriptionCache
+from src.core.cache import hash_audio
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Create a cache in a temporary directory."""
+    return TranscriptionCache(str(tmp_path / "cache"))
+
+
+@pytest.fixture
+def audio_file(tmp_path):
+    """Create a small fake audio file."""
+    path = tmp_path / "clip.mp3"
+    path.write_bytes(b"not really audio")
+    return str(path)
+
+
+def test_key_depends_on_content_and_settings(cache, audio_file, tmp_path):
+    """Test that the key changes with audio content, model, fp16 and options."""
+    base = cache.make_key(audio_file, "base", True)
+
+    copy = tmp_path / "renamed.mp3"
+    copy.write_bytes(b"not really audio")
+    assert cache.make_key(str(copy), "base", True) == base
+
+    assert cache.make_key(audio_file, "tiny", True) != base
+    assert cache.make_key(audio_file, "base", False) != base
+    assert cache.make_key(audio_file, "base", True, {"language": "en"}) != base
+
+    samples = np.zeros(16000, dtype=np.float32)
+    assert cache.make_key(samples, "base", True) == cache.make_key(samples.copy(), "base", True)
+
+
+def test_file_digest_is_reused_until_the_file_changes(audio_file):
+    """Test that a file is read once for repeated keys and again after it changes."""
+    with patch("src.core.cache.open", wraps=open, create=True) as mock_open:
+        digest = hash_audio(audio_file)
+        assert hash_audio(audio_file) == digest
+        assert mock_open.call_count == 1
+
+        with open(audio_file, "wb") as f:
+            f.write(b"other audio bytes")
+        stat = os.stat(audio_file)
+        os.utime(audio_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert hash_audio(audio_file) != digest
+        assert mock_open.call_count == 2
+
+
+def test_get_put_roundtrip_and_counters(cache):
+    """Test storing and reading back a result."""
+    result = {"text": " Hi.", "segments": [{"id": 0, "start": 0.0, "end": 1.0}], "language": "en"}
+
+    assert cache.get("abc") is None
+    cache.put("abc", result)
+    assert cache.get("abc") == result
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.stats()["entries"] == 1
+
+
+def test_eviction_removes_least_recently_used(tmp_path):
+    """Test that the size cap evicts the entry used longest ago."""
+    cache = TranscriptionCache(str(tmp_path / "cache"), max_bytes=10 ** 6)
+    payload = {"text": "x" * 400}
+    for key in ("a", "b", "c"):
+        cache.put(key, payload)
+    # Make "a" the most recently used, then shrink the cap to two entries
+    old = time.time() - 100
+    for key in ("a", "b", "c"):
+        os.utime(cache._path(key), (old, old))
+    cache.get("a")
+    entry_size = os.path.getsize(cache._path("a"))
+    cache.max_bytes = entry_size * 2
+
+    assert cache.evict() == 1
+    assert cache.get("a") is not None
+    assert cache.get("b") is None or cache.get("c") is None
+
+
+def test_purge(cache):
+    """Test that purge empties the cache."""
+    cache.put("a", {"text": "a"})
+    cache.put("b", {"text": "b"})
+    assert cache.purge() == 2
+    assert cache.stats()["entries"] == 0
+
+
+@patch("src.core.audio.decode_audio", return_value=np.zeros(16000, dtype=np.float32))
+@patch("src.core.decoding.WindowDecoder")
+@patch("whisper.load_model")
+def test_transcriber_uses_cache(mock_load_model, MockDecoder, mock_decode_audio, cache, audio_file):
+    """Test that a cache hit skips model loading and inference."""
+    decoder = MockDecoder.return_value
+    decoder.seek = decoder.content_frames = 0
+    decoder.duration = 0.0
+    decoder.windows.return_value = iter([])
+    decoder.result.return_value = {"text": " Hello.", "segments": [], "language": "en"}
+
+    first = Transcriber("tiny", cache=cache).transcribe(audio_file, fp16=False)
+    second = Transcriber("tiny", cache=cache).transcribe(audio_file, fp16=False)
+
+    assert first == second
+    assert MockDecoder.call_count == 1
+    assert mock_load_model.call_count == 1
+    assert mock_decode_audio.call_count == 1
@@ -0,0 +1,76 @@
+"""
+Tests for cooperative cancellation between decode windows.
+"""
+import threading
+import time
+
+import pytest
+
+from src.core import CancellationToken, TranscriptionCancelled
+
+OPTIONS = dict(fp16=False, language="en", temperature=0.0)
+
+
+def test_token_reports_latency():
+    """Test that the raised exception carries the time since cancel()."""
+    token = CancellationToken()
+    token.raise_if_cancelled()  # not cancelled yet: no-op
+
+    token.cancel()
+    time.sleep(0.01)
+    with pytest.raises(TranscriptionCancelled) as info:
+        token.raise_if_cancelled()
+
+    assert token.cancelled
+    assert info.value.latency >= 0.01
+
+
+def test_cancel_stops_after_current_window(random_transcriber, audio):
+    """Test that cancelling mid-file stops before the next window is decoded."""
+    token = CancellationToken()
+    windows_started = []
+
+    def on_progress(progress):
+        windows_started.append(progress.position)
+        if progress.position > 0:
+            token.cancel()  # first window done
+
+    with pytest.raises(TranscriptionCancelled):
+        random_transcriber.transcribe(audio, progress_callback=on_progress,
+                                      cancel_token=token, **OPTIONS)
+
+    assert windows_started == [0.0, 30.0]
+    assert random_transcriber.last_result is None
+
+
+def test_model_is_reusable_after_cancel(random_model, random_transcriber, audio):
+    """Test that a cancelled job leaves the model ready for the next one."""
+    token = CancellationToken()
+    token.cancel()
+    with pytest.raises(TranscriptionCancelled):
+        random_transcriber.transcribe(audio, cancel_token=token, **OPTIONS)
+
+    result = random_transcriber.transcribe(audio, **OPTIONS)
+
+    assert result == random_model.transcribe(audio, **OPTIONS)
+
+
+def test_cancel_latency_bounded_by_one_window(random_transcriber, audio):
+    """Test that a cancel from another thread is honoured within one window."""
+    token = CancellationToken()
+    window_times = []
+    last = [time.perf_counter()]
+
+    def on_progress(progress):
+        now = time.perf_counter()
+        window_times.append(now - last[0])
+        last[0] = now
+        if len(window_times) == 2:
+            # Cancel from another thread while the second window decodes
+            threading.Timer(0.001, token.cancel).start()
+
+    with pytest.raises(TranscriptionCancelled) as info:
+        random_transcriber.transcribe(audio, progress_callback=on_progress,
+                                      cancel_token=token, **OPTIONS)
+
+    assert info.value.latency <= max(window_times) * 2 + 0.5
@@ -0,0 +1,110 @@
+"""
+Tests for checkpointed, resumable transcription.
+"""
+import json
+import os
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.core import CancellationToken, ModelRegistry, Transcriber, TranscriptionCancelled
+from src.core.batch import run_batch, run_batch_parallel
+from src.core.checkpoint import TranscriptionCheckpoint, checkpoint_path
+from test_audio import write_wav
+
+OPTIONS = dict(language="en", temperature=0.0)
+
+
+@pytest.fixture
+def clip(tmp_path, audio):
+    """A 40 second WAV file."""
+    path = tmp_path / "clip.wav"
+    write_wav(path, audio)
+    return str(path)
+
+
+@pytest.fixture
+def transcriber(random_model):
+    return Transcriber(
+        "random", registry=ModelRegistry(loader=lambda name: random_model), checkpoint=True
+    )
+
+
+def test_interrupted_run_resumes_from_checkpoint(transcriber, random_transcriber, clip):
+    """Test that a rerun after a cancel continues from the checkpoint with the same result."""
+    expected = random_transcriber.transcribe(clip, fp16=False, **OPTIONS)
+
+    token = CancellationToken()
+    with pytest.raises(TranscriptionCancelled):
+        for _ in transcriber.transcribe_stream(clip, fp16=False, cancel_token=token, **OPTIONS):
+            token.cancel()
+    with open(checkpoint_path(clip), encoding="utf-8") as f:
+        saved = json.load(f)
+    assert not saved["complete"]
+    assert saved["state"]["seek"] > 0
+
+    segments = list(transcriber.transcribe_stream(clip, fp16=False, **OPTIONS))
+    assert transcriber.resumed_from == pytest.approx(saved["state"]["seek"] / 100)
+    assert transcriber.last_result == expected
+    assert segments == expected["segments"]
+
+
+def test_completed_checkpoint_answers_rerun(transcriber, clip, monkeypatch):
+    """Test that a finished file is answered from its checkpoint without the model."""
+    result = transcriber.transcribe(clip, fp16=False, **OPTIONS)
+    assert transcriber.is_complete(clip, fp16=False, **OPTIONS)
+    assert not transcriber.is_complete(clip, fp16=False, language="de", temperature=0.0)
+
+    monkeypatch.setattr(transcriber, "load_model", lambda: pytest.fail("model was loaded"))
+    assert transcriber.transcribe(clip, fp16=False, **OPTIONS) == result
+
+
+def test_checkpoint_ignored_after_file_changes(transcriber, clip, audio):
+    """Test that a checkpoint of an older version of the file is not used."""
+    transcriber.transcribe(clip, fp16=False, **OPTIONS)
+    time.sleep(0.01)
+    write_wav(clip, audio[: 16000 * 10])
+
+    assert not transcriber.is_complete(clip, fp16=False, **OPTIONS)
+    result = transcriber.transcribe(clip, fp16=False, **OPTIONS)
+    assert result["segments"][-1]["end"] <= 10.0
+
+
+def test_save_is_throttled_and_survives_read_only_directory(tmp_path):
+    """Test the write interval and that an unwritable location disables checkpointing."""
+    checkpoint = TranscriptionCheckpoint(str(tmp_path / "a.checkpoint.json"), "key", interval=60)
+    assert checkpoint.save({"seek": 1})
+    assert not checkpoint.save({"seek": 2})
+    assert checkpoint.state() == {"seek": 1}
+    assert checkpoint.save({"seek": 3}, force=True)
+    assert checkpoint.state() == {"seek": 3}
+    assert TranscriptionCheckpoint(checkpoint.path, "other").state() is None
+
+    unwritable = TranscriptionCheckpoint(str(tmp_path / "missing" / "b.checkpoint.json"), "key")
+    with pytest.warns(UserWarning, match="Checkpointing disabled"):
+        assert not unwritable.save({"seek": 1})
+    assert not unwritable.enabled
+
+
+def test_batch_skips_completed_files(transcriber, clip, tmp_path):
+    """Test that a rerun batch skips files completed by an earlier run."""
+    first = run_batch(transcriber, [clip], output_dir=str(tmp_path / "out"), fp16=False)
+    assert first[0]["status"] == "ok" and not first[0].get("skipped")
+
+    second = run_batch(transcriber, [clip], output_dir=str(tmp_path / "out"), fp16=False)
+    assert second[0]["skipped"]
+    assert second[0]["output_path"] == first[0]["output_path"]
+    assert os.path.exists(second[0]["output_path"])
+
+
+def test_parallel_batch_skips_completed_files(transcriber, clip, tmp_path):
+    """Test that completed files are not sent to the pool's workers on a rerun."""
+    first = run_batch(transcriber, [clip], output_dir=str(tmp_path / "out"), fp16=False)
+    pool = MagicMock(checkpoint=True)
+    pool.is_complete.side_effect = lambda path: transcriber.is_complete(path, fp16=False)
+
+    summary = run_batch_parallel(pool, [clip], output_dir=str(tmp_path / "out"))
+    assert summary[0]["skipped"]
+    assert summary[0]["output_path"] == first[0]["output_path"]
+    pool.imap.assert_not_called()
@@ -0,0 +1,71 @@
+"""
+Tests for long-audio chunking and timestamp stitching.
+"""
+import numpy as np
+
+from src.core.chunking import SAMPLE_RATE, split_audio, stitch_results
+
+
+def make_audio(pattern):
+    """Build audio from (seconds, is_speech) pairs."""
+    rng = np.random.RandomState(0)
+    parts = []
+    for seconds, speech in pattern:
+        n = int(seconds * SAMPLE_RATE)
+        amplitude = 0.3 if speech else 0.001
+        parts.append((rng.randn(n) * amplitude).astype(np.float32))
+    return np.concatenate(parts)
+
+
+def test_split_points_land_in_silence():
+    """Test that chunk boundaries are moved into the nearby pause."""
+    # Speech 0-55s, pause 55-57s, speech 57-115s, pause 115-116s, speech to 170s
+    audio = make_audio([(55, True), (2, False), (58, True), (1, False), (54, True)])
+    ranges = split_audio(audio, chunk_seconds=60, search_seconds=10)
+
+    assert ranges[0][0] == 0
+    assert ranges[-1][1] == len(audio)
+    for (_, end), (start, _) in zip(ranges[:-1], ranges[1:]):
+        assert end == start
+
+    cuts = [end / SAMPLE_RATE for _, end in ranges[:-1]]
+    assert len(cuts) == 2
+    assert 55 <= cuts[0] <= 57
+    assert 115 <= cuts[1] <= 116
+
+
+def test_short_audio_is_a_single_chunk():
+    """Test that audio close to the chunk length is not split."""
+    audio = make_audio([(80, True)])
+    assert split_audio(audio, chunk_seconds=60) == [(0, len(audio))]
+
+
+def test_stitch_results_shifts_timestamps_and_renumbers():
+    """Test that stitched segments are on the original timeline."""
+    first = {
+        "text": " Hello there.",
+        "language": "en",
+        "segments": [{"id": 0, "seek": 0, "start": 0.0, "end": 2.0, "text": " Hello there."}],
+    }
+    second = {
+        "text": " General Kenobi.",
+        "language": "en",
+        "segments": [
+            {"id": 0, "seek": 0, "start": 1.0, "end": 3.0, "text": " General"},
+            {"id": 1, "seek": 0, "start": 3.0, "end": 99.0, "text": " Kenobi."},
+            {"id": 2, "seek": 0, "start": 9.0, "end": 9.5, "text": " "},
+        ],
+    }
+    ranges = [(0, 60 * SAMPLE_RATE), (60 * SAMPLE_RATE, 70 * SAMPLE_RATE)]
+
+    result = stitch_results([first, second], ranges)
+
+    assert result["text"] == " Hello there. General Kenobi."
+    assert result["language"] == "en"
+    assert [s["id"] for s in result["segments"]] == [0, 1, 2]
+    assert [(s["start"], s["end"]) for s in result["segments"]] == [
+        (0.0, 2.0),
+        (61.0, 63.0),
+        (63.0, 70.0),  # clamped to the end of its chunk
+    ]
+    assert result["segments"][1]["seek"] == 60 * SAMPLE_RATE // 160
@@ -0,0 +1,35 @@
+"""
+Tests for the window-by-window decoder against whisper.transcribe.
+"""
+import pytest
+
+from src.core.decoding import WindowDecoder
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"temperature": 0.0},
+        {"temperature": 0.0, "word_timestamps": True},
+        {"temperature": 0.0, "initial_prompt": "Meeting notes", "condition_on_previous_text": False},
+    ],
+)
+def test_matches_whisper_transcribe(random_model, audio, options):
+    """Test that decoding window by window gives whisper.transcribe's result."""
+    expected = random_model.transcribe(audio, fp16=False, language="en", **options)
+
+    decoder = WindowDecoder(random_model, audio, fp16=False, language="en", **options)
+    streamed = [segment for window in decoder.windows() for segment in window]
+
+    assert decoder.result() == expected
+    assert streamed == expected["segments"]
+    assert decoder.finished
+
+
+def test_transcribe_stream_sets_last_result(random_transcriber, audio):
+    """Test that the streaming API yields every segment and keeps the full result."""
+    transcriber = random_transcriber
+    segments = list(transcriber.transcribe_stream(audio, fp16=False, language="en", temperature=0.0))
+
+    assert transcriber.last_result["segments"] == segments
+    assert transcriber.last_result["language"] == "en"
@@ -0,0 +1,83 @@
+"""
+Tests for the transcript export formats.
+"""
+import json
+
+import numpy as np
+import pytest
+
+from src.core.batch import run_batch
+from src.core.export import (
+    SegmentExporter,
+    export_result,
+    format_timestamp,
+    output_paths,
+    parse_formats,
+)
+from test_audio import write_wav
+
+SEGMENTS = [
+    {"id": 0, "start": 0.0, "end": 2.5, "text": " Hello there."},
+    {"id": 1, "start": 2.5, "end": 2.5, "text": ""},
+    {"id": 2, "start": 3661.25, "end": 3663.0, "text": " General\tKenobi."},
+]
+RESULT = {"text": " Hello there. General\tKenobi.", "segments": SEGMENTS, "language": "en"}
+
+
+def read(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def test_formats(tmp_path):
+    """Test the content written for every format."""
+    paths = output_paths(str(tmp_path / "talk.txt"), ["txt", "srt", "vtt", "tsv", "json"])
+    export_result(RESULT, paths)
+
+    assert read(paths["txt"]) == " Hello there. General\tKenobi."
+    assert read(paths["srt"]) == (
+        "1\n00:00:00,000 --> 00:00:02,500\nHello there.\n\n"
+        "2\n01:01:01,250 --> 01:01:03,000\nGeneral\tKenobi.\n\n"
+    )
+    assert read(paths["vtt"]) == (
+        "WEBVTT\n\n00:00.000 --> 00:02.500\nHello there.\n\n"
+        "01:01:01.250 --> 01:01:03.000\nGeneral\tKenobi.\n\n"
+    )
+    assert read(paths["tsv"]) == "start\tend\ttext\n0\t2500\tHello there.\n3661250\t3663000\tGeneral Kenobi.\n"
+    assert json.loads(read(paths["json"])) == RESULT
+
+
+def test_segments_are_written_as_they_arrive(tmp_path):
+    """Test that each segment is on disk before the next one is decoded."""
+    paths = output_paths(str(tmp_path / "talk.srt"), ["srt", "json"])
+    with SegmentExporter(paths) as exporter:
+        exporter.write_segment(SEGMENTS[0])
+        assert "Hello there." in read(paths["srt"])
+        assert read(paths["json"]).startswith('{"segments": [{"id": 0')
+        exporter.finish(RESULT)
+    assert json.loads(read(paths["json"]))["segments"] == [SEGMENTS[0]]
+
+
+def test_parse_formats_and_paths():
+    """Test format parsing and the output path of each format."""
+    assert parse_formats(["srt,VTT", "json", "srt"]) == ["srt", "vtt", "json"]
+    with pytest.raises(ValueError, match="Unknown format 'doc'"):
+        parse_formats(["doc"])
+    assert output_paths("out/a.srt", ["txt", "srt"]) == {"txt": "out/a.txt", "srt": "out/a.srt"}
+    assert format_timestamp(59.9996) == "01:00.000"
+
+
+def test_batch_writes_every_format(random_transcriber, tmp_path):
+    """Test that run_batch writes each requested format from one transcription per file."""
+    clip = str(tmp_path / "clip.wav")
+    write_wav(clip, np.zeros(16000 * 2, dtype=np.float32))
+
+    summary = run_batch(
+        random_transcriber, [clip], output_dir=str(tmp_path / "out"), fp16=False,
+        prefetch=0, formats=["txt", "vtt"],
+    )
+
+    entry = summary[0]
+    assert entry["status"] == "ok", entry["error"]
+    assert entry["output_path"] == entry["outputs"]["txt"]
+    assert read(entry["outputs"]["vtt"]).startswith("WEBVTT\n\n")
@@ -1,23 +1,28 @@
 """
 Tests for the GUI application components.
 """
+import os
 import sys
+import time
 import pytest
+from PySide6.QtCore import QMimeData, QPointF, Qt, QUrl
+from PySide6.QtGui import QDropEvent
 from PySide6.QtWidgets import QApplication
 from src.gui.main_window import MainWindow
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def app():
-    """Create a Qt Application."""
-    return QApplication(sys.argv)
+    """Create the Qt Application, once: Qt allows only one per process."""
+    return QApplication.instance() or QApplication(sys.argv)
 
 
 @pytest.fixture
 def main_window(app):
-    """Create the main window."""
+    """Create the main window, and close it (stopping its jobs) after the test."""
     window = MainWindow()
-    return window
+    yield window
+    window.close()
 
 
 def test_initial_state(main_window):
@@ -40,12 +45,12 @@ def test_initial_state(main_window):
 
 def test_file_selection(main_window, monkeypatch):
     """Test file selection behavior."""
-    # Mock QFileDialog.getOpenFileName to return a test file
+    # Mock QFileDialog.getOpenFileNames to return a test file
     def mock_get_file(*args, **kwargs):
-        return "test.mp3", "Audio Files"
+        return ["test.mp3"], "Audio Files"
     
     monkeypatch.setattr(
-        "PySide6.QtWidgets.QFileDialog.getOpenFileName",
+        "PySide6.QtWidgets.QFileDialog.getOpenFileNames",
         mock_get_file
     )
     
@@ -67,10 +72,10 @@ def test_transcription_ui_state(main_window):
     # Start transcription
     main_window.start_transcription()
     
-    # Check UI state during transcription
+    # Check UI state during transcription; other files can be queued meanwhile
     assert not main_window.transcribe_btn.isEnabled()
-    assert not main_window.select_file_btn.isEnabled()
-    assert not main_window.model_combo.isEnabled()
+    assert main_window.select_file_btn.isEnabled()
+    assert main_window.model_combo.isEnabled()
     assert not main_window.save_btn.isEnabled()
     assert main_window.progress_bar.isVisible()
 
@@ -91,4 +96,177 @@ def test_cleanup_after_transcription(main_window):
     assert main_window.select_file_btn.isEnabled()
     assert main_window.model_combo.isEnabled()
     assert not main_window.progress_bar.isVisible()
-    assert main_window.worker is None 
\ No newline at end of file
+    assert not main_window.cancel_btn.isEnabled()
+
+def test_segments_stream_into_transcript_view(main_window):
+    """Test that decoded segments are appended to the transcript live, one row each."""
+    main_window.on_segment_decoded({"start": 0.0, "end": 1.0, "text": " Hello"})
+    main_window.on_segment_decoded({"start": 1.0, "end": 2.0, "text": ""})
+    main_window.on_segment_decoded({"start": 2.0, "end": 3.0, "text": " world."})
+
+    model = main_window.transcript_view.model()
+    assert model.rowCount() == 2
+    assert model.data(model.index(1)) == "00:02.000  world."
+    assert main_window.transcript_view.text() == " Hello world."
+
+
+def test_jump_to_time(main_window):
+    """Test that typing a position selects the segment playing at that time."""
+    main_window.transcript_view.set_segments(
+        {"start": float(i * 5), "end": float(i * 5 + 5), "text": f" Segment {i}."}
+        for i in range(1000)
+    )
+
+    main_window.jump_input.setText("1:02:03")
+    main_window.jump_to_time()
+    assert main_window.transcript_view.currentIndex().row() == 744
+
+    main_window.jump_input.setText("soon")
+    main_window.jump_to_time()
+    assert main_window.status_label.text() == "Cannot jump to 'soon'"
+
+
+def test_cancelled_transcription_restores_ui(main_window):
+    """Test that a cooperatively cancelled job re-enables the UI."""
+    main_window.transcribe_btn.setEnabled(False)
+    main_window.cancel_btn.setEnabled(True)
+
+    main_window.on_transcription_cancelled(0.42)
+
+    assert main_window.transcribe_btn.isEnabled()
+    assert not main_window.cancel_btn.isEnabled()
+    assert main_window.status_label.text() == "Transcription cancelled (stopped in 0.4s)"
+
+
+def test_vad_report_shown_on_completion(main_window):
+    """Test that the skipped-audio report of a VAD run reaches the status bar."""
+    main_window.on_transcription_complete({
+        "text": " Hello",
+        "segments": [],
+        "vad": {"duration": 600.0, "speech": 400.0, "skipped": 200.0, "regions": 3},
+    })
+
+    assert main_window.status_label.text() == (
+        "Transcription complete. VAD skipped 3:20 of 10:00 (33% of the audio)"
+    )
+    assert main_window.vad_checkbox.isEnabled()
+
+
+def test_model_status_shows_warmup_and_first_job(main_window):
+    """Test that the warm-up timings and the first job's latency are shown."""
+    main_window.model_combo.setCurrentText("base")
+    main_window.warming_up = "base"
+    main_window.on_warmup_complete("base", {"import": 0.5, "load": 1.0, "cold": 2.0, "warm": 0.5})
+    assert main_window.model_status_label.text() == (
+        "base ready (warm-up: model loaded in 1.0s; first inference 2.00s cold, 0.50s warm)"
+    )
+
+    main_window.job_started_at = time.perf_counter()
+    main_window.job_warm = True
+    main_window.job_cache_hits = main_window.transcriber.cache.hits
+    main_window.on_segment_decoded({"text": " Hello"})
+    main_window.on_transcription_complete({"text": " Hello", "segments": []})
+
+    assert main_window.first_job["warm"]
+    assert main_window.first_job["first_segment"] <= main_window.first_job["total"]
+    assert main_window.model_status_label.text().splitlines()[1].endswith("(warm base model)")
+
+    main_window.model_combo.setCurrentText("small")
+    assert main_window.model_status_label.text().startswith("small not loaded yet")
+
+
+
+def test_save_uses_picked_format(main_window, monkeypatch, tmp_path):
+    """Test that the save dialog's format filter picks the export format."""
+    main_window.on_transcription_complete({
+        "text": " Hello world.",
+        "segments": [{"start": 0.0, "end": 1.5, "text": " Hello world."}],
+        "language": "en",
+    })
+    monkeypatch.setattr(
+        "PySide6.QtWidgets.QFileDialog.getSaveFileName",
+        lambda *args, **kwargs: (str(tmp_path / "out"), "SubRip Subtitles (*.srt)")
+    )
+    monkeypatch.setattr("PySide6.QtWidgets.QMessageBox.information", lambda *args: None)
+
+    main_window.save_transcription()
+
+    with open(tmp_path / "out.srt", encoding="utf-8") as f:
+        assert f.read() == "1\n00:00:00,000 --> 00:00:01,500\nHello world.\n\n"
+
+
+def test_save_keeps_an_unknown_typed_extension(main_window, monkeypatch, tmp_path):
+    """Test that a typed extension the app does not know is kept, in the filter's format."""
+    main_window.on_transcription_complete({
+        "text": " Hello world.",
+        "segments": [{"start": 0.0, "end": 1.5, "text": " Hello world."}],
+        "language": "en",
+    })
+    monkeypatch.setattr(
+        "PySide6.QtWidgets.QFileDialog.getSaveFileName",
+        lambda *args, **kwargs: (str(tmp_path / "notes.md"), "Text Files (*.txt)")
+    )
+    monkeypatch.setattr("PySide6.QtWidgets.QMessageBox.information", lambda *args: None)
+
+    main_window.save_transcription()
+
+    assert os.listdir(tmp_path) == ["notes.md"]
+    with open(tmp_path / "notes.md", encoding="utf-8") as f:
+        assert f.read().strip() == "Hello world."
+
+
+def test_dropped_files_are_queued_and_shown(main_window, monkeypatch, tmp_path):
+    """Test that dropped files are queued in order and the first one starts and is shown."""
+    monkeypatch.setattr(main_window.scheduler, "dispatch", lambda: None)
+    files = [tmp_path / "one.wav", tmp_path / "two.wav"]
+    for path in files:
+        path.write_bytes(b"")
+    mime = QMimeData()
+    mime.setUrls([QUrl.fromLocalFile(str(path)) for path in files])
+    event = QDropEvent(
+        QPointF(10, 10), Qt.DropAction.CopyAction, mime,
+        Qt.MouseButton.LeftButton, Qt.KeyboardModifier.NoModifier,
+    )
+
+    main_window.dropEvent(event)
+
+    jobs = main_window.scheduler.jobs
+    assert [job.name for job in jobs] == ["one.wav", "two.wav"]
+    assert main_window.queue_panel.table.rowCount() == 2
+    assert main_window.queue_panel.table.item(1, 2).text() == "Queued"
+
+    jobs[0].status = "running"
+    main_window.scheduler.job_started.emit(jobs[0])
+    main_window.scheduler.segments.emit(jobs[0], [{"start": 0.0, "end": 1.0, "text": " Hello"}])
+    assert main_window.current_job is jobs[0]
+    assert main_window.transcript_view.text() == " Hello"
+    assert main_window.cancel_btn.isEnabled()
+
+
+def test_resource_panel_shows_sampled_history(main_window):
+    """Test that the resource panel draws the sampler's history without sampling itself."""
+    sampler = main_window.resource_sampler
+    sampler.stop()
+    for _ in range(3):
+        sampler.sample()
+    latest = sampler.latest()
+
+    main_window.resource_panel.refresh()
+
+    panel = main_window.resource_panel
+    assert len(panel.cpu.values) >= 3
+    assert panel.memory.caption == f"Memory: {(latest.rss + latest.children_rss) / 1024 ** 2:.0f} MB"
+    assert panel.threads.caption == f"Threads: {latest.threads}"
+    assert not panel.gpu.isVisibleTo(main_window)
+
+
+def test_warmup_skipped_when_model_does_not_fit(main_window):
+    """Test that the planner's refusal skips the warm-up and is shown."""
+    main_window.planner._memory = lambda: (4 * 1024 ** 3, 3 * 1024 ** 3)
+    main_window.model_combo.setCurrentText("large")
+
+    main_window.start_warmup()
+
+    assert main_window.warmup_worker is None
+    assert main_window.model_status_label.text().startswith("Not warming up large: needs ")
+    assert main_window.status_label.text().startswith("Resource planner: refuse large: ")
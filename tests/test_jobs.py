@@ -0,0 +1,136 @@
+"""
+Tests for the background transcription job queue.
+"""
+import os
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from src.core import ModelRegistry
+from src.core.cache import TranscriptionCache
+from src.core.jobs import JobQueue, QueueFull
+from src.core.resources import ResourceSampler
+from test_audio import write_wav
+
+
+@pytest.fixture
+def clip(tmp_path, audio):
+    """A 40 second WAV file."""
+    path = tmp_path / "clip.wav"
+    write_wav(path, audio)
+    return str(path)
+
+
+@pytest.fixture
+def registry(random_model):
+    return ModelRegistry(loader=lambda name: random_model)
+
+
+def test_job_runs_and_streams_segments(registry, clip):
+    """Test that a job finishes with its result and segments can be followed."""
+    with JobQueue("random", registry=registry) as jobs:
+        job = jobs.submit(clip, language="en", temperature=0.0)
+        segments = list(job.iter_segments())
+
+        assert job.wait(timeout=60)
+    assert job.status == "done"
+    assert segments == job.result["segments"]
+    assert job.to_dict()["result"]["text"] == job.result["text"]
+    metrics = jobs.metrics()
+    assert metrics["completed"]["done"] == 1
+    assert metrics["audio_seconds"] == pytest.approx(40.0)
+    assert metrics["models"] == ["random"]
+
+
+def test_cached_jobs_stay_out_of_realtime_factor(registry, clip, tmp_path):
+    """Test that a job answered from the cache is counted apart from decoded audio."""
+    cache = TranscriptionCache(str(tmp_path / "cache"))
+    with JobQueue("random", registry=registry, cache=cache) as jobs:
+        for _ in range(2):
+            assert jobs.submit(clip, language="en", temperature=0.0).wait(timeout=60)
+        metrics = jobs.metrics()
+
+    assert metrics["completed"]["done"] == 2
+    assert metrics["replayed"] == 1
+    assert metrics["audio_seconds"] == pytest.approx(40.0)
+
+
+def test_full_queue_refuses_jobs(registry, clip):
+    """Test that submissions beyond max_pending raise QueueFull."""
+    started, release = threading.Event(), threading.Event()
+    jobs = JobQueue("random", registry=registry, max_pending=1)
+    with patch.object(JobQueue, "_run", lambda *args: (started.set(), release.wait())):
+        jobs.submit(clip)
+        started.wait(timeout=10)
+        waiting = jobs.submit(clip)
+        with pytest.raises(QueueFull):
+            jobs.submit(clip)
+
+        assert jobs.cancel(waiting.id)
+        assert waiting.status == "cancelled"
+        assert jobs.metrics()["rejected"] == 1
+        release.set()
+        jobs.close()
+
+
+def test_cancel_running_job(registry, clip):
+    """Test that a running job stops and its upload is deleted."""
+    with JobQueue("random", registry=registry) as jobs:
+        job = jobs.submit(clip, delete_after=True, language="en", temperature=0.0)
+        job.wait_for_segments(0, timeout=60)
+        jobs.cancel(job.id)
+
+        assert job.wait(timeout=60)
+    assert job.status == "cancelled"
+    assert not job.result
+    assert not os.path.exists(clip)
+
+
+def test_failed_job_reports_error(registry, tmp_path):
+    """Test that a job on a missing file fails without stopping the worker."""
+    with JobQueue("random", registry=registry) as jobs:
+        job = jobs.submit(str(tmp_path / "missing.wav"))
+        assert job.wait(timeout=60)
+    assert job.status == "failed"
+    assert job.error
+
+
+def test_inference_lock_is_per_model():
+    """Test that each model (and its int8 form) has one shared inference lock."""
+    registry = ModelRegistry(loader=lambda name: None)
+
+    assert registry.inference_lock("base") is registry.inference_lock("base")
+    assert registry.inference_lock("base") is not registry.inference_lock("base", quantized=True)
+    assert registry.inference_lock("base") is not registry.inference_lock("tiny")
+
+
+def test_warm_up_before_first_job(registry, clip):
+    """Test that warm_up() loads the model, times a dummy inference and marks the first job warm."""
+    with JobQueue("random", registry=registry) as jobs:
+        report = jobs.warm_up()
+        assert registry.is_loaded("random")
+        assert set(report) == {"import", "load", "cold", "warm"}
+        assert report["cold"] > 0 and report["warm"] > 0
+
+        job = jobs.submit(clip, language="en", temperature=0.0)
+        assert job.wait(timeout=60)
+    metrics = jobs.metrics()
+    assert metrics["warmup"] == report
+    assert metrics["first_job"]["warm"]
+    assert metrics["first_job"]["run_seconds"] > 0
+
+
+def test_result_carries_resource_summary(registry, clip):
+    """Test that a job's result gets the sampler's summary of the job."""
+    sampler = ResourceSampler()
+    with JobQueue("random", registry=registry, sampler=sampler) as jobs:
+        job = jobs.submit(clip, language="en", temperature=0.0)
+        assert job.wait(timeout=60)
+        resources = job.result["resources"]
+        assert jobs.metrics()["resources"]["rss_mb"] > 0
+
+    assert resources["samples"] >= 2
+    assert resources["peak_rss_mb"] > 0
+    assert resources["mean_cpu_percent"] > 0
+    assert resources["seconds"] <= job.run_seconds + 1
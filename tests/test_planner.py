@@ -0,0 +1,97 @@
+"""
+Tests for memory-aware admission of transcription work.
+"""
+from src.core import ModelRegistry
+from src.core.planner import GB, MB, MODEL_FOOTPRINTS, ResourcePlanner
+
+
+def fixed_memory(total, available):
+    return lambda: (total, available)
+
+
+def test_job_is_admitted_queued_or_refused_by_memory():
+    """Test that a job is admitted when it fits, queued behind running jobs, else refused."""
+    planner = ResourcePlanner(cpus=8, memory=fixed_memory(16 * GB, 8 * GB))
+    decision = planner.admit("medium")
+    assert decision.admitted
+    assert decision.needed == planner.model_memory("medium") + planner.job_memory("medium")
+    planner.release(decision)
+
+    planner._memory = fixed_memory(16 * GB, 2 * GB)
+    assert planner.admit("medium", running=["small"]).action == "queue"
+    assert planner.admit("medium").action == "refuse"
+
+    planner._memory = fixed_memory(4 * GB, 4 * GB)
+    refused = planner.admit("large", running=["tiny"])
+    assert refused.action == "refuse"
+    assert "more than this machine's 4.0 GB" in refused.reason
+    assert planner.admit("large", quantized=True).admitted
+    assert [d.action for d in planner.decisions] == ["admit", "queue", "refuse", "refuse", "admit"]
+
+
+def test_admitted_jobs_hold_memory_until_loaded_or_released(random_model):
+    """Test that back-to-back admits count the memory promised to jobs not yet loaded."""
+    planner = ResourcePlanner(cpus=8, reserve=512 * MB, memory=fixed_memory(16 * GB, 6 * GB))
+    medium = planner.admit("medium")
+    assert medium.admitted
+    assert planner.reserved() == medium.needed
+    small = planner.admit("small", running=["medium"])
+    assert small.admitted
+    assert small.available == 6 * GB - 512 * MB - medium.needed
+    third = planner.admit("medium", running=["medium", "small"])
+    assert third.action == "queue"
+    assert third.available == 6 * GB - 512 * MB - medium.needed - small.needed
+
+    planner.release(medium)
+    planner.release(small)
+    assert planner.reserved() == 0
+    assert planner.admit("medium", running=["medium", "small"]).admitted
+
+    # A model showing up in the registry releases its promise: the OS now counts it
+    registry = ModelRegistry(loader=lambda name: random_model)
+    planner = ResourcePlanner(registry, cpus=8, memory=fixed_memory(16 * GB, 6 * GB))
+    assert planner.admit("tiny").admitted and planner.reserved() > 0
+    registry.get("tiny")
+    assert planner.reserved() == 0
+
+
+def test_running_jobs_are_capped_by_cores():
+    """Test that no more jobs are admitted than the cores run well."""
+    planner = ResourcePlanner(cpus=4, memory=fixed_memory(64 * GB, 64 * GB))
+    assert planner.max_jobs() == 2
+    assert planner.admit("tiny", running=["tiny"]).admitted
+    assert planner.admit("tiny", running=["tiny", "base"]).action == "queue"
+
+
+def test_resident_models_are_reused_or_evicted(random_model):
+    """Test that a resident model costs nothing to start and idle ones make room."""
+    registry = ModelRegistry(loader=lambda name: random_model)
+    registry.get("idle")
+    registry.get("busy")
+    size = registry.footprint("idle")
+    job = ResourcePlanner(registry).job_memory("busy")
+    planner = ResourcePlanner(registry, reserve=0, cpus=8, memory=fixed_memory(64 * GB, job))
+
+    assert planner.model_memory("busy") == size
+    assert planner.admit("busy", running=["busy"]).admitted
+
+    # Loading "tiny" needs its weights: only evicting the idle model makes room
+    planner._memory = fixed_memory(64 * GB, MODEL_FOOTPRINTS["tiny"] + planner.job_memory("tiny") - size)
+    decision = planner.admit("tiny", running=["busy"])
+    assert decision.admitted and decision.evicted == ["idle"]
+    assert registry.loaded_models() == ["busy"]
+
+
+def test_worker_processes_are_sized_to_memory():
+    """Test that fewer worker processes are planned when not all of them fit."""
+    shown = []
+    planner = ResourcePlanner(reserve=512 * MB, memory=fixed_memory(16 * GB, 4 * GB))
+    planner.on_decision = shown.append
+    per_worker = planner.model_memory("small") + planner.job_memory("small")
+
+    decision = planner.admit_workers("small", 8)
+    assert decision.admitted
+    assert decision.workers == (4 * GB - 512 * MB) // per_worker
+    assert decision.format().startswith(f"admit small: {decision.workers} of 8 worker(s)")
+    assert not planner.admit_workers("large", 2).admitted
+    assert [d.workers for d in shown] == [decision.workers, 0]
@@ -0,0 +1,59 @@
+"""
+Tests for the multi-process transcription pool.
+"""
+import os
+
+import pytest
+import torch
+
+from src.core.pool import TranscriptionPool, plan_workers
+from test_audio import write_wav
+
+
+@pytest.fixture
+def model_file(tmp_path, random_model):
+    """The random model saved as a checkpoint the spawned workers load by path."""
+    path = tmp_path / "random.pt"
+    torch.save({"dims": random_model.dims.__dict__, "model_state_dict": random_model.state_dict()}, path)
+    return str(path)
+
+
+def test_plan_workers_splits_core_budget():
+    """Test that the core budget is divided evenly across workers."""
+    assert plan_workers(4, 32) == (4, 8)
+    assert plan_workers(3, 32) == (3, 10)
+
+
+def test_plan_workers_defaults_to_four_threads_per_worker():
+    """Test the default worker count for a given budget."""
+    assert plan_workers(None, 32) == (8, 4)
+    assert plan_workers(None, 2) == (1, 2)
+
+
+def test_plan_workers_never_exceeds_budget():
+    """Test that more workers than cores are clamped to one thread each."""
+    assert plan_workers(16, 4) == (4, 1)
+
+
+def test_pool_returns_results_in_input_order_with_per_file_errors(tmp_path, model_file, audio):
+    """Test that spawned workers report every input, in order, a failing one as an error."""
+    clips = []
+    for name, start in (("a.wav", 0), ("b.wav", 5)):
+        path = tmp_path / name
+        write_wav(path, audio[start * 16000:(start + 5) * 16000])
+        clips.append(str(path))
+    missing = str(tmp_path / "missing.wav")
+    inputs = [clips[0], missing, clips[1]]
+
+    with TranscriptionPool(model_file, workers=2, total_threads=2, fp16=False, profile=True) as pool:
+        entries = pool.map(inputs)
+
+    assert [entry["index"] for entry in entries] == [0, 1, 2]
+    assert [entry["audio_file"] for entry in entries] == inputs
+    assert [entry["status"] for entry in entries] == ["ok", "error", "ok"]
+    assert entries[1]["error"] and entries[1]["result"] is None
+    for entry in (entries[0], entries[2]):
+        assert entry["error"] is None
+        assert isinstance(entry["result"]["text"], str)
+        assert entry["timings"]["stages"]["encoder"]["count"] >= 1
+    assert all(entry["worker_pid"] != os.getpid() for entry in entries)
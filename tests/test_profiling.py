@@ -0,0 +1,129 @@
+"""
+Tests for per-stage profiling of transcriptions.
+"""
+import json
+from unittest.mock import patch
+
+from src.core.profiling import Profiler, format_timings
+
+OPTIONS = dict(fp16=False, language="en", temperature=0.0)
+
+
+def test_spans_are_aggregated_by_stage():
+    """Test that stage totals add up their spans and windows are listed separately."""
+    profiler = Profiler()
+    with profiler.span("window", start=0.0):
+        with profiler.span("encoder"):
+            pass
+        with profiler.span("decoder", temperature=0.0):
+            pass
+        profiler.count_fallback()
+        with profiler.span("decoder", temperature=0.2):
+            pass
+
+    timings = profiler.summary()
+
+    assert timings["stages"]["decoder"]["count"] == 2
+    assert timings["stages"]["encoder"]["count"] == 1
+    assert "window" not in timings["stages"]
+    assert timings["windows"][0]["start"] == 0.0
+    assert timings["fallbacks"] == 1
+    assert "decoder" in format_timings(timings)
+
+
+class FakeCuda:
+    """torch.cuda's peak memory counter, driven by the test."""
+
+    def __init__(self):
+        self.allocated = self.peak = 0
+
+    def allocate(self, size):
+        self.allocated = size
+        self.peak = max(self.peak, size)
+
+    def reset_peak_memory_stats(self):
+        self.peak = self.allocated
+
+    def max_memory_allocated(self):
+        return self.peak
+
+
+def test_nested_spans_keep_the_outer_cuda_peak():
+    """Test that an inner span's counter reset does not hide the outer span's peak."""
+    cuda = FakeCuda()
+    profiler = Profiler()
+    with patch("src.core.profiling._cuda", return_value=cuda):
+        with profiler.span("outer"):
+            cuda.allocate(500)
+            cuda.allocate(100)
+            with profiler.span("first"):
+                cuda.allocate(200)
+            cuda.allocate(50)
+            with profiler.span("second"):
+                cuda.allocate(300)
+            cuda.allocate(0)
+
+    peaks = {span["name"]: span["cuda_peak"] for span in profiler.spans}
+    assert peaks == {"first": 200, "second": 300, "outer": 500}
+
+
+def test_transcription_timings(random_transcriber, audio):
+    """Test that a profiled transcription reports its stages and windows."""
+    random_transcriber.profile = True
+
+    result = random_transcriber.transcribe(audio, **OPTIONS)
+
+    timings = result["timings"]
+    assert {"load_model", "mel", "encoder", "decoder"} <= set(timings["stages"])
+    assert len(timings["windows"]) == timings["stages"]["encoder"]["count"] >= 2
+    assert timings["windows"][0]["start"] == 0.0
+    assert timings["stages"]["decoder"]["count"] == (
+        timings["stages"]["encoder"]["count"] + timings["fallbacks"]
+    )
+    assert sum(stage["wall"] for stage in timings["stages"].values()) <= timings["wall"]
+
+
+def test_fallbacks_reuse_encoder_output(random_transcriber, audio):
+    """Test that temperature fallbacks are counted and only rerun the decoder."""
+    random_transcriber.profile = True
+
+    result = random_transcriber.transcribe(audio[:16000 * 10], fp16=False, language="en",
+                                           temperature=(0.0, 0.5, 1.0),
+                                           compression_ratio_threshold=0.0)
+
+    timings = result["timings"]
+    assert timings["fallbacks"] == 2
+    assert timings["windows"][0]["fallbacks"] == 2
+    assert timings["stages"]["encoder"]["count"] == 1
+    assert timings["stages"]["decoder"]["count"] == 3
+
+
+def test_timings_are_not_cached(random_transcriber, audio, tmp_path):
+    """Test that the cached result has no timings and a cache hit reports its own."""
+    from src.core import TranscriptionCache
+
+    random_transcriber.cache = TranscriptionCache(str(tmp_path))
+    random_transcriber.profile = True
+    random_transcriber.transcribe(audio[:16000 * 5], **OPTIONS)
+
+    key = random_transcriber._cache_key(audio[:16000 * 5], False, dict(language="en", temperature=0.0))
+    assert "timings" not in random_transcriber.cache.get(key)
+    hit = random_transcriber.transcribe(audio[:16000 * 5], **OPTIONS)
+    assert set(hit["timings"]["stages"]) == {"cache_lookup"}
+
+
+def test_chrome_trace_export(random_transcriber, audio, tmp_path):
+    """Test that the trace is valid Trace Event Format with nested window spans."""
+    random_transcriber.profile = True
+    random_transcriber.transcribe(audio, **OPTIONS)
+
+    path = random_transcriber.last_profile.export_chrome_trace(str(tmp_path / "trace.json"))
+
+    with open(path, encoding="utf-8") as f:
+        events = json.load(f)["traceEvents"]
+    assert all(event["ph"] == "X" and event["dur"] >= 0 for event in events)
+    window = next(event for event in events if event["name"] == "window")
+    encoder = next(event for event in events if event["name"] == "encoder")
+    assert window["ts"] <= encoder["ts"]
+    assert encoder["ts"] + encoder["dur"] <= window["ts"] + window["dur"] + 1
+    assert "cpu_ms" in encoder["args"]
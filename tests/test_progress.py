@@ -0,0 +1,48 @@
+"""
+Tests for transcription progress reporting.
+"""
+import pytest
+
+from src.core import TranscriptionProgress
+from src.core.progress import format_duration
+
+
+def test_progress_math():
+    """Test percentage, speed, realtime factor and ETA."""
+    progress = TranscriptionProgress(position=150.0, duration=600.0, elapsed=50.0)
+
+    assert progress.percent == 25
+    assert progress.speed == pytest.approx(3.0)
+    assert progress.realtime_factor == pytest.approx(1 / 3)
+    assert progress.eta == pytest.approx(150.0)
+    assert progress.format() == "25% | 2:30 / 10:00 | ETA 2:30 | 3.0x realtime"
+
+
+def test_progress_before_first_window():
+    """Test that no ETA is guessed before any audio has been decoded."""
+    progress = TranscriptionProgress(position=0.0, duration=600.0, elapsed=0.0)
+
+    assert progress.percent == 0
+    assert progress.eta is None
+    assert progress.format() == "0% | 0:00 / 10:00"
+
+
+def test_format_duration():
+    """Test M:SS and H:MM:SS formatting."""
+    assert format_duration(59.6) == "1:00"
+    assert format_duration(3725) == "1:02:05"
+    assert format_duration(-3) == "0:00"
+
+
+def test_transcribe_reports_progress_per_window(random_transcriber, audio):
+    """Test that progress rises monotonically to 100% over a real decode."""
+    reports = []
+    random_transcriber.transcribe(audio, fp16=False, language="en", temperature=0.0,
+                                  progress_callback=reports.append)
+
+    positions = [p.position for p in reports]
+    assert len(reports) >= 3
+    assert positions == sorted(positions)
+    assert reports[0].percent == 0
+    assert reports[-1].percent == 100
+    assert reports[-1].duration == pytest.approx(40.0)
@@ -0,0 +1,74 @@
+"""
+Tests for precision selection and int8 dynamic quantization.
+"""
+from unittest.mock import patch
+
+import pytest
+import torch
+
+from src.core import ModelRegistry
+from src.core.quantization import QuantizedModelCache, quantize_model, resolve_precision
+
+
+def test_resolve_precision_on_cpu():
+    """Test that fp16 falls back to fp32 without a GPU and other precisions are kept."""
+    with patch("torch.cuda.is_available", return_value=False):
+        assert resolve_precision("fp16") == "fp32"
+        assert resolve_precision(None, fp16=True) == "fp32"
+    with patch("torch.cuda.is_available", return_value=True):
+        assert resolve_precision(None, fp16=True) == "fp16"
+        assert resolve_precision("int8") == "int8"
+    assert resolve_precision(None, fp16=False) == "fp32"
+    with pytest.raises(ValueError):
+        resolve_precision("int4")
+
+
+def test_quantize_model_leaves_original(random_model):
+    """Test that linear layers are quantized in a copy and the original is untouched."""
+    quantized = quantize_model(random_model)
+
+    layer = quantized.encoder.blocks[0].mlp[0]
+    assert type(layer) is torch.ao.nn.quantized.dynamic.Linear
+    assert type(random_model.encoder.blocks[0].mlp[0]) is not type(layer)
+    assert quantized.dims == random_model.dims
+
+
+def test_quantized_model_is_cached_on_disk(random_model, tmp_path):
+    """Test that a second registry loads the quantized model without quantizing again."""
+    cache = QuantizedModelCache(str(tmp_path))
+    loads = []
+
+    def loader(name):
+        loads.append(name)
+        return random_model
+
+    first = ModelRegistry(loader=loader, quantized_cache=cache).get("random", quantized=True)
+    with patch("src.core.quantization.quantize_model") as mock_quantize:
+        second = ModelRegistry(loader=loader, quantized_cache=cache).get("random", quantized=True)
+
+    mock_quantize.assert_not_called()
+    assert loads == ["random"]
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert type(second.encoder.blocks[0].mlp[0]) is type(first.encoder.blocks[0].mlp[0])
+    mel = torch.randn(1, random_model.dims.n_mels, 3000)
+    with torch.no_grad():
+        assert torch.equal(second.encoder(mel), first.encoder(mel))
+    assert torch.equal(second.alignment_heads.to_dense(), first.alignment_heads.to_dense())
+
+    # The entry is plain tensors and containers, loadable without unpickling code
+    data = torch.load(cache._path(cache.make_key("random")), weights_only=True)
+    assert set(data) == {"dims", "alignment_heads", "model_state_dict"}
+
+
+def test_int8_transcription(random_transcriber, audio):
+    """Test that int8 mode transcribes with the quantized model next to the float one."""
+    options = dict(language="en", temperature=0.0)
+    random_transcriber.transcribe(audio, **options)
+    float_model = random_transcriber.model
+
+    random_transcriber.precision = "int8"
+    result = random_transcriber.transcribe(audio, **options)
+
+    assert random_transcriber.model is not float_model
+    assert random_transcriber.registry.loaded_models() == ["random", "random:int8"]
+    assert result["segments"]
@@ -0,0 +1,124 @@
+"""
+Tests for the in-process model registry.
+"""
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+import torch
+
+from src.core import ModelRegistry, Transcriber
+
+
+def make_loader(sizes):
+    """Return a loader building fake models with the given parameter counts."""
+    calls = []
+
+    def loader(name):
+        calls.append(name)
+        return torch.nn.Linear(sizes[name], 1, bias=False)
+
+    loader.calls = calls
+    return loader
+
+
+def test_get_reuses_resident_model():
+    """Test that a second get does not reload the model."""
+    loader = make_loader({"tiny": 10})
+    registry = ModelRegistry(loader=loader)
+
+    assert registry.get("tiny") is registry.get("tiny")
+    assert loader.calls == ["tiny"]
+    assert registry.memory_used() == 10 * 4
+    assert registry.footprint(registry.key("tiny")) == 10 * 4
+    assert registry.key("tiny", quantized=True) == "tiny:int8"
+
+
+def test_evicts_least_recently_used_over_budget():
+    """Test LRU eviction once the memory budget is exceeded."""
+    loader = make_loader({"tiny": 100, "base": 100, "small": 100})
+    registry = ModelRegistry(memory_budget=250 * 4, loader=loader)
+
+    registry.get("tiny")
+    registry.get("base")
+    registry.get("tiny")  # tiny is now most recently used
+    registry.get("small")
+
+    assert registry.loaded_models() == ["tiny", "small"]
+    assert not registry.is_loaded("base")
+
+
+def test_keeps_single_model_larger_than_budget():
+    """Test that the newest model stays resident even if it alone is over budget."""
+    registry = ModelRegistry(memory_budget=1, loader=make_loader({"large": 1000}))
+    registry.get("large")
+    assert registry.loaded_models() == ["large"]
+
+
+def test_load_does_not_block_other_models():
+    """Test that a slow load leaves resident models usable and loads once per key."""
+    loading, release = threading.Event(), threading.Event()
+    fast = make_loader({"tiny": 10, "medium": 100})
+
+    def loader(name):
+        if name == "medium":
+            loading.set()
+            release.wait(10)
+        return fast(name)
+
+    registry = ModelRegistry(loader=loader)
+    tiny = registry.get("tiny")
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get("medium"))) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    assert loading.wait(10)
+
+    # The registry answers while medium is still loading
+    assert registry.get("tiny") is tiny
+    assert registry.loaded_models() == ["tiny"]
+    assert registry.memory_used() == 10 * 4
+
+    release.set()
+    for thread in threads:
+        thread.join(10)
+    assert len(results) == 2 and results[0] is results[1]
+    assert fast.calls == ["tiny", "medium"]
+
+
+def test_failed_load_is_retried():
+    """Test that a loader error reaches the caller and the next get loads again."""
+    calls = []
+
+    def loader(name):
+        calls.append(name)
+        if len(calls) == 1:
+            raise RuntimeError("download failed")
+        return torch.nn.Linear(1, 1, bias=False)
+
+    registry = ModelRegistry(loader=loader)
+    with pytest.raises(RuntimeError):
+        registry.get("tiny")
+    assert registry.get("tiny") is not None
+    assert calls == ["tiny", "tiny"]
+
+
+@patch("whisper.load_model")
+def test_transcriber_switches_models_without_reloading(mock_load_model):
+    """Test that flipping model_name back and forth loads each model once."""
+    mock_load_model.side_effect = lambda name: MagicMock(name=name)
+    transcriber = Transcriber("tiny", registry=ModelRegistry())
+
+    transcriber.load_model()
+    tiny = transcriber.model
+    transcriber.model_name = "small"
+    assert not transcriber.is_model_loaded()
+    transcriber.load_model()
+    small = transcriber.model
+    transcriber.model_name = "tiny"
+    assert transcriber.is_model_loaded()
+    transcriber.load_model()
+
+    assert transcriber.model is tiny
+    assert small is not tiny
+    assert [c.args[0] for c in mock_load_model.call_args_list] == ["tiny", "small"]
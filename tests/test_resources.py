@@ -0,0 +1,44 @@
+"""
+Tests for the background resource sampler.
+"""
+import threading
+import time
+
+from src.core.resources import MB, ResourceSampler, format_resources
+
+
+def test_sampler_keeps_a_bounded_history():
+    """Test that the sampling thread fills the ring buffer and drops old samples."""
+    with ResourceSampler(interval=0.01, capacity=5) as sampler:
+        deadline = time.monotonic() + 10
+        while len(sampler.samples()) < 5 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.05)
+        samples = sampler.samples()
+
+    assert len(samples) == 5
+    assert [sample.time for sample in samples] == sorted(sample.time for sample in samples)
+    latest = sampler.latest()
+    assert latest.rss > 0 and latest.threads >= 2
+    assert 0.0 <= latest.cpu_percent <= 100.0
+    assert latest.gpu_memory is None or latest.gpu_memory >= 0
+
+
+def test_summary_of_a_busy_span():
+    """Test that a span's summary reports its peak memory and the CPU it used."""
+    sampler = ResourceSampler()
+    start = sampler.sample().time
+    block = b"x" * (64 * MB)
+    end = time.process_time() + 0.3
+    while time.process_time() < end:
+        pass
+    sampler.sample()
+    del block
+
+    summary = sampler.summarize(start)
+    assert summary["samples"] == 2
+    assert summary["peak_rss_mb"] >= 64
+    # Busy on one thread: close to one core
+    assert 50 <= summary["mean_cpu_percent"] <= 100 * threading.active_count() + 10
+    assert format_resources(summary).startswith(f"peak {summary['peak_rss_mb']:.0f} MB, CPU ")
+    assert sampler.summarize(time.monotonic() + 1)["peak_rss_mb"] is None
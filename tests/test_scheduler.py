@@ -0,0 +1,147 @@
+"""
+Tests for the desktop app's job scheduler.
+"""
+import os
+import threading
+from unittest.mock import patch
+
+import pytest
+from PySide6.QtCore import QCoreApplication
+
+from src.core.checkpoint import checkpoint_path
+from src.core.jobs import JobQueue
+from src.core.planner import GB, ResourcePlanner
+from src.gui.scheduler import JobScheduler
+from src.gui.widgets.job_queue import job_status
+from test_audio import write_wav
+
+
+@pytest.fixture
+def qt_app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+@pytest.fixture
+def clip(tmp_path, audio):
+    """A 40 second WAV file."""
+    path = tmp_path / "clip.wav"
+    write_wav(path, audio)
+    return str(path)
+
+
+def wait_for(scheduler, entry, timeout=60):
+    """Poll the scheduler the way its timer does until entry has finished."""
+    assert entry.job.wait(timeout)
+    scheduler.poll()
+    assert entry.finished
+
+
+def test_jobs_stream_and_finish(qt_app, random_transcriber, clip):
+    """Test that a job's segments and outcome reach the scheduler's signals."""
+    scheduler = JobScheduler(random_transcriber)
+    streamed, finished = [], []
+    scheduler.segments.connect(lambda entry, segments: streamed.extend(segments))
+    scheduler.job_finished.connect(finished.append)
+    try:
+        entry = scheduler.add(clip, "random")
+        assert entry.status == "running"
+        wait_for(scheduler, entry)
+    finally:
+        scheduler.close()
+
+    assert entry.status == "done"
+    assert finished == [entry]
+    assert streamed == entry.result["segments"]
+    assert entry.progress == 1.0
+
+
+def test_checkpoint_is_removed_once_done(qt_app, random_transcriber, clip):
+    """Test that a checkpointed job leaves no sidecar behind once it is done."""
+    scheduler = JobScheduler(random_transcriber)
+    try:
+        entry = scheduler.add(clip, "random", checkpoint=True)
+        assert entry.job.wait(60)
+        assert os.path.exists(checkpoint_path(clip))
+        scheduler.poll()
+    finally:
+        scheduler.close()
+
+    assert entry.status == "done"
+    assert not os.path.exists(checkpoint_path(clip))
+
+
+def test_queued_jobs_reorder_and_cancel(qt_app, random_transcriber, clip):
+    """Test that queued jobs start in their (re)arranged order and cancel at once."""
+    started = []
+    release = threading.Event()
+
+    def run(queue, job, transcriber):
+        started.append(job.audio_file)
+        release.wait()
+        job._update(status="done", result={"segments": []})
+
+    with patch.object(JobQueue, "_run", run):
+        scheduler = JobScheduler(random_transcriber, workers=1)
+        first, second, third, fourth = (
+            scheduler.add(f"{clip}.{n}", "random") for n in range(4)
+        )
+        assert [entry.status for entry in scheduler.jobs] == ["running", "queued", "queued", "queued"]
+
+        assert scheduler.move(fourth, -2)
+        assert not scheduler.move(first, 1)
+        assert scheduler.jobs == [first, fourth, second, third]
+        assert scheduler.cancel(second)
+        assert second.status == "cancelled" and second.job is None
+
+        release.set()
+        for entry in (first, fourth, third):
+            wait_for(scheduler, entry)
+        scheduler.close()
+
+    assert started == [first.audio_file, fourth.audio_file, third.audio_file]
+
+
+def test_more_workers_start_queued_jobs(qt_app, random_transcriber, clip):
+    """Test that raising the worker count starts waiting jobs at once."""
+    release = threading.Event()
+    with patch.object(JobQueue, "_run", lambda queue, job, transcriber: release.wait()):
+        scheduler = JobScheduler(random_transcriber, workers=1)
+        entries = [scheduler.add(clip, "random") for _ in range(2)]
+        assert len(scheduler.running()) == 1
+
+        scheduler.set_workers(2)
+        assert [entry.status for entry in entries] == ["running", "running"]
+        release.set()
+        scheduler.close()
+
+
+def test_planner_holds_back_jobs_that_do_not_fit(qt_app, random_transcriber, clip):
+    """Test that a job waits while a running one holds the memory, and one too big is refused."""
+    release = threading.Event()
+    memory = {"available": 8 * GB}
+
+    def run(queue, job, transcriber):
+        release.wait()
+        job._update(status="done", result={"segments": []})
+
+    planner = ResourcePlanner(cpus=8, memory=lambda: (16 * GB, memory["available"]))
+    with patch.object(JobQueue, "_run", run):
+        scheduler = JobScheduler(random_transcriber, workers=2, planner=planner)
+        first = scheduler.add(clip, "small")
+        memory["available"] = 1 * GB
+        second = scheduler.add(clip, "small")
+        assert second.status == "queued"
+        assert job_status(second).startswith("Waiting: needs ")
+
+        memory["available"] = 8 * GB
+        release.set()
+        wait_for(scheduler, first)
+        assert second.status == "running" and second.waiting is None
+        wait_for(scheduler, second)
+        scheduler.close()
+
+    refused = JobScheduler(random_transcriber, planner=ResourcePlanner(memory=lambda: (4 * GB, 4 * GB)))
+    entry = refused.add(clip, "large")
+    refused.close()
+    assert entry.status == "refused"
+    assert job_status(entry).startswith("Refused: needs ")
@@ -0,0 +1,119 @@
+"""
+Tests for the local HTTP transcription server.
+"""
+import http.client
+import json
+import socket
+import threading
+
+import pytest
+
+from server import TranscriptionServer
+from src.core import ModelRegistry
+from src.core.jobs import JobQueue
+from test_audio import write_wav
+
+
+@pytest.fixture
+def server(random_model):
+    """A server on a free local port, backed by the random model."""
+    jobs = JobQueue("random", registry=ModelRegistry(loader=lambda name: random_model))
+    server = TranscriptionServer(("127.0.0.1", 0), jobs, max_upload_bytes=10 * 1024 ** 2)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    jobs.close(cancel_running=True)
+
+
+def request(server, method, path, body=None, headers=None):
+    """Send a request and return (status, decoded JSON or raw body)."""
+    connection = http.client.HTTPConnection(*server.server_address, timeout=60)
+    connection.request(method, path, body=body, headers=headers or {})
+    response = connection.getresponse()
+    data = response.read()
+    connection.close()
+    if response.getheader("Content-Type") == "application/json":
+        data = json.loads(data)
+    return response.status, data
+
+
+@pytest.fixture
+def wav_bytes(tmp_path, audio):
+    """Ten seconds of WAV audio."""
+    write_wav(tmp_path / "clip.wav", audio[:16000 * 10])
+    return (tmp_path / "clip.wav").read_bytes()
+
+
+def test_submit_stream_and_poll(server, wav_bytes):
+    """Test the submit -> stream segments -> poll result round trip."""
+    status, job = request(
+        server, "POST", "/jobs?language=en&filename=clip.wav", wav_bytes,
+        {"Content-Type": "audio/wav"},
+    )
+    assert status == 202
+    assert job["status"] in ("queued", "running")
+
+    status, body = request(server, "GET", f"/jobs/{job['id']}/segments")
+    lines = [json.loads(line) for line in body.decode("utf-8").splitlines()]
+    assert status == 200
+    assert lines[-1]["job"]["status"] == "done"
+
+    status, polled = request(server, "GET", f"/jobs/{job['id']}")
+    assert polled["status"] == "done"
+    assert [line["segment"] for line in lines[:-1]] == polled["result"]["segments"]
+    assert polled["options"] == {"language": "en"}
+
+
+def test_health_and_metrics(server, wav_bytes):
+    """Test that health reports readiness and metrics count finished jobs."""
+    status, health = request(server, "GET", "/health")
+    assert status == 200
+    assert health == {"status": "ok", "model": "random", "model_loaded": False, "warm": False}
+
+    _, job = request(server, "POST", "/jobs?language=en&filename=clip.wav", wav_bytes)
+    server.jobs.get(job["id"]).wait(timeout=60)
+
+    _, health = request(server, "GET", "/health")
+    _, metrics = request(server, "GET", "/metrics")
+    assert health["model_loaded"]
+    assert metrics["completed"]["done"] == 1
+    assert metrics["latency_seconds"]["p50"] > 0
+
+
+def test_errors(server, wav_bytes):
+    """Test the error responses for bad submissions and unknown jobs."""
+    assert request(server, "POST", "/jobs", b"")[0] == 400
+    assert request(server, "POST", "/jobs?model=huge", wav_bytes)[0] == 400
+    assert request(server, "GET", "/jobs/nope")[0] == 404
+    assert request(server, "DELETE", "/jobs/nope")[0] == 404
+    assert request(server, "GET", "/nowhere")[0] == 404
+    assert request(server, "GET", "/jobs/nope/segments?from=abc")[0] == 400
+    assert request(server, "POST", "/jobs", wav_bytes, {"Content-Length": "lots"})[0] == 400
+
+
+def test_unknown_model_is_rejected_before_the_upload(server):
+    """Test that a bad model is refused from the headers, without reading the body."""
+    with socket.create_connection(server.server_address, timeout=60) as connection:
+        # Announces a large body but never sends it: reading it would hang
+        connection.sendall(b"POST /jobs?model=huge HTTP/1.1\r\nHost: test\r\nContent-Length: 100000000\r\n\r\n")
+        response = connection.makefile("rb").read().decode("utf-8")
+
+    assert response.startswith("HTTP/1.1 400")
+    assert "Connection: close" in response
+    assert "Unknown model huge" in response
+
+
+def test_truncated_upload_is_rejected(server, wav_bytes):
+    """Test that a body shorter than its Content-Length is refused, not transcribed."""
+    with socket.create_connection(server.server_address, timeout=60) as connection:
+        connection.sendall(
+            f"POST /jobs HTTP/1.1\r\nHost: test\r\nContent-Length: {len(wav_bytes)}\r\n\r\n".encode("ascii")
+            + wav_bytes[:1000]
+        )
+        connection.shutdown(socket.SHUT_WR)
+        response = connection.makefile("rb").read()
+    assert response.startswith(b"HTTP/1.1 400")
+    assert b"Upload truncated: got 1000 of" in response
+    assert request(server, "GET", "/jobs") == (200, [])
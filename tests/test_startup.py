@@ -0,0 +1,35 @@
+"""
+Tests that entry points start without importing torch or whisper.
+"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def imported_after(code):
+    """Run code in a fresh interpreter and return the heavy modules it imported."""
+    probe = code + "\nimport sys; print(sorted(m for m in ('torch', 'whisper') if m in sys.modules))"
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    output = subprocess.run(
+        [sys.executable, "-c", probe], cwd=ROOT, env=env,
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return output.strip().splitlines()[-1]
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        "import cli_app",
+        "from src.core import Transcriber; Transcriber('tiny')",
+        "import gui_app",
+    ],
+)
+def test_startup_is_lazy(code):
+    """Test that importing entry points and creating a Transcriber stays light."""
+    assert imported_after(code) == "[]"
+
@@ -0,0 +1,83 @@
+"""
+Tests for the low-memory path: streaming decode to .npy, on-demand sample
+reads and window-by-window mel computation.
+"""
+import os
+
+import numpy as np
+import pytest
+import torch
+import whisper
+
+from src.core.audio import DecodedAudioCache, decode_audio
+from src.core.streaming import N_SAMPLES, PcmFile, StreamingMel, decode_to_npy, open_streaming
+
+from test_audio import write_wav
+
+
+@pytest.mark.parametrize("seconds", [0.5, 29.99, 30, 75.3])
+def test_streaming_mel_matches_log_mel_spectrogram(seconds):
+    """Test that every window slice equals the full spectrogram's."""
+    samples = (np.random.RandomState(1).randn(int(16000 * seconds)) * 0.1).astype(np.float32)
+    full = whisper.log_mel_spectrogram(samples, 80, padding=N_SAMPLES)
+    mel = StreamingMel(samples, 80)
+
+    assert mel.shape == tuple(full.shape)
+    for start in range(0, mel.n_frames, 1234):
+        stop = min(start + 3000, mel.n_frames)
+        torch.testing.assert_close(mel[:, start:stop], full[:, start:stop], rtol=0, atol=1e-5)
+
+
+def test_decode_to_npy_streams_wav(tmp_path):
+    """Test that WAV decoded block by block matches decode_audio and loads with numpy."""
+    write_wav(tmp_path / "a.wav", np.random.RandomState(0).randn(16000 * 65) * 0.1)
+    expected = decode_audio(str(tmp_path / "a.wav"))
+
+    length = decode_to_npy(str(tmp_path / "a.wav"), str(tmp_path / "a.npy"))
+
+    assert length == len(expected)
+    np.testing.assert_array_equal(np.load(tmp_path / "a.npy"), expected)
+    source = PcmFile(str(tmp_path / "a.npy"))
+    assert len(source) == len(expected)
+    np.testing.assert_array_equal(source.read(100, 50000), expected[100:50000])
+    assert len(source.read(len(expected) - 10, len(expected) + 10)) == 10
+    source.close()
+
+
+def test_temporary_decode_is_removed(tmp_path):
+    """Test that open_streaming without a cache leaves no temporary file behind."""
+    write_wav(tmp_path / "a.wav", np.zeros(16000))
+
+    source = open_streaming(str(tmp_path / "a.wav"))
+    assert len(source) == 16000
+    source.close()
+
+    assert not os.path.exists(source.path)
+
+
+def test_cache_open_decodes_once(tmp_path):
+    """Test that DecodedAudioCache.open streams into the cache on a miss and reuses it."""
+    write_wav(tmp_path / "a.wav", np.random.RandomState(0).randn(16000) * 0.1)
+    cache = DecodedAudioCache(str(tmp_path / "cache"))
+
+    first = cache.open(str(tmp_path / "a.wav"))
+    second = cache.open(str(tmp_path / "a.wav"))
+
+    assert (cache.hits, cache.misses) == (1, 1)
+    np.testing.assert_array_equal(second.read(0, len(second)), first.read(0, len(first)))
+    first.close()
+    second.close()
+
+
+def test_low_memory_transcription_matches(random_transcriber, audio, tmp_path):
+    """Test that streaming mode produces the same result as the in-memory path."""
+    np.save(tmp_path / "a.npy", audio)
+    path = str(tmp_path / "a.npy")
+    options = dict(fp16=False, language="en", temperature=0.0)
+
+    expected = random_transcriber.transcribe(path, **options)
+    random_transcriber.low_memory = True
+    result = random_transcriber.transcribe(path, **options)
+
+    assert result["text"] == expected["text"]
+    assert [s["start"] for s in result["segments"]] == [s["start"] for s in expected["segments"]]
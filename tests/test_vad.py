@@ -0,0 +1,127 @@
+"""
+Tests for the voice activity detection pre-pass.
+"""
+import numpy as np
+import pytest
+
+from src.core.streaming import PcmFile
+from src.core.vad import SpeechMap, detect_speech, estimate_speedup, format_summary
+
+SR = 16000
+
+
+def with_silence(speech_seconds):
+    """Build noise bursts of the given (start, end) seconds inside 20 s of near silence."""
+    rng = np.random.RandomState(0)
+    samples = (rng.randn(20 * SR) * 1e-4).astype(np.float32)
+    for start, end in speech_seconds:
+        samples[int(start * SR):int(end * SR)] = rng.randn(int((end - start) * SR)) * 0.1
+    return samples
+
+
+def test_detects_speech_regions():
+    """Test that loud regions are found, padded, and short clicks are dropped."""
+    samples = with_silence([(2, 5), (10, 14), (17.0, 17.1)])
+
+    speech = detect_speech(samples, pad=0.2)
+
+    assert [(s / SR, e / SR) for s, e in speech.regions] == [(1.8, 5.2), (9.8, 14.2)]
+    assert speech.speech_duration == pytest.approx(7.8)
+    assert speech.summary()["skipped"] == pytest.approx(12.2)
+
+
+def test_short_pauses_are_kept():
+    """Test that pauses shorter than min_silence do not split a region."""
+    speech = detect_speech(with_silence([(2, 5), (5.5, 8)]), pad=0.0, min_silence=1.0)
+
+    assert [(s / SR, e / SR) for s, e in speech.regions] == [(2.0, 8.0)]
+
+
+def test_to_original_maps_across_seams():
+    """Test that speech-only times map back onto the original timeline."""
+    speech = SpeechMap([(SR, 3 * SR), (10 * SR, 12 * SR)], 20 * SR)
+
+    assert speech.to_original(0.0) == 1.0
+    assert speech.to_original(1.5) == 2.5
+    assert speech.to_original(2.0) == 10.0
+    assert speech.to_original(2.0, end=True) == 3.0
+    assert speech.to_original(3.0) == 11.0
+    assert speech.to_original(9.0, end=True) == 12.0
+
+    segment = {"start": 1.0, "end": 3.0, "text": " hi", "words": [{"start": 2.5, "end": 3.0}]}
+    remapped = speech.remap_segment(segment)
+    assert (remapped["start"], remapped["end"]) == (2.0, 11.0)
+    assert remapped["words"] == [{"start": 10.5, "end": 11.0}]
+    assert segment["start"] == 1.0
+
+
+def test_compact_from_disk_matches_array(tmp_path):
+    """Test that the on-demand reader returns the same samples as the concatenated array."""
+    samples = with_silence([(2, 5), (10, 14)])
+    np.save(tmp_path / "a.npy", samples)
+    source = PcmFile(str(tmp_path / "a.npy"))
+
+    speech = detect_speech(source)
+    compact = speech.compact(source)
+    expected = speech.compact(samples)
+
+    assert len(compact) == len(expected)
+    np.testing.assert_array_equal(compact.read(0, len(compact)), expected)
+    np.testing.assert_array_equal(compact.read(SR, 4 * SR), expected[SR:4 * SR])
+    compact.close()
+
+
+def test_format_summary():
+    """Test the skipped-audio report."""
+    text = format_summary({"duration": 600.0, "speech": 400.0, "skipped": 200.0, "regions": 12})
+
+    assert text == "VAD skipped 3:20 of 10:00 (33% of the audio)"
+
+
+def test_format_summary_with_speedup():
+    """Test that a profiled run reports the speedup measured from its decode rate."""
+    summary = {"duration": 600.0, "speech": 400.0, "skipped": 200.0, "regions": 12}
+    timings = {
+        "wall": 50.0,
+        "stages": {"vad": {"wall": 1.0}, "mel": {"wall": 2.0}, "decode_audio": {"wall": 7.0}},
+        "windows": [{"wall": 25.0}, {"wall": 15.0}],
+    }
+
+    # 42 s of model time for 400 s of speech: 63 s for all 600 s, plus the
+    # 7 s outside the model, against the 50 s the run took
+    assert estimate_speedup(summary, timings) == pytest.approx(1.4)
+    assert format_summary(summary, timings) == "VAD skipped 3:20 of 10:00 (33% of the audio, 1.4x faster)"
+    assert estimate_speedup(dict(summary, speech=0.0), dict(timings, windows=[])) is None
+
+
+def test_transcribe_with_vad(random_transcriber, audio):
+    """Test that only speech is decoded and timestamps land in the original recording."""
+    samples = np.zeros(SR * 100, dtype=np.float32)
+    samples[SR * 60:SR * 100] = audio
+    options = dict(fp16=False, language="en", temperature=0.0)
+
+    random_transcriber.vad = True
+    result = random_transcriber.transcribe(samples, **options)
+
+    # The speech region starts 0.2 s (the padding) before the noise
+    assert result["vad"]["skipped"] == pytest.approx(59.8)
+    expected = random_transcriber.model.transcribe(samples[int(59.8 * SR):], **options)
+    assert result["text"] == expected["text"]
+    assert len(result["segments"]) == len(expected["segments"])
+    for segment, reference in zip(result["segments"], expected["segments"]):
+        assert segment["start"] == pytest.approx(reference["start"] + 59.8, abs=1e-3)
+        assert segment["end"] == pytest.approx(reference["end"] + 59.8, abs=1e-3)
+
+
+def test_silent_audio_skips_decoding(random_transcriber):
+    """Test that audio without speech returns an empty result without decoding."""
+    random_transcriber.vad = True
+    progress = []
+
+    result = random_transcriber.transcribe(
+        np.zeros(SR * 10, dtype=np.float32), language="en", progress_callback=progress.append
+    )
+
+    assert result["segments"] == [] and result["text"] == ""
+    assert result["vad"]["skipped"] == 10.0
+    assert progress[-1].fraction == 1.0